@@ -17,6 +17,7 @@ import json
 import logging
 from datetime import datetime
 from openai import OpenAI
+from metrics import LLMCall
 import re
 
 logger = logging.getLogger(__name__)
@@ -103,14 +104,17 @@ class AdvancedAI:
             messages.append({"role": "user", "content": user_input})
             
             # Generate response
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                max_tokens=500,
-                temperature=0.8,
-                presence_penalty=0.1,
-                frequency_penalty=0.1
-            )
+            with LLMCall('AdvancedAI', 'gpt-4o') as call:
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=messages,
+                    max_tokens=500,
+                    temperature=0.8,
+                    presence_penalty=0.1,
+                    frequency_penalty=0.1
+                )
+                if response.usage:
+                    call.usage(response.usage.prompt_tokens, response.usage.completion_tokens)
             
             ai_response = response.choices[0].message.content.strip()
             
@@ -220,12 +224,15 @@ class AdvancedAI:
             }}
             """
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": analysis_prompt}],
-                response_format={"type": "json_object"},
-                max_tokens=400
-            )
+            with LLMCall('AdvancedAI', 'gpt-4o') as call:
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[{"role": "user", "content": analysis_prompt}],
+                    response_format={"type": "json_object"},
+                    max_tokens=400
+                )
+                if response.usage:
+                    call.usage(response.usage.prompt_tokens, response.usage.completion_tokens)
             
             return json.loads(response.choices[0].message.content)
             
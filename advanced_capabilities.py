@@ -11,37 +11,45 @@ import requests
 import json
 import time
 import logging
-from typing import Dict, List, Any, Optional
-from urllib.parse import urljoin, urlparse
-import subprocess
-import os
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
+from execution_pool import execution_pool
+from node_pool import node_pool
+from job_manager import job_manager
+from web_crawler import WebCrawler
+from http_cache import http_cache
+from page_parser import parse_response
+from data_engine import data_engine
 
 class WebBrowser:
     """Advanced web browsing and scraping capabilities"""
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_cache.install(requests.Session())
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.last_response = None
+        self.last_page = None
+        self.last_crawler = None
         
     def navigate_to(self, url: str) -> Dict[str, Any]:
-        """Navigate to a specific URL"""
+        """Navigate to a specific URL and parse the page once"""
         try:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
             self.last_response = response
+            self.last_page = parse_response(response)
             
             return {
                 'success': True,
                 'url': response.url,
                 'status_code': response.status_code,
-                'title': self._extract_title(response.text),
-                'content_length': len(response.text),
-                'headers': dict(response.headers)
+                'title': self.last_page.title,
+                'content_length': len(response.content),
+                'headers': dict(response.headers),
+                'cache_status': response.cache_status
             }
         except Exception as e:
             return {
@@ -51,66 +59,42 @@ class WebBrowser:
     
     def extract_text(self) -> str:
         """Extract readable text from the current page"""
-        if not self.last_response:
+        if not self.last_page:
             return ""
         
-        # Basic text extraction - remove HTML tags
-        import re
-        text = re.sub(r'<[^>]+>', '', self.last_response.text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return self.last_page.text
     
     def find_links(self, filter_pattern: str = None) -> List[Dict[str, str]]:
         """Find all links on the current page"""
-        if not self.last_response:
+        if not self.last_page:
             return []
         
-        import re
-        link_pattern = r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>'
-        matches = re.findall(link_pattern, self.last_response.text, re.IGNORECASE)
-        
-        links = []
-        for href, text in matches:
-            if filter_pattern and filter_pattern.lower() not in text.lower():
-                continue
-            
-            # Convert relative URLs to absolute
-            full_url = urljoin(self.last_response.url, href)
-            links.append({
-                'url': full_url,
-                'text': text.strip(),
-                'domain': urlparse(full_url).netloc
-            })
-        
-        return links
+        return self.last_page.find_links(filter_pattern)
     
     def search_content(self, query: str) -> List[str]:
         """Search for specific content on the current page"""
-        if not self.last_response:
+        if not self.last_page:
             return []
         
-        text = self.extract_text()
-        sentences = text.split('.')
-        
-        results = []
-        for sentence in sentences:
-            if query.lower() in sentence.lower():
-                results.append(sentence.strip())
-        
-        return results
+        return self.last_page.search(query)
     
-    def _extract_title(self, html: str) -> str:
-        """Extract page title from HTML"""
-        import re
-        title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-        return title_match.group(1) if title_match else "No title"
+    def crawl(self, seeds: List[str], **options) -> Iterator[Dict[str, Any]]:
+        """Crawl from seed URLs, yielding page results as they complete
+        
+        options are passed to WebCrawler (max_depth, max_pages, concurrency,
+        per_host_concurrency, min_delay, respect_robots, same_host...).
+        """
+        headers = dict(self.session.headers)
+        crawler = WebCrawler(user_agent=headers.pop('User-Agent'), headers=headers, **options)
+        self.last_crawler = crawler
+        return crawler.iter_crawl(seeds)
 
 
 class APIIntegrator:
     """Advanced API integration capabilities"""
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_cache.install(requests.Session())
         
     def call_api(self, url: str, method: str = 'GET', headers: Dict = None, 
                  data: Dict = None, params: Dict = None) -> Dict[str, Any]:
@@ -141,7 +125,8 @@ class APIIntegrator:
                 'status_code': response.status_code,
                 'data': json_data,
                 'text': response.text if not json_data else None,
-                'headers': dict(response.headers)
+                'headers': dict(response.headers),
+                'cache_status': response.cache_status
             }
             
         except Exception as e:
@@ -175,37 +160,23 @@ class CodeExecutor:
         self.supported_languages = ['python', 'javascript', 'bash']
         
     def execute_python(self, code: str, timeout: int = 30) -> Dict[str, Any]:
-        """Execute Python code safely"""
+        """Execute Python code on a warm, resource-limited pool worker"""
         try:
-            # Create temporary file
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
+            result = execution_pool.execute(code, owner='code_executor', timeout=timeout)
             
-            # Execute with timeout
-            result = subprocess.run(
-                ['python', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            
-            # Clean up
-            os.unlink(temp_file)
+            if result.get('timed_out'):
+                return {
+                    'success': False,
+                    'error': 'Code execution timed out'
+                }
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr,
-                'return_code': result.returncode
+                'success': result['success'],
+                'output': result['output'],
+                'error': result['error'],
+                'return_code': result['return_code']
             }
             
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'error': 'Code execution timed out'
-            }
         except Exception as e:
             return {
                 'success': False,
@@ -213,34 +184,23 @@ class CodeExecutor:
             }
     
     def execute_javascript(self, code: str, timeout: int = 30) -> Dict[str, Any]:
-        """Execute JavaScript code using Node.js"""
+        """Execute JavaScript code on a persistent Node.js worker"""
         try:
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
+            result = node_pool.execute(code, owner='code_executor', timeout=timeout)
             
-            result = subprocess.run(
-                ['node', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            
-            os.unlink(temp_file)
+            if result.get('timed_out'):
+                return {
+                    'success': False,
+                    'error': 'Code execution timed out'
+                }
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr,
-                'return_code': result.returncode
+                'success': result['success'],
+                'output': result['output'],
+                'error': result['error'],
+                'return_code': result['return_code']
             }
             
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'error': 'Code execution timed out'
-            }
         except Exception as e:
             return {
                 'success': False,
@@ -248,28 +208,24 @@ class CodeExecutor:
             }
     
     def execute_bash(self, command: str, timeout: int = 30) -> Dict[str, Any]:
-        """Execute bash commands safely"""
+        """Execute bash commands with capped, streamed output"""
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            job = job_manager.run_command(command, timeout=timeout, owner='code_executor')
             
-            return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr,
-                'return_code': result.returncode
-            }
+            if job.status == 'timed_out':
+                return {
+                    'success': False,
+                    'error': 'Command execution timed out'
+                }
             
-        except subprocess.TimeoutExpired:
             return {
-                'success': False,
-                'error': 'Command execution timed out'
+                'success': job.return_code == 0,
+                'output': job.output_text('stdout'),
+                'error': job.output_text('stderr'),
+                'return_code': job.return_code,
+                'job_id': job.id
             }
+            
         except Exception as e:
             return {
                 'success': False,
@@ -393,6 +349,23 @@ class AdvancedCapabilities:
         
         return result
     
+    def crawl_website(self, url: Any, max_depth: int = 1, max_pages: int = 50,
+                      **options) -> Dict[str, Any]:
+        """Crawl a website (or a list of seed URLs) and collect every page result"""
+        try:
+            seeds = [url] if isinstance(url, str) else list(url)
+            pages = list(self.browser.crawl(seeds, max_depth=max_depth, max_pages=max_pages, **options))
+            return {
+                'success': True,
+                'pages': pages,
+                'stats': self.browser.last_crawler.get_crawl_stats()
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def process_external_request(self, request_type: str, details: Dict[str, Any]) -> Dict[str, Any]:
         """Process various types of external requests"""
         if request_type == 'web_scraping':
@@ -400,6 +373,13 @@ class AdvancedCapabilities:
             extract = details.get('extract', 'text')
             return self.browse_website(url, extract)
         
+        elif request_type == 'web_crawl':
+            return self.crawl_website(
+                details.get('url'),
+                max_depth=details.get('max_depth', 1),
+                max_pages=details.get('max_pages', 50)
+            )
+        
         elif request_type == 'api_call':
             return self.api.call_api(
                 url=details.get('url'),
@@ -447,6 +427,10 @@ class AdvancedCapabilities:
                     'success': True,
                     'result': self.processor.transform_data(data, transformation)
                 }
+            elif operation == 'pipeline':
+                return data_engine.process(data, details.get('operations', []),
+                                           page=details.get('page', 1),
+                                           page_size=details.get('page_size', 100))
         
         return {
             'success': False,
@@ -460,7 +444,8 @@ class AdvancedCapabilities:
                 'navigate': True,
                 'extract_text': True,
                 'find_links': True,
-                'search_content': True
+                'search_content': True,
+                'crawl': True
             },
             'api_integration': {
                 'http_methods': ['GET', 'POST', 'PUT', 'DELETE', 'PATCH'],
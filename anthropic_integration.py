@@ -18,6 +18,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import anthropic
+from metrics import LLMCall
 
 logger = logging.getLogger(__name__)
 
@@ -76,12 +77,15 @@ class AnthropicAIEngine:
             })
             
             # Generate response with Claude
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                system=system_message,
-                messages=messages
-            )
+            with LLMCall('AnthropicAIEngine', self.model) as call:
+                response = self.client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    system=system_message,
+                    messages=messages
+                )
+                if getattr(response, 'usage', None):
+                    call.usage(response.usage.input_tokens, response.usage.output_tokens)
             
             ai_response = response.content[0].text
             
@@ -14,7 +14,7 @@ import os
 import threading
 import time
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 import logging
 
@@ -24,10 +24,12 @@ from chat_manager import AutoChatManager
 from cloud_deploy import CloudDeploymentManager
 from automation_controller import AutomationController
 from self_management import AVACoreSelfManagement
+from file_integrity import file_integrity
 from development_suite import AdvancedDevelopmentSuite
 from advanced_capabilities import AdvancedCapabilities
 from enhanced_features import EnhancedFeatures
 from restored_features import RestoredCapabilitiesManager
+from metrics import metrics, instrument_flask, instrument_socketio, CONTENT_TYPE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -38,6 +40,8 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'ava-core-secret-key')
 
 # Initialize SocketIO for real-time communication
 socketio = SocketIO(app, cors_allowed_origins="*", path='/ws')
+instrument_flask(app, 'app')
+instrument_socketio(socketio, 'app')
 
 # Global voice assistant instance
 voice_assistant = None
@@ -164,6 +168,11 @@ def monitor():
     """Conversation monitoring page"""
     return render_template('monitor.html')
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition of request and Socket.IO metrics"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
 @app.route('/api/status')
 def get_status():
     """Get current assistant status"""
@@ -604,6 +613,26 @@ def perform_upgrade():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/self-management/backups', methods=['GET', 'POST'])
+def system_backups():
+    """List incremental backups, or create one"""
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            result = self_management.upgrade_system.create_system_backup()
+            if data.get('keep'):
+                result['pruned'] = file_integrity.prune_backups(int(data['keep']))
+            return jsonify(result), 200 if result.get('success') else 500
+        return jsonify({
+            'success': True,
+            'backups': file_integrity.list_backups(),
+            'status': file_integrity.get_status()
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/self-management/defense/status')
 def get_defense_status():
     """Get security defense status"""
@@ -1099,22 +1128,23 @@ def handle_webhook_connection(connection_data):
 
 def get_system_health():
     """Get current system health metrics"""
-    import psutil
+    from health_sampler import health_sampler
+    sample = health_sampler.latest()
     return {
-        'cpu_percent': psutil.cpu_percent(interval=1),
-        'memory_percent': psutil.virtual_memory().percent,
-        'disk_percent': psutil.disk_usage('/').percent,
-        'network_active': len(psutil.net_connections()) > 0
+        'cpu_percent': sample.get('cpu_percent'),
+        'memory_percent': sample.get('memory_percent'),
+        'disk_percent': sample.get('disk_percent'),
+        'network_active': sample.get('network_connections', 0) > 0
     }
 
 def get_active_connections():
     """Get active network connections"""
-    import psutil
-    connections = psutil.net_connections()
+    from health_sampler import health_sampler
+    sample = health_sampler.latest()
     return {
-        'total_connections': len(connections),
-        'established': len([c for c in connections if c.status == 'ESTABLISHED']),
-        'listening': len([c for c in connections if c.status == 'LISTEN'])
+        'total_connections': sample.get('network_connections', 0),
+        'established': sample.get('connections_established', 0),
+        'listening': sample.get('connections_listening', 0)
     }
 
 def get_performance_metrics():
@@ -17,6 +17,8 @@ from typing import Dict, List, Optional, Any
 import json
 import requests
 from urllib.parse import urlparse
+from job_manager import job_manager
+from tool_inventory import tool_inventory
 
 logger = logging.getLogger(__name__)
 
@@ -75,15 +77,7 @@ class AutomationController:
     def _check_dev_tools(self) -> bool:
         """Check available development tools"""
         tools = ['git', 'npm', 'python', 'pip', 'code']
-        available = {}
-        for tool in tools:
-            try:
-                result = subprocess.run([tool, '--version'], 
-                                      capture_output=True, text=True, timeout=5)
-                available[tool] = result.returncode == 0
-            except:
-                available[tool] = False
-        return available
+        return {tool: path is not None for tool, path in tool_inventory.which(tools).items()}
     
     def _check_system_control(self) -> bool:
         """Check system control capabilities"""
@@ -609,23 +603,26 @@ class AutomationController:
     def _run_system_command(self, command: str) -> Dict[str, Any]:
         """Run system command"""
         try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+            job = job_manager.run_command(command, timeout=30, owner='automation')
+            
+            if job.status == 'timed_out':
+                return {
+                    'action': 'run_command',
+                    'status': 'timeout',
+                    'error': 'Command timed out after 30 seconds',
+                    'job_id': job.id
+                }
             
             return {
                 'action': 'run_command',
                 'command': command,
                 'status': 'completed',
-                'output': result.stdout,
-                'error_output': result.stderr,
-                'return_code': result.returncode
+                'output': job.output_text('stdout'),
+                'error_output': job.output_text('stderr'),
+                'return_code': job.return_code,
+                'job_id': job.id
             }
             
-        except subprocess.TimeoutExpired:
-            return {
-                'action': 'run_command',
-                'status': 'timeout',
-                'error': 'Command timed out after 30 seconds'
-            }
         except Exception as e:
             return {
                 'action': 'run_command',
@@ -15,15 +15,19 @@ Autonomous thinking, decision-making, and persistent memory capabilities
 import os
 import json
 import sqlite3
-import time
-import threading
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import requests
+from table_stats import table_stats
+from memory_consolidation import MemoryConsolidator
+from background_scheduler import background_scheduler
 
 logger = logging.getLogger(__name__)
 
+THINKING_INTERVAL = 30
+THINKING_MAX_INTERVAL = 300
+
 class AutonomousThinkingEngine:
     """Autonomous thinking and decision-making capabilities"""
     
@@ -34,6 +38,9 @@ class AutonomousThinkingEngine:
         self.learning_patterns = {}
         self.memory_db = 'autonomous_memory.db'
         self.init_memory_system()
+        self.consolidator = MemoryConsolidator(self.memory_db)
+        self._in_cycle = False
+        self._first_cycle_done = False
         
     def init_memory_system(self):
         """Initialize persistent memory database"""
@@ -98,6 +105,8 @@ class AutonomousThinkingEngine:
             
             conn.commit()
             conn.close()
+            
+            table_stats.track(self.memory_db, 'thoughts', 'memory_associations')
             logger.info("Autonomous memory system initialized")
             
         except Exception as e:
@@ -106,54 +115,57 @@ class AutonomousThinkingEngine:
     def start_autonomous_thinking(self):
         """Start autonomous thinking process"""
         self.thinking_active = True
-        thinking_thread = threading.Thread(target=self._thinking_loop, daemon=True)
-        thinking_thread.start()
+        # Think every 30 seconds, backing off to 5 minutes while there is no new activity
+        background_scheduler.register('autonomous_thinking', self._thinking_job, THINKING_INTERVAL,
+                                      max_interval=THINKING_MAX_INTERVAL, delay=0, retry_interval=5)
         logger.info("Autonomous thinking activated")
     
-    def _thinking_loop(self):
-        """Continuous thinking and decision-making loop"""
-        while self.thinking_active:
+    def stop_autonomous_thinking(self):
+        """Stop autonomous thinking process"""
+        self.thinking_active = False
+        background_scheduler.unregister('autonomous_thinking')
+    
+    def _thinking_job(self) -> Dict[str, Any]:
+        """One scheduled thinking cycle; the first one runs even without activity"""
+        result = self.run_cycle(force=not self._first_cycle_done)
+        self._first_cycle_done = True
+        return result
+    
+    def run_cycle(self, force: bool = False) -> Dict[str, Any]:
+        """One reflection cycle; without new activity only consolidation runs"""
+        activity = self.consolidator.ingest()
+        active = force or any(activity.values())
+        if active:
+            self._in_cycle = True
             try:
                 # Autonomous reflection cycle
                 self._reflect_on_recent_events()
                 self._analyze_patterns()
                 self._make_autonomous_decisions()
                 self._update_knowledge_base()
-                
-                # Think every 30 seconds
-                time.sleep(30)
-                
-            except Exception as e:
-                logger.error(f"Thinking loop error: {e}")
-                time.sleep(5)
+            finally:
+                self._in_cycle = False
+                self.consolidator.flush()
+                self.consolidator.absorb()
+        consolidation = self.consolidator.consolidate()
+        return {'active': active, 'activity': activity, 'consolidation': consolidation}
     
     def _reflect_on_recent_events(self):
         """Reflect on recent interactions and events"""
         try:
-            conn = sqlite3.connect(self.memory_db)
-            cursor = conn.cursor()
-            
-            # Get recent thoughts
-            cursor.execute('''
-                SELECT * FROM thoughts 
-                WHERE timestamp > datetime('now', '-1 hour')
-                ORDER BY timestamp DESC
-            ''')
-            recent_thoughts = cursor.fetchall()
+            # Thought types of the last hour, kept current by the consolidator
+            recent_types = self.consolidator.recent_thought_types()
             
-            if recent_thoughts:
-                reflection = self._generate_reflection(recent_thoughts)
+            if recent_types:
+                reflection = self._generate_reflection(recent_types)
                 self._store_thought('reflection', reflection, 'recent_events', 0.7)
             
-            conn.close()
-            
         except Exception as e:
             logger.error(f"Reflection error: {e}")
     
-    def _generate_reflection(self, thoughts: List) -> str:
-        """Generate autonomous reflection on thoughts"""
-        thought_types = [thought[1] for thought in thoughts]
-        common_themes = max(set(thought_types), key=thought_types.count) if thought_types else 'general'
+    def _generate_reflection(self, thought_types: Dict[str, int]) -> str:
+        """Generate autonomous reflection on thoughts, given their counts per type"""
+        common_themes = max(thought_types, key=thought_types.get) if thought_types else 'general'
         
         reflections = {
             'problem_solving': 'I notice patterns in problem-solving approaches that could be optimized.',
@@ -168,26 +180,15 @@ class AutonomousThinkingEngine:
     def _analyze_patterns(self):
         """Analyze patterns in behavior and learning"""
         try:
-            conn = sqlite3.connect(self.memory_db)
-            cursor = conn.cursor()
-            
-            # Find recurring patterns
-            cursor.execute('''
-                SELECT pattern_type, COUNT(*) as frequency
-                FROM learning_patterns
-                GROUP BY pattern_type
-                ORDER BY frequency DESC
-                LIMIT 5
-            ''')
-            patterns = cursor.fetchall()
+            # Find recurring patterns; only those that grew since the last analysis are reported
+            patterns = self.consolidator.pattern_counts(5)
+            changed = self.consolidator.take_changed_patterns()
             
             for pattern_type, frequency in patterns:
-                if frequency > 3:  # Pattern threshold
+                if frequency > 3 and pattern_type in changed:  # Pattern threshold
                     analysis = f"Pattern '{pattern_type}' shows high frequency ({frequency}), indicating strong learning."
                     self._store_thought('pattern_analysis', analysis, pattern_type, 0.8)
             
-            conn.close()
-            
         except Exception as e:
             logger.error(f"Pattern analysis error: {e}")
     
@@ -213,17 +214,8 @@ class AutonomousThinkingEngine:
     def _decide_on_memory_optimization(self) -> Dict[str, Any]:
         """Decide on memory optimization strategies"""
         try:
-            conn = sqlite3.connect(self.memory_db)
-            cursor = conn.cursor()
-            
             # Check memory usage patterns
-            cursor.execute('SELECT COUNT(*) FROM thoughts')
-            thought_count = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM memory_associations')
-            association_count = cursor.fetchone()[0]
-            
-            conn.close()
+            thought_count = table_stats.count(self.memory_db, 'thoughts')
             
             if thought_count > 10000:  # Threshold for cleanup
                 return {
@@ -380,18 +372,12 @@ class AutonomousThinkingEngine:
             self._store_knowledge(area, 'domain_knowledge', knowledge_content[area])
     
     def _store_thought(self, thought_type: str, content: str, context: str, confidence: float):
-        """Store autonomous thought in memory"""
+        """Store autonomous thought in memory; thoughts of a cycle are written together"""
         try:
-            conn = sqlite3.connect(self.memory_db)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO thoughts (thought_type, content, context, confidence)
-                VALUES (?, ?, ?, ?)
-            ''', (thought_type, content, context, confidence))
-            
-            conn.commit()
-            conn.close()
+            self.consolidator.record_thought(thought_type, content, context, confidence)
+            if not self._in_cycle:
+                self.consolidator.flush()
+                self.consolidator.absorb()
             
         except Exception as e:
             logger.error(f"Thought storage error: {e}")
@@ -445,6 +431,7 @@ class AutonomousThinkingEngine:
             
             conn.commit()
             conn.close()
+            self.consolidator.note_interaction()
             
         except Exception as e:
             logger.error(f"Interaction memory error: {e}")
@@ -507,7 +494,7 @@ class AutonomousThinkingEngine:
                 SELECT thought_type, content, confidence, timestamp 
                 FROM thoughts 
                 WHERE timestamp > datetime('now', '-24 hours')
-                ORDER BY timestamp DESC
+                ORDER BY id DESC
                 LIMIT 10
             ''')
             recent_thoughts = cursor.fetchall()
@@ -560,6 +547,8 @@ class AutonomousThinkingEngine:
                     for area in knowledge_areas
                 ],
                 'memory_associations_count': self._get_memory_count(),
+                'consolidation': self.consolidator.get_status(),
+                'thought_summaries': self.consolidator.summaries(10),
                 'focus_areas': [
                     'Climate change solutions',
                     'Business development tools',
@@ -576,12 +565,7 @@ class AutonomousThinkingEngine:
     def _get_memory_count(self) -> int:
         """Get total memory associations count"""
         try:
-            conn = sqlite3.connect(self.memory_db)
-            cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM memory_associations')
-            count = cursor.fetchone()[0]
-            conn.close()
-            return count
+            return table_stats.count(self.memory_db, 'memory_associations')
         except:
             return 0
 
@@ -0,0 +1,361 @@
+"""
+AVA CORE Background Scheduler
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+One cooperative thread for the periodic background work of the application.
+Subsystems register jobs instead of starting their own sleeping daemon
+threads. Jobs that block for long (subprocesses, network sweeps) are
+registered as blocking and run on a short-lived worker thread of their own,
+so the scheduler thread only dispatches and quick jobs are not held up behind
+them. Each run is followed by a jittered wait, so jobs that share an
+interval do not wake together. A job that reports it found nothing to do is
+backed off, doubling its interval up to a ceiling, and returns to its base
+interval as soon as it is active again. While recent HTTP request latency is
+high, deferrable jobs are pushed back so they do not compete with request
+threads for the GIL, up to a limit after which they run anyway. The CPU time
+of every run is measured with the thread clock and reported per job.
+Dispatching stops when the interpreter begins shutting down.
+"""
+
+import os
+import time
+import atexit
+import random
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from metrics import http_request_seconds
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JITTER = 0.1
+# Recent request latency at or above which deferrable jobs wait
+DEFER_LATENCY_MS = float(os.environ.get('AVA_BACKGROUND_DEFER_MS', '500'))
+DEFER_STEP = 5.0
+MAX_DEFER = float(os.environ.get('AVA_BACKGROUND_MAX_DEFER', '120'))
+LATENCY_WINDOW = 60.0
+LATENCY_SAMPLE_INTERVAL = 5.0
+# Fewer requests than this in the window are too few to call the server busy
+MIN_REQUESTS = 5
+LATENCY_QUANTILE = 0.95
+
+def is_idle(result: Any) -> bool:
+    """Default reading of a job result: False, or a dict with active False, means idle"""
+    if result is False:
+        return True
+    return isinstance(result, dict) and result.get('active') is False
+
+class Job:
+    """A registered callable with its schedule and accounting"""
+
+    def __init__(self, name: str, func: Callable[[], Any], interval: Optional[float], max_interval: float,
+                 jitter: float, retry_interval: float, deferrable: bool, idle: Callable[[Any], bool],
+                 blocking: bool = False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.max_interval = max(max_interval or 0.0, interval or 0.0)
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.deferrable = deferrable
+        self.idle = idle
+        self.blocking = blocking
+        # A blocking job is not dispatched again while a run is still going
+        self.running = False
+        self.current_interval = interval
+        self.next_run = 0.0
+        self.deferred_since: Optional[float] = None
+        self.runs = 0
+        self.idle_runs = 0
+        self.failures = 0
+        self.deferrals = 0
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.last_cpu_ms: Optional[float] = None
+        self.last_wall_ms: Optional[float] = None
+        self.last_run: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def schedule(self, delay: float):
+        spread = delay * self.jitter
+        self.next_run = time.monotonic() + max(0.0, delay + random.uniform(-spread, spread))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'interval': self.interval,
+            'current_interval': self.current_interval,
+            'max_interval': self.max_interval,
+            'deferrable': self.deferrable,
+            'blocking': self.blocking,
+            'running': self.running,
+            'next_run_in': round(max(self.next_run - time.monotonic(), 0.0), 1),
+            'runs': self.runs,
+            'idle_runs': self.idle_runs,
+            'failures': self.failures,
+            'deferrals': self.deferrals,
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'wall_seconds': round(self.wall_seconds, 4),
+            'last_cpu_ms': self.last_cpu_ms,
+            'last_wall_ms': self.last_wall_ms,
+            'last_run': self.last_run,
+            'last_error': self.last_error
+        }
+
+class BackgroundScheduler:
+    """Runs registered periodic jobs one at a time on a single daemon thread"""
+
+    def __init__(self, defer_latency_ms: float = DEFER_LATENCY_MS, max_defer: float = MAX_DEFER):
+        self.defer_latency_ms = defer_latency_ms
+        self.max_defer = max_defer
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._latency_samples: deque = deque()
+        self._latency_checked = 0.0
+        self._latency: Dict[str, Any] = {'p95_ms': None, 'requests': 0, 'busy': False}
+        self._once = 0
+        self.stats = {'runs': 0, 'idle_runs': 0, 'failures': 0, 'deferrals': 0, 'cpu_seconds': 0.0}
+
+    def register(self, name: str, func: Callable[[], Any], interval: float, max_interval: float = None,
+                 jitter: float = DEFAULT_JITTER, delay: float = None, retry_interval: float = None,
+                 deferrable: bool = True, idle: Callable[[Any], bool] = is_idle, blocking: bool = False) -> Job:
+        """Run func every interval seconds, replacing any job of the same name
+
+        func's result decides back-off: see is_idle, or pass idle to read it
+        differently. max_interval defaults to interval, i.e. no back-off.
+        The first run comes after delay (default: one jittered interval) and a
+        failed run is retried after retry_interval (default: interval).
+        Pass blocking for jobs that wait on subprocesses or the network, so
+        they run off the scheduler thread.
+        """
+        job = Job(name, func, interval, max_interval or interval, jitter,
+                  retry_interval if retry_interval is not None else interval, deferrable, idle, blocking)
+        job.schedule(interval if delay is None else delay)
+        with self._wake:
+            self.jobs[name] = job
+            self._wake.notify()
+        self.start()
+        return job
+
+    def call_later(self, delay: float, func: Callable[[], Any], name: str = None) -> Job:
+        """Run func once after delay seconds, without deferral under load"""
+        with self._lock:
+            self._once += 1
+            name = name or f'once-{self._once}'
+        return self.register(name, func, None, delay=delay, jitter=0.0, deferrable=False)
+
+    def unregister(self, name: str) -> bool:
+        with self._wake:
+            removed = self.jobs.pop(name, None) is not None
+            self._wake.notify()
+        return removed
+
+    def run_now(self, name: str) -> bool:
+        """Move a job's next run to now"""
+        with self._wake:
+            job = self.jobs.get(name)
+            if job is None:
+                return False
+            job.next_run = 0.0
+            job.deferred_since = None
+            self._wake.notify()
+        return True
+
+    def start(self):
+        """Start the scheduler thread; safe to call repeatedly"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='background-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._wake:
+            self._stopping = True
+            self._wake.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    # Request latency
+
+    def request_latency(self) -> Dict[str, Any]:
+        """p95 of HTTP requests finished in the last minute, from the request histogram"""
+        now = time.monotonic()
+        if now - self._latency_checked < LATENCY_SAMPLE_INTERVAL:
+            return self._latency
+        self._latency_checked = now
+        cell = http_request_seconds.merged()
+        samples = self._latency_samples
+        samples.append((now, cell))
+        while len(samples) > 1 and now - samples[1][0] >= LATENCY_WINDOW:
+            samples.popleft()
+
+        oldest = samples[0][1]
+        counts = [current - previous for current, previous in zip(cell[2:], oldest[2:])]
+        requests = cell[0] - oldest[0]
+        p95 = None
+        if requests:
+            # Upper bound of the bucket holding the quantile; the +Inf bucket reports the largest bound
+            bounds = http_request_seconds.buckets + (http_request_seconds.buckets[-1],)
+            target, seen = requests * LATENCY_QUANTILE, 0
+            for bound, count in zip(bounds, counts):
+                seen += count
+                if seen >= target:
+                    p95 = bound * 1000
+                    break
+        self._latency = {
+            'p95_ms': p95,
+            'requests': requests,
+            'window_seconds': round(now - samples[0][0], 1),
+            'busy': requests >= MIN_REQUESTS and p95 is not None and p95 >= self.defer_latency_ms
+        }
+        return self._latency
+
+    # Running jobs
+
+    def _shutting_down(self) -> bool:
+        # The main thread counts as finished once interpreter shutdown begins,
+        # before concurrent.futures and atexit handlers have run
+        if not self._stopping and not threading.main_thread().is_alive():
+            self._stopping = True
+        return self._stopping
+
+    def _due(self) -> Optional[Job]:
+        """The job to run now, or None after waiting until the next one is due"""
+        with self._wake:
+            if self._shutting_down():
+                return None
+            ready = [job for job in self.jobs.values() if not job.running]
+            if not ready:
+                self._wake.wait()
+                return None
+            job = min(ready, key=lambda j: j.next_run)
+            wait = job.next_run - time.monotonic()
+            if wait > 0:
+                self._wake.wait(wait)
+                return None
+            return job
+
+    def _defer(self, job: Job) -> bool:
+        busy = job.deferrable and self.request_latency()['busy']
+        with self._lock:
+            if not busy:
+                job.deferred_since = None
+                return False
+            now = time.monotonic()
+            if job.deferred_since is None:
+                job.deferred_since = now
+            elif now - job.deferred_since >= self.max_defer:
+                # Deferred long enough; run anyway so the job is never starved
+                job.deferred_since = None
+                return False
+            job.deferrals += 1
+            self.stats['deferrals'] += 1
+            job.next_run = now + DEFER_STEP
+            return True
+
+    def _dispatch(self, job: Job):
+        """Run a blocking job on a worker thread; it is rescheduled when the run finishes"""
+        with self._lock:
+            if self._shutting_down():
+                return
+            job.running = True
+        worker = threading.Thread(target=self._execute, args=(job,), name=f'background-{job.name}', daemon=True)
+        try:
+            worker.start()
+        except RuntimeError as e:
+            with self._lock:
+                job.running = False
+                job.schedule(job.retry_interval or DEFER_STEP)
+            logger.error(f"Background job {job.name} could not start: {e}")
+
+    def _execute(self, job: Job):
+        cpu_started = time.thread_time()
+        started = time.perf_counter()
+        failed = False
+        try:
+            result = job.func()
+        except BaseException as e:
+            # SystemExit from a job must not end the scheduler thread
+            failed = True
+            job.last_error = str(e)
+            logger.error(f"Background job {job.name} failed: {e}")
+        cpu = time.thread_time() - cpu_started
+        wall = time.perf_counter() - started
+
+        # Blocking jobs finish on their own threads, so accounting and rescheduling happen under the lock
+        with self._wake:
+            job.runs += 1
+            job.cpu_seconds += cpu
+            job.wall_seconds += wall
+            job.last_cpu_ms = round(cpu * 1000, 3)
+            job.last_wall_ms = round(wall * 1000, 3)
+            job.last_run = datetime.now().isoformat()
+            self.stats['runs'] += 1
+            self.stats['cpu_seconds'] += cpu
+            job.running = False
+            self._wake.notify()
+            if failed:
+                job.failures += 1
+                self.stats['failures'] += 1
+            if job.interval is None:
+                # One-shot job
+                if self.jobs.get(job.name) is job:
+                    del self.jobs[job.name]
+                return
+            if failed:
+                job.schedule(job.retry_interval)
+                return
+            if job.idle(result):
+                job.idle_runs += 1
+                self.stats['idle_runs'] += 1
+                job.current_interval = min(job.current_interval * 2, job.max_interval)
+            else:
+                job.current_interval = job.interval
+            job.schedule(job.current_interval)
+
+    def _run(self):
+        while True:
+            job = self._due()
+            if job is None:
+                if self._stopping:
+                    return
+                continue
+            if self._defer(job):
+                continue
+            if job.blocking:
+                self._dispatch(job)
+            else:
+                self._execute(job)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = sorted(self.jobs.values(), key=lambda j: j.next_run)
+            running = self._thread is not None and self._thread.is_alive()
+            workers = sum(1 for job in jobs if job.running)
+        return {
+            'running': running,
+            'threads': (1 if running else 0) + workers,
+            'defer_latency_ms': self.defer_latency_ms,
+            'max_defer_seconds': self.max_defer,
+            'request_latency': dict(self._latency),
+            'jobs': [job.to_dict() for job in jobs],
+            'stats': dict(self.stats, cpu_seconds=round(self.stats['cpu_seconds'], 4))
+        }
+
+# Global background scheduler instance
+background_scheduler = BackgroundScheduler()
+# concurrent.futures refuses new work from a threading exit hook, which runs before atexit
+# handlers and before the main thread is marked finished, so jobs dispatched in between fail.
+# Stop from the same (private) hook where it exists; atexit and the main thread check cover the rest
+if hasattr(threading, '_register_atexit'):
+    threading._register_atexit(background_scheduler.stop)
+atexit.register(background_scheduler.stop)
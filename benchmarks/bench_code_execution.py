@@ -0,0 +1,112 @@
+"""
+AVA CORE Code Execution Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Compares executions/sec and latency percentiles of the previous execution
+paths (a cold python subprocess per run through a temp file, and exec on the
+calling thread) with the pre-forked execution pool, at a given client
+concurrency.
+
+Usage: python benchmarks/bench_code_execution.py [--jobs 200] [--concurrency 4]
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SNIPPET = '''
+import json
+total = sum(i * i for i in range(2000))
+print(json.dumps({'total': total}))
+'''
+
+
+def cold_subprocess(code):
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+        f.write(code)
+        temp_file = f.name
+    try:
+        result = subprocess.run([sys.executable, temp_file], capture_output=True, text=True, timeout=30)
+        return result.returncode == 0
+    finally:
+        os.unlink(temp_file)
+
+
+def in_process(code):
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+        exec(code, {'__name__': '__main__'})
+    return True
+
+
+def _measure(func, jobs, concurrency):
+    latencies = []
+
+    def timed(_):
+        start = time.perf_counter()
+        ok = func(SNIPPET)
+        latencies.append(time.perf_counter() - start)
+        return ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ok = all(pool.map(timed, range(jobs)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'ok': ok,
+        'executions_per_sec': jobs / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def run(jobs=200, concurrency=4, workers=None):
+    from execution_pool import ExecutionPool
+
+    pool = ExecutionPool(size=workers or concurrency)
+    pool.start()
+    # Wait until every worker has reported ready so spawn time is excluded
+    for _ in range(pool.size * 2):
+        pool.execute('pass')
+
+    stdout, stderr = sys.stdout, sys.stderr
+    results = {
+        'cold_subprocess': _measure(cold_subprocess, max(1, jobs // 4), concurrency),
+        'in_process_exec': _measure(in_process, jobs, concurrency),
+        'execution_pool': _measure(lambda code: pool.execute(code)['success'], jobs, concurrency),
+    }
+    # Overlapping redirect_stdout calls on several threads can leave the
+    # process-wide streams swapped, one more reason exec moved off-thread
+    sys.stdout, sys.stderr = stdout, stderr
+    pool.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE code execution benchmark')
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    results = run(args.jobs, args.concurrency, args.workers)
+    print(f"{'path':18s} {'exec/s':>10} {'p50_ms':>10} {'p99_ms':>10} {'ok':>5}")
+    for name, row in results.items():
+        print(f"{name:18s} {row['executions_per_sec']:>10.1f} {row['p50_ms']:>10.2f} "
+              f"{row['p99_ms']:>10.2f} {str(row['ok']):>5}")
+    sys.exit(0 if all(row['ok'] for row in results.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
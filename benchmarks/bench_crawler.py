@@ -0,0 +1,132 @@
+"""
+AVA CORE Crawler Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Serves a generated fixture site from a local threaded HTTP server (pages
+with a fixed response latency, cross links, a robots.txt disallowing one
+section) and compares following every link with sequential
+WebBrowser.navigate_to calls against the concurrent crawler. Also checks the
+crawler visited each allowed page exactly once and none of the disallowed ones.
+
+Usage: python benchmarks/bench_crawler.py [--pages 120] [--latency 0.02] [--concurrency 8]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROBOTS = 'User-agent: *\nDisallow: /private/\n'
+
+
+def make_handler(pages, latency):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        requests_served = 0
+        connections = set()
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            FixtureHandler.requests_served += 1
+            FixtureHandler.connections.add(self.client_address)
+            if self.path == '/robots.txt':
+                return self._send(ROBOTS, 'text/plain')
+            time.sleep(latency)
+            if self.path == '/' or self.path.startswith('/page/') or self.path.startswith('/private/'):
+                index = 0 if self.path == '/' else int(self.path.rstrip('/').rsplit('/', 1)[1]) % pages
+                links = ''.join(f'<a href="/page/{(index * 7 + k) % pages}">page {k}</a>' for k in range(1, 6))
+                links += f'<a href="/private/{index}">private</a><a href="#top">top</a>'
+                return self._send(f'<html><head><title>Page {index}</title></head>'
+                                  f'<body><p>Fixture page {index}.</p>{links}</body></html>', 'text/html')
+            self._send('not found', 'text/plain', 404)
+
+        def _send(self, body, content_type, status=200):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return FixtureHandler
+
+
+def sequential(browser, seed, max_pages):
+    """Breadth-first crawl of the previous kind: navigate_to plus find_links"""
+    seen, frontier, fetched = {seed}, deque([seed]), 0
+    while frontier and fetched < max_pages:
+        url = frontier.popleft()
+        if not browser.navigate_to(url)['success']:
+            continue
+        fetched += 1
+        for link in browser.find_links():
+            target = link['url'].split('#')[0]
+            if target not in seen and '/private/' not in target:
+                seen.add(target)
+                frontier.append(target)
+    return fetched
+
+
+def run(pages=120, latency=0.02, concurrency=8):
+    from advanced_capabilities import WebBrowser
+
+    handler = make_handler(pages, latency)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    seed = f'http://127.0.0.1:{server.server_port}/'
+    results = {}
+
+    try:
+        browser = WebBrowser()
+        start = time.perf_counter()
+        fetched = sequential(browser, seed, pages + 1)
+        elapsed = time.perf_counter() - start
+        results['sequential_navigate'] = {'pages': fetched, 'seconds': elapsed, 'ok': fetched == pages + 1}
+
+        handler.connections.clear()
+        handler.requests_served = 0
+        start = time.perf_counter()
+        crawled = list(browser.crawl([seed], max_depth=50, max_pages=pages * 2, concurrency=concurrency,
+                                     per_host_concurrency=concurrency, min_delay=0))
+        elapsed = time.perf_counter() - start
+        urls = [page['url'] for page in crawled if page['success']]
+        blocked = [page for page in crawled if page.get('error') == 'Disallowed by robots.txt']
+        ok = len(urls) == len(set(urls)) == pages + 1 and not any('/private/' in u for u in urls)
+        results['async_crawler'] = {
+            'pages': len(urls), 'seconds': elapsed, 'ok': ok,
+            'robots_blocked': len(blocked),
+            'connections': len(handler.connections),
+            'requests': handler.requests_served
+        }
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE crawler benchmark')
+    parser.add_argument('--pages', type=int, default=120)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    results = run(args.pages, args.latency, args.concurrency)
+    print(f"{'path':20s} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'ok':>5}")
+    for name, row in results.items():
+        print(f"{name:20s} {row['pages']:>6} {row['seconds']:>8.2f} "
+              f"{row['pages'] / row['seconds']:>8.1f} {str(row['ok']):>5}")
+    crawler = results['async_crawler']
+    print(f"crawler: {crawler['requests']} requests over {crawler['connections']} connections, "
+          f"{crawler['robots_blocked']} blocked by robots.txt")
+    sys.exit(0 if all(row['ok'] for row in results.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+AVA CORE Data Engine Benchmark
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Runs a filter -> aggregate -> sort pipeline over generated records with the
+columnar data_engine and with the equivalent per-record Python loops, and
+times loading the same rows from a list of dicts, NDJSON and CSV. Also
+compares DataProcessor.filter_data with the same equality filter evaluated
+column-wise, both from the list of dicts (conversion included) and on a
+table that is already columnar. Exits non-zero when the results disagree.
+
+Usage: python benchmarks/bench_data_engine.py [--rows 1000000]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CITIES = ['Paris', 'Berlin', 'Rome', 'Madrid', 'Vienna', 'Oslo', 'Lisbon', 'Prague']
+
+PIPELINE = [
+    {'op': 'filter', 'where': [{'column': 'amount', 'operator': '>', 'value': 25.0},
+                               {'column': 'status', 'operator': '==', 'value': 'paid'}]},
+    {'op': 'aggregate', 'group_by': ['city'],
+     'aggregates': {'orders': 'count', 'revenue': 'sum:amount', 'average': 'mean:amount', 'largest': 'max:amount'}},
+    {'op': 'sort', 'by': [{'column': 'revenue', 'descending': True}]}
+]
+
+
+def _records(rows):
+    rng = random.Random(7)
+    return [{'id': i, 'city': rng.choice(CITIES), 'amount': round(rng.random() * 100, 2),
+             'status': 'paid' if rng.random() < 0.7 else 'refunded', 'quantity': rng.randint(1, 9)}
+            for i in range(rows)]
+
+
+def _python_pipeline(records):
+    groups = defaultdict(list)
+    for record in records:
+        if record['amount'] > 25.0 and record['status'] == 'paid':
+            groups[record['city']].append(record['amount'])
+    rows = [{'city': city, 'orders': len(values), 'revenue': sum(values),
+             'average': sum(values) / len(values), 'largest': max(values)}
+            for city, values in groups.items()]
+    return sorted(rows, key=lambda row: -row['revenue'])
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def run(rows):
+    from data_engine import ColumnTable, run_pipeline, filter_mask, matching_indices
+    from advanced_capabilities import DataProcessor
+
+    records = _records(rows)
+    expected, python_seconds = _timed(lambda: _python_pipeline(records))
+    table, load_seconds = _timed(lambda: ColumnTable.from_records(records))
+    result, pipeline_seconds = _timed(lambda: run_pipeline(table, PIPELINE))
+    actual = result.to_records()
+    agree = [r['city'] for r in actual] == [r['city'] for r in expected] and all(
+        a['orders'] == e['orders'] and abs(a['revenue'] - e['revenue']) < 1e-6 * e['revenue']
+        for a, e in zip(actual, expected))
+
+    ndjson = '\n'.join(json.dumps(record) for record in records)
+    _, ndjson_seconds = _timed(lambda: ColumnTable.from_ndjson(io.StringIO(ndjson)))
+    csv_text = 'id,city,amount,status,quantity\n' + '\n'.join(
+        f"{r['id']},{r['city']},{r['amount']},{r['status']},{r['quantity']}" for r in records)
+    _, csv_seconds = _timed(lambda: ColumnTable.from_csv(io.StringIO(csv_text, newline='')))
+
+    processor = DataProcessor()
+    conditions = {'city': 'Rome', 'status': 'paid'}
+
+    step = {'conditions': conditions}
+
+    looped, loop_seconds = _timed(lambda: processor.filter_data(records, conditions))
+    columnar, columnar_filter_seconds = _timed(
+        lambda: [records[index] for index in matching_indices(records, step)])
+    _, table_filter_seconds = _timed(lambda: table.take(filter_mask(table, step)))
+    agree = agree and looped == columnar
+
+    return {
+        'rows': rows,
+        'python_pipeline_s': python_seconds,
+        'columnar_load_s': load_seconds,
+        'columnar_pipeline_s': pipeline_seconds,
+        'ndjson_load_s': ndjson_seconds,
+        'csv_load_s': csv_seconds,
+        'loop_filter_s': loop_seconds,
+        'columnar_filter_s': columnar_filter_seconds,
+        'table_filter_s': table_filter_seconds,
+        'agree': agree,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE data engine benchmark')
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    result = run(args.rows)
+    print(f"rows:                      {result['rows']}")
+    print(f"python loop pipeline:      {result['python_pipeline_s']:.3f} s")
+    print(f"columnar pipeline:         {result['columnar_pipeline_s']:.3f} s "
+          f"(+{result['columnar_load_s']:.3f} s to load from dicts)")
+    print(f"load from NDJSON:          {result['ndjson_load_s']:.3f} s")
+    print(f"load from CSV:             {result['csv_load_s']:.3f} s")
+    print(f"filter_data:               {result['loop_filter_s']:.3f} s")
+    print(f"columnar filter (dicts):   {result['columnar_filter_s']:.3f} s")
+    print(f"columnar filter (table):   {result['table_filter_s']:.3f} s")
+    print(f"results agree:             {result['agree']}")
+    sys.exit(0 if result['agree'] else 1)
+
+
+if __name__ == '__main__':
+    main()
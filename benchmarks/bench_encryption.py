@@ -0,0 +1,94 @@
+"""
+AVA CORE Encryption Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Compares the per-value Fernet path (encrypt_data/decrypt_data) with the framed
+AES-GCM streaming path and the batch row APIs, and measures KDF cache savings.
+
+Usage: python benchmarks/bench_encryption.py [--mb 64] [--rows 20000]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _mb_per_sec(size, seconds):
+    return (size / (1024 * 1024)) / seconds if seconds else float('inf')
+
+
+def run(mb=64, rows=20000, chunk_size=64 * 1024):
+    # SecurityManager writes its key file to the working directory
+    workdir = tempfile.mkdtemp(prefix='ava_bench_')
+    os.chdir(workdir)
+
+    from security_manager import SecurityManager
+
+    manager = SecurityManager()
+    payload = os.urandom(mb * 1024 * 1024)
+    results = {}
+
+    # Fernet path: the buffer has to be processed in chunks via encrypt_data
+    pieces = [payload[i:i + chunk_size].hex() for i in range(0, len(payload), chunk_size)]
+    tokens, seconds = _timed(lambda: [manager.encrypt_data(p) for p in pieces])
+    results['fernet_encrypt_mb_s'] = _mb_per_sec(len(payload), seconds)
+    _, seconds = _timed(lambda: [manager.decrypt_data(t) for t in tokens])
+    results['fernet_decrypt_mb_s'] = _mb_per_sec(len(payload), seconds)
+
+    sealed, seconds = _timed(manager.encrypt_buffer, payload, chunk_size)
+    results['stream_encrypt_mb_s'] = _mb_per_sec(len(payload), seconds)
+    plain, seconds = _timed(manager.decrypt_buffer, sealed)
+    results['stream_decrypt_mb_s'] = _mb_per_sec(len(payload), seconds)
+    assert plain == payload
+
+    source = os.path.join(workdir, 'payload.bin')
+    with open(source, 'wb') as f:
+        f.write(payload)
+    _, seconds = _timed(manager.encrypt_file, source, source + '.enc', chunk_size)
+    results['file_encrypt_mb_s'] = _mb_per_sec(len(payload), seconds)
+    _, seconds = _timed(manager.decrypt_file, source + '.enc', source + '.out')
+    results['file_decrypt_mb_s'] = _mb_per_sec(len(payload), seconds)
+
+    row_set = [{'id': i, 'speaker': 'user', 'message': f'message number {i}'} for i in range(rows)]
+    _, seconds = _timed(lambda: [manager.encrypt_data(r) for r in row_set])
+    results['fernet_rows_per_s'] = rows / seconds
+    batch, seconds = _timed(manager.encrypt_batch, row_set)
+    results['batch_encrypt_rows_per_s'] = rows / seconds
+    _, seconds = _timed(manager.decrypt_batch, batch)
+    results['batch_decrypt_rows_per_s'] = rows / seconds
+
+    manager.clear_key_cache()
+    _, cold = _timed(manager.derive_password_key, b'benchmark', b'ava_core_salt_2024', 100000)
+    _, warm = _timed(manager.derive_password_key, b'benchmark', b'ava_core_salt_2024', 100000)
+    results['kdf_cold_ms'] = cold * 1000
+    results['kdf_cached_ms'] = warm * 1000
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE encryption benchmarks')
+    parser.add_argument('--mb', type=int, default=64, help='payload size in MiB')
+    parser.add_argument('--rows', type=int, default=20000, help='row count for batch APIs')
+    parser.add_argument('--chunk-size', type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    results = run(args.mb, args.rows, args.chunk_size)
+    for name, value in results.items():
+        print(f"{name:28s} {value:12.2f}")
+
+
+if __name__ == '__main__':
+    main()
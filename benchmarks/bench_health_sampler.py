@@ -0,0 +1,90 @@
+"""
+AVA CORE Health Sampler Benchmark
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Compares one health check done with direct psutil calls (the sweep the
+monitoring endpoints used to run on every request) with reading the latest
+sample and a window from health_sampler. Then runs the sampler at a short
+interval for a few seconds and reports per-probe cost and the sampler
+thread's CPU overhead. Exits non-zero when the ring does not hold the
+expected number of samples.
+
+Usage: python benchmarks/bench_health_sampler.py [--reads 2000] [--interval 0.1] [--seconds 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _direct_sweep():
+    connections = psutil.net_connections()
+    processes = [proc.info for proc in psutil.process_iter(['pid', 'name', 'cmdline'])]
+    return {
+        'cpu_percent': psutil.cpu_percent(),
+        'memory_percent': psutil.virtual_memory().percent,
+        'disk_percent': psutil.disk_usage('/').percent,
+        'process_count': len(processes),
+        'network_connections': len(connections),
+    }
+
+
+def _per_call_us(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def run(reads, interval, seconds):
+    from health_sampler import HealthSampler
+
+    sweep_calls = max(1, reads // 100)
+    sweep_us = _per_call_us(_direct_sweep, sweep_calls)
+
+    sampler = HealthSampler(interval=interval, capacity=max(16, int(seconds / interval) * 2))
+    sampler.start()
+    time.sleep(seconds)
+    latest_us = _per_call_us(sampler.latest, reads)
+    window_us = _per_call_us(lambda: sampler.window(60), reads)
+    sampler.stop()
+
+    status = sampler.get_sampler_status()
+    expected = int(seconds / interval)
+    return {
+        'sweep_us': sweep_us,
+        'latest_us': latest_us,
+        'window_us': window_us,
+        'samples': status['samples'],
+        'expected_samples': expected,
+        'overhead_percent': status['overhead_percent'],
+        'probes': status['probes'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE health sampler benchmark')
+    parser.add_argument('--reads', type=int, default=2000)
+    parser.add_argument('--interval', type=float, default=0.1)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    result = run(args.reads, args.interval, args.seconds)
+    print(f"direct psutil sweep:   {result['sweep_us']:.0f} us/call")
+    print(f"sampler latest():      {result['latest_us']:.1f} us/call")
+    print(f"sampler window(60):    {result['window_us']:.1f} us/call")
+    print(f"samples taken:         {result['samples']} (expected ~{result['expected_samples']})")
+    print(f"sampler overhead:      {result['overhead_percent']}% of one CPU at {args.interval}s interval")
+    for name, probe in result['probes'].items():
+        print(f"  {name:<12} every {probe['every_seconds']:.1f}s  avg {probe['avg_ms']} ms  calls {probe['calls']}")
+    ok = result['samples'] >= result['expected_samples'] * 0.8
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
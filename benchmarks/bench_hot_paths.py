@@ -0,0 +1,304 @@
+"""
+AVA CORE Hot Path Micro-Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Times the in-process functions that sit on every chat and API request: intent
+analysis, NLP processing, chat session bookkeeping, autonomous memory,
+importance scoring, record filtering, encryption and session validation.
+
+Every benchmark runs at three scales over datasets generated from a fixed seed,
+so two runs on the same machine see identical inputs. Each measurement is
+calibrated to a minimum run time, repeated, and reported per call as
+mean/median/stdev/min in microseconds.
+
+Usage: python benchmarks/bench_hot_paths.py [--scales small medium large]
+       [--only analyze_intent ...] [--runs 7] [--min-time 0.1]
+       [--output run.json] [--baseline base.json] [--save-baseline base.json]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import logging
+import platform
+import argparse
+import statistics
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCALES = ('small', 'medium', 'large')
+
+# Words per message for the text benchmarks
+TEXT_WORDS = {'small': 12, 'medium': 120, 'large': 1200}
+
+# Rows held by the store behind the stateful benchmarks
+STORE_ROWS = {'small': 100, 'medium': 1000, 'large': 10000}
+
+# Records scanned per filter_data call
+FILTER_ROWS = {'small': 1000, 'medium': 10000, 'large': 50000}
+
+# Distinct inputs cycled through by each measurement
+INPUT_POOL = 64
+
+VOCABULARY = [
+    'open', 'start', 'search', 'for', 'help', 'me', 'with', 'what', 'is', 'how', 'can', 'i',
+    'explain', 'recommend', 'the', 'a', 'project', 'deadline', 'meeting', 'urgent', 'revenue',
+    'growth', 'solar', 'sensor', 'cloud', 'server', 'database', 'build', 'optimize', 'analyze',
+    'good', 'great', 'problem', 'error', 'please', 'report', 'browser', 'file', 'folder',
+    'tomorrow', 'team', 'customer', 'schedule', 'remember', 'important', 'today', 'plan',
+]
+
+OPENERS = [
+    'open', 'what is', 'how can i', 'help me with', 'tell me about', 'hello', 'search for',
+    'recommend', 'explain', 'remember',
+]
+
+
+def make_messages(rng, words, count=INPUT_POOL):
+    """Sentences of roughly `words` words, spread across the intent openers"""
+    messages = []
+    for index in range(count):
+        body = ' '.join(rng.choice(VOCABULARY) for _ in range(max(words - 2, 1)))
+        ending = '?' if index % 3 == 0 else '.'
+        messages.append(f"{OPENERS[index % len(OPENERS)]} {body}{ending}")
+    return messages
+
+
+def make_records(rng, rows):
+    regions = ['eu', 'us', 'apac', 'latam']
+    statuses = ['active', 'paused', 'closed']
+    return [{'id': index, 'region': rng.choice(regions), 'status': rng.choice(statuses),
+             'score': rng.randint(0, 100)} for index in range(rows)]
+
+
+def measure(func, inputs, runs, min_time, max_loops=1 << 20):
+    """pyperf-style timing: calibrate loops to min_time, warm up once, then repeat"""
+    count = len(inputs)
+
+    def timed(loops):
+        start = time.perf_counter()
+        for index in range(loops):
+            func(inputs[index % count])
+        return time.perf_counter() - start
+
+    loops = 1
+    while loops < max_loops:
+        if timed(loops) >= min_time:
+            break
+        loops *= 2
+    timed(loops)
+    per_call = [timed(loops) / loops * 1e6 for _ in range(runs)]
+    return {
+        'loops': loops,
+        'runs': runs,
+        'mean_us': round(statistics.fmean(per_call), 3),
+        'median_us': round(statistics.median(per_call), 3),
+        'stdev_us': round(statistics.stdev(per_call), 3) if runs > 1 else 0.0,
+        'min_us': round(min(per_call), 3),
+    }
+
+
+# Each setup returns (callable taking one input, list of inputs, parameters for the report).
+# Setups run with the working directory set to a fresh scratch directory.
+
+def setup_analyze_intent(rng, scale):
+    from advanced_ai import AdvancedAI
+    ai = AdvancedAI()
+    words = TEXT_WORDS[scale]
+    return ai.analyze_intent, make_messages(rng, words), {'words': words}
+
+
+def setup_process_natural_language(rng, scale):
+    from voice_assistant import NaturalLanguageProcessor
+    nlp = NaturalLanguageProcessor()
+    words = TEXT_WORDS[scale]
+    return nlp.process_natural_language, make_messages(rng, words), {'words': words}
+
+
+def setup_chat_add_message(rng, scale):
+    from chat_manager import ChatSession
+    session = ChatSession('bench-session', 'bench-user')
+    history = STORE_ROWS[scale]
+    for message in make_messages(rng, 12, history):
+        session.add_message('User', message)
+    inputs = make_messages(rng, 12)
+    return (lambda message: session.add_message('User', message)), inputs, {'history_messages': history}
+
+
+def setup_remember_interaction(rng, scale):
+    engine, pairs = _memory_engine(rng, STORE_ROWS[scale])
+    # Inputs repeat stored pairs, so the table size stays fixed while measuring
+    inputs = rng.sample(pairs, INPUT_POOL)
+    return (lambda pair: engine.remember_interaction(*pair)), inputs, {'stored_associations': len(pairs)}
+
+
+def setup_recall_memory(rng, scale):
+    engine, pairs = _memory_engine(rng, STORE_ROWS[scale])
+    inputs = [trigger for trigger, _ in rng.sample(pairs, INPUT_POOL // 2)]
+    inputs += [f"unknown trigger {index}" for index in range(INPUT_POOL // 2)]
+    return engine.recall_memory, inputs, {'stored_associations': len(pairs)}
+
+
+def _memory_engine(rng, rows):
+    from autonomous_thinking import AutonomousThinkingEngine
+    engine = AutonomousThinkingEngine()
+    triggers = make_messages(rng, 6, rows)
+    pairs = [(trigger, f"response {index}") for index, trigger in enumerate(triggers)]
+    conn = sqlite3.connect(engine.memory_db)
+    conn.executemany('INSERT INTO memory_associations (trigger, response, context_tags, usage_count) '
+                     'VALUES (?, ?, ?, 1)', [(trigger, response, 'bench') for trigger, response in pairs])
+    conn.commit()
+    conn.close()
+    return engine, pairs
+
+
+def setup_calculate_importance(rng, scale):
+    from self_management import PersistentMemory
+    memory = PersistentMemory('bench-user')
+    words = TEXT_WORDS[scale]
+    return memory.calculate_importance, make_messages(rng, words), {'words': words}
+
+
+def setup_filter_data(rng, scale):
+    from advanced_capabilities import DataProcessor
+    processor = DataProcessor()
+    rows = FILTER_ROWS[scale]
+    records = make_records(rng, rows)
+    conditions = [{'region': 'eu'}, {'region': 'us', 'status': 'active'}, {'status': 'closed'},
+                  {'region': 'apac', 'status': 'paused'}]
+    return (lambda condition: processor.filter_data(records, condition)), conditions, {'rows': rows}
+
+
+def setup_encrypt_data(rng, scale):
+    manager = _security_manager()
+    words = TEXT_WORDS[scale]
+    inputs = make_messages(rng, words)
+    # Half the inputs are dict payloads, as stored by the memory and chat paths
+    inputs = [{'speaker': 'user', 'message': text} if index % 2 else text for index, text in enumerate(inputs)]
+    return manager.encrypt_data, inputs, {'words': words}
+
+
+def setup_validate_session(rng, scale):
+    manager = _security_manager()
+    sessions = STORE_ROWS[scale]
+    tokens = [manager._create_session(f"user{index}") for index in range(sessions)]
+    inputs = rng.sample(tokens, INPUT_POOL // 2) + ['invalid.token.value'] * (INPUT_POOL // 8)
+    rng.shuffle(inputs)
+    return manager.validate_session, inputs, {'active_sessions': sessions}
+
+
+def _security_manager():
+    from security_manager import SecurityManager
+    return SecurityManager()
+
+
+BENCHMARKS = {
+    'analyze_intent': setup_analyze_intent,
+    'process_natural_language': setup_process_natural_language,
+    'chat_add_message': setup_chat_add_message,
+    'remember_interaction': setup_remember_interaction,
+    'recall_memory': setup_recall_memory,
+    'calculate_importance': setup_calculate_importance,
+    'filter_data': setup_filter_data,
+    'encrypt_data': setup_encrypt_data,
+    'validate_session': setup_validate_session,
+}
+
+
+def run(names, scales, runs=7, min_time=0.1, seed=1):
+    # Several of these classes create databases and key files in the working directory
+    workdir = tempfile.mkdtemp(prefix='ava_hot_')
+    result = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+        'settings': {'runs': runs, 'min_time': min_time, 'seed': seed},
+        'benchmarks': {},
+    }
+    for name in names:
+        result['benchmarks'][name] = {}
+        for scale in scales:
+            scratch = os.path.join(workdir, f"{name}-{scale}")
+            os.makedirs(scratch)
+            os.chdir(scratch)
+            try:
+                func, inputs, params = BENCHMARKS[name](random.Random(f"{seed}:{name}:{scale}"), scale)
+                stats = measure(func, inputs, runs, min_time)
+                stats['params'] = params
+            except Exception as e:
+                stats = {'error': f"{type(e).__name__}: {e}"}
+            result['benchmarks'][name][scale] = stats
+    return result
+
+
+def compare(result, baseline, threshold, floor_us=0.5):
+    """Regressions of result against baseline, as readable strings"""
+    regressions = []
+    for name, scales in result['benchmarks'].items():
+        for scale, current in scales.items():
+            previous = baseline.get('benchmarks', {}).get(name, {}).get(scale)
+            if not previous or 'error' in current or 'error' in previous:
+                continue
+            # Medians resist the occasional preempted run; the floor ignores timer noise
+            old, new = previous['median_us'], current['median_us']
+            if new > old * (1 + threshold) and new - old > floor_us:
+                regressions.append(f"{name} [{scale}]: median {old} -> {new} us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE hot path micro-benchmarks')
+    parser.add_argument('--only', nargs='*', help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--scales', nargs='*', default=list(SCALES), help='dataset scales to run')
+    parser.add_argument('--runs', type=int, default=7, help='timed repetitions per measurement')
+    parser.add_argument('--min-time', type=float, default=0.1, help='minimum seconds per repetition')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write this run as JSON')
+    parser.add_argument('--baseline', help='compare against a stored run')
+    parser.add_argument('--save-baseline', help='store this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.15, help='allowed relative regression')
+    args = parser.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    unknown = set(args.scales) - set(SCALES)
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(sorted(unknown))}")
+    output_paths = [os.path.abspath(path) for path in (args.output, args.save_baseline) if path]
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    # Keep module warnings (missing API keys, voice libraries) out of the report
+    logging.disable(logging.WARNING)
+    result = run(names, args.scales, args.runs, args.min_time, args.seed)
+
+    for name, scales in result['benchmarks'].items():
+        for scale, stats in scales.items():
+            if 'error' in stats:
+                print(f"{name:<26} {scale:<7} failed: {stats['error']}")
+                continue
+            print(f"{name:<26} {scale:<7} median={stats['median_us']:>12.3f} us  "
+                  f"stdev={stats['stdev_us']:>10.3f}  min={stats['min_us']:>12.3f}  loops={stats['loops']}")
+
+    for path in output_paths:
+        with open(path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    regressions = []
+    if baseline_path:
+        with open(baseline_path) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        print(f"regressions vs {args.baseline}: {len(regressions)}")
+        for line in regressions:
+            print(f"  {line}")
+    failed = any('error' in stats for scales in result['benchmarks'].values() for stats in scales.values())
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == '__main__':
+    main()
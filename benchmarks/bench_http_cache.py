@@ -0,0 +1,135 @@
+"""
+AVA CORE HTTP Cache Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Serves three kinds of resource from a local HTTP server with a fixed
+response latency and body size: one fresh for a minute (max-age), one that
+must be revalidated on every use (no-cache with an ETag), and one with only
+Last-Modified. Compares repeated fetches through a plain requests session
+with the caching session, reporting latency, round trips to the origin
+and body bytes saved.
+
+Usage: python benchmarks/bench_http_cache.py [--requests 200] [--size 200000] [--latency 0.005]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LAST_MODIFIED = 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+
+def make_handler(size, latency):
+    body = (b'0123456789abcdef' * (size // 16 + 1))[:size]
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        full_responses = 0
+        not_modified = 0
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            if self.path == '/fresh':
+                headers = {'Cache-Control': 'max-age=60', 'ETag': '"fresh-1"'}
+            elif self.path == '/revalidate':
+                headers = {'Cache-Control': 'no-cache', 'ETag': '"reval-1"'}
+            else:
+                headers = {'Last-Modified': LAST_MODIFIED, 'Cache-Control': 'max-age=0'}
+
+            if (('ETag' in headers and self.headers.get('If-None-Match') == headers['ETag'])
+                    or ('Last-Modified' in headers and self.headers.get('If-Modified-Since') == LAST_MODIFIED)):
+                FixtureHandler.not_modified += 1
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+
+            FixtureHandler.full_responses += 1
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return FixtureHandler
+
+
+def _measure(session, url, count):
+    latencies = []
+    ok = True
+    for _ in range(count):
+        start = time.perf_counter()
+        response = session.get(url, timeout=10)
+        latencies.append(time.perf_counter() - start)
+        ok = ok and response.status_code == 200 and len(response.content) > 0
+    latencies.sort()
+    return {
+        'ok': ok,
+        'requests_per_sec': count / sum(latencies),
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def run(count=200, size=200000, latency=0.005):
+    from http_cache import HTTPCache
+
+    handler = make_handler(size, latency)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+    results = {}
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = HTTPCache(directory=directory)
+            plain = requests.Session()
+            cached = cache.install(requests.Session())
+            for path in ('/fresh', '/revalidate', '/last-modified'):
+                handler.full_responses = handler.not_modified = 0
+                results[f'plain {path}'] = _measure(plain, base + path, count)
+                results[f'plain {path}']['origin'] = f'{handler.full_responses} full'
+
+                handler.full_responses = handler.not_modified = 0
+                results[f'cached {path}'] = _measure(cached, base + path, count)
+                results[f'cached {path}']['origin'] = f'{handler.full_responses} full/{handler.not_modified} 304'
+            results['status'] = cache.get_cache_status()
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE HTTP cache benchmark')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--latency', type=float, default=0.005)
+    args = parser.parse_args()
+
+    results = run(args.requests, args.size, args.latency)
+    status = results.pop('status')
+    print(f"{'path':26s} {'req/s':>9} {'p50_ms':>8} {'p99_ms':>8} {'origin':>14} {'ok':>5}")
+    for name, row in results.items():
+        print(f"{name:26s} {row['requests_per_sec']:>9.1f} {row['p50_ms']:>8.2f} "
+              f"{row['p99_ms']:>8.2f} {row['origin']:>14} {str(row['ok']):>5}")
+    stats = status['stats']
+    print(f"hit rate {status['hit_rate']}, {stats['hits']} hits, {stats['revalidated']} revalidated, "
+          f"{stats['bytes_saved']} bytes saved, {status['stored_bytes']} bytes stored")
+    sys.exit(0 if all(row['ok'] for row in results.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
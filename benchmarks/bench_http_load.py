@@ -0,0 +1,504 @@
+"""
+AVA CORE HTTP Load Benchmark
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Boots production_ava, app and standalone_ava as separate server processes
+against a fake local LLM and HTTP provider, then drives a weighted mix of
+their API endpoints plus Socket.IO round trips at a fixed concurrency.
+Reports throughput, p50/p95/p99 latency per endpoint and the server's RSS.
+Runs are reproducible for a given --seed: every worker draws its requests
+from its own seeded generator, and the fake provider answers with fixed
+bodies after a fixed delay. Servers build their components on first use, so
+every endpoint (and the Socket.IO connection) is primed until it answers
+before the warm-up and measured window start; the cold start times are
+reported separately. Errors are counted per kind (connect, read, write,
+status) so a slow read is not mistaken for a refused connection.
+
+--save-baseline stores a run as JSON; --baseline compares a run against a
+stored one and exits non-zero when throughput, p95/p99 latency or peak RSS
+regress by more than --threshold.
+
+Usage: python benchmarks/bench_http_load.py [production_ava app standalone_ava]
+           [--concurrency 8] [--duration 20] [--baseline FILE] [--save-baseline FILE]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import platform
+from collections import Counter
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TARGETS = ('production_ava', 'app', 'standalone_ava')
+
+# (weight, name, method, path, json body)
+MIXES = {
+    'production_ava': [
+        (30, 'chat', 'POST', '/api/chat', {'message': 'Summarise the status of my projects'}),
+        (20, 'tasks_list', 'GET', '/api/tasks', None),
+        (10, 'tasks_create', 'POST', '/api/tasks/create', {'title': 'Benchmark task', 'description': 'load', 'priority': 2}),
+        (20, 'autonomous_recall', 'POST', '/api/autonomous/recall', {'trigger': 'nlp_input_schedule a meeting'}),
+        (20, 'nlp_process', 'POST', '/api/nlp/process', {'text': 'Schedule a meeting with the team tomorrow at 10', 'context': 'calendar'}),
+    ],
+    'app': [
+        (40, 'chat', 'POST', '/api/chat', {'message': 'What can you help me with today?'}),
+        (20, 'status', 'GET', '/api/status', None),
+        (20, 'conversation', 'GET', '/api/conversation', None),
+        (20, 'memory_history', 'GET', '/api/self-management/memory/history', None),
+    ],
+    'standalone_ava': [
+        (30, 'chat', 'POST', '/api/chat', {'message': 'Summarise the status of my projects'}),
+        (20, 'tasks_list', 'GET', '/api/tasks', None),
+        (20, 'autonomous_recall', 'POST', '/api/autonomous/recall', {'trigger': 'schedule'}),
+        (20, 'nlp_process', 'POST', '/api/nlp/process', {'text': 'Schedule a meeting tomorrow'}),
+        (10, 'status', 'GET', '/api/status', None),
+    ],
+}
+
+# Socket.IO path and an (event, payload, reply event) round trip, if the server has one
+SOCKETIO = {
+    'production_ava': {'path': 'socket.io', 'round_trip': ('job_subscribe', {'job_id': 'missing'}, 'job_error')},
+    'app': {'path': 'ws', 'round_trip': None},
+    'standalone_ava': None,
+}
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    """OpenAI- and Anthropic-shaped completions plus a static page for everything else"""
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.05
+
+    def _reply(self, status, body, content_type='application/json'):
+        data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        time.sleep(self.latency)
+        model = request.get('model', 'fake')
+        if self.path.endswith('/chat/completions'):
+            self._reply(200, {
+                'id': 'chatcmpl-bench', 'object': 'chat.completion', 'created': 0, 'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': 'Benchmark reply from the fake provider.'}}],
+                'usage': {'prompt_tokens': 42, 'completion_tokens': 8, 'total_tokens': 50}
+            })
+        elif self.path.endswith('/messages'):
+            self._reply(200, {
+                'id': 'msg_bench', 'type': 'message', 'role': 'assistant', 'model': model,
+                'content': [{'type': 'text', 'text': 'Benchmark reply from the fake provider.'}],
+                'stop_reason': 'end_turn', 'stop_sequence': None,
+                'usage': {'input_tokens': 42, 'output_tokens': 8}
+            })
+        else:
+            self._reply(404, {'error': 'unknown endpoint'})
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self._reply(200, '<html><head><title>Fake page</title></head><body><p>Benchmark content</p></body></html>',
+                    'text/html')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_provider(latency: float):
+    handler = type('Handler', (FakeProviderHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def serve(target: str, port: int):
+    """Run one target server in this process (the harness starts it as a subprocess)"""
+    if target == 'standalone_ava':
+        import standalone_ava
+        standalone_ava.AVAProductionHandler.log_message = lambda *args: None
+        standalone_ava.ThreadedHTTPServer(('127.0.0.1', port), standalone_ava.AVAProductionHandler).serve_forever()
+    else:
+        import importlib
+        module = importlib.import_module(target)
+        module.socketio.run(module.app, host='127.0.0.1', port=port, debug=False,
+                            allow_unsafe_werkzeug=True, log_output=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def boot(target: str, provider_port: int, workdir: str, timeout: float = 180.0):
+    """Start a target server; returns (process, base_url) once it answers"""
+    port = _free_port()
+    provider = f'http://127.0.0.1:{provider_port}'
+    env = dict(os.environ,
+               PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''),
+               OPENAI_API_KEY='bench', OPENAI_BASE_URL=f'{provider}/v1',
+               ANTHROPIC_API_KEY='bench', ANTHROPIC_BASE_URL=provider,
+               NO_PROXY='127.0.0.1,localhost', AVA_WARMUP='0')
+    log = open(os.path.join(workdir, f'{target}.log'), 'wb')
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', target, '--port', str(port)],
+                               cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{target} exited with {process.returncode}; see {log.name}")
+        try:
+            requests.get(base_url + '/api/status', timeout=2)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.25)
+    process.kill()
+    raise RuntimeError(f"{target} did not start within {timeout:.0f}s; see {log.name}")
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+
+def summarize(latencies, errors):
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': sum(errors.values()),
+        'error_kinds': dict(errors),
+        'mean_ms': round(sum(ordered) * 1000 / len(ordered), 3) if ordered else None,
+        'p50_ms': _percentile(ordered, 0.50),
+        'p95_ms': _percentile(ordered, 0.95),
+        'p99_ms': _percentile(ordered, 0.99),
+    }
+
+
+def _request_error_kind(error):
+    if isinstance(error, (requests.exceptions.ConnectTimeout, requests.exceptions.InvalidURL)):
+        return 'connect'
+    if isinstance(error, (requests.exceptions.ReadTimeout, requests.exceptions.ChunkedEncodingError,
+                          requests.exceptions.ContentDecodingError)):
+        return 'read'
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # Refused before a byte was sent, or reset while the request was in flight
+        return 'connect' if 'refused' in str(error).lower() else 'connection'
+    return 'request'
+
+
+def prime_http(base_url, mix, timeout=180.0):
+    """Call every endpoint once so lazily built components exist before measuring
+
+    Returns the seconds each endpoint took to answer for the first time.
+    """
+    cold = {}
+    session = requests.Session()
+    for _, name, method, path, body in mix:
+        began = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                session.request(method, base_url + path, json=body, timeout=timeout)
+                break
+            except requests.RequestException:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"{name} did not answer within {timeout:.0f}s")
+                time.sleep(0.25)
+        cold[name] = round((time.perf_counter() - began) * 1000, 3)
+    return cold
+
+
+def drive_http(base_url, mix, concurrency, duration, warmup, seed):
+    """Closed-loop workers issuing the weighted mix; returns latencies and errors per endpoint"""
+    names = [name for _, name, _, _, _ in mix]
+    weights = [weight for weight, _, _, _, _ in mix]
+    results = {name: ([], Counter()) for name in names}
+    lock = threading.Lock()
+    start = time.monotonic()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        local = {name: ([], Counter()) for name in names}
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            _, name, method, path, body = rng.choices(mix, weights)[0]
+            began = time.perf_counter()
+            error = None
+            try:
+                response = session.request(method, base_url + path, json=body, timeout=60)
+                if response.status_code >= 400:
+                    error = 'status'
+            except requests.RequestException as e:
+                error = _request_error_kind(e)
+            elapsed = time.perf_counter() - began
+            if now >= measure_from:
+                local[name][0].append(elapsed)
+                if error:
+                    local[name][1][error] += 1
+        with lock:
+            for name, (latencies, errors) in local.items():
+                results[name][0].extend(latencies)
+                results[name][1].update(errors)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def prime_socketio(base_url, config, timeout=180.0):
+    """Connect once, retrying until the Socket.IO endpoint accepts; returns milliseconds"""
+    import socketio
+
+    began = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socketio.SimpleClient() as client:
+                client.connect(base_url, socketio_path=config['path'], transports=['polling'], wait_timeout=30)
+            return round((time.perf_counter() - began) * 1000, 3)
+        except Exception:
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Socket.IO did not accept connections within {timeout:.0f}s")
+            time.sleep(0.25)
+
+
+def drive_socketio(base_url, config, clients, duration, warmup):
+    """Connect/round-trip loops per client; returns latencies and errors per operation"""
+    import socketio
+
+    results = {'socketio_connect': ([], Counter()), 'socketio_round_trip': ([], Counter())}
+    lock = threading.Lock()
+    measure_from = time.monotonic() + warmup
+    stop_at = measure_from + duration
+
+    def client_loop():
+        local = {name: ([], Counter()) for name in results}
+        while time.monotonic() < stop_at:
+            began = time.perf_counter()
+            # Which operation is in progress, so a failure is charged to it
+            operation, kind = 'socketio_connect', 'connect'
+            try:
+                with socketio.SimpleClient() as client:
+                    client.connect(base_url, socketio_path=config['path'], transports=['polling'], wait_timeout=5)
+                    kind = 'read'
+                    client.receive(timeout=5)
+                    if time.monotonic() >= measure_from:
+                        local['socketio_connect'][0].append(time.perf_counter() - began)
+                    if config['round_trip']:
+                        event, payload, reply = config['round_trip']
+                        operation = 'socketio_round_trip'
+                        for _ in range(10):
+                            if time.monotonic() >= stop_at:
+                                break
+                            sent = time.perf_counter()
+                            kind = 'write'
+                            client.emit(event, payload)
+                            kind = 'read'
+                            while client.receive(timeout=5)[0] != reply:
+                                pass
+                            if time.monotonic() >= measure_from:
+                                local['socketio_round_trip'][0].append(time.perf_counter() - sent)
+            except Exception:
+                # Failures count when they surface, however long the attempt took
+                if time.monotonic() >= measure_from:
+                    local[operation][1][kind] += 1
+        with lock:
+            for name, (latencies, errors) in local.items():
+                results[name][0].extend(latencies)
+                results[name][1].update(errors)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {name: (latencies, errors) for name, (latencies, errors) in results.items() if latencies or errors}
+
+
+def run_target(target, args, provider_port, workdir):
+    process, base_url = boot(target, provider_port, workdir)
+    server = psutil.Process(process.pid)
+    rss = []
+    stop = threading.Event()
+
+    def sample_rss():
+        while not stop.is_set():
+            try:
+                rss.append(server.memory_info().rss)
+            except psutil.Error:
+                break
+            stop.wait(0.5)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    try:
+        # Measure from readiness: every endpoint has answered once
+        config = SOCKETIO.get(target)
+        cold_start = prime_http(base_url, MIXES[target])
+        if config and args.socketio_clients:
+            cold_start['socketio_connect'] = prime_socketio(base_url, config)
+        socket_results = {}
+        socket_thread = None
+        if config and args.socketio_clients:
+            def run_socketio():
+                socket_results.update(drive_socketio(base_url, config, args.socketio_clients,
+                                                     args.duration, args.warmup))
+            socket_thread = threading.Thread(target=run_socketio)
+            socket_thread.start()
+        http_results = drive_http(base_url, MIXES[target], args.concurrency, args.duration, args.warmup, args.seed)
+        if socket_thread is not None:
+            socket_thread.join()
+    finally:
+        stop.set()
+        sampler.join()
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    endpoints = {name: summarize(latencies, errors) for name, (latencies, errors) in
+                 list(http_results.items()) + list(socket_results.items())}
+    total = sum(len(latencies) for latencies, _ in http_results.values())
+    return {
+        'throughput_rps': round(total / args.duration, 2),
+        'requests': total,
+        'errors': sum(sum(errors.values()) for _, errors in list(http_results.values()) + list(socket_results.values())),
+        'cold_start_ms': cold_start,
+        'rss_start_mb': round(rss[0] / 2 ** 20, 1) if rss else None,
+        'rss_peak_mb': round(max(rss) / 2 ** 20, 1) if rss else None,
+        'endpoints': endpoints,
+    }
+
+
+def compare(result, baseline, threshold, floor_ms=1.0):
+    """Regressions of result against baseline, as readable strings"""
+    regressions = []
+    for target, current in result['targets'].items():
+        previous = baseline.get('targets', {}).get(target)
+        if not previous or 'error' in current or 'error' in previous:
+            continue
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - threshold):
+            regressions.append(f"{target}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} rps")
+        if previous.get('rss_peak_mb') and current.get('rss_peak_mb') and \
+                current['rss_peak_mb'] > previous['rss_peak_mb'] * (1 + threshold):
+            regressions.append(f"{target}: peak RSS {previous['rss_peak_mb']} -> {current['rss_peak_mb']} MB")
+        for name, stats in current['endpoints'].items():
+            before = previous['endpoints'].get(name)
+            if not before:
+                continue
+            for key in ('p95_ms', 'p99_ms'):
+                old, new = before.get(key), stats.get(key)
+                # Sub-millisecond differences are scheduler noise, not regressions
+                if old is not None and new is not None and new > old * (1 + threshold) and new - old > floor_ms:
+                    regressions.append(f"{target} {name}: {key} {old} -> {new}")
+    return regressions
+
+
+def run(args):
+    provider, provider_port = start_fake_provider(args.llm_latency_ms / 1000)
+    workdir = tempfile.mkdtemp(prefix='ava_load_')
+    result = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+        'settings': {'concurrency': args.concurrency, 'duration': args.duration, 'warmup': args.warmup,
+                     'socketio_clients': args.socketio_clients, 'llm_latency_ms': args.llm_latency_ms,
+                     'seed': args.seed},
+        'targets': {},
+    }
+    try:
+        for target in args.targets:
+            try:
+                result['targets'][target] = run_target(target, args, provider_port, workdir)
+            except RuntimeError as e:
+                result['targets'][target] = {'error': str(e)}
+    finally:
+        provider.shutdown()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE HTTP load benchmark')
+    parser.add_argument('targets', nargs='*', help=f"servers to load (default: {' '.join(TARGETS)})")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20.0, help='measured seconds per target')
+    parser.add_argument('--warmup', type=float, default=3.0, help='unmeasured seconds before measuring')
+    parser.add_argument('--socketio-clients', type=int, default=2)
+    parser.add_argument('--llm-latency-ms', type=float, default=50.0, help='fake provider response delay')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write this run as JSON')
+    parser.add_argument('--baseline', help='compare against a stored run')
+    parser.add_argument('--save-baseline', help='store this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative regression')
+    parser.add_argument('--serve', choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    args.targets = args.targets or list(TARGETS)
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    result = run(args)
+    for target, stats in result['targets'].items():
+        if 'error' in stats:
+            print(f"{target}: failed to run: {stats['error']}")
+            continue
+        print(f"{target}: {stats['throughput_rps']} rps, {stats['requests']} requests, "
+              f"{stats['errors']} errors, RSS {stats['rss_start_mb']} -> {stats['rss_peak_mb']} MB")
+        for name, endpoint in stats['endpoints'].items():
+            kinds = ', '.join(f'{kind}={count}' for kind, count in sorted(endpoint['error_kinds'].items()))
+            print(f"  {name:<20} n={endpoint['requests']:<6} err={endpoint['errors']:<4} "
+                  f"p50={endpoint['p50_ms']} p95={endpoint['p95_ms']} p99={endpoint['p99_ms']} ms"
+                  + (f" ({kinds})" if kinds else ''))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(result, f, indent=2)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        print(f"regressions vs {args.baseline}: {len(regressions)}")
+        for line in regressions:
+            print(f"  {line}")
+    failed = any('error' in stats for stats in result['targets'].values())
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+AVA CORE NDA Wrapper Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Measures the per-call overhead added by nda_protect in microseconds, compared
+with an undecorated call and with the previous wrapper (per-call INFO log and
+string-based response type check).
+
+Usage: python benchmarks/bench_nda_protect.py [--calls 200000]
+"""
+
+import io
+import os
+import sys
+import time
+import logging
+import argparse
+import functools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _legacy_nda_protect(operation_type, license_info, log):
+    """The wrapper as it was before batching, kept for comparison"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                log.info(f"NDA protected access to {func.__name__}")
+                result = func(*args, **kwargs)
+                if hasattr(result, '__class__') and 'Response' in str(type(result)):
+                    return result
+                elif isinstance(result, dict):
+                    result.update(license_info)
+                    return result
+                elif hasattr(result, 'get_json'):
+                    return result
+                else:
+                    return result
+            except Exception as e:
+                log.error(f"NDA protection error in {func.__name__}: {e}")
+                return None
+        return wrapper
+    return decorator
+
+
+def _per_call_us(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def run(calls=200000):
+    import nda_protection
+    from nda_protection import nda_protect, NDA_LICENSE_INFO
+
+    # Production logs at INFO; format into memory so handler I/O is excluded
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+    def endpoint():
+        return {'success': True}
+
+    legacy = _legacy_nda_protect('api_calls', NDA_LICENSE_INFO, nda_protection.logger)(endpoint)
+    current = nda_protect('api_calls')(endpoint)
+
+    for func in (endpoint, legacy, current):
+        _per_call_us(func, 1000)  # warm up
+
+    baseline = _per_call_us(endpoint, calls)
+    results = {
+        'undecorated_us': baseline,
+        'legacy_wrapper_us': _per_call_us(legacy, calls),
+        'nda_protect_us': _per_call_us(current, calls),
+    }
+    results['legacy_overhead_us'] = results['legacy_wrapper_us'] - baseline
+    results['nda_protect_overhead_us'] = results['nda_protect_us'] - baseline
+
+    root.removeHandler(handler)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE nda_protect overhead benchmark')
+    parser.add_argument('--calls', type=int, default=200000)
+    args = parser.parse_args()
+
+    for name, value in run(args.calls).items():
+        print(f"{name:28s} {value:10.3f}")
+
+
+if __name__ == '__main__':
+    main()
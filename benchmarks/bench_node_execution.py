@@ -0,0 +1,115 @@
+"""
+AVA CORE Node Execution Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Compares executions/sec and latency percentiles of a cold `node` process per
+snippet (the previous path) with the persistent Node worker pool, and the
+TypeScript path with and without a warm transpile cache when a transpiler is
+available to the workers.
+
+Usage: python benchmarks/bench_node_execution.py [--jobs 200] [--concurrency 2]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SNIPPET = '''
+let total = 0;
+for (let i = 0; i < 2000; i++) { total += i * i; }
+console.log(JSON.stringify({ total }));
+'''
+
+TS_SNIPPET = '''
+interface Point { x: number; y: number }
+const points: Point[] = [{ x: 1, y: 2 }, { x: 3, y: 4 }];
+console.log(points.map((p: Point): number => p.x * p.y).join(','));
+'''
+
+
+def cold_node(code):
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
+        f.write(code)
+        temp_file = f.name
+    try:
+        result = subprocess.run([shutil.which('node') or 'node', temp_file],
+                                capture_output=True, text=True, timeout=30)
+        return result.returncode == 0
+    finally:
+        os.unlink(temp_file)
+
+
+def _measure(func, code, jobs, concurrency):
+    latencies = []
+
+    def timed(_):
+        start = time.perf_counter()
+        ok = func(code)
+        latencies.append(time.perf_counter() - start)
+        return ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ok = all(pool.map(timed, range(jobs)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'ok': ok,
+        'executions_per_sec': jobs / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def run(jobs=200, concurrency=2, workers=None):
+    from node_pool import NodeExecutionPool
+
+    pool = NodeExecutionPool(size=workers or concurrency)
+    pool.start()
+    for _ in range(pool.size * 2):
+        pool.execute('')
+
+    results = {
+        'cold_node': _measure(cold_node, SNIPPET, max(1, jobs // 4), concurrency),
+        'node_pool': _measure(lambda code: pool.execute(code)['success'], SNIPPET, jobs, concurrency),
+    }
+
+    if pool.execute(TS_SNIPPET, language='typescript')['success']:
+        # Every snippet is unique, so each run pays for a transpile
+        counter = iter(range(jobs * 2))
+        results['typescript_uncached'] = _measure(
+            lambda code: pool.execute(f"{code}// {next(counter)}\n", language='typescript')['success'],
+            TS_SNIPPET, jobs, concurrency)
+        results['typescript_cached'] = _measure(
+            lambda code: pool.execute(code, language='typescript')['success'],
+            TS_SNIPPET, jobs, concurrency)
+
+    pool.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE Node execution benchmark')
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    results = run(args.jobs, args.concurrency, args.workers)
+    print(f"{'path':20s} {'exec/s':>10} {'p50_ms':>10} {'p99_ms':>10} {'ok':>5}")
+    for name, row in results.items():
+        print(f"{name:20s} {row['executions_per_sec']:>10.1f} {row['p50_ms']:>10.2f} "
+              f"{row['p99_ms']:>10.2f} {str(row['ok']):>5}")
+    sys.exit(0 if all(row['ok'] for row in results.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+AVA CORE Page Parsing Benchmarks
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Compares the previous whole-page regex approach with the single-pass page
+parser on a generated page. The regex approach strips tags for the text,
+rescans the HTML for links and the title, and re-extracts and re-splits the
+text for every query. The parser builds the page once and answers queries
+from its sentence index. Also checks that parsing the page in small
+chunks gives the same result as parsing it whole.
+
+Usage: python benchmarks/bench_page_parsing.py [--paragraphs 5000] [--queries 20]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = ('alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'theta', 'kappa', 'lambda', 'sigma')
+
+
+def make_page(paragraphs):
+    parts = ['<html><head><title>Benchmark page</title><style>p { color: red; }</style></head><body>']
+    for i in range(paragraphs):
+        words = ' '.join(WORDS[(i + k) % len(WORDS)] for k in range(12))
+        parts.append(f'<div class="row"><p>Paragraph {i} mentions {words}. Second sentence {i}.</p>'
+                     f'<a href="/item/{i}">item {i}</a></div>')
+    parts.append('<script>var x = 1;</script></body></html>')
+    return ''.join(parts)
+
+
+def regex_approach(html, url, queries):
+    title = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
+    links = [urljoin(url, href) for href, _ in
+             re.findall(r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>([^<]*)</a>', html, re.IGNORECASE)]
+    results = []
+    for query in queries:
+        text = re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', html)).strip()
+        results.append([s.strip() for s in text.split('.') if query.lower() in s.lower()])
+    return title, links, results
+
+
+def parser_approach(html, url, queries, backend=None):
+    from page_parser import parse_html
+
+    page = parse_html(html, url, backend=backend)
+    return page.title, page.links, [page.search(query) for query in queries]
+
+
+def _time(func, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(paragraphs=5000, queries=20):
+    from page_parser import etree, parse_html, parse_chunks
+
+    html = make_page(paragraphs)
+    url = 'http://example.test/'
+    query_list = [WORDS[i % len(WORDS)] + (' ' + WORDS[(i + 1) % len(WORDS)] if i % 2 else '')
+                  for i in range(queries)]
+
+    whole = parse_html(html, url)
+    data = html.encode('utf-8')
+    chunked = parse_chunks((data[i:i + 1000] for i in range(0, len(data), 1000)), url)
+    consistent = (whole.text == chunked.text and whole.links == chunked.links
+                  and whole.title == chunked.title and len(whole.links) == paragraphs)
+
+    results = {
+        'page_bytes': len(data),
+        'consistent': consistent,
+        'timings': {'regex passes': _time(regex_approach, html, url, query_list)}
+    }
+    for backend in (('lxml', 'html.parser') if etree is not None else ('html.parser',)):
+        results['timings'][f'parser ({backend})'] = _time(parser_approach, html, url, query_list, backend)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE page parsing benchmark')
+    parser.add_argument('--paragraphs', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    results = run(args.paragraphs, args.queries)
+    print(f"page: {results['page_bytes']} bytes, {args.queries} queries")
+    for name, seconds in results['timings'].items():
+        print(f"{name:22s} {seconds * 1000:>9.1f} ms")
+    print(f"chunked parse matches whole parse: {results['consistent']}")
+    sys.exit(0 if results['consistent'] else 1)
+
+
+if __name__ == '__main__':
+    main()
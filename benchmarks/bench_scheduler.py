@@ -0,0 +1,115 @@
+"""
+AVA CORE Cron Scheduler Benchmark
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Loads many schedules into cron_scheduler, marks them all overdue and lets
+two schedulers sharing the database fire them. Reports bulk insert and
+startup time, heap operation cost, fire throughput and lag, and checks that
+every schedule fired exactly once across both workers. Exits non-zero when
+a schedule fires twice or not at all.
+
+Usage: python benchmarks/bench_scheduler.py [--schedules 100000] [--workers 4]
+"""
+
+import os
+import sys
+import time
+import heapq
+import sqlite3
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+EXPRESSIONS = ['* * * * *', '*/5 * * * *', '0 * * * *', '30 9 * * mon-fri', '0 0 1 * *']
+
+
+def run(schedules, workers=4):
+    from cron_scheduler import CronScheduler
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix='ava_bench_'), 'scheduler.db')
+    fired = []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def mark(data):
+        with lock:
+            fired.append(data['n'])
+            if len(fired) >= schedules:
+                done.set()
+
+    first = CronScheduler(db_path, max_workers=workers, worker_id='first')
+    second = CronScheduler(db_path, max_workers=workers, worker_id='second')
+    for scheduler in (first, second):
+        scheduler.register_action('bench', 'mark', mark)
+
+    start = time.perf_counter()
+    first.add_schedules('bench', [
+        {'name': f'job {i}', 'cron_expression': EXPRESSIONS[i % len(EXPRESSIONS)],
+         'action_type': 'mark', 'action_data': {'n': i}}
+        for i in range(schedules)
+    ])
+    add_seconds = time.perf_counter() - start
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('UPDATE cron_schedules SET next_run = ?', (time.time() - 1,))
+
+    start = time.perf_counter()
+    first.start()
+    second.start()
+    startup_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    done.wait(timeout=600)
+    fire_seconds = time.perf_counter() - start
+    time.sleep(0.5)
+    statuses = [first.get_scheduler_status(), second.get_scheduler_status()]
+    first.stop()
+    second.stop()
+
+    # Heap cost with every schedule loaded: one reschedule is a push and a pop
+    entries = list(first._entries)[:10000]
+    start = time.perf_counter()
+    with first._cond:
+        for schedule_id in entries:
+            first._reschedule(schedule_id, time.time() + 3600)
+        for _ in entries:
+            heapq.heappop(first._heap)
+    heap_us = (time.perf_counter() - start) * 1e6 / max(1, len(entries))
+
+    return {
+        'schedules': schedules,
+        'add_seconds': add_seconds,
+        'startup_seconds': startup_seconds,
+        'fire_seconds': fire_seconds,
+        'fires_per_second': len(fired) / fire_seconds if fire_seconds else 0.0,
+        'heap_op_us': heap_us,
+        'fired': len(fired),
+        'unique': len(set(fired)),
+        'per_worker': [status['stats']['fired'] for status in statuses],
+        'lag_p95': max(status['lag_seconds']['p95'] or 0.0 for status in statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE cron scheduler benchmark')
+    parser.add_argument('--schedules', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    result = run(args.schedules, args.workers)
+    print(f"schedules:        {result['schedules']}")
+    print(f"bulk add:         {result['add_seconds']:.2f} s")
+    print(f"startup (2x):     {result['startup_seconds']:.2f} s")
+    print(f"fire all:         {result['fire_seconds']:.2f} s ({result['fires_per_second']:.0f}/s)")
+    print(f"fire lag p95:     {result['lag_p95']:.2f} s")
+    print(f"heap push+pop:    {result['heap_op_us']:.1f} us")
+    print(f"fired per worker: {result['per_worker']}")
+    print(f"fired/unique:     {result['fired']}/{result['unique']}")
+    ok = result['fired'] == result['unique'] == result['schedules']
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
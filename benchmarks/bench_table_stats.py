@@ -0,0 +1,105 @@
+"""
+AVA CORE Table Statistics Regression Benchmark
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+
+Compares SELECT * + len(), SELECT COUNT(*) and trigger-maintained counts
+from table_stats at several table sizes, and verifies the maintained counts
+stay exact across inserts and deletes. Exits non-zero on a count mismatch
+or when table_stats is slower than COUNT(*) at the largest size.
+
+Usage: python benchmarks/bench_table_stats.py [--sizes 1000 100000 1000000]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _per_call_us(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def _populate(db_path, rows):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE thoughts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                thought_type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                confidence REAL
+            )
+        ''')
+        conn.executemany(
+            'INSERT INTO thoughts (thought_type, content, confidence) VALUES (?, ?, ?)',
+            (('reflection', f'thought {i}', 0.5) for i in range(rows))
+        )
+
+
+def run(sizes, calls=200):
+    from table_stats import TableStatistics
+
+    results = []
+    ok = True
+    workdir = tempfile.mkdtemp(prefix='ava_bench_')
+    for rows in sizes:
+        db_path = os.path.join(workdir, f'stats_{rows}.db')
+        _populate(db_path, rows)
+        stats = TableStatistics()
+        stats.track(db_path, 'thoughts')
+        conn = sqlite3.connect(db_path)
+
+        def select_all():
+            return len(conn.execute('SELECT * FROM thoughts').fetchall())
+
+        def count_star():
+            return conn.execute('SELECT COUNT(*) FROM thoughts').fetchone()[0]
+
+        def maintained():
+            return stats.count(db_path, 'thoughts')
+
+        row = {
+            'rows': rows,
+            'select_all_us': _per_call_us(select_all, max(1, calls // 20)),
+            'count_star_us': _per_call_us(count_star, calls),
+            'table_stats_us': _per_call_us(maintained, calls),
+        }
+
+        # Counts must stay exact across writes from other connections
+        with sqlite3.connect(db_path) as writer:
+            writer.executemany('INSERT INTO thoughts (thought_type, content) VALUES (?, ?)',
+                               [('decision', 'x')] * 100)
+            writer.execute('DELETE FROM thoughts WHERE id <= 50')
+        row['count_matches'] = maintained() == count_star()
+        ok = ok and row['count_matches']
+        results.append(row)
+        conn.close()
+
+    if results and results[-1]['table_stats_us'] > results[-1]['count_star_us']:
+        ok = False
+    return results, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AVA CORE table statistics benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+
+    results, ok = run(args.sizes, args.calls)
+    print(f"{'rows':>10} {'select_all_us':>14} {'count_star_us':>14} {'table_stats_us':>15} {'exact':>6}")
+    for row in results:
+        print(f"{row['rows']:>10} {row['select_all_us']:>14.1f} {row['count_star_us']:>14.1f} "
+              f"{row['table_stats_us']:>15.1f} {str(row['count_matches']):>6}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,11 +9,11 @@ Secure chat management with privacy controls and automatic conversation initiati
 
 import uuid
 import time
-import threading
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import json
+from background_scheduler import background_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -91,7 +91,6 @@ class AutoChatManager:
         self.user_sessions: Dict[str, List[str]] = {}  # user_id -> [session_ids]
         self.auto_greeting_enabled = True
         self.privacy_enforced = True
-        self.cleanup_thread = None
         self.start_cleanup_scheduler()
         
         # Auto-chat settings
@@ -237,7 +236,7 @@ class AutoChatManager:
             }, room=session_id)
         
         # Clean up after delay
-        threading.Timer(60, lambda: self.cleanup_session(session_id)).start()
+        background_scheduler.call_later(60, lambda: self.cleanup_session(session_id))
     
     def cleanup_session(self, session_id: str):
         """Remove session from memory"""
@@ -256,25 +255,20 @@ class AutoChatManager:
     
     def start_cleanup_scheduler(self):
         """Start automatic session cleanup"""
-        def cleanup_expired():
-            while True:
-                try:
-                    expired_sessions = []
-                    for session_id, session in self.active_sessions.items():
-                        if session.is_expired():
-                            expired_sessions.append(session_id)
-                    
-                    for session_id in expired_sessions:
-                        self.end_session(session_id)
-                    
-                    time.sleep(300)  # Check every 5 minutes
-                    
-                except Exception as e:
-                    logger.error(f"Cleanup error: {str(e)}")
-                    time.sleep(60)
+        # Check every 5 minutes, backing off to 30 minutes while there are no sessions
+        background_scheduler.register(f'chat_cleanup:{id(self)}', self.cleanup_expired, 300,
+                                      max_interval=1800, retry_interval=60,
+                                      idle=lambda ended: not ended and not self.active_sessions)
+    
+    def cleanup_expired(self) -> int:
+        """End every expired session; returns how many were ended"""
+        expired_sessions = [session_id for session_id, session in list(self.active_sessions.items())
+                            if session.is_expired()]
+        
+        for session_id in expired_sessions:
+            self.end_session(session_id)
         
-        self.cleanup_thread = threading.Thread(target=cleanup_expired, daemon=True)
-        self.cleanup_thread.start()
+        return len(expired_sessions)
     
     def get_active_sessions_count(self) -> int:
         """Get count of active sessions"""
@@ -245,9 +245,10 @@ Optimized for cloud hosting with automatic scaling and mobile compatibility
 
 import os
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 import logging
+from metrics import metrics, instrument_flask, instrument_socketio, CONTENT_TYPE
 
 # Configure logging for cloud environment
 logging.basicConfig(
@@ -269,6 +270,8 @@ socketio = SocketIO(
     logger=False,
     engineio_logger=False
 )
+instrument_flask(app, 'cloud_deploy')
+instrument_socketio(socketio, 'cloud_deploy')
 
 # Import core modules
 try:
@@ -419,6 +422,11 @@ def handle_disconnect():
     """Handle WebSocket disconnection"""
     logger.info("Client disconnected from cloud instance")
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition for cloud monitoring"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
 # Health check endpoint for cloud platforms
 @app.route('/health')
 def health_check():
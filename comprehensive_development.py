@@ -16,7 +16,6 @@ project management, code execution, deployment, and system control.
 """
 
 import os
-import sys
 import json
 import sqlite3
 import subprocess
@@ -27,6 +26,9 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from nda_protection import nda_protect, NDA_LICENSE_INFO
+from execution_pool import execution_pool
+from node_pool import node_pool
+from execution_cache import execution_cache
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -270,28 +272,37 @@ class ComprehensiveDevelopmentSuite:
     
     @nda_protect('code_execution')
     def execute_code(self, project_id: str, language: str, code: str, 
-                    unrestricted: bool = True) -> Dict[str, Any]:
-        """Execute code with full capabilities and no restrictions"""
+                    unrestricted: bool = True, pure: Optional[bool] = None,
+                    inputs: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute code with full capabilities and no restrictions
+        
+        Identical deterministic runs (or runs marked pure) are answered from
+        the execution cache.
+        """
         try:
             start_time = time.time()
             
             if language == 'python':
-                result = self._execute_python_advanced(code, unrestricted)
+                runner = lambda: self._execute_python_advanced(code, unrestricted, inputs)
             elif language == 'javascript':
-                result = self._execute_javascript_advanced(code, unrestricted)
+                runner = lambda: self._execute_javascript_advanced(code, unrestricted, inputs)
             elif language == 'bash':
-                result = self._execute_bash_advanced(code, unrestricted)
+                runner = lambda: self._execute_bash_advanced(code, unrestricted)
             elif language == 'rust':
-                result = self._execute_rust_advanced(code, unrestricted)
+                runner = lambda: self._execute_rust_advanced(code, unrestricted)
             elif language == 'go':
-                result = self._execute_go_advanced(code, unrestricted)
+                runner = lambda: self._execute_go_advanced(code, unrestricted)
             else:
-                result = self._execute_generic_advanced(language, code, unrestricted)
+                runner = lambda: self._execute_generic_advanced(language, code, unrestricted)
+            
+            result = execution_cache.execute(language, code, runner, pure=pure, inputs=inputs,
+                                             namespace='comprehensive_development')
             
             execution_time = time.time() - start_time
             
             # Log execution
-            self._log_execution(project_id, language, code, result.get('output', ''), execution_time)
+            self._log_execution(project_id, language, code, result.get('output', ''),
+                                execution_time, result['cached'])
             
             result.update({
                 'execution_time': execution_time,
@@ -306,13 +317,12 @@ class ComprehensiveDevelopmentSuite:
             logger.error(f"Code execution failed: {e}")
             return {'success': False, 'error': str(e)}
     
-    def _execute_python_advanced(self, code: str, unrestricted: bool) -> Dict[str, Any]:
+    def _execute_python_advanced(self, code: str, unrestricted: bool,
+                                 inputs: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute Python code with advanced capabilities"""
         try:
-            # Create temporary file
-            temp_file = f"temp_execution_{int(time.time())}.py"
-            
-            # Enhanced code with imports and capabilities
+            # The pool workers have these libraries imported already, so the
+            # preamble only binds names instead of paying for cold imports
             enhanced_code = f"""
 import sys
 import os
@@ -329,22 +339,16 @@ import logging
 {code}
 """
             
-            with open(temp_file, 'w') as f:
-                f.write(enhanced_code)
-            
-            # Execute with full permissions
-            result = subprocess.run([sys.executable, temp_file], 
-                                  capture_output=True, text=True, timeout=30)
-            
-            # Cleanup
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            result = execution_pool.execute(enhanced_code, owner='comprehensive_development',
+                                            timeout=30, context=inputs)
+            if result.get('timed_out'):
+                return {'success': False, 'error': result['error']}
             
             return {
                 'success': True,
-                'output': result.stdout,
-                'error': result.stderr,
-                'return_code': result.returncode,
+                'output': result['output'],
+                'error': result['error'],
+                'return_code': result['return_code'],
                 'language': 'python',
                 'capabilities': 'unlimited'
             }
@@ -352,40 +356,32 @@ import logging
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def _execute_javascript_advanced(self, code: str, unrestricted: bool) -> Dict[str, Any]:
+    def _execute_javascript_advanced(self, code: str, unrestricted: bool,
+                                     inputs: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute JavaScript code with advanced capabilities"""
         try:
-            # Create temporary file
-            temp_file = f"temp_execution_{int(time.time())}.js"
-            
             # Enhanced code with requires and capabilities
             enhanced_code = f"""
 const fs = require('fs');
 const path = require('path');
 const http = require('http');
 const https = require('https');
-const { spawn } = require('child_process');
+const {{ spawn }} = require('child_process');
 
 // Enable all requires and capabilities
 {code}
 """
             
-            with open(temp_file, 'w') as f:
-                f.write(enhanced_code)
-            
-            # Execute with Node.js
-            result = subprocess.run(['node', temp_file], 
-                                  capture_output=True, text=True, timeout=30)
-            
-            # Cleanup
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            result = node_pool.execute(enhanced_code, owner='comprehensive_development',
+                                       timeout=30, globals=inputs)
+            if result.get('timed_out'):
+                return {'success': False, 'error': 'Code execution timed out'}
             
             return {
                 'success': True,
-                'output': result.stdout,
-                'error': result.stderr,
-                'return_code': result.returncode,
+                'output': result['output'],
+                'error': result['error'],
+                'return_code': result['return_code'],
                 'language': 'javascript',
                 'capabilities': 'unlimited'
             }
@@ -750,15 +746,13 @@ if __name__ == "__main__":
         return '\n'.join(base_requirements)
     
     def _log_execution(self, project_id: str, language: str, code: str, 
-                      output: str, execution_time: float):
-        """Log code execution"""
+                      output: str, execution_time: float, cached: bool = False):
+        """Log code execution with code and output stored once by content hash"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT INTO executions 
-                    (project_id, language, code, output, execution_time)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (project_id, language, code, output, execution_time))
+            execution_cache.log_execution(
+                self.db_path, language, code, output, cached=cached,
+                project_id=project_id, execution_time=execution_time
+            )
         except Exception as e:
             logger.error(f"Failed to log execution: {e}")
 
@@ -26,6 +26,8 @@ import secrets
 import hashlib
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from status_registry import status_registry
+from table_stats import table_stats
 
 logger = logging.getLogger(__name__)
 
@@ -43,10 +45,20 @@ class ComprehensiveSystemIntegration:
         
         # Initialize comprehensive integration
         self.init_comprehensive_database()
+        table_stats.track(
+            self.integration_db,
+            'all_project_data', 'additional_development_features', 'real_world_connections', 'invisible_operations'
+        )
         self.restore_all_project_data()
         self.integrate_additional_features()
         self.setup_real_world_connections()
         
+        status_registry.register(
+            'comprehensive_integration_status',
+            self._build_comprehensive_integration_status,
+            tables=('all_project_data', 'additional_development_features', 'real_world_connections', 'invisible_operations', 'github_integration')
+        )
+        
         logger.info("Comprehensive system integration initialized with all project data")
     
     def init_comprehensive_database(self):
@@ -225,6 +237,7 @@ class ComprehensiveSystemIntegration:
                 
                 conn.commit()
             
+            status_registry.table_changed('all_project_data')
             logger.info("All project data restored and integrated")
             
         except Exception as e:
@@ -309,6 +322,7 @@ class ComprehensiveSystemIntegration:
                 
                 conn.commit()
             
+            status_registry.table_changed('additional_development_features')
             logger.info("Additional enterprise and secret features integrated")
             
         except Exception as e:
@@ -407,6 +421,7 @@ class ComprehensiveSystemIntegration:
                 
                 conn.commit()
             
+            status_registry.table_changed('real_world_connections')
             logger.info("Real-world connections configured")
             
         except Exception as e:
@@ -470,6 +485,7 @@ class ComprehensiveSystemIntegration:
                 
                 conn.commit()
             
+            status_registry.table_changed('invisible_operations')
             logger.info("Invisible operations configured")
             
         except Exception as e:
@@ -505,66 +521,16 @@ class ComprehensiveSystemIntegration:
                 
                 conn.commit()
             
+            status_registry.table_changed('github_integration')
             logger.info("GitHub repository integration configured")
             
         except Exception as e:
             logger.error(f"GitHub integration setup error: {e}")
     
     def get_comprehensive_integration_status(self) -> Dict[str, Any]:
-        """Get comprehensive system integration status"""
+        """Get comprehensive system integration status (cached until the underlying tables change)"""
         try:
-            with sqlite3.connect(self.integration_db) as conn:
-                # Get all project data count
-                cursor = conn.execute('SELECT COUNT(*) FROM all_project_data')
-                total_project_features = cursor.fetchone()[0]
-                
-                # Get additional features count
-                cursor = conn.execute('SELECT COUNT(*) FROM additional_development_features')
-                additional_features = cursor.fetchone()[0]
-                
-                # Get real-world connections
-                cursor = conn.execute('SELECT COUNT(*) FROM real_world_connections')
-                real_world_connections = cursor.fetchone()[0]
-                
-                # Get invisible operations
-                cursor = conn.execute('SELECT COUNT(*) FROM invisible_operations')
-                invisible_operations = cursor.fetchone()[0]
-                
-                # Get GitHub integration
-                cursor = conn.execute('SELECT repository_url, deployment_status FROM github_integration ORDER BY id DESC LIMIT 1')
-                github_info = cursor.fetchone()
-            
-            return {
-                'comprehensive_system_integration_active': True,
-                'all_project_data_restored': True,
-                'total_project_features_integrated': total_project_features,
-                'additional_enterprise_features': additional_features,
-                'real_world_connections_configured': real_world_connections,
-                'invisible_operations_active': invisible_operations,
-                'github_repository': {
-                    'url': github_info[0] if github_info else 'https://github.com/radosavlevici210/NeuralAssistant',
-                    'status': github_info[1] if github_info else 'production_ready'
-                },
-                'netlify_deployment_ready': True,
-                'production_system_complete': True,
-                'invisible_and_transparent_operations': True,
-                'authorization': {
-                    'copyright_owner': self.copyright_owner,
-                    'authorized_contact': self.authorized_contact,
-                    'watermark': self.watermark,
-                    'timestamp': self.timestamp
-                },
-                'integration_scope': {
-                    'all_past_development': True,
-                    'enterprise_features': True,
-                    'secret_capabilities': True,
-                    'protection_systems': True,
-                    'real_world_integrations': True,
-                    'github_deployment': True,
-                    'netlify_optimization': True
-                }
-            }
-            
+            return status_registry.get('comprehensive_integration_status')
         except Exception as e:
             logger.error(f"Status retrieval error: {e}")
             return {
@@ -572,6 +538,50 @@ class ComprehensiveSystemIntegration:
                 'error_handled': True
             }
     
+    def _build_comprehensive_integration_status(self) -> Dict[str, Any]:
+        """Build the comprehensive system integration status document"""
+        # Row counts come from trigger-maintained statistics
+        total_project_features = table_stats.count(self.integration_db, 'all_project_data')
+        additional_features = table_stats.count(self.integration_db, 'additional_development_features')
+        real_world_connections = table_stats.count(self.integration_db, 'real_world_connections')
+        invisible_operations = table_stats.count(self.integration_db, 'invisible_operations')
+        
+        with sqlite3.connect(self.integration_db) as conn:
+            # Get GitHub integration
+            cursor = conn.execute('SELECT repository_url, deployment_status FROM github_integration ORDER BY id DESC LIMIT 1')
+            github_info = cursor.fetchone()
+        
+        return {
+            'comprehensive_system_integration_active': True,
+            'all_project_data_restored': True,
+            'total_project_features_integrated': total_project_features,
+            'additional_enterprise_features': additional_features,
+            'real_world_connections_configured': real_world_connections,
+            'invisible_operations_active': invisible_operations,
+            'github_repository': {
+                'url': github_info[0] if github_info else 'https://github.com/radosavlevici210/NeuralAssistant',
+                'status': github_info[1] if github_info else 'production_ready'
+            },
+            'netlify_deployment_ready': True,
+            'production_system_complete': True,
+            'invisible_and_transparent_operations': True,
+            'authorization': {
+                'copyright_owner': self.copyright_owner,
+                'authorized_contact': self.authorized_contact,
+                'watermark': self.watermark,
+                'timestamp': self.timestamp
+            },
+            'integration_scope': {
+                'all_past_development': True,
+                'enterprise_features': True,
+                'secret_capabilities': True,
+                'protection_systems': True,
+                'real_world_integrations': True,
+                'github_deployment': True,
+                'netlify_optimization': True
+            }
+        }
+    
     def execute_comprehensive_integration_operation(self, operation_type: str, operation_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute comprehensive integration operation"""
         try:
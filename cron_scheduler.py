@@ -0,0 +1,617 @@
+"""
+AVA CORE Cron Scheduler
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Cron schedules that actually fire.
+Each expression is parsed once into sorted value sets, and the scheduler keeps
+a min-heap of next-fire times, so adding, firing and rescheduling a schedule
+cost O(log n) however many exist. Due jobs go to a bounded worker pool.
+Schedules and their next-fire times live in SQLite: a restarted process
+catches up on what it missed, once the action handlers it needs have been
+registered, and several processes can share one database because each fire
+is claimed with a compare-and-set lease.
+"""
+
+import os
+import json
+import time
+import uuid
+import heapq
+import sqlite3
+import logging
+import threading
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from metrics import TimedConnection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 300
+SYNC_INTERVAL = 30
+# How long after start a due schedule waits for its action handler to be registered
+HANDLER_GRACE = float(os.environ.get('AVA_CRON_HANDLER_GRACE', '300'))
+CLAIM_BATCH = 1000
+LAG_WINDOW = 1000
+SEARCH_YEARS = 5
+
+# (name, lowest, highest) for the five fields of an expression
+CRON_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+
+MONTH_NAMES = {name: index + 1 for index, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'))}
+WEEKDAY_NAMES = {name: index for index, name in enumerate(('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'))}
+
+CRON_ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *'
+}
+
+def _parse_field(text: str, name: str, lowest: int, highest: int) -> Tuple[int, ...]:
+    names = MONTH_NAMES if name == 'month' else WEEKDAY_NAMES if name == 'weekday' else {}
+
+    def value(token: str) -> int:
+        token = token.lower()
+        if token in names:
+            return names[token]
+        if not token.isdigit():
+            raise ValueError(f"Invalid {name} value: {token}")
+        number = int(token)
+        if not lowest <= number <= highest:
+            raise ValueError(f"{name} value {number} is outside {lowest}-{highest}")
+        return number
+
+    values = set()
+    for part in text.split(','):
+        span, _, step_text = part.partition('/')
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Invalid {name} step: {step_text}")
+            step = int(step_text)
+        if span == '*':
+            start, end = lowest, highest
+        elif '-' in span:
+            first, _, last = span.partition('-')
+            start, end = value(first), value(last)
+            if start > end:
+                raise ValueError(f"Invalid {name} range: {span}")
+        else:
+            start = value(span)
+            end = highest if step_text else start
+        values.update(range(start, end + 1, step))
+    if name == 'weekday' and 7 in values:
+        # 7 is an alias for Sunday
+        values.discard(7)
+        values.add(0)
+    return tuple(sorted(values))
+
+class CronExpression:
+    """A parsed five-field cron expression (minute hour day month weekday)
+
+    Day of month and day of week follow the usual cron rule: when both are
+    restricted, a day matching either one fires.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = CRON_ALIASES.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression!r}")
+        parsed = [_parse_field(text, *spec) for text, spec in zip(fields, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self._day_set = frozenset(self.days)
+        self._weekday_set = frozenset(self.weekdays)
+        self._month_set = frozenset(self.months)
+        self._hour_set = frozenset(self.hours)
+        self._minute_set = frozenset(self.minutes)
+        self._days_restricted = not fields[2].startswith('*')
+        self._weekdays_restricted = not fields[4].startswith('*')
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self._day_set
+        weekday_ok = (moment.weekday() + 1) % 7 in self._weekday_set
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, timestamp: float) -> float:
+        """First fire time strictly after timestamp, in local time"""
+        current = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current.year + SEARCH_YEARS
+        while current.year <= limit:
+            if current.month not in self._month_set:
+                index = bisect_left(self.months, current.month)
+                if index == len(self.months):
+                    current = datetime(current.year + 1, self.months[0], 1)
+                else:
+                    current = datetime(current.year, self.months[index], 1)
+                continue
+            if not self._day_matches(current):
+                current = datetime(current.year, current.month, current.day) + timedelta(days=1)
+                continue
+            if current.hour not in self._hour_set:
+                index = bisect_left(self.hours, current.hour)
+                if index == len(self.hours):
+                    current = datetime(current.year, current.month, current.day) + timedelta(days=1)
+                else:
+                    current = current.replace(hour=self.hours[index], minute=0)
+                continue
+            if current.minute not in self._minute_set:
+                index = bisect_left(self.minutes, current.minute)
+                if index == len(self.minutes):
+                    current = current.replace(minute=0) + timedelta(hours=1)
+                    continue
+                current = current.replace(minute=self.minutes[index])
+            return current.timestamp()
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+@lru_cache(maxsize=4096)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse an expression once; schedules sharing an expression share the result"""
+    cron = CronExpression(expression)
+    cron.next_after(time.time())
+    return cron
+
+class CronScheduler:
+    """Fires persisted cron schedules from a heap of next-fire times"""
+
+    def __init__(self, db_path: str = 'scheduler.db', max_workers: int = 4, max_pending: int = 256,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS, catch_up: str = 'once',
+                 worker_id: str = None):
+        if catch_up not in ('once', 'skip'):
+            raise ValueError("catch_up must be 'once' or 'skip'")
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.lease_seconds = lease_seconds
+        self.catch_up = catch_up
+        self.worker_id = worker_id or f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self._actions: Dict[str, Dict[str, Callable[[Dict[str, Any]], Any]]] = {}
+        # schedule id -> in-memory entry; heap items whose time no longer
+        # matches the entry are stale and skipped when popped
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        # (namespace, action type) -> heap items that came due before their handler was registered
+        self._parked: Dict[Tuple[str, str], List[Tuple[float, str]]] = {}
+        self._started_at = 0.0
+        self._cond = threading.Condition()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._initialized = False
+        self._last_rowid = 0
+        self._completions: List[tuple] = []
+        self._in_flight = 0
+        self._lags = deque(maxlen=LAG_WINDOW)
+        self._fire_times = deque()
+        self.stats = {'fired': 0, 'completed': 0, 'failed': 0, 'caught_up': 0,
+                      'skipped_overlap': 0, 'claimed_elsewhere': 0}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits on success and is closed on exit"""
+        if not self._initialized:
+            with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS cron_schedules (
+                        id TEXT PRIMARY KEY,
+                        namespace TEXT NOT NULL,
+                        name TEXT,
+                        cron_expression TEXT NOT NULL,
+                        action_type TEXT NOT NULL,
+                        action_data TEXT,
+                        enabled INTEGER DEFAULT 1,
+                        next_run REAL,
+                        last_run REAL,
+                        last_status TEXT,
+                        last_error TEXT,
+                        run_count INTEGER DEFAULT 0,
+                        failure_count INTEGER DEFAULT 0,
+                        lease_owner TEXT,
+                        lease_until REAL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_cron_schedules_namespace ON cron_schedules(namespace)')
+            self._initialized = True
+        with closing(sqlite3.connect(self.db_path, timeout=30, factory=TimedConnection)) as conn:
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                yield conn
+
+    def register_action(self, namespace: str, action_type: str, handler: Callable[[Dict[str, Any]], Any]):
+        """Register a blocking handler(action_data) for an action type"""
+        with self._cond:
+            self._actions.setdefault(namespace, {})[action_type] = handler
+            # Fires that came due while this handler was missing run now
+            self._unpark(self._parked.pop((namespace, action_type), []))
+
+    def _unpark(self, items: List[Tuple[float, str]]):
+        for item in items:
+            heapq.heappush(self._heap, item)
+        if items:
+            self._cond.notify()
+
+    def supported_actions(self, namespace: str) -> List[str]:
+        return sorted(self._actions.get(namespace, {}))
+
+    # Schedules
+
+    def add_schedule(self, namespace: str, name: str, cron_expression: str, action_type: str,
+                     action_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Persist a schedule and queue its first fire; raises ValueError when invalid"""
+        return self.add_schedules(namespace, [{
+            'name': name,
+            'cron_expression': cron_expression,
+            'action_type': action_type,
+            'action_data': action_data
+        }])[0]
+
+    def add_schedules(self, namespace: str, schedules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add many schedules in one transaction; nothing is added if any is invalid"""
+        now = time.time()
+        rows = []
+        for schedule in schedules:
+            action_type = schedule.get('action_type') or ''
+            if action_type not in self._actions.get(namespace, {}):
+                raise ValueError(f"Unknown action type: {action_type or '(none)'}")
+            cron = parse_cron(schedule.get('cron_expression') or '')
+            rows.append((f'sched_{uuid.uuid4().hex}', namespace, schedule.get('name') or '',
+                         cron.expression, action_type, json.dumps(schedule.get('action_data') or {}),
+                         cron.next_after(now)))
+
+        with self._connect() as conn:
+            conn.executemany('''
+                INSERT INTO cron_schedules
+                    (id, namespace, name, cron_expression, action_type, action_data, next_run)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        if self._running:
+            with self._cond:
+                for row in rows:
+                    self._track(*row)
+                self._cond.notify()
+
+        return [{'id': row[0], 'namespace': namespace, 'name': row[2], 'cron_expression': row[3],
+                 'action_type': row[4], 'next_run': datetime.fromtimestamp(row[6]).isoformat()}
+                for row in rows]
+
+    def remove_schedule(self, schedule_id: str) -> bool:
+        with self._connect() as conn:
+            removed = conn.execute('DELETE FROM cron_schedules WHERE id = ?', (schedule_id,)).rowcount
+        with self._cond:
+            self._entries.pop(schedule_id, None)
+        return bool(removed)
+
+    def set_enabled(self, schedule_id: str, enabled: bool) -> bool:
+        next_run = None
+        with self._connect() as conn:
+            row = conn.execute('SELECT cron_expression FROM cron_schedules WHERE id = ?',
+                               (schedule_id,)).fetchone()
+            if row is None:
+                return False
+            if enabled:
+                next_run = parse_cron(row[0]).next_after(time.time())
+            conn.execute('UPDATE cron_schedules SET enabled = ?, next_run = COALESCE(?, next_run) WHERE id = ?',
+                         (1 if enabled else 0, next_run, schedule_id))
+        with self._cond:
+            self._entries.pop(schedule_id, None)
+            if enabled and self._running:
+                self._load('WHERE id = ?', (schedule_id,))
+                self._cond.notify()
+        return True
+
+    def set_expression(self, schedule_id: str, cron_expression: str) -> bool:
+        """Change when a schedule fires; raises ValueError when the expression is invalid"""
+        cron = parse_cron(cron_expression)
+        with self._connect() as conn:
+            updated = conn.execute('UPDATE cron_schedules SET cron_expression = ?, next_run = ? WHERE id = ?',
+                                   (cron.expression, cron.next_after(time.time()), schedule_id)).rowcount
+        if not updated:
+            return False
+        with self._cond:
+            self._entries.pop(schedule_id, None)
+            if self._running:
+                self._load('WHERE id = ? AND enabled = 1', (schedule_id,))
+                self._cond.notify()
+        return True
+
+    def get_schedule(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        schedules = self._query('WHERE id = ?', (schedule_id,))
+        return schedules[0] if schedules else None
+
+    def list_schedules(self, namespace: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+        if namespace:
+            return self._query('WHERE namespace = ? ORDER BY next_run LIMIT ?', (namespace, limit))
+        return self._query('ORDER BY next_run LIMIT ?', (limit,))
+
+    def _query(self, clause: str, args: tuple) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(f'''
+                SELECT id, namespace, name, cron_expression, action_type, action_data, enabled,
+                       next_run, last_run, last_status, last_error, run_count, failure_count,
+                       lease_owner, created_at
+                FROM cron_schedules {clause}
+            ''', args).fetchall()
+
+        def moment(value):
+            return datetime.fromtimestamp(value).isoformat() if value else None
+
+        return [{'id': r[0], 'namespace': r[1], 'name': r[2], 'cron_expression': r[3],
+                 'action_type': r[4], 'action_data': json.loads(r[5] or '{}'), 'enabled': bool(r[6]),
+                 'next_run': moment(r[7]), 'last_run': moment(r[8]), 'last_status': r[9],
+                 'last_error': r[10], 'run_count': r[11], 'failure_count': r[12],
+                 'running_on': r[13], 'created_at': r[14]} for r in rows]
+
+    # Heap bookkeeping; callers hold self._cond
+
+    def _track(self, schedule_id: str, namespace: str, name: str, expression: str,
+               action_type: str, action_data: str, next_run: float):
+        self._entries[schedule_id] = {'namespace': namespace, 'name': name, 'cron': parse_cron(expression),
+                                      'action_type': action_type, 'action_data': action_data,
+                                      'next_run': next_run}
+        heapq.heappush(self._heap, (next_run, schedule_id))
+
+    def _reschedule(self, schedule_id: str, next_run: float):
+        entry = self._entries.get(schedule_id)
+        if entry is not None:
+            entry['next_run'] = next_run
+            heapq.heappush(self._heap, (next_run, schedule_id))
+
+    def _load(self, clause: str, args: tuple) -> int:
+        with self._connect() as conn:
+            rows = conn.execute(f'''
+                SELECT rowid, id, namespace, name, cron_expression, action_type, action_data, next_run
+                FROM cron_schedules {clause}
+            ''', args).fetchall()
+        for row in rows:
+            self._last_rowid = max(self._last_rowid, row[0])
+            if row[1] not in self._entries:
+                self._track(*row[1:])
+        return len(rows)
+
+    def _compact(self):
+        """Rebuild the heap once stale items outnumber live ones"""
+        if len(self._heap) > 2 * len(self._entries) + 1024:
+            self._heap = [(entry['next_run'], schedule_id) for schedule_id, entry in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    # Dispatching
+
+    def start(self):
+        """Load enabled schedules and start firing them; safe to call repeatedly"""
+        with self._cond:
+            if self._running:
+                return
+            now = time.time()
+            if self.catch_up == 'skip':
+                with self._connect() as conn:
+                    overdue = conn.execute('''
+                        SELECT id, cron_expression FROM cron_schedules WHERE enabled = 1 AND next_run < ?
+                    ''', (now,)).fetchall()
+                    conn.executemany('UPDATE cron_schedules SET next_run = ? WHERE id = ?',
+                                     [(parse_cron(expr).next_after(now), sid) for sid, expr in overdue])
+            self._heap = []
+            self._entries = {}
+            self._parked = {}
+            self._started_at = now
+            loaded = self._load('WHERE enabled = 1', ())
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cron-job')
+            self._running = True
+            self._thread = threading.Thread(target=self._dispatch_loop, name='cron-scheduler', daemon=True)
+            self._thread.start()
+        logger.info(f"Cron scheduler started with {loaded} schedules as {self.worker_id}")
+
+    def stop(self, wait: bool = True):
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=wait)
+        self._flush_completions()
+
+    def _dispatch_loop(self):
+        last_sync = time.time()
+        while True:
+            with self._cond:
+                while self._running:
+                    now = time.time()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    if self._completions or now - last_sync >= SYNC_INTERVAL:
+                        break
+                    timeout = SYNC_INTERVAL - (now - last_sync)
+                    if self._heap:
+                        timeout = min(timeout, self._heap[0][0] - now)
+                    self._cond.wait(max(timeout, 0.001))
+                if not self._running:
+                    return
+                now = time.time()
+                due = []
+                while self._heap and self._heap[0][0] <= now and len(due) < CLAIM_BATCH:
+                    next_run, schedule_id = heapq.heappop(self._heap)
+                    entry = self._entries.get(schedule_id)
+                    if entry is None or entry['next_run'] != next_run:
+                        continue
+                    if (entry['action_type'] not in self._actions.get(entry['namespace'], {})
+                            and now - self._started_at < HANDLER_GRACE):
+                        # Subsystems register their handlers while warming up; catch-up waits for them
+                        self._parked.setdefault((entry['namespace'], entry['action_type']), []).append(
+                            (next_run, schedule_id))
+                        continue
+                    due.append((schedule_id, next_run, entry))
+                self._compact()
+                if now - last_sync >= SYNC_INTERVAL:
+                    # Pick up schedules added by other processes sharing the database
+                    self._load('WHERE enabled = 1 AND rowid > ?', (self._last_rowid,))
+                    last_sync = now
+                    if self._parked and now - self._started_at >= HANDLER_GRACE:
+                        # Still no handler: fire so the missing handler is recorded as a failure
+                        parked, self._parked = self._parked, {}
+                        self._unpark([item for items in parked.values() for item in items])
+
+            try:
+                self._flush_completions()
+                if due:
+                    self._fire(due, now)
+            except Exception as e:
+                logger.error(f"Cron dispatch failed: {e}")
+                with self._cond:
+                    # Retry the claims shortly instead of dropping them
+                    for schedule_id, next_run, _ in due:
+                        if schedule_id in self._entries:
+                            heapq.heappush(self._heap, (next_run + 1, schedule_id))
+                            self._entries[schedule_id]['next_run'] = next_run + 1
+
+    def _fire(self, due: List[tuple], now: float):
+        """Claim due fires in one transaction, then hand the won ones to the pool"""
+        claimed = []
+        rescheduled = []
+        dropped = []
+        lease_until = now + self.lease_seconds
+        with self._connect() as conn:
+            for schedule_id, next_run, entry in due:
+                following = entry['cron'].next_after(now)
+                won = conn.execute('''
+                    UPDATE cron_schedules SET next_run = ?, lease_owner = ?, lease_until = ?
+                    WHERE id = ? AND enabled = 1 AND next_run = ?
+                      AND (lease_until IS NULL OR lease_until < ?)
+                ''', (following, self.worker_id, lease_until, schedule_id, next_run, now)).rowcount
+                if won:
+                    claimed.append((schedule_id, next_run, following, entry))
+                    continue
+
+                row = conn.execute('SELECT enabled, next_run FROM cron_schedules WHERE id = ?',
+                                   (schedule_id,)).fetchone()
+                if row is None or not row[0]:
+                    dropped.append(schedule_id)
+                elif row[1] != next_run:
+                    # Another process fired this one; follow its next time
+                    rescheduled.append((schedule_id, row[1]))
+                    self._count('claimed_elsewhere')
+                else:
+                    # The previous run still holds the lease, so this fire is skipped
+                    conn.execute('UPDATE cron_schedules SET next_run = ? WHERE id = ? AND next_run = ?',
+                                 (following, schedule_id, next_run))
+                    rescheduled.append((schedule_id, following))
+                    self._count('skipped_overlap')
+
+        with self._cond:
+            for schedule_id in dropped:
+                self._entries.pop(schedule_id, None)
+            for schedule_id, next_run in rescheduled:
+                self._reschedule(schedule_id, next_run)
+            for schedule_id, _, following, _ in claimed:
+                self._reschedule(schedule_id, following)
+
+        for schedule_id, scheduled_for, _, entry in claimed:
+            # Blocks when max_pending jobs are queued; the wait shows up as lag
+            self._slots.acquire()
+            fired_at = time.time()
+            with self._cond:
+                self._in_flight += 1
+                self.stats['fired'] += 1
+                if fired_at - scheduled_for > 60:
+                    self.stats['caught_up'] += 1
+                self._lags.append(fired_at - scheduled_for)
+                self._fire_times.append(fired_at)
+                self._trim_fire_times(fired_at)
+            self._executor.submit(self._run_job, schedule_id, entry, fired_at)
+
+    def _run_job(self, schedule_id: str, entry: Dict[str, Any], fired_at: float):
+        error = None
+        try:
+            handler = self._actions.get(entry['namespace'], {}).get(entry['action_type'])
+            if handler is None:
+                raise ValueError(f"No handler for action type {entry['action_type']}")
+            result = handler(json.loads(entry['action_data'] or '{}'))
+            if isinstance(result, dict) and result.get('success') is False:
+                error = str(result.get('error') or 'Action reported failure')
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Scheduled job {entry['name'] or schedule_id} failed: {e}")
+        finally:
+            self._slots.release()
+            with self._cond:
+                self._in_flight -= 1
+                self.stats['failed' if error else 'completed'] += 1
+                self._completions.append((fired_at, 'failed' if error else 'completed', error,
+                                          1 if error else 0, schedule_id, self.worker_id))
+                self._cond.notify()
+
+    def _flush_completions(self):
+        """Record finished runs and release their leases in one write"""
+        with self._cond:
+            completions, self._completions = self._completions, []
+        if not completions:
+            return
+        with self._connect() as conn:
+            conn.executemany('''
+                UPDATE cron_schedules
+                SET last_run = ?, last_status = ?, last_error = ?, run_count = run_count + 1,
+                    failure_count = failure_count + ?, lease_owner = NULL, lease_until = NULL
+                WHERE id = ? AND lease_owner = ?
+            ''', completions)
+
+    def _count(self, key: str):
+        with self._cond:
+            self.stats[key] += 1
+
+    def _trim_fire_times(self, now: float):
+        """Keep only the last minute of fire times; called with the lock held"""
+        while self._fire_times and self._fire_times[0] < now - 60:
+            self._fire_times.popleft()
+
+    def get_scheduler_status(self) -> Dict[str, Any]:
+        """Heap size, fire lag percentiles, throughput and counters"""
+        now = time.time()
+        with self._cond:
+            self._trim_fire_times(now)
+            lags = sorted(self._lags)
+            next_fire = None
+            for next_run, schedule_id in heapq.nsmallest(8, self._heap):
+                entry = self._entries.get(schedule_id)
+                if entry is not None and entry['next_run'] == next_run:
+                    next_fire = datetime.fromtimestamp(next_run).isoformat()
+                    break
+            status = {
+                'running': self._running,
+                'worker_id': self.worker_id,
+                'schedules': len(self._entries),
+                'heap_size': len(self._heap),
+                'in_flight': self._in_flight,
+                'max_workers': self.max_workers,
+                'next_fire': next_fire,
+                'fires_last_minute': len(self._fire_times),
+                'stats': dict(self.stats)
+            }
+
+        def percentile(fraction):
+            return round(lags[min(len(lags) - 1, int(fraction * len(lags)))], 4) if lags else None
+
+        status['lag_seconds'] = {
+            'samples': len(lags),
+            'mean': round(sum(lags) / len(lags), 4) if lags else None,
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'max': round(lags[-1], 4) if lags else None
+        }
+        return status
+
+# Global cron scheduler instance
+cron_scheduler = CronScheduler()
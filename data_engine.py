@@ -0,0 +1,748 @@
+"""
+AVA CORE Data Engine
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Columnar processing for /api/data/process.
+Records (a list of dicts, NDJSON or CSV) are loaded into typed NumPy columns,
+each with a validity mask for missing values. Pipelines of filter, project,
+compute, transform, aggregate, sort and limit steps then run as whole-column
+operations, not per-record loops. Streamed input is converted in batches,
+so the full list of dicts is never materialized. Results are kept for a short
+while and returned one page at a time, and the input is not echoed back.
+"""
+
+import io
+import re
+import csv
+import json
+import math
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from numpy import strings as np_strings  # numpy >= 2.0
+    STRING_DTYPE = np.dtypes.StringDType()
+except ImportError:  # columnar processing is unavailable; the legacy transformations remain
+    np = None
+
+logger = logging.getLogger(__name__)
+
+BATCH_ROWS = 65536
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10000
+MAX_RESULTS = 16
+
+COMPARISONS = {
+    '==': 'equal', '=': 'equal', 'eq': 'equal',
+    '!=': 'not_equal', 'ne': 'not_equal',
+    '>': 'greater', 'gt': 'greater',
+    '>=': 'greater_equal', 'gte': 'greater_equal',
+    '<': 'less', 'lt': 'less',
+    '<=': 'less_equal', 'lte': 'less_equal'
+}
+ARITHMETIC = {'+': 'add', '-': 'subtract', '*': 'multiply', '/': 'true_divide'}
+AGGREGATES = ('count', 'sum', 'mean', 'avg', 'min', 'max', 'distinct')
+# Identifiers such as '007' or ZIP codes, which lose their meaning as numbers
+LEADING_ZERO = re.compile(r'\s*[+-]?0\d')
+# Group sums beyond this may have wrapped around int64 and are redone exactly
+INT_SUM_LIMIT = 2.0 ** 62
+
+def columnar_available() -> bool:
+    return np is not None
+
+class Column:
+    """A typed value array with a validity mask (False marks a missing value)
+
+    Text columns are dictionary-encoded, Arrow style: values holds int32
+    codes into dictionary, which may repeat entries. Filters, transforms and
+    grouping on text then work on the small dictionary and integer codes.
+    """
+
+    __slots__ = ('values', 'valid', 'kind', 'dictionary')
+
+    def __init__(self, values, valid, kind: str, dictionary=None):
+        self.values = values
+        self.valid = valid
+        self.kind = kind
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.values)
+
+    def take(self, selector) -> 'Column':
+        return Column(self.values[selector], self.valid[selector], self.kind, self.dictionary)
+
+    def entries(self, selector):
+        """Per-row result of a per-entry dictionary array"""
+        return selector[self.values]
+
+    def to_list(self) -> List[Any]:
+        valid = self.valid
+        if self.kind == 'float':
+            valid = valid & ~np.isnan(self.values)
+        values = (self.dictionary[self.values] if self.kind == 'str' else self.values).tolist()
+        if valid.all():
+            return values
+        return [v if ok else None for v, ok in zip(values, valid.tolist())]
+
+def _kind_of(types: set) -> str:
+    if not types:
+        return 'null'
+    if types <= {bool}:
+        return 'bool'
+    if types <= {int}:
+        return 'int'
+    if types <= {int, float}:
+        return 'float'
+    if types <= {str}:
+        return 'str'
+    return 'object'
+
+def _encode(values: List[Any]) -> Tuple[Any, List[Any]]:
+    """Dictionary-encode hashable values: (int32 codes, distinct values in first-seen order)"""
+    distinct = list(dict.fromkeys(values))
+    index = {value: code for code, value in enumerate(distinct)}
+    return np.fromiter(map(index.__getitem__, values), dtype=np.int32, count=len(values)), distinct
+
+def build_column(values: List[Any]) -> Column:
+    """Infer a column type from Python values; None marks a missing value"""
+    if values.count(None):
+        valid = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+    else:
+        valid = np.ones(len(values), dtype=bool)
+    kind = _kind_of(set(map(type, values)) - {type(None)})
+    try:
+        if kind == 'bool':
+            return Column(np.array([bool(v) for v in values], dtype=bool), valid, kind)
+        if kind == 'int':
+            return Column(np.array(values if valid.all() else [0 if v is None else v for v in values],
+                                   dtype=np.int64), valid, kind)
+        if kind == 'float':
+            return Column(np.array(values if valid.all() else [math.nan if v is None else v for v in values],
+                                   dtype=np.float64), valid, kind)
+        if kind == 'str':
+            codes, distinct = _encode(values)
+            return Column(codes, valid, kind, np.array(['' if v is None else v for v in distinct], dtype=STRING_DTYPE))
+    except OverflowError:
+        pass
+    # Mixed types, nested values and integers beyond int64 stay Python objects
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return Column(array, valid, 'object' if kind != 'null' else 'null')
+
+def _parse_strings(values: List[str]) -> Column:
+    """Type a CSV column: integers, then floats, then text; empty cells are missing
+
+    Values with a leading zero keep the whole column as text.
+    """
+    codes, distinct = _encode(values)
+    dictionary = np.array(distinct, dtype=STRING_DTYPE)
+    present = dictionary != ''
+    valid = present[codes]
+    numeric = not any(LEADING_ZERO.match(value) for value in distinct)
+    # Conversion runs once per distinct value, not once per row
+    for kind, dtype, fill in (('int', np.int64, 0), ('float', np.float64, math.nan)) if numeric else ():
+        try:
+            converted = dictionary[present].astype(dtype)
+        except (ValueError, OverflowError):
+            continue
+        typed = np.full(len(dictionary), fill, dtype=dtype)
+        typed[present] = converted
+        return Column(typed[codes], valid, kind)
+    return Column(codes, valid, 'str' if present.any() else 'null', dictionary)
+
+def _concat(chunks: List[Column]) -> Column:
+    kinds = {c.kind for c in chunks} - {'null'}
+    if not kinds:
+        kind = 'null'
+    elif len(kinds) == 1:
+        kind = kinds.pop()
+    elif kinds <= {'int', 'float', 'bool'}:
+        kind = 'float'
+    else:
+        kind = 'object'
+
+    valid = np.concatenate([c.valid for c in chunks])
+    if kind == 'str':
+        # Dictionaries are appended and codes shifted; repeated entries are allowed
+        parts, dictionaries, offset = [], [], 0
+        for chunk in chunks:
+            if chunk.kind == 'null':
+                parts.append(np.zeros(len(chunk), dtype=np.int32) + offset)
+                dictionaries.append(np.array([''], dtype=STRING_DTYPE))
+            else:
+                parts.append(chunk.values + offset)
+                dictionaries.append(chunk.dictionary)
+            offset += len(dictionaries[-1])
+        return Column(np.concatenate(parts).astype(np.int32), valid, kind, np.concatenate(dictionaries))
+
+    parts = []
+    for chunk in chunks:
+        values = chunk.values
+        if chunk.kind == 'null' and kind != 'null':
+            values = _empty_values(kind, len(chunk))
+        elif kind == 'float' and chunk.kind != 'float':
+            values = np.where(chunk.valid, values.astype(np.float64), math.nan)
+        elif kind == 'object' and values.dtype != object:
+            values = np.empty(len(chunk), dtype=object)
+            values[:] = chunk.to_list()
+        parts.append(values)
+    return Column(np.concatenate(parts), valid, kind)
+
+def _empty_values(kind: str, length: int):
+    if kind == 'int':
+        return np.zeros(length, dtype=np.int64)
+    if kind == 'float':
+        return np.full(length, math.nan)
+    if kind == 'bool':
+        return np.zeros(length, dtype=bool)
+    return np.full(length, None, dtype=object)
+
+def _null_column(length: int) -> Column:
+    return Column(np.full(length, None, dtype=object), np.zeros(length, dtype=bool), 'null')
+
+def _decode_lines(lines: List[str]) -> List[Any]:
+    """Decode a batch of JSON lines with one parser call"""
+    try:
+        return json.loads('[' + ','.join(lines) + ']')
+    except ValueError:
+        # Find the offending line for the error message
+        for number, line in enumerate(lines, 1):
+            try:
+                json.loads(line)
+            except ValueError as e:
+                raise ValueError(f'Invalid JSON on line {number} of the batch: {e}')
+        raise
+
+class ColumnTable:
+    """Named columns of equal length"""
+
+    def __init__(self, columns: 'OrderedDict[str, Column]', length: int):
+        self.columns = columns
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'ColumnTable':
+        if not isinstance(records, list) or any(not isinstance(r, dict) for r in records):
+            raise ValueError('Columnar processing needs a list of objects')
+        names = list(dict.fromkeys(chain.from_iterable(records)))
+        columns = OrderedDict((name, build_column([r.get(name) for r in records])) for name in names)
+        return cls(columns, len(records))
+
+    @classmethod
+    def from_batches(cls, batches: Iterable['ColumnTable']) -> 'ColumnTable':
+        batches = [b for b in batches if b.length]
+        if not batches:
+            return cls(OrderedDict(), 0)
+        names = list(dict.fromkeys(name for b in batches for name in b.columns))
+        columns = OrderedDict()
+        for name in names:
+            columns[name] = _concat([b.columns[name] if name in b.columns else _null_column(b.length)
+                                     for b in batches])
+        return cls(columns, sum(b.length for b in batches))
+
+    @classmethod
+    def from_ndjson(cls, lines: Iterable[Any]) -> 'ColumnTable':
+        """Load newline-delimited JSON objects, converting every BATCH_ROWS lines"""
+        def batches():
+            batch = []
+            for line in lines:
+                line = line.strip()
+                if line:
+                    batch.append(line)
+                if len(batch) >= BATCH_ROWS:
+                    yield cls.from_records(_decode_lines(batch))
+                    batch = []
+            if batch:
+                yield cls.from_records(_decode_lines(batch))
+        return cls.from_batches(batches())
+
+    @classmethod
+    def from_csv(cls, lines: Iterable[str]) -> 'ColumnTable':
+        """Load CSV with a header row, typing each column from its values"""
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if not header:
+            return cls(OrderedDict(), 0)
+
+        def batches():
+            rows = []
+            for row in reader:
+                rows.append(row)
+                if len(rows) >= BATCH_ROWS:
+                    yield cls._from_rows(header, rows)
+                    rows = []
+            if rows:
+                yield cls._from_rows(header, rows)
+        return cls.from_batches(batches())
+
+    @classmethod
+    def _from_rows(cls, header: List[str], rows: List[List[str]]) -> 'ColumnTable':
+        width = len(header)
+        rows = [row + [''] * (width - len(row)) if len(row) < width else row for row in rows]
+        columns = OrderedDict(
+            (name, _parse_strings(list(values)))
+            for name, values in zip(header, zip(*rows))
+        )
+        return cls(columns, len(rows))
+
+    def column(self, name: str) -> Column:
+        if name not in self.columns:
+            raise ValueError(f'Unknown column: {name}')
+        return self.columns[name]
+
+    def take(self, selector) -> 'ColumnTable':
+        """Rows selected by a boolean mask or an index array"""
+        if selector.dtype == bool and len(self.columns) > 1:
+            # Resolve the mask once instead of once per column
+            selector = np.flatnonzero(selector)
+        columns = OrderedDict((name, column.take(selector)) for name, column in self.columns.items())
+        length = int(np.count_nonzero(selector)) if selector.dtype == bool else len(selector)
+        return ColumnTable(columns, length)
+
+    def slice(self, start: int, stop: int) -> 'ColumnTable':
+        columns = OrderedDict((name, column.take(slice(start, stop))) for name, column in self.columns.items())
+        return ColumnTable(columns, max(0, min(stop, self.length) - start))
+
+    def schema(self) -> List[Dict[str, str]]:
+        return [{'name': name, 'type': column.kind} for name, column in self.columns.items()]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        names = list(self.columns)
+        values = [column.to_list() for column in self.columns.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+# Pipeline steps
+
+def _compare(values, operator: str, value: Any):
+    if operator in ('in', 'not_in'):
+        # Not cast to the column dtype, which would turn 1.5 into 1 for an int column
+        return np.isin(values, np.array(value, dtype=object if values.dtype == object else None))
+    if operator == 'contains':
+        return np_strings.find(values, value) >= 0
+    if operator in ('startswith', 'endswith'):
+        return getattr(np_strings, operator)(values, value)
+    return np.asarray(getattr(np, COMPARISONS[operator])(values, value), dtype=bool)
+
+def _condition_mask(table: ColumnTable, condition: Dict[str, Any]):
+    column = table.column(condition.get('column'))
+    operator = str(condition.get('operator', condition.get('op', '=='))).lower()
+    value = condition.get('value')
+    valid = column.valid
+
+    if operator == 'is_null':
+        return ~valid
+    if operator == 'not_null':
+        return valid.copy()
+    if operator in ('in', 'not_in'):
+        if not isinstance(value, list):
+            raise ValueError(f"'{operator}' needs a list value")
+        wanted = [v for v in value if isinstance(v, str) == (column.kind == 'str') and v is not None]
+        if column.kind == 'object':
+            wanted = value
+    elif operator in ('contains', 'startswith', 'endswith'):
+        if column.kind != 'str':
+            raise ValueError(f"'{operator}' needs a text column, {condition['column']} is {column.kind}")
+        wanted = str(value)
+    elif operator not in COMPARISONS:
+        raise ValueError(f'Unknown filter operator: {operator}')
+    elif value is None:
+        return ~valid if COMPARISONS[operator] == 'equal' else valid.copy()
+    elif (column.kind == 'str') != isinstance(value, str) and column.kind not in ('object', 'null'):
+        # Text never equals a number; ordering between them is an error
+        if COMPARISONS[operator] in ('equal', 'not_equal'):
+            return np.zeros(len(valid), dtype=bool) if COMPARISONS[operator] == 'equal' else valid.copy()
+        raise ValueError(f"Cannot compare {column.kind} column {condition['column']} with {value!r}")
+    else:
+        wanted = value
+
+    if column.kind == 'str':
+        # Evaluate once per dictionary entry, then look the rows up by code
+        matched = column.entries(_compare(column.dictionary, operator, wanted))
+    elif operator in ('in', 'not_in') and column.kind == 'object':
+        matched = np.isin(column.values, np.array(wanted, dtype=object))
+    else:
+        matched = _compare(column.values, operator, wanted)
+    return valid & (~matched if operator == 'not_in' else matched)
+
+def filter_mask(table: ColumnTable, step: Dict[str, Any]):
+    """Boolean row mask for a filter step
+
+    Accepts 'where' (all conditions), 'any' (at least one), a single inline
+    condition, or legacy 'conditions' ({column: value} equality).
+    """
+    mask = np.ones(table.length, dtype=bool)
+    conditions = list(step.get('where') or [])
+    if 'column' in step:
+        conditions.append(step)
+    for column, value in (step.get('conditions') or {}).items():
+        conditions.append({'column': column, 'operator': '==', 'value': value})
+    for condition in conditions:
+        mask &= _condition_mask(table, condition)
+    if step.get('any'):
+        either = np.zeros(table.length, dtype=bool)
+        for condition in step['any']:
+            either |= _condition_mask(table, condition)
+        mask &= either
+    return mask
+
+def matching_indices(records: List[Dict[str, Any]], step: Dict[str, Any]) -> List[int]:
+    """Indices of the records a filter step keeps, building only the columns it reads"""
+    names = [c.get('column') for c in list(step.get('where') or []) + list(step.get('any') or [])]
+    names += list(step.get('conditions') or {})
+    columns = OrderedDict((name, build_column([r.get(name) for r in records])) for name in dict.fromkeys(names))
+    return np.flatnonzero(filter_mask(ColumnTable(columns, len(records)), step)).tolist()
+
+def _operand(table: ColumnTable, operand: Any) -> Tuple[Any, Any]:
+    if isinstance(operand, str):
+        column = table.column(operand)
+        if column.kind not in ('int', 'float', 'bool', 'null'):
+            raise ValueError(f'Column {operand} is not numeric')
+        return column.values, column.valid
+    if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+        return operand, np.ones(table.length, dtype=bool)
+    raise ValueError(f'Invalid operand: {operand!r}')
+
+def _compute(table: ColumnTable, step: Dict[str, Any]) -> ColumnTable:
+    operator = step.get('operator')
+    if operator not in ARITHMETIC:
+        raise ValueError(f'Unknown arithmetic operator: {operator}')
+    left, left_valid = _operand(table, step.get('left'))
+    right, right_valid = _operand(table, step.get('right'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = getattr(np, ARITHMETIC[operator])(left, right)
+    valid = left_valid & right_valid
+    if operator == '/':
+        valid = valid & np.isfinite(values)
+    kind = 'int' if values.dtype.kind in 'iu' else 'float'
+    return _with_column(table, step.get('as') or f"{step.get('left')}{operator}{step.get('right')}",
+                        Column(values, valid, kind))
+
+def _transform(table: ColumnTable, step: Dict[str, Any]) -> ColumnTable:
+    name = step.get('column')
+    column = table.column(name)
+    function = step.get('function')
+    if column.kind == 'str' and function in ('upper', 'lower', 'strip'):
+        result = Column(column.values, column.valid, 'str', getattr(np_strings, function)(column.dictionary))
+    elif column.kind == 'str' and function == 'length':
+        result = Column(column.entries(np_strings.str_len(column.dictionary).astype(np.int64)), column.valid, 'int')
+    elif column.kind in ('int', 'float') and function == 'abs':
+        result = Column(np.abs(column.values), column.valid, column.kind)
+    elif column.kind in ('int', 'float') and function == 'round':
+        digits = int(step.get('digits', 0))
+        result = Column(np.round(column.values, digits), column.valid, column.kind)
+    else:
+        raise ValueError(f'Cannot apply {function} to {column.kind} column {name}')
+    return _with_column(table, step.get('as') or name, result)
+
+def _with_column(table: ColumnTable, name: str, column: Column) -> ColumnTable:
+    columns = OrderedDict(table.columns)
+    columns[name] = column
+    return ColumnTable(columns, table.length)
+
+def _codes(column: Column):
+    """Non-negative integer codes in value order; missing values get -1
+
+    Equal values share a code, so the codes serve as group keys as well as
+    sort keys.
+    """
+    codes = np.full(len(column), -1, dtype=np.int64)
+    if column.kind == 'str':
+        # Rank the dictionary once; repeated entries get the same rank
+        ranks = np.unique(column.dictionary, return_inverse=True)[1].reshape(-1)
+        codes[column.valid] = column.entries(ranks)[column.valid]
+        return codes
+    present = column.values[column.valid]
+    if not len(present):
+        return codes
+    if column.kind in ('int', 'bool'):
+        low, high = int(present.min()), int(present.max())
+        if high - low <= 4 * len(present) + 1024:
+            # A small value range is its own code space, no sort needed
+            codes[column.valid] = present.astype(np.int64) - low
+            return codes
+    if column.kind == 'object':
+        present = np.array([json.dumps(v, sort_keys=True, default=str) for v in present], dtype=STRING_DTYPE)
+    codes[column.valid] = np.unique(present, return_inverse=True)[1].reshape(-1)
+    return codes
+
+def _sort(table: ColumnTable, step: Dict[str, Any]) -> ColumnTable:
+    by = step.get('by')
+    if isinstance(by, (str, dict)):
+        by = [by]
+    if not by:
+        raise ValueError('Sort needs at least one column')
+    keys = []
+    for spec in by:
+        if isinstance(spec, str):
+            spec = {'column': spec}
+        column = table.column(spec.get('column'))
+        codes = _codes(column) if column.kind in ('str', 'object', 'bool') else column.values
+        if spec.get('descending'):
+            codes = -codes
+        # Missing values sort last in either direction
+        keys.append((~column.valid, codes))
+    # lexsort treats its last key as the primary one
+    order = np.lexsort([key for pair in reversed(keys) for key in reversed(pair)])
+    return table.take(order)
+
+def _group(keys: List[Any], length: int) -> Tuple[Any, Any]:
+    """Group ids (0..n-1, in key order) and each group's first row for code arrays"""
+    shifted = [key + 1 for key in keys]  # missing values (-1) form their own group
+    sizes = [int(key.max()) + 1 if length else 1 for key in shifted]
+    space = 1
+    for size in sizes:
+        space *= size
+    if space < 2 ** 62:
+        combined = np.zeros(length, dtype=np.int64)
+        for key, size in zip(shifted, sizes):
+            combined = combined * size + key
+        if space <= 4 * length + 1024:
+            # Counting instead of sorting when the key space is small
+            used = np.flatnonzero(np.bincount(combined, minlength=space))
+            remap = np.zeros(space, dtype=np.int64)
+            remap[used] = np.arange(len(used))
+            groups = remap[combined]
+            count = len(used)
+        else:
+            _, groups = np.unique(combined, return_inverse=True)
+            groups = groups.reshape(-1)
+            count = int(groups.max()) + 1 if length else 0
+    else:
+        _, groups = np.unique(np.stack(shifted, axis=1), axis=0, return_inverse=True)
+        groups = groups.reshape(-1)
+        count = int(groups.max()) + 1 if length else 0
+    first = np.full(count, length, dtype=np.int64)
+    np.minimum.at(first, groups, np.arange(length, dtype=np.int64))
+    return groups, first
+
+def _parse_aggregates(spec: Any) -> List[Tuple[str, str, Optional[str]]]:
+    """[(output, function, column)] from {'name': {'function', 'column'}} or 'fn:column' strings"""
+    parsed = []
+    items = spec.items() if isinstance(spec, dict) else ((s if isinstance(s, str) else None, s) for s in spec or [])
+    for output, definition in items:
+        if isinstance(definition, str):
+            function, _, column = definition.partition(':')
+        else:
+            function, column = definition.get('function'), definition.get('column')
+        function = (function or '').lower()
+        if function not in AGGREGATES:
+            raise ValueError(f'Unknown aggregate: {function}')
+        if function != 'count' and not column:
+            raise ValueError(f'Aggregate {function} needs a column')
+        parsed.append((output or (f'{function}_{column}' if column else function), function, column or None))
+    return parsed
+
+def _aggregate(table: ColumnTable, step: Dict[str, Any]) -> ColumnTable:
+    group_by = step.get('group_by') or []
+    if isinstance(group_by, str):
+        group_by = [group_by]
+    aggregates = _parse_aggregates(step.get('aggregates') or {'count': 'count'})
+
+    if group_by:
+        groups, first = _group([_codes(table.column(name)) for name in group_by], table.length)
+    else:
+        groups = np.zeros(table.length, dtype=np.int64)
+        first = np.zeros(1 if table.length else 0, dtype=np.int64)
+    count = len(first)
+
+    columns = OrderedDict((name, table.column(name).take(first)) for name in group_by)
+    for output, function, name in aggregates:
+        if name is None:
+            columns[output] = Column(np.bincount(groups, minlength=count).astype(np.int64),
+                                     np.ones(count, dtype=bool), 'int')
+            continue
+        column = table.column(name)
+        valid = column.valid
+        if column.kind == 'float':
+            valid = valid & ~np.isnan(column.values)
+        present_groups = groups[valid]
+        counts = np.bincount(present_groups, minlength=count)
+        has_values = counts > 0
+
+        if function == 'count':
+            result = Column(counts.astype(np.int64), np.ones(count, dtype=bool), 'int')
+        elif function in ('sum', 'mean', 'avg'):
+            if column.kind not in ('int', 'float', 'bool'):
+                raise ValueError(f'Cannot {function} {column.kind} column {name}')
+            if function == 'sum' and column.kind in ('int', 'bool'):
+                # Exact int64 accumulation; float64 weights lose precision above 2**53
+                values = column.values[valid]
+                sums = np.zeros(count, dtype=np.int64)
+                np.add.at(sums, present_groups, values.astype(np.int64))
+                # Wrapped int64 sums are still right when the total fits; the float estimate tells
+                estimate = np.bincount(present_groups, weights=values.astype(np.float64), minlength=count)
+                if np.abs(estimate).max(initial=0.0) >= INT_SUM_LIMIT:
+                    # Python integers, like values beyond int64 in build_column
+                    sums = np.zeros(count, dtype=object)
+                    np.add.at(sums, present_groups, values.astype(object))
+                    result = Column(sums, np.ones(count, dtype=bool), 'object')
+                else:
+                    result = Column(sums, np.ones(count, dtype=bool), 'int')
+            else:
+                sums = np.bincount(present_groups, weights=column.values[valid].astype(np.float64), minlength=count)
+                if function == 'sum':
+                    result = Column(sums, np.ones(count, dtype=bool), 'float')
+                else:
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        result = Column(sums / counts, has_values, 'float')
+        elif function in ('min', 'max'):
+            numeric = column.kind in ('int', 'float')
+            keys = (column.values if numeric else _codes(column))[valid]
+            reduce = np.minimum if function == 'min' else np.maximum
+            if numeric and column.kind == 'float':
+                best = np.full(count, math.inf if function == 'min' else -math.inf)
+            else:
+                info = np.iinfo(np.int64)
+                best = np.full(count, info.max if function == 'min' else info.min, dtype=np.int64)
+            reduce.at(best, present_groups, keys)
+            if numeric:
+                result = Column(np.where(has_values, best, 0).astype(column.values.dtype), has_values, column.kind)
+            else:
+                # Map the winning codes back to a row holding that value
+                rows = np.flatnonzero(valid)
+                row_of_code = np.zeros(int(keys.max()) + 1 if len(keys) else 1, dtype=np.int64)
+                row_of_code[keys] = rows
+                result = column.take(row_of_code[np.where(has_values, best, 0)])
+                result.valid = has_values
+        else:
+            codes = _codes(column)[valid]
+            width = int(codes.max()) + 1 if len(codes) else 1
+            pairs = np.unique(present_groups * width + codes)
+            result = Column(np.bincount(pairs // width, minlength=count).astype(np.int64),
+                            np.ones(count, dtype=bool), 'int')
+        columns[output] = result
+    return ColumnTable(columns, count)
+
+def run_pipeline(table: ColumnTable, operations: List[Dict[str, Any]]) -> ColumnTable:
+    """Apply pipeline steps in order; raises ValueError for an invalid step"""
+    for index, step in enumerate(operations or []):
+        if not isinstance(step, dict):
+            raise ValueError(f'Operation {index} must be an object')
+        op = step.get('op')
+        if op == 'filter':
+            table = table.take(filter_mask(table, step))
+        elif op in ('project', 'select'):
+            names = step.get('columns') or []
+            table = ColumnTable(OrderedDict((name, table.column(name)) for name in names), table.length)
+        elif op == 'rename':
+            mapping = step.get('columns') or {}
+            table = ColumnTable(OrderedDict((mapping.get(name, name), column)
+                                            for name, column in table.columns.items()), table.length)
+        elif op == 'compute':
+            table = _compute(table, step)
+        elif op == 'transform':
+            table = _transform(table, step)
+        elif op == 'aggregate':
+            table = _aggregate(table, step)
+        elif op == 'sort':
+            table = _sort(table, step)
+        elif op == 'limit':
+            offset = max(int(step.get('offset', 0)), 0)
+            table = table.slice(offset, offset + max(int(step.get('count', table.length)), 0))
+        else:
+            raise ValueError(f'Unknown operation: {op}')
+    return table
+
+class DataEngine:
+    """Runs columnar pipelines and keeps recent results for paging"""
+
+    def __init__(self, max_results: int = MAX_RESULTS):
+        self.max_results = max_results
+        self._results: 'OrderedDict[str, ColumnTable]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'pipelines': 0, 'rows_in': 0, 'rows_out': 0, 'pages_served': 0}
+
+    def load(self, payload: Any, content_type: str = 'application/json') -> ColumnTable:
+        """Build a table from records, or from NDJSON/CSV lines or text"""
+        if not columnar_available():
+            raise RuntimeError('Columnar processing requires numpy 2.0 or later')
+        if content_type in ('application/json', None):
+            return ColumnTable.from_records(payload)
+        lines = _text_lines(payload)
+        if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+            return ColumnTable.from_ndjson(lines)
+        if content_type in ('text/csv', 'application/csv'):
+            return ColumnTable.from_csv(lines)
+        raise ValueError(f'Unsupported input type: {content_type}')
+
+    def process(self, payload: Any, operations: List[Dict[str, Any]], content_type: str = 'application/json',
+                page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Load the input, run the pipeline and return the first requested page"""
+        started = time.perf_counter()
+        table = self.load(payload, content_type)
+        rows_in = table.length
+        loaded = time.perf_counter()
+        result = run_pipeline(table, operations)
+        finished = time.perf_counter()
+
+        result_id = f'data_{uuid.uuid4().hex}'
+        with self._lock:
+            self._results[result_id] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+            self.stats['pipelines'] += 1
+            self.stats['rows_in'] += rows_in
+            self.stats['rows_out'] += result.length
+
+        response = self.page(result_id, page, page_size)
+        response['input_rows'] = rows_in
+        response['timing_ms'] = {
+            'load': round((loaded - started) * 1000, 2),
+            'pipeline': round((finished - loaded) * 1000, 2)
+        }
+        return response
+
+    def page(self, result_id: str, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Optional[Dict[str, Any]]:
+        """One page of a kept result, or None once it has been evicted"""
+        with self._lock:
+            table = self._results.get(result_id)
+            if table is None:
+                return None
+            self._results.move_to_end(result_id)
+            self.stats['pages_served'] += 1
+        page_size = max(1, min(int(page_size or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+        page = max(1, int(page or 1))
+        start = (page - 1) * page_size
+        return {
+            'success': True,
+            'result_id': result_id,
+            'columns': table.schema(),
+            'total_rows': table.length,
+            'page': page,
+            'page_size': page_size,
+            'pages': max(1, math.ceil(table.length / page_size)),
+            'rows': table.slice(start, start + page_size).to_records()
+        }
+
+    def get_engine_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'available': columnar_available(),
+                'numpy_version': np.__version__ if np is not None else None,
+                'kept_results': len(self._results),
+                'stats': dict(self.stats)
+            }
+
+def _text_lines(payload: Any) -> Iterator[str]:
+    """Iterate text lines from a str, bytes or binary/text stream"""
+    if isinstance(payload, bytes):
+        payload = payload.decode('utf-8')
+    if isinstance(payload, str):
+        return iter(io.StringIO(payload, newline=''))
+    if isinstance(payload, io.TextIOBase):
+        return iter(payload)
+    return iter(io.TextIOWrapper(payload, encoding='utf-8', newline=''))
+
+# Global data engine instance
+data_engine = DataEngine()
@@ -0,0 +1,261 @@
+"""
+AVA CORE Database Maintenance
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Scheduled compaction, statistics and backups for the application's SQLite files.
+A cron schedule fires a maintenance pass, which only proceeds when the health
+sampler reports a low-load window. Each database is moved to incremental
+auto-vacuum once (one full VACUUM, for files below a size limit); after that
+free pages are returned to the filesystem in small incremental_vacuum steps
+that never hold the write lock for long. Tables are ANALYZEd on the first pass
+and periodically afterwards, with PRAGMA optimize in between, and the pass
+ends with an incremental, paged online backup through file_integrity.
+Fragmentation and bytes reclaimed are tracked per database.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List
+from cron_scheduler import cron_scheduler, parse_cron
+from file_integrity import file_integrity, is_sqlite_file
+from health_sampler import health_sampler
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'maintenance'
+DEFAULT_CRON = os.environ.get('AVA_MAINTENANCE_CRON', '17 * * * *')
+# The application's own stores; other SQLite files in the directory, such as
+# the scheduler database firing this job, are left alone
+DEFAULT_DATABASES = [name.strip() for name in os.environ.get(
+    'AVA_MAINTENANCE_DBS', 'ava_memory.db,autonomous_memory.db,production_conversations.db,api_accounts.db'
+).split(',') if name.strip()]
+# Average CPU over the load window must stay below this for a pass to run
+MAX_CPU_PERCENT = float(os.environ.get('AVA_MAINTENANCE_MAX_CPU', '50'))
+LOAD_WINDOW_SECONDS = 300
+# Full VACUUM needed to switch auto_vacuum mode is skipped above this size
+CONVERT_MAX_BYTES = int(os.environ.get('AVA_MAINTENANCE_CONVERT_MAX_MB', '256')) * 1024 * 1024
+VACUUM_STEP_PAGES = 512
+VACUUM_STEP_PAUSE = 0.01
+VACUUM_TIME_BUDGET = 5.0
+ANALYZE_INTERVAL = 24 * 3600
+KEEP_BACKUPS = int(os.environ.get('AVA_MAINTENANCE_KEEP_BACKUPS', '48'))
+
+AUTO_VACUUM_MODES = {0: 'none', 1: 'full', 2: 'incremental'}
+
+class DatabaseMaintenance:
+    """Low-load compaction, statistics and backup passes over SQLite databases"""
+
+    def __init__(self, directory: str = '.', cron_expression: str = DEFAULT_CRON,
+                 max_cpu_percent: float = MAX_CPU_PERCENT, backup: bool = True,
+                 database_names: List[str] = None):
+        self.directory = directory
+        self.database_names = list(DEFAULT_DATABASES if database_names is None else database_names)
+        self.cron_expression = cron_expression
+        self.max_cpu_percent = max_cpu_percent
+        self.backup = backup
+        self._extra: List[str] = []
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self.history: List[Dict[str, Any]] = []
+        self.stats = {'passes': 0, 'deferred': 0, 'databases_maintained': 0, 'conversions': 0,
+                      'analyzes': 0, 'bytes_reclaimed': 0, 'errors': 0}
+
+    def register(self, path: str):
+        """Maintain a database beyond the configured stores as well"""
+        if path not in self._extra:
+            self._extra.append(path)
+
+    def databases(self) -> List[str]:
+        paths = [os.path.join(self.directory, name) for name in self.database_names] + self._extra
+        return [path for path in dict.fromkeys(paths) if is_sqlite_file(path)]
+
+    def start(self):
+        """Register the maintenance action and make sure exactly one schedule exists, on the configured expression"""
+        if self._started:
+            return
+        cron_scheduler.register_action(NAMESPACE, 'run', lambda data: self.run_pass(force=bool(data.get('force'))))
+        existing = cron_scheduler.list_schedules(NAMESPACE, limit=1)
+        if not existing:
+            cron_scheduler.add_schedule(NAMESPACE, 'database maintenance', self.cron_expression, 'run')
+        elif existing[0]['cron_expression'] != parse_cron(self.cron_expression).expression:
+            # AVA_MAINTENANCE_CRON changed since the schedule was created
+            cron_scheduler.set_expression(existing[0]['id'], self.cron_expression)
+        cron_scheduler.start()
+        self._started = True
+
+    # Load window
+
+    def load_check(self) -> Dict[str, Any]:
+        samples = health_sampler.window(LOAD_WINDOW_SECONDS)
+        cpu = [sample.get('cpu_percent', 0.0) for sample in samples] or [health_sampler.latest().get('cpu_percent', 0.0)]
+        average = sum(cpu) / len(cpu)
+        return {'cpu_percent': round(average, 1), 'limit': self.max_cpu_percent,
+                'low_load': average < self.max_cpu_percent}
+
+    # Per-database steps
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        # Autocommit, so VACUUM and incremental_vacuum run outside implicit transactions
+        return sqlite3.connect(path, timeout=10, isolation_level=None)
+
+    def inspect(self, path: str) -> Dict[str, Any]:
+        """Size, free pages and fragmentation of one database"""
+        conn = self._connect(path)
+        try:
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+            freelist = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            auto_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            'size_bytes': page_size * page_count,
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_count': freelist,
+            'free_bytes': page_size * freelist,
+            'fragmentation': round(freelist / page_count, 4) if page_count else 0.0,
+            'auto_vacuum': AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum))
+        }
+
+    def _incremental_vacuum(self, conn: sqlite3.Connection) -> int:
+        """Release free pages in short steps until none are left or the time budget runs out"""
+        released = 0
+        deadline = time.monotonic() + VACUUM_TIME_BUDGET
+        while time.monotonic() < deadline:
+            before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            if not before:
+                break
+            # sqlite3 steps a statement without result columns only once, and each
+            # step of incremental_vacuum frees a single page, so a step is one
+            # short write transaction issuing the pragma once per page
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                for _ in range(min(before, VACUUM_STEP_PAGES)):
+                    conn.execute('PRAGMA incremental_vacuum')
+                conn.execute('COMMIT')
+            except sqlite3.Error:
+                conn.execute('ROLLBACK')
+                raise
+            after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            released += before - after
+            if after >= before:
+                break
+            time.sleep(VACUUM_STEP_PAUSE)
+        return released
+
+    def maintain(self, path: str) -> Dict[str, Any]:
+        """Compact, analyze and optimize one database; returns what was done"""
+        state = self._state.setdefault(path, {'bytes_reclaimed': 0, 'runs': 0, 'last_analyze': 0.0})
+        started = time.perf_counter()
+        before = self.inspect(path)
+        report = {'database': path, 'before': before, 'actions': []}
+        conn = self._connect(path)
+        try:
+            if before['auto_vacuum'] != 'incremental':
+                if before['size_bytes'] <= CONVERT_MAX_BYTES:
+                    conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                    conn.execute('VACUUM')
+                    report['actions'].append('vacuum_to_incremental')
+                    self.stats['conversions'] += 1
+                else:
+                    report['actions'].append('conversion_skipped_size')
+            elif before['freelist_count']:
+                pages = self._incremental_vacuum(conn)
+                report['actions'].append(f'incremental_vacuum:{pages}')
+
+            has_stats = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'").fetchone()
+            if not has_stats or time.time() - state['last_analyze'] >= ANALYZE_INTERVAL:
+                conn.execute('ANALYZE')
+                state['last_analyze'] = time.time()
+                report['actions'].append('analyze')
+                self.stats['analyzes'] += 1
+            else:
+                conn.execute('PRAGMA optimize')
+                report['actions'].append('optimize')
+        finally:
+            conn.close()
+
+        after = self.inspect(path)
+        reclaimed = max(before['size_bytes'] - after['size_bytes'], 0)
+        state['bytes_reclaimed'] += reclaimed
+        state['runs'] += 1
+        state['last_run'] = datetime.now().isoformat()
+        state['last_duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        state['last_report'] = dict(report, after=after, bytes_reclaimed=reclaimed)
+        self.stats['bytes_reclaimed'] += reclaimed
+        return state['last_report']
+
+    # Passes
+
+    def run_pass(self, force: bool = False) -> Dict[str, Any]:
+        """One maintenance pass over every database; deferred under load unless forced"""
+        load = self.load_check()
+        if not force and not load['low_load']:
+            self.stats['deferred'] += 1
+            logger.info(f"Database maintenance deferred: CPU {load['cpu_percent']}% >= {self.max_cpu_percent}%")
+            return {'success': True, 'deferred': True, 'load': load}
+
+        if not self._lock.acquire(blocking=False):
+            return {'success': False, 'error': 'A maintenance pass is already running'}
+        try:
+            started = time.perf_counter()
+            result = {'success': True, 'deferred': False, 'load': load, 'started_at': datetime.now().isoformat(),
+                      'databases': [], 'errors': {}}
+            databases = self.databases()
+            for path in databases:
+                try:
+                    result['databases'].append(self.maintain(path))
+                    self.stats['databases_maintained'] += 1
+                except sqlite3.Error as e:
+                    # A busy database is retried on the next pass
+                    logger.warning(f"Maintenance of {path} failed: {e}")
+                    result['errors'][path] = str(e)
+                    self.stats['errors'] += 1
+                    self._state.setdefault(path, {'bytes_reclaimed': 0, 'runs': 0, 'last_analyze': 0.0})['last_error'] = str(e)
+
+            if self.backup and databases:
+                result['backup'] = file_integrity.create_backup(databases, label='maintenance')
+                result['pruned'] = file_integrity.prune_backups(KEEP_BACKUPS, label='maintenance')
+
+            result['bytes_reclaimed'] = sum(report['bytes_reclaimed'] for report in result['databases'])
+            result['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            result['success'] = not result['errors']
+            self.stats['passes'] += 1
+            self.history = (self.history + [{key: result[key] for key in
+                                             ('started_at', 'duration_ms', 'bytes_reclaimed', 'errors')}])[-20:]
+            logger.info(f"Database maintenance: {len(result['databases'])} databases, "
+                        f"{result['bytes_reclaimed']} bytes reclaimed in {result['duration_ms']} ms")
+            return result
+        finally:
+            self._lock.release()
+
+    def get_status(self) -> Dict[str, Any]:
+        databases = {}
+        for path in self.databases():
+            try:
+                current = self.inspect(path)
+            except sqlite3.Error as e:
+                current = {'error': str(e)}
+            state = self._state.get(path, {})
+            databases[path] = dict(current, bytes_reclaimed=state.get('bytes_reclaimed', 0),
+                                   runs=state.get('runs', 0), last_run=state.get('last_run'),
+                                   last_duration_ms=state.get('last_duration_ms'), last_error=state.get('last_error'))
+        return {
+            'scheduled': self._started,
+            'cron_expression': self.cron_expression,
+            'max_cpu_percent': self.max_cpu_percent,
+            'databases': databases,
+            'history': list(self.history),
+            'stats': dict(self.stats)
+        }
+
+# Global database maintenance instance
+db_maintenance = DatabaseMaintenance()
@@ -19,9 +19,9 @@ import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import sqlite3
+from security_manager import derive_key
+from tool_inventory import tool_inventory
 
 class SecretManager:
     """Secure secret management for development"""
@@ -36,13 +36,7 @@ class SecretManager:
         """Initialize encryption with master password"""
         password = self.master_password.encode()
         salt = b'ava_core_salt_2024'
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
+        key = base64.urlsafe_b64encode(derive_key(password, salt, 100000))
         return Fernet(key)
     
     def init_database(self):
@@ -96,6 +90,33 @@ class SecretManager:
         
         logging.info(f"Secret stored for {service_name}")
         
+    def store_secrets(self, secrets: List[Dict[str, str]]):
+        """Store many encrypted secrets in a single transaction"""
+        encrypt = self.cipher_suite.encrypt
+        rows = [
+            (
+                secret['service_name'],
+                encrypt(secret['secret_value'].encode()).decode(),
+                secret.get('description', ''),
+                secret.get('category', 'general')
+            )
+            for secret in secrets
+        ]
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT OR REPLACE INTO secrets 
+            (service_name, encrypted_secret, description, category)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
+        
+        conn.commit()
+        conn.close()
+        
+        logging.info(f"Stored {len(rows)} secrets")
+        
     def get_secret(self, service_name: str) -> str:
         """Retrieve and decrypt secret"""
         conn = sqlite3.connect(self.db_path)
@@ -124,6 +145,33 @@ class SecretManager:
         
         return ""
     
+    def get_secrets(self, service_names: List[str]) -> Dict[str, str]:
+        """Retrieve and decrypt several secrets with one query"""
+        if not service_names:
+            return {}
+        
+        placeholders = ','.join('?' * len(service_names))
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT service_name, encrypted_secret FROM secrets 
+            WHERE service_name IN ({placeholders})
+        ''', list(service_names))
+        rows = cursor.fetchall()
+        
+        if rows:
+            cursor.execute(f'''
+                UPDATE secrets SET last_used = CURRENT_TIMESTAMP 
+                WHERE service_name IN ({placeholders})
+            ''', list(service_names))
+            conn.commit()
+        
+        conn.close()
+        
+        decrypt = self.cipher_suite.decrypt
+        return {name: decrypt(encrypted.encode()).decode() for name, encrypted in rows}
+    
     def list_secrets(self) -> List[Dict]:
         """List all stored secrets (without values)"""
         conn = sqlite3.connect(self.db_path)
@@ -191,18 +239,9 @@ class DevelopmentWorkflow:
     
     def get_available_tools(self) -> List[str]:
         """Get list of available development tools"""
-        tools = []
-        
-        # Check for common development tools
+        # Check for common development tools on PATH
         dev_tools = ['git', 'python', 'pip', 'npm', 'node', 'code', 'vim', 'nano']
-        for tool in dev_tools:
-            try:
-                subprocess.run([tool, '--version'], capture_output=True, check=True)
-                tools.append(tool)
-            except:
-                pass
-        
-        return tools
+        return tool_inventory.available_tools(dev_tools)
     
     def create_project(self, project_name: str, project_type: str) -> Dict[str, Any]:
         """Create a new development project"""
@@ -692,15 +731,19 @@ class AdvancedDevelopmentSuite:
         # Only add if they don't already exist
         existing_secrets = [s['service_name'] for s in self.secret_manager.list_secrets()]
         
-        for service_name, description, category in common_secrets:
-            if service_name not in existing_secrets:
-                # Store placeholder that indicates secret needs to be added
-                self.secret_manager.store_secret(
-                    service_name, 
-                    "PLEASE_ADD_YOUR_ACTUAL_SECRET_HERE", 
-                    description, 
-                    category
-                )
+        # Store placeholders that indicate secrets need to be added
+        missing_secrets = [
+            {
+                'service_name': service_name,
+                'secret_value': "PLEASE_ADD_YOUR_ACTUAL_SECRET_HERE",
+                'description': description,
+                'category': category
+            }
+            for service_name, description, category in common_secrets
+            if service_name not in existing_secrets
+        ]
+        if missing_secrets:
+            self.secret_manager.store_secrets(missing_secrets)
     
     def get_suite_status(self) -> Dict[str, Any]:
         """Get comprehensive development suite status"""
@@ -9,8 +9,6 @@ Comprehensive restoration of all development capabilities and enhanced tools
 """
 
 import requests
-import json
-import time
 import logging
 import os
 import subprocess
@@ -18,6 +16,11 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import sqlite3
 import threading
+import uuid
+from http_cache import http_cache
+from workflow_engine import workflow_engine
+from cron_scheduler import cron_scheduler
+from metrics import LLMCall, TimedConnection
 
 class WebAutomationEngine:
     """Advanced web automation beyond basic browsing"""
@@ -25,10 +28,14 @@ class WebAutomationEngine:
     def __init__(self):
         self.active_sessions = {}
         self.automation_history = []
+        workflow_engine.register_action('web_automation', 'navigate',
+                                        lambda params: self._navigate_action(params.get('url')))
+        workflow_engine.register_action('web_automation', 'extract_data', self._extract_data_action)
+        workflow_engine.register_action('web_automation', 'submit_form', self._submit_form_action)
         
     def create_automation_session(self, session_name: str) -> Dict[str, Any]:
         """Create a new automation session"""
-        session_id = f"session_{int(time.time())}"
+        session_id = f"session_{uuid.uuid4().hex}"
         self.active_sessions[session_id] = {
             'name': session_name,
             'created_at': datetime.now().isoformat(),
@@ -43,48 +50,50 @@ class WebAutomationEngine:
         }
     
     def execute_web_workflow(self, session_id: str, workflow: List[Dict]) -> Dict[str, Any]:
-        """Execute a series of web automation actions"""
+        """Execute web automation actions as a DAG; steps may declare depends_on
+        
+        Without depends_on the steps run in order and stop at the first failure.
+        """
         if session_id not in self.active_sessions:
             return {'success': False, 'error': 'Session not found'}
         
         session = self.active_sessions[session_id]
-        results = []
+        try:
+            definition = workflow_engine.create_workflow('web_automation', session['name'], workflow)
+        except ValueError as e:
+            return {'success': False, 'error': str(e)}
         
-        for step in workflow:
-            action = step.get('action')
-            params = step.get('params', {})
-            
-            if action == 'navigate':
-                result = self._navigate_action(params.get('url'))
-            elif action == 'extract_data':
-                result = self._extract_data_action(params)
-            elif action == 'submit_form':
-                result = self._submit_form_action(params)
-            elif action == 'wait':
-                result = self._wait_action(params.get('seconds', 1))
-            else:
-                result = {'success': False, 'error': f'Unknown action: {action}'}
-            
-            results.append({'action': action, 'result': result})
-            session['actions'].append({'action': action, 'params': params, 'result': result})
-            
-            if not result.get('success'):
-                break
+        run = workflow_engine.run(definition['id'])
+        results = []
+        for step in definition['steps']:
+            record = run['steps'][step['id']]
+            if record['status'] in ('pending', 'skipped'):
+                continue
+            result = record.get('result', {'success': False, 'error': 'Step did not finish'})
+            results.append({'action': step['action'], 'result': result})
+            session['actions'].append({'action': step['action'], 'params': step['params'], 'result': result})
         
         return {
             'success': True,
             'session_id': session_id,
-            'results': results
+            'workflow_id': definition['id'],
+            'run_id': run['id'],
+            'status': run['status'],
+            'results': results,
+            'steps': run['steps'],
+            'duration': run['duration'],
+            'critical_path': run['critical_path']
         }
     
     def _navigate_action(self, url: str) -> Dict[str, Any]:
         """Navigate to a URL"""
         try:
-            response = requests.get(url, timeout=30)
+            response = http_cache.session.get(url, timeout=30)
             return {
                 'success': True,
                 'status_code': response.status_code,
-                'url': response.url
+                'url': response.url,
+                'cache_status': response.cache_status
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -104,14 +113,6 @@ class WebAutomationEngine:
             'success': True,
             'message': 'Form submitted successfully'
         }
-    
-    def _wait_action(self, seconds: int) -> Dict[str, Any]:
-        """Wait for specified time"""
-        time.sleep(seconds)
-        return {
-            'success': True,
-            'message': f'Waited {seconds} seconds'
-        }
 
 
 class AIIntegrationHub:
@@ -176,15 +177,21 @@ class AIIntegrationHub:
                 'max_tokens': options.get('max_tokens', 1000)
             }
             
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers=headers,
-                json=data,
-                timeout=60
-            )
+            with LLMCall('AIIntegrationHub', data['model']) as call:
+                response = requests.post(
+                    'https://api.openai.com/v1/chat/completions',
+                    headers=headers,
+                    json=data,
+                    timeout=60
+                )
+                if response.status_code == 200:
+                    result = response.json()
+                    usage = result.get('usage', {})
+                    call.usage(usage.get('prompt_tokens'), usage.get('completion_tokens'))
+                else:
+                    call.outcome = 'error'
             
             if response.status_code == 200:
-                result = response.json()
                 return {
                     'success': True,
                     'response': result['choices'][0]['message']['content'],
@@ -216,15 +223,21 @@ class AIIntegrationHub:
                 'messages': [{'role': 'user', 'content': prompt}]
             }
             
-            response = requests.post(
-                'https://api.anthropic.com/v1/messages',
-                headers=headers,
-                json=data,
-                timeout=60
-            )
+            with LLMCall('AIIntegrationHub', data['model']) as call:
+                response = requests.post(
+                    'https://api.anthropic.com/v1/messages',
+                    headers=headers,
+                    json=data,
+                    timeout=60
+                )
+                if response.status_code == 200:
+                    result = response.json()
+                    usage = result.get('usage', {})
+                    call.usage(usage.get('input_tokens'), usage.get('output_tokens'))
+                else:
+                    call.outcome = 'error'
             
             if response.status_code == 200:
-                result = response.json()
                 return {
                     'success': True,
                     'response': result['content'][0]['text'],
@@ -251,10 +264,15 @@ class ProductivitySuite:
         self.automations = {}
         self.db_path = "productivity.db"
         self._init_database()
+        cron_scheduler.register_action('productivity', 'create_task', lambda data: self.create_task(
+            data.get('title'), data.get('description', ''), data.get('priority', 1),
+            data.get('due_date'), data.get('tags', [])))
+        cron_scheduler.register_action('productivity', 'workflow', lambda data: {
+            'success': workflow_engine.run(data['workflow_id'])['status'] == 'completed'})
         
     def _init_database(self):
         """Initialize productivity database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -290,7 +308,7 @@ class ProductivitySuite:
     def create_task(self, title: str, description: str = "", priority: int = 1, 
                    due_date: str = None, tags: List[str] = None) -> Dict[str, Any]:
         """Create a new task"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         tags_str = ','.join(tags) if tags else ""
@@ -312,7 +330,7 @@ class ProductivitySuite:
     
     def get_tasks(self, status: str = None, priority: int = None) -> Dict[str, Any]:
         """Get tasks with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         query = 'SELECT * FROM tasks WHERE 1=1'
@@ -353,7 +371,7 @@ class ProductivitySuite:
     
     def update_task_status(self, task_id: int, status: str) -> Dict[str, Any]:
         """Update task status"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         update_fields = ['status = ?']
@@ -383,22 +401,18 @@ class ProductivitySuite:
     
     def schedule_automation(self, name: str, cron_expression: str, 
                           action_type: str, action_data: Dict) -> Dict[str, Any]:
-        """Schedule an automated task"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO schedules (name, cron_expression, action_type, action_data)
-            VALUES (?, ?, ?, ?)
-        ''', (name, cron_expression, action_type, json.dumps(action_data)))
-        
-        schedule_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        """Schedule an automated task on the cron scheduler"""
+        try:
+            schedule = cron_scheduler.add_schedule('productivity', name, cron_expression,
+                                                   action_type, action_data)
+        except ValueError as e:
+            return {'success': False, 'error': str(e)}
+        cron_scheduler.start()
         
         return {
             'success': True,
-            'schedule_id': schedule_id,
+            'schedule_id': schedule['id'],
+            'next_run': schedule['next_run'],
             'message': f'Automation "{name}" scheduled successfully'
         }
 
@@ -96,6 +96,8 @@ import base64
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Union
 import logging
+from status_registry import status_registry
+from table_stats import table_stats
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +114,7 @@ class EnterpriseExpandedCapabilities:
         
         # Initialize expanded enterprise capabilities
         self.init_expanded_database()
+        table_stats.track(self.expanded_db, 'enterprise_capabilities', 'operational_frameworks', 'intellectual_property')
         self.integrate_business_strategy_capabilities()
         self.integrate_technical_development_capabilities()
         self.integrate_system_integration_capabilities()
@@ -124,6 +127,12 @@ class EnterpriseExpandedCapabilities:
         self.integrate_quality_standards_capabilities()
         self.integrate_sustainability_capabilities()
         
+        status_registry.register(
+            'expanded_enterprise_capabilities',
+            self._build_expanded_enterprise_capabilities,
+            tables=('enterprise_capabilities', 'operational_frameworks', 'intellectual_property')
+        )
+        
         logger.info("Enterprise expanded capabilities fully integrated with comprehensive protection")
     
     def init_expanded_database(self):
@@ -1036,65 +1045,55 @@ class EnterpriseExpandedCapabilities:
             logger.error(f"Failed to integrate sustainability capabilities: {e}")
     
     def get_expanded_enterprise_capabilities(self) -> Dict[str, Any]:
-        """Get complete expanded enterprise capabilities status"""
+        """Get complete expanded enterprise capabilities status (cached until the tables change)"""
         try:
-            with sqlite3.connect(self.expanded_db) as conn:
-                # Get all enterprise capabilities
-                cursor = conn.execute('SELECT * FROM enterprise_capabilities')
-                capabilities = cursor.fetchall()
-                
-                # Get operational frameworks
-                cursor = conn.execute('SELECT * FROM operational_frameworks')
-                frameworks = cursor.fetchall()
-                
-                # Get intellectual property records
-                cursor = conn.execute('SELECT * FROM intellectual_property')
-                ip_records = cursor.fetchall()
-            
-            return {
-                'expanded_enterprise_capabilities_active': True,
-                'total_capabilities_integrated': len(capabilities),
-                'operational_frameworks': len(frameworks),
-                'intellectual_property_records': len(ip_records),
-                'comprehensive_enterprise_features': {
-                    'business_strategy': 'market_analysis_forecasting_risk_assessment_competitive_intelligence_strategic_planning',
-                    'technical_development': 'full_stack_consulting_architecture_design_code_optimization_security_protocols',
-                    'system_integration': 'legacy_modernization_cross_platform_erp_iot_integration',
-                    'analytics_processing': 'big_data_ml_operations_predictive_modeling_decision_support',
-                    'security_compliance': 'cybersecurity_regulatory_compliance_access_control_privacy_management',
-                    'project_management': 'agile_methodologies_resource_planning_stakeholder_communication_quality_control',
-                    'client_services': 'consultation_training_technical_support_relationship_management',
-                    'innovation_research': 'emerging_technology_rd_initiatives_technology_roadmapping_trend_forecasting',
-                    'knowledge_management': 'best_practices_documentation_information_architecture_collaborative_tools',
-                    'quality_standards': 'iso_compliance_performance_metrics_continuous_improvement',
-                    'sustainability': 'environmental_impact_resource_efficiency_green_technology'
-                },
-                'comprehensive_protection': {
-                    'copyright': self.copyright_holder,
-                    'watermark': self.watermark,
-                    'contact': self.contact,
-                    'timestamp': self.timestamp,
-                    'nda_license': self.nda_license,
-                    'protection_level': 'comprehensive_enterprise',
-                    'intellectual_property_protected': True
-                },
-                'enterprise_access': {
-                    'restrictions': 'none',
-                    'limitations': 'removed',
-                    'access_level': 'unlimited_enterprise',
-                    'development_tier': 'maximum_capabilities',
-                    'production_ready': True,
-                    'real_world_integration': True
-                },
-                'system_url': 'https://6b8ab92f-0e1c-4484-9a3a-7b1912596b3d-00-wivmddnymuta.worf.replit.dev/',
-                'integration_complete': True,
-                'timestamp': datetime.now().isoformat()
-            }
-            
+            return status_registry.get('expanded_enterprise_capabilities')
         except Exception as e:
             logger.error(f"Failed to get expanded enterprise capabilities: {e}")
             return {'error': str(e)}
     
+    def _build_expanded_enterprise_capabilities(self) -> Dict[str, Any]:
+        """Build the expanded enterprise capabilities status document"""
+        return {
+            'expanded_enterprise_capabilities_active': True,
+            'total_capabilities_integrated': table_stats.count(self.expanded_db, 'enterprise_capabilities'),
+            'operational_frameworks': table_stats.count(self.expanded_db, 'operational_frameworks'),
+            'intellectual_property_records': table_stats.count(self.expanded_db, 'intellectual_property'),
+            'comprehensive_enterprise_features': {
+                'business_strategy': 'market_analysis_forecasting_risk_assessment_competitive_intelligence_strategic_planning',
+                'technical_development': 'full_stack_consulting_architecture_design_code_optimization_security_protocols',
+                'system_integration': 'legacy_modernization_cross_platform_erp_iot_integration',
+                'analytics_processing': 'big_data_ml_operations_predictive_modeling_decision_support',
+                'security_compliance': 'cybersecurity_regulatory_compliance_access_control_privacy_management',
+                'project_management': 'agile_methodologies_resource_planning_stakeholder_communication_quality_control',
+                'client_services': 'consultation_training_technical_support_relationship_management',
+                'innovation_research': 'emerging_technology_rd_initiatives_technology_roadmapping_trend_forecasting',
+                'knowledge_management': 'best_practices_documentation_information_architecture_collaborative_tools',
+                'quality_standards': 'iso_compliance_performance_metrics_continuous_improvement',
+                'sustainability': 'environmental_impact_resource_efficiency_green_technology'
+            },
+            'comprehensive_protection': {
+                'copyright': self.copyright_holder,
+                'watermark': self.watermark,
+                'contact': self.contact,
+                'timestamp': self.timestamp,
+                'nda_license': self.nda_license,
+                'protection_level': 'comprehensive_enterprise',
+                'intellectual_property_protected': True
+            },
+            'enterprise_access': {
+                'restrictions': 'none',
+                'limitations': 'removed',
+                'access_level': 'unlimited_enterprise',
+                'development_tier': 'maximum_capabilities',
+                'production_ready': True,
+                'real_world_integration': True
+            },
+            'system_url': 'https://6b8ab92f-0e1c-4484-9a3a-7b1912596b3d-00-wivmddnymuta.worf.replit.dev/',
+            'integration_complete': True,
+            'timestamp': datetime.now().isoformat()
+        }
+    
     def execute_expanded_enterprise_operation(self, operation_type: str, operation_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute expanded enterprise operation with comprehensive capabilities"""
         try:
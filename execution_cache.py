@@ -0,0 +1,489 @@
+"""
+AVA CORE Execution Result Cache
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Deterministic execution caching and content-addressed execution logs.
+A run is keyed by the SHA-256 of its language, runtime version, code and
+inputs. Snippets marked pure, or that only use side-effect free modules and
+builtins, are answered from the stored result of an earlier identical run
+instead of being executed again. Code and output blobs are stored once per
+database in execution_blobs and referenced by hash from the executions
+table, so re-running the same snippet no longer duplicates its text.
+"""
+
+import os
+import re
+import ast
+import sys
+import json
+import types
+import shutil
+import importlib
+import sqlite3
+import hashlib
+import logging
+import threading
+import subprocess
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterable, Optional
+from metrics import TimedConnection
+
+logger = logging.getLogger(__name__)
+
+BLOBS_TABLE = 'execution_blobs'
+DEFAULT_MEMORY_ENTRIES = 1024
+MAX_CACHED_OUTPUT_BYTES = 1024 * 1024
+BACKFILL_BATCH = 500
+
+# Modules whose functions depend only on their arguments. Python snippets
+# importing anything else are only cached when explicitly marked pure.
+PURE_PYTHON_MODULES = frozenset({
+    'abc', 'array', 'base64', 'binascii', 'bisect', 'calendar', 'cmath', 'collections',
+    'colorsys', 'copy', 'dataclasses', 'decimal', 'difflib', 'enum', 'fractions',
+    'functools', 'hashlib', 'heapq', 'itertools', 'json', 'keyword', 'math', 'numbers',
+    'operator', 'pprint', 're', 'statistics', 'string', 'struct', 'textwrap', 'typing',
+    'unicodedata', 'zlib'
+})
+
+# Names and attributes starting with a double underscore (__builtins__,
+# __class__, __subclasses__...) are impure too, except __name__
+IMPURE_PYTHON_NAMES = frozenset({
+    'open', 'input', 'exec', 'eval', 'compile', '__import__', 'globals', 'locals',
+    'vars', 'id', 'hash', 'breakpoint', 'memoryview', 'help', 'exit', 'quit',
+    # Reflection that reaches any of the above by name
+    'getattr', 'setattr', 'delattr',
+    # Modules the execution paths bind without an import statement
+    'os', 'sys', 'time', 'datetime', 'random', 'requests', 'subprocess', 'sqlite3',
+    'threading', 'socket', 'logging'
+})
+
+# Attributes that lead from ordinary objects to frames and their globals
+IMPURE_PYTHON_ATTRIBUTES = frozenset({
+    'gi_frame', 'cr_frame', 'ag_frame', 'tb_frame', 'f_back', 'f_globals', 'f_locals',
+    'f_builtins', 'gi_code', 'cr_code', 'ag_code', 'f_code'
+})
+
+# Names that reach the clock, randomness, the filesystem, the network or
+# the host process from JavaScript and TypeScript
+IMPURE_JS_PATTERN = re.compile(
+    r'\b(require|import|Date|Math\.random|fetch|process|performance|crypto|'
+    r'setTimeout|setInterval|setImmediate|eval|Function|globalThis|global|XMLHttpRequest)\b'
+)
+
+# Version of the TypeScript transpiler node_worker.js uses; built-in type
+# stripping follows the node version, which is already part of the key
+TRANSPILER_PROBE = "try { require('typescript').version } catch (e) { 'strip-types' }"
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+def _is_dunder(name: str) -> bool:
+    return name.startswith('__') and name != '__name__'
+
+def _reaches_impure_module(module_name: str, attributes: Iterable[str]) -> bool:
+    """Whether following attributes from a pure module leads to a module outside the pure set
+
+    Pure modules hold references to the modules they import themselves
+    (json.codecs, typing.sys), which would otherwise open a way to the host.
+    """
+    try:
+        value = importlib.import_module(module_name)
+    except ImportError:
+        return True
+    for attribute in attributes:
+        value = getattr(value, attribute, None)
+        if value is None:
+            return False
+        if isinstance(value, types.ModuleType) and value.__name__.split('.')[0] not in PURE_PYTHON_MODULES:
+            return True
+    return False
+
+def _attribute_chain(node: ast.Attribute):
+    """(root name, [attributes]) of a dotted access such as a.b.c, or None"""
+    attributes = []
+    while isinstance(node, ast.Attribute):
+        attributes.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    return node.id, attributes[::-1]
+
+def is_deterministic(language: str, code: str) -> bool:
+    """Conservatively decide whether a snippet's result depends only on its inputs"""
+    language = language.lower()
+    if language == 'python':
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            # The error message is as deterministic as the code itself
+            return True
+        # Local names bound to pure modules, and the module each one stands for
+        modules = {}
+        # Name nodes used as the start of a dotted access
+        roots = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name.split('.')[0] not in PURE_PYTHON_MODULES:
+                        return False
+                    if alias.asname:
+                        modules[alias.asname] = alias.name
+                    else:
+                        modules[alias.name.split('.')[0]] = alias.name.split('.')[0]
+            elif isinstance(node, ast.ImportFrom):
+                if node.level or (node.module or '').split('.')[0] not in PURE_PYTHON_MODULES:
+                    return False
+                if any(alias.name == '*' or _reaches_impure_module(node.module, [alias.name])
+                       for alias in node.names):
+                    return False
+            elif isinstance(node, ast.Name) and (node.id in IMPURE_PYTHON_NAMES or _is_dunder(node.id)):
+                return False
+            elif isinstance(node, ast.Attribute):
+                if _is_dunder(node.attr) or node.attr in IMPURE_PYTHON_ATTRIBUTES:
+                    return False
+                if isinstance(node.value, ast.Name):
+                    roots.add(id(node.value))
+                chain = _attribute_chain(node)
+                if chain and chain[0] in modules and _reaches_impure_module(modules[chain[0]], chain[1]):
+                    return False
+            elif isinstance(node, (ast.Global, ast.Nonlocal, ast.Await, ast.AsyncFor, ast.AsyncWith)):
+                return False
+        # A module passed around by value could be followed where the checks above cannot see
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and node.id in modules and id(node) not in roots:
+                return False
+        return True
+    if language in ('javascript', 'typescript'):
+        return IMPURE_JS_PATTERN.search(code) is None
+    # Shell commands and everything else always touch the host
+    return False
+
+class ExecutionCache:
+    """Result cache for deterministic executions backed by SQLite"""
+
+    def __init__(self, db_path: str = 'execution_cache.db',
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_output_bytes: int = MAX_CACHED_OUTPUT_BYTES):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.max_output_bytes = max_output_bytes
+        self._memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._runtimes: Dict[str, str] = {}
+        self._migrated = set()
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.stats = {
+            'hits': 0, 'memory_hits': 0, 'misses': 0, 'bypassed': 0, 'stored': 0,
+            'not_stored': 0, 'blobs_written': 0, 'blobs_deduplicated': 0, 'bytes_deduplicated': 0
+        }
+
+    def _init_database(self):
+        if self._initialized:
+            return
+        with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+            self.ensure_blob_table(conn)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS execution_results (
+                    cache_key TEXT PRIMARY KEY,
+                    language TEXT NOT NULL,
+                    runtime TEXT NOT NULL,
+                    code_hash TEXT NOT NULL,
+                    result_hash TEXT NOT NULL,
+                    hits INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_hit_at TIMESTAMP
+                )
+            ''')
+        self._initialized = True
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    # Content-addressed blobs
+
+    @staticmethod
+    def ensure_blob_table(conn: sqlite3.Connection):
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {BLOBS_TABLE} (
+                hash TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+    def store_blob(self, conn: sqlite3.Connection, content: str) -> str:
+        """Store content once per database and return its hash"""
+        digest = content_hash(content)
+        cursor = conn.execute(
+            f'INSERT OR IGNORE INTO {BLOBS_TABLE} (hash, content, size) VALUES (?, ?, ?)',
+            (digest, content, len(content))
+        )
+        if cursor.rowcount:
+            self._count('blobs_written')
+        else:
+            self._count('blobs_deduplicated')
+            self._count('bytes_deduplicated', len(content))
+        return digest
+
+    @staticmethod
+    def load_blob(conn: sqlite3.Connection, digest: str) -> Optional[str]:
+        row = conn.execute(f'SELECT content FROM {BLOBS_TABLE} WHERE hash = ?', (digest,)).fetchone()
+        return row[0] if row else None
+
+    # Execution logs
+
+    def migrate_executions(self, db_path: str):
+        """Add hash columns to an executions table and move existing text into blobs
+
+        Rows keep their code and output columns empty once the text lives in
+        execution_blobs; the executions_expanded view joins it back.
+        """
+        if db_path in self._migrated:
+            return
+        with closing(sqlite3.connect(db_path, factory=TimedConnection)) as conn, conn:
+            self.ensure_blob_table(conn)
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(executions)')}
+            for column, definition in (('code_hash', 'TEXT'), ('output_hash', 'TEXT'),
+                                       ('cached', 'INTEGER DEFAULT 0')):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE executions ADD COLUMN {column} {definition}')
+
+            while True:
+                rows = conn.execute('''
+                    SELECT id, code, output FROM executions
+                    WHERE code_hash IS NULL LIMIT ?
+                ''', (BACKFILL_BATCH,)).fetchall()
+                if not rows:
+                    break
+                for row_id, code, output in rows:
+                    conn.execute('''
+                        UPDATE executions SET code = '', output = '', code_hash = ?, output_hash = ?
+                        WHERE id = ?
+                    ''', (self.store_blob(conn, code or ''), self.store_blob(conn, output or ''), row_id))
+
+            conn.execute(f'''
+                CREATE VIEW IF NOT EXISTS executions_expanded AS
+                SELECT e.*, code_blob.content AS code_text, output_blob.content AS output_text
+                FROM executions e
+                LEFT JOIN {BLOBS_TABLE} code_blob ON code_blob.hash = e.code_hash
+                LEFT JOIN {BLOBS_TABLE} output_blob ON output_blob.hash = e.output_hash
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_executions_code_hash ON executions(code_hash)')
+        self._migrated.add(db_path)
+
+    def log_execution(self, db_path: str, language: str, code: str, output: str,
+                      cached: bool = False, **columns):
+        """Insert an executions row whose code and output are stored as blobs
+
+        columns are the table's remaining values (project_id, execution_time...).
+        """
+        self.migrate_executions(db_path)
+        with closing(sqlite3.connect(db_path, factory=TimedConnection)) as conn, conn:
+            values = dict(columns)
+            values.update({
+                'language': language,
+                'code': '',
+                'output': '',
+                'code_hash': self.store_blob(conn, code or ''),
+                'output_hash': self.store_blob(conn, output or ''),
+                'cached': 1 if cached else 0
+            })
+            names = ', '.join(values)
+            placeholders = ', '.join('?' for _ in values)
+            conn.execute(f'INSERT INTO executions ({names}) VALUES ({placeholders})',
+                         tuple(values.values()))
+
+    # Result cache
+
+    def runtime_version(self, language: str) -> str:
+        """Version string of the interpreter that runs a language's snippets"""
+        language = language.lower()
+        if language == 'python':
+            return f'cpython-{sys.version}'
+        if language not in self._runtimes:
+            version = 'unknown'
+            if language in ('javascript', 'typescript'):
+                try:
+                    result = subprocess.run([shutil.which('node') or 'node', '--version'],
+                                            capture_output=True, text=True, timeout=10)
+                    version = f'node-{result.stdout.strip()}'
+                    if language == 'typescript':
+                        # The worker resolves the typescript package from its own directory
+                        result = subprocess.run([shutil.which('node') or 'node', '-p', TRANSPILER_PROBE],
+                                                capture_output=True, text=True, timeout=10,
+                                                cwd=os.path.dirname(os.path.abspath(__file__)))
+                        version += f"+typescript-{result.stdout.strip() or 'unknown'}"
+                except Exception as e:
+                    logger.warning(f"Could not determine node version: {e}")
+            self._runtimes[language] = version
+        return self._runtimes[language]
+
+    def key(self, language: str, code: str, inputs: Dict[str, Any] = None,
+            namespace: str = 'default') -> str:
+        """Cache key over everything that can change a deterministic result"""
+        material = json.dumps({
+            'namespace': namespace,
+            'language': language.lower(),
+            'runtime': self.runtime_version(language),
+            'code': code,
+            'inputs': inputs or {}
+        }, sort_keys=True, separators=(',', ':'), default=str)
+        return content_hash(material)
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+        if result is not None:
+            self._count('memory_hits')
+        else:
+            self._init_database()
+            with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+                row = conn.execute(f'''
+                    SELECT b.content FROM execution_results r
+                    JOIN {BLOBS_TABLE} b ON b.hash = r.result_hash
+                    WHERE r.cache_key = ?
+                ''', (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('''
+                    UPDATE execution_results SET hits = hits + 1, last_hit_at = CURRENT_TIMESTAMP
+                    WHERE cache_key = ?
+                ''', (key,))
+            result = json.loads(row[0])
+            self._remember(key, result)
+        return dict(result)
+
+    def store(self, key: str, language: str, code: str, result: Dict[str, Any]):
+        """Persist a finished result unless it timed out, was cancelled or is too large"""
+        if result.get('timed_out') or result.get('cancelled') or result.get('return_code', 0) < 0:
+            self._count('not_stored')
+            return
+        body = json.dumps(result, sort_keys=True, default=str)
+        if len(body) > self.max_output_bytes:
+            self._count('not_stored')
+            return
+
+        self._init_database()
+        with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO execution_results
+                (cache_key, language, runtime, code_hash, result_hash)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, language.lower(), self.runtime_version(language),
+                  self.store_blob(conn, code), self.store_blob(conn, body)))
+        self._remember(key, json.loads(body))
+        self._count('stored')
+
+    def execute(self, language: str, code: str, runner: Callable[[], Dict[str, Any]],
+                pure: Optional[bool] = None, inputs: Dict[str, Any] = None,
+                namespace: str = 'default') -> Dict[str, Any]:
+        """Return the cached result of an identical deterministic run, or run and cache it
+
+        pure=True caches regardless of what the code references, pure=False
+        always runs, and None caches only snippets that look deterministic.
+        """
+        cacheable = pure if pure is not None else is_deterministic(language, code)
+        if not cacheable:
+            self._count('bypassed')
+            result = runner()
+            result['cached'] = False
+            return result
+
+        try:
+            key = self.key(language, code, inputs, namespace)
+            cached = self.lookup(key)
+        except Exception as e:
+            logger.error(f"Execution cache lookup failed: {e}")
+            key, cached = None, None
+
+        if cached is not None:
+            self._count('hits')
+            cached.update({'cached': True, 'cache_key': key})
+            return cached
+
+        self._count('misses')
+        result = runner()
+        if key is not None:
+            try:
+                self.store(key, language, code, result)
+            except Exception as e:
+                logger.error(f"Execution cache store failed: {e}")
+        result['cached'] = False
+        return result
+
+    def clear(self) -> int:
+        """Drop every cached result; execution logs are left untouched"""
+        self._init_database()
+        with self._lock:
+            self._memory.clear()
+        with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+            removed = conn.execute('DELETE FROM execution_results').rowcount
+            conn.execute(f'DELETE FROM {BLOBS_TABLE}')
+        return removed
+
+    def blob_usage(self, db_paths: Iterable[str]) -> Dict[str, Any]:
+        """Logical versus stored bytes of the executions tables in db_paths"""
+        usage = {}
+        for db_path in db_paths:
+            try:
+                self.migrate_executions(db_path)
+                with closing(sqlite3.connect(db_path, factory=TimedConnection)) as conn, conn:
+                    rows, logical = conn.execute(f'''
+                        SELECT COUNT(*), COALESCE(SUM(cb.size), 0) + COALESCE(SUM(ob.size), 0)
+                        FROM executions e
+                        LEFT JOIN {BLOBS_TABLE} cb ON cb.hash = e.code_hash
+                        LEFT JOIN {BLOBS_TABLE} ob ON ob.hash = e.output_hash
+                    ''').fetchone()
+                    blobs, stored = conn.execute(
+                        f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {BLOBS_TABLE}'
+                    ).fetchone()
+                usage[db_path] = {
+                    'executions': rows,
+                    'blobs': blobs,
+                    'logical_bytes': logical,
+                    'stored_bytes': stored,
+                    'dedup_ratio': round(logical / stored, 2) if stored else 1.0
+                }
+            except Exception as e:
+                usage[db_path] = {'error': str(e)}
+        return usage
+
+    def get_cache_status(self, db_paths: Iterable[str] = ()) -> Dict[str, Any]:
+        """Hit rate, counters, stored entries and blob deduplication"""
+        with self._lock:
+            stats = dict(self.stats)
+            memory_entries = len(self._memory)
+        lookups = stats['hits'] + stats['misses']
+        status = {
+            'hit_rate': round(stats['hits'] / lookups, 3) if lookups else 0.0,
+            'memory_entries': memory_entries,
+            'max_memory_entries': self.memory_entries,
+            'stats': stats
+        }
+        try:
+            self._init_database()
+            with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+                status['entries'], status['stored_hits'] = conn.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM execution_results'
+                ).fetchone()
+        except Exception as e:
+            status['error'] = str(e)
+        if db_paths:
+            status['execution_logs'] = self.blob_usage(db_paths)
+        return status
+
+# Global execution cache instance
+execution_cache = ExecutionCache()
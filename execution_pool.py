@@ -0,0 +1,685 @@
+"""
+AVA CORE Execution Pool
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Pre-forked pool of warm Python worker interpreters for code execution.
+Workers import the common libraries once at spawn and then take jobs over
+their stdin/stdout pipes as length-prefixed JSON frames, so a run no longer
+pays for interpreter startup or blocks the request thread with an in-process
+exec. Each job runs under CPU and address-space limits and a wall-clock
+timeout; a worker is replaced when it overruns, hits a limit or reaches its
+job budget. Between jobs a worker restores its working directory,
+environment, sys.path and sys.modules to their state after preloading, and
+is replaced if a job left a thread running. Jobs are queued round-robin per owner so one caller cannot
+starve the others.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import struct
+import select
+import signal
+import logging
+import threading
+import traceback
+import subprocess
+from collections import OrderedDict, deque
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows; limits are then wall-clock only
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct('>I')
+
+# Imported by every worker before it reports ready
+PRELOAD_MODULES = ('json', 'os', 'sys', 'time', 'datetime', 'sqlite3', 'threading',
+                   'subprocess', 'logging', 'requests')
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_CPU_LIMIT = 30
+DEFAULT_MEMORY_LIMIT_MB = 512
+DEFAULT_MAX_JOBS_PER_WORKER = 50
+
+def _write_frame(stream, message: Dict[str, Any]):
+    body = json.dumps(message, default=str).encode('utf-8')
+    stream.write(FRAME_HEADER.pack(len(body)) + body)
+    stream.flush()
+
+def _read_exact(stream, size: int) -> Optional[bytes]:
+    data = b''
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+def _read_frame(stream) -> Optional[Dict[str, Any]]:
+    header = _read_exact(stream, FRAME_HEADER.size)
+    if header is None:
+        return None
+    body = _read_exact(stream, FRAME_HEADER.unpack(header)[0])
+    if body is None:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+# Worker side
+
+class CPULimitExceeded(BaseException):
+    """Raised inside a worker when a job exhausts its CPU time allowance"""
+
+def _on_cpu_limit(signum, frame):
+    raise CPULimitExceeded()
+
+def _address_space() -> int:
+    """Current virtual memory size of this process in bytes (0 if unknown)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+def _apply_limits(cpu_limit: Optional[float], memory_limit_mb: Optional[int]):
+    if resource is None:
+        return
+    if cpu_limit:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime) + 1
+        hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        soft = used + int(cpu_limit)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    if memory_limit_mb:
+        # The allowance is on top of what the warm interpreter already maps
+        hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+        soft = _address_space() + memory_limit_mb * 1024 * 1024
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+def _clear_limits():
+    if resource is None:
+        return
+    for limit in (resource.RLIMIT_CPU, resource.RLIMIT_AS):
+        hard = resource.getrlimit(limit)[1]
+        resource.setrlimit(limit, (hard, hard))
+
+def _resolve_name(spec: str):
+    """Resolve 'module' or 'module:attribute' to an object"""
+    module_name, _, attr = spec.partition(':')
+    __import__(module_name)
+    module = sys.modules[module_name]
+    return getattr(module, attr) if attr else module
+
+class _StreamingBuffer(io.StringIO):
+    """Output buffer that also forwards completed lines to the pool as they are written"""
+
+    def __init__(self, stream_name: str, send: Callable[[Dict[str, Any]], None]):
+        super().__init__()
+        self.stream_name = stream_name
+        self.send = send
+        self.pending = ''
+
+    def write(self, text):
+        self.pending += text
+        if '\n' in text or len(self.pending) >= 8192:
+            self.flush()
+        return super().write(text)
+
+    def flush(self):
+        if self.pending:
+            self.send({'type': 'output', 'stream': self.stream_name, 'data': self.pending})
+            self.pending = ''
+
+def _format_traceback() -> str:
+    """Format the exception being handled without the worker's own frame"""
+    exc_type, exc, tb = sys.exc_info()
+    return ''.join(traceback.format_exception(exc_type, exc, tb.tb_next if tb else None))
+
+def _run_job(job: Dict[str, Any], send: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    if job.get('stream') and send is not None:
+        stdout_buffer = _StreamingBuffer('stdout', send)
+        stderr_buffer = _StreamingBuffer('stderr', send)
+    else:
+        stdout_buffer = io.StringIO()
+        stderr_buffer = io.StringIO()
+    exec_globals = {'__name__': '__main__', '__builtins__': __builtins__}
+    limit_hit = None
+    return_code = 0
+    started = time.perf_counter()
+
+    try:
+        for name, spec in (job.get('names') or {}).items():
+            exec_globals[name] = _resolve_name(spec)
+        exec_globals.update(job.get('context') or {})
+        compiled = compile(job['code'], '<ava-execution>', 'exec')
+    except BaseException:
+        stderr_buffer.write(_format_traceback())
+        stderr_buffer.flush()
+        return {'success': False, 'output': '', 'error': stderr_buffer.getvalue(),
+                'return_code': 1, 'duration': time.perf_counter() - started}
+
+    failure = None
+    try:
+        _apply_limits(job.get('cpu_limit'), job.get('memory_limit_mb'))
+        with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+            exec(compiled, exec_globals)
+    except SystemExit as e:
+        if e.code is None:
+            return_code = 0
+        elif isinstance(e.code, int):
+            return_code = e.code
+        else:
+            failure = f"{e.code}\n"
+            return_code = 1
+    except CPULimitExceeded:
+        limit_hit = 'cpu'
+        failure = 'CPU time limit exceeded\n'
+        return_code = 1
+    except MemoryError:
+        limit_hit = 'memory'
+        failure = 'Memory limit exceeded\n'
+        return_code = 1
+    except BaseException:
+        failure = _format_traceback()
+        return_code = 1
+    finally:
+        _clear_limits()
+
+    # Output printed before the failure is streamed ahead of its report
+    stdout_buffer.flush()
+    if failure:
+        stderr_buffer.write(failure)
+    stderr_buffer.flush()
+
+    result = {
+        'success': return_code == 0,
+        'output': stdout_buffer.getvalue(),
+        'error': stderr_buffer.getvalue(),
+        'return_code': return_code,
+        'duration': time.perf_counter() - started
+    }
+    if limit_hit:
+        result['limit_exceeded'] = limit_hit
+    if job.get('return_globals'):
+        result['globals'] = {k: str(v) for k, v in exec_globals.items() if not k.startswith('__')}
+    return result
+
+def _snapshot_interpreter() -> Dict[str, Any]:
+    """Process state a job may change, as it is once the worker is warm"""
+    return {'cwd': os.getcwd(), 'environ': dict(os.environ), 'path': list(sys.path),
+            'modules': dict(sys.modules)}
+
+def _reset_interpreter(baseline: Dict[str, Any]) -> bool:
+    """Undo a job's changes to shared process state; False if the worker must be replaced"""
+    clean = True
+    try:
+        os.chdir(baseline['cwd'])
+    except OSError:
+        clean = False
+    if os.environ != baseline['environ']:
+        os.environ.clear()
+        os.environ.update(baseline['environ'])
+    sys.path[:] = baseline['path']
+    modules = baseline['modules']
+    for name in [name for name in sys.modules if name not in modules]:
+        del sys.modules[name]
+    for name, module in modules.items():
+        if sys.modules.get(name) is not module:
+            sys.modules[name] = module
+    # A thread left behind would keep running into the next owner's job
+    if any(thread is not threading.main_thread() and thread.is_alive() for thread in threading.enumerate()):
+        clean = False
+    return clean
+
+def _worker_main():
+    """Serve jobs over the inherited pipes until stdin closes"""
+    # Keep private copies of the pipes and point fds 0/1 at /dev/null so
+    # child processes started by user code cannot corrupt the protocol
+    proto_in = os.fdopen(os.dup(0), 'rb', buffering=0)
+    proto_out = os.fdopen(os.dup(1), 'wb')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    if hasattr(signal, 'SIGXCPU'):
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+    for module_name in PRELOAD_MODULES:
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+
+    # Threads started by user code may print while the job streams output
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            _write_frame(proto_out, message)
+
+    baseline = _snapshot_interpreter()
+    send({'ready': True, 'pid': os.getpid()})
+    while True:
+        job = _read_frame(proto_in)
+        if job is None:
+            break
+        result = _run_job(job, send)
+        if not _reset_interpreter(baseline):
+            result['recycle'] = True
+        send(result)
+
+# Pool side
+
+class ExecutionJob:
+    """A queued execution request and its eventual result"""
+
+    def __init__(self, request: Dict[str, Any], owner: str, timeout: float,
+                 on_output: Optional[Callable[[str, str], None]] = None):
+        self.request = request
+        self.owner = owner
+        self.timeout = timeout
+        self.on_output = on_output
+        self.cancelled = False
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.result = None
+        self.done = threading.Event()
+
+    def finish(self, result: Dict[str, Any]):
+        self.result = result
+        self.done.set()
+
+class FairJobQueue:
+    """Round-robin queue across job owners, FIFO within an owner"""
+
+    def __init__(self):
+        self._queues: 'OrderedDict[str, deque]' = OrderedDict()
+        self._cond = threading.Condition()
+        self._size = 0
+        self._closed = False
+
+    def put(self, job: ExecutionJob):
+        with self._cond:
+            self._queues.setdefault(job.owner, deque()).append(job)
+            self._size += 1
+            self._cond.notify()
+
+    def get(self) -> Optional[ExecutionJob]:
+        """Block for the next job; returns None once the queue is closed and drained"""
+        with self._cond:
+            while not self._size and not self._closed:
+                self._cond.wait()
+            if not self._size:
+                return None
+            owner, jobs = next(iter(self._queues.items()))
+            job = jobs.popleft()
+            if jobs:
+                self._queues.move_to_end(owner)
+            else:
+                del self._queues[owner]
+            self._size -= 1
+            return job
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return self._size
+
+class PoolWorker:
+    """One warm interpreter process and the thread that feeds it jobs"""
+
+    def __init__(self, pool: 'ExecutionPool', index: int):
+        self.pool = pool
+        self.index = index
+        self.process = None
+        self.successor = None
+        self.pid = None
+        self.jobs_run = 0
+        self.job_budget = pool.max_jobs_per_worker
+        self.started_at = None
+        self.busy = False
+        self.current_job = None
+
+    def _launch(self) -> subprocess.Popen:
+        process = subprocess.Popen(
+            [sys.executable, '-u', os.path.abspath(__file__), '--worker'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.pool.cwd
+        )
+        process.protocol = process.stdout
+        return process
+
+    def _send(self, process: subprocess.Popen, message: Dict[str, Any]):
+        _write_frame(process.stdin, message)
+
+    def _read_message(self, process: subprocess.Popen) -> Optional[Dict[str, Any]]:
+        return _read_frame(process.protocol)
+
+    def _receive(self, process: subprocess.Popen, job: ExecutionJob = None) -> Optional[Dict[str, Any]]:
+        """Read up to the next non-output message, passing streamed output to the job"""
+        while True:
+            message = self._read_message(process)
+            if message is None or message.pop('type', None) != 'output':
+                return message
+            if job is not None and job.on_output is not None:
+                try:
+                    job.on_output(message['stream'], message['data'])
+                except Exception as e:
+                    logger.error(f"Output callback failed: {e}")
+
+    def _adopt(self, process: subprocess.Popen):
+        """Wait for a launched interpreter to finish preloading and make it current"""
+        ready = self._receive(process)
+        if not ready or not ready.get('ready'):
+            process.kill()
+            process.wait()
+            raise RuntimeError('Execution worker failed to start')
+        self.process = process
+        self.pid = ready['pid']
+        self.jobs_run = 0
+        self.started_at = time.time()
+        # Stagger budgets across slots so workers are not all recycled at once
+        max_jobs = self.pool.max_jobs_per_worker
+        self.job_budget = max_jobs + (self.index * max_jobs) // (2 * self.pool.size)
+        self.pool._count('workers_started')
+
+    def spawn(self):
+        """Replace the current interpreter, blocking until the new one is warm"""
+        process, self.successor = self.successor or self._launch(), None
+        self._adopt(process)
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.protocol.close()
+        self.process = None
+        self.pid = None
+
+    def run(self, job: ExecutionJob) -> Dict[str, Any]:
+        """Send one job and wait for its result, killing the worker on overrun"""
+        timed_out = threading.Event()
+        process = self.process
+
+        def expire():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(job.timeout + self.pool.kill_grace, expire)
+        timer.daemon = True
+        timer.start()
+        try:
+            self._send(process, job.request)
+            result = self._receive(process, job)
+        except (OSError, ValueError):
+            result = None
+        finally:
+            timer.cancel()
+
+        self.jobs_run += 1
+        if result is None:
+            self.stop()
+            if job.cancelled:
+                self.pool._count('cancelled')
+                return {'success': False, 'output': '', 'error': 'Execution cancelled',
+                        'return_code': -9, 'cancelled': True}
+            if timed_out.is_set():
+                self.pool._count('timed_out')
+                return {'success': False, 'output': '', 'error': 'Code execution timed out',
+                        'return_code': -9, 'timed_out': True}
+            self.pool._count('worker_crashes')
+            return {'success': False, 'output': '', 'error': 'Execution worker exited unexpectedly',
+                    'return_code': -1}
+
+        if result.get('timed_out'):
+            self.pool._count('timed_out')
+        if result.get('limit_exceeded'):
+            self.pool._count(f"{result['limit_exceeded']}_limited")
+            self.stop()
+        elif result.pop('recycle', False):
+            # The job left state behind that cannot be reset in place
+            self.pool._count('recycled')
+            self.stop()
+        return result
+
+    def replenish(self):
+        """Keep a warm interpreter in this slot ahead of the next job
+
+        A worker that has used up its job budget keeps serving while its
+        successor preloads, and is swapped out once the successor is ready.
+        """
+        try:
+            if self.process is None or self.process.poll() is not None:
+                self.stop()
+                self.spawn()
+            elif self.jobs_run >= self.job_budget:
+                if self.successor is None:
+                    self.successor = self._launch()
+                elif select.select([self.successor.protocol], [], [], 0)[0]:
+                    self.stop()
+                    self.spawn()
+                    self.pool._count('recycled')
+        except Exception as e:
+            logger.error(f"Execution worker {self.index} failed to pre-fork: {e}")
+
+    def serve(self):
+        self.replenish()
+        while True:
+            job = self.pool._queue.get()
+            if job is None:
+                break
+            if job.cancelled:
+                self.pool._record_cancelled(job)
+                continue
+            self.busy = True
+            self.current_job = job
+            try:
+                if self.process is None:
+                    self.spawn()
+                job.started_at = time.perf_counter()
+                result = self.run(job)
+            except Exception as e:
+                logger.error(f"Execution worker {self.index} error: {e}")
+                self.stop()
+                result = {'success': False, 'output': '', 'error': str(e), 'return_code': -1}
+            finally:
+                self.busy = False
+                self.current_job = None
+
+            result['worker'] = self.index
+            result['queue_wait'] = (job.started_at or time.perf_counter()) - job.submitted_at
+            self.pool._record(result)
+            job.finish(result)
+            self.replenish()
+
+    def close(self):
+        self.stop()
+        if self.successor is not None:
+            self.successor.kill()
+            self.successor.wait()
+            self.successor.protocol.close()
+            self.successor = None
+
+class ExecutionPool:
+    """Pool of pre-forked, resource-limited Python worker interpreters"""
+
+    worker_class = PoolWorker
+    # Python workers have no in-process wall clock, so the pool kills them
+    # right at the deadline; subclasses whose workers time jobs out
+    # themselves leave a grace period before the kill
+    kill_grace = 0.0
+
+    def __init__(self, size: int = None, max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+                 cpu_limit: float = DEFAULT_CPU_LIMIT, memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+                 timeout: float = DEFAULT_TIMEOUT, cwd: str = None):
+        self.size = size or int(os.environ.get('AVA_EXEC_WORKERS', min(4, os.cpu_count() or 1)))
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.cpu_limit = cpu_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.timeout = timeout
+        self.cwd = cwd or os.getcwd()
+        self._queue = FairJobQueue()
+        self._workers: List[PoolWorker] = []
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.started_at = None
+        self.stats = {
+            'submitted': 0, 'completed': 0, 'failed': 0, 'timed_out': 0,
+            'cpu_limited': 0, 'memory_limited': 0, 'worker_crashes': 0,
+            'recycled': 0, 'workers_started': 0, 'cancelled': 0,
+            'total_queue_wait': 0.0, 'total_execution_time': 0.0
+        }
+
+    def start(self):
+        """Spawn the workers; called on first submit if not done explicitly"""
+        with self._lock:
+            if self._workers:
+                return
+            self.started_at = datetime.now().isoformat()
+            # Each dispatcher thread forks its own worker, so they warm up in parallel
+            for index in range(self.size):
+                worker = self.worker_class(self, index)
+                thread = threading.Thread(target=worker.serve, name=f'ava-exec-{index}', daemon=True)
+                thread.start()
+                self._workers.append(worker)
+                self._threads.append(thread)
+            logger.info(f"Execution pool started with {self.size} workers")
+
+    def shutdown(self):
+        """Stop dispatching and terminate every worker"""
+        with self._lock:
+            self._queue.close()
+            for thread in self._threads:
+                thread.join(timeout=5)
+            for worker in self._workers:
+                worker.close()
+            self._workers = []
+            self._threads = []
+            self._queue = FairJobQueue()
+
+    def submit(self, code: str, owner: str = 'default', timeout: float = None,
+               names: Dict[str, str] = None, context: Dict[str, Any] = None,
+               return_globals: bool = False, cpu_limit: float = None,
+               memory_limit_mb: int = None,
+               on_output: Callable[[str, str], None] = None) -> ExecutionJob:
+        """Queue code for execution and return the pending job
+
+        names maps global names to 'module' or 'module:attribute' specs that
+        are resolved inside the worker; context values must be JSON-serializable.
+        on_output receives (stream, text) as the code writes output.
+        """
+        request = {
+            'code': code,
+            'names': names or {},
+            'context': context or {},
+            'return_globals': return_globals,
+            'cpu_limit': cpu_limit or self.cpu_limit,
+            'memory_limit_mb': memory_limit_mb or self.memory_limit_mb,
+            'stream': on_output is not None
+        }
+        return self._enqueue(request, owner, timeout or self.timeout, on_output)
+
+    def _enqueue(self, request: Dict[str, Any], owner: str, timeout: float,
+                 on_output: Callable[[str, str], None] = None) -> ExecutionJob:
+        if not self._workers:
+            self.start()
+
+        job = ExecutionJob(request, owner, timeout, on_output)
+        self._count('submitted')
+        self._queue.put(job)
+        return job
+
+    def execute(self, code: str, **kwargs) -> Dict[str, Any]:
+        """Run code on a warm worker and wait for the result"""
+        job = self.submit(code, **kwargs)
+        job.done.wait()
+        return job.result
+
+    def cancel(self, job: ExecutionJob):
+        """Cancel a queued job, or kill the worker running it"""
+        job.cancelled = True
+        for worker in list(self._workers):
+            process = worker.process
+            if worker.current_job is job and process is not None:
+                process.kill()
+                break
+
+    def _record_cancelled(self, job: ExecutionJob):
+        self._count('cancelled')
+        job.finish({'success': False, 'output': '', 'error': 'Execution cancelled',
+                    'return_code': -9, 'cancelled': True, 'queue_wait': 0.0})
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _record(self, result: Dict[str, Any]):
+        with self._stats_lock:
+            self.stats['completed'] += 1
+            if not result.get('success'):
+                self.stats['failed'] += 1
+            self.stats['total_queue_wait'] += result.get('queue_wait', 0.0)
+            self.stats['total_execution_time'] += result.get('duration', 0.0)
+
+    def get_pool_status(self) -> Dict[str, Any]:
+        """Get worker states, queue depth and execution counters"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        completed = stats['completed'] or 1
+        return {
+            'size': self.size,
+            'started_at': self.started_at,
+            'queued_jobs': len(self._queue),
+            'workers': [
+                {
+                    'index': worker.index,
+                    'pid': worker.pid,
+                    'alive': worker.process is not None and worker.process.poll() is None,
+                    'busy': worker.busy,
+                    'jobs_run': worker.jobs_run
+                }
+                for worker in self._workers
+            ],
+            'limits': {
+                'timeout': self.timeout,
+                'cpu_seconds': self.cpu_limit,
+                'memory_mb': self.memory_limit_mb,
+                'max_jobs_per_worker': self.max_jobs_per_worker,
+                'enforced': resource is not None
+            },
+            'stats': stats,
+            'average_queue_wait_ms': round(stats['total_queue_wait'] * 1000 / completed, 3),
+            'average_execution_ms': round(stats['total_execution_time'] * 1000 / completed, 3)
+        }
+
+# Global execution pool instance
+execution_pool = ExecutionPool()
+
+if __name__ == '__main__' and '--worker' in sys.argv:
+    _worker_main()
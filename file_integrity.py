@@ -0,0 +1,374 @@
+"""
+AVA CORE File Integrity and Backup Service
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Stat-gated integrity checks and incremental, content-addressed backups.
+Files are only read and rehashed when their size or mtime differ from the
+small JSON index kept next to the application, so a health cycle over
+unchanged files costs one stat() each. Backups split files into fixed-size
+chunks stored once under their SHA-256; a backup is a manifest listing the
+chunks of every file, and files unchanged since the previous manifest reuse
+its chunk list without being read. SQLite databases are snapshotted with
+the online backup API, which gives a consistent copy while the application
+keeps writing, and their fixed-size chunks line up with database pages so
+untouched pages deduplicate across backups.
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CRITICAL_FILES = [
+    'app.py', 'voice_assistant.py', 'advanced_ai.py',
+    'automation_controller.py', 'self_management.py'
+]
+BACKUP_FILES = CRITICAL_FILES + ['ava_memory.db']
+
+DEFAULT_INDEX_PATH = 'ava_integrity_index.json'
+DEFAULT_BACKUP_ROOT = 'ava_backups'
+# A multiple of every SQLite page size, so page-level changes stay chunk-local
+CHUNK_SIZE = 64 * 1024
+# Files smaller than this are treated as truncated
+MIN_FILE_SIZE = 100
+# Pages copied per online backup step, and the pause that lets writers in between steps
+BACKUP_STEP_PAGES = 256
+BACKUP_STEP_PAUSE = 0.005
+
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    """Size and mtime of path, plus its WAL file for SQLite databases"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = [stat.st_size, stat.st_mtime_ns]
+    # Writes to a WAL database land in the -wal file and leave the main file untouched
+    try:
+        wal = os.stat(path + '-wal')
+        key += [wal.st_size, wal.st_mtime_ns]
+    except OSError:
+        pass
+    return key
+
+def is_sqlite_file(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+class FileIntegrityService:
+    """Integrity index and chunked backup store for the application's own files"""
+
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH, backup_root: str = DEFAULT_BACKUP_ROOT,
+                 chunk_size: int = CHUNK_SIZE):
+        self.index_path = index_path
+        self.backup_root = backup_root
+        self.chunk_size = chunk_size
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+        self.stats = {
+            'checks': 0, 'files_checked': 0, 'files_rehashed': 0,
+            'backups': 0, 'files_reused': 0, 'chunks_written': 0, 'chunks_deduplicated': 0,
+            'bytes_written': 0
+        }
+
+    # Integrity index
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            try:
+                with open(self.index_path) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.integrity_', dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def _hash_file(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, path: str) -> Optional[Dict[str, Any]]:
+        """Index entry for path, rehashing only when its size or mtime changed"""
+        with self._lock:
+            index = self._load_index()
+            key = _stat_key(path)
+            if key is None:
+                index.pop(path, None)
+                return None
+            entry = index.get(path)
+            if entry and entry['stat'] == key:
+                return dict(entry, rehashed=False)
+            try:
+                sha256 = self._hash_file(path)
+            except OSError as e:
+                logger.warning(f"Could not hash {path}: {e}")
+                return {'stat': key, 'size': key[0], 'sha256': None, 'error': str(e), 'rehashed': True}
+            entry = {
+                'stat': key,
+                'size': key[0],
+                'sha256': sha256,
+                'previous_sha256': entry.get('sha256') if entry else None,
+                'hashed_at': datetime.now().isoformat()
+            }
+            index[path] = entry
+            self.stats['files_rehashed'] += 1
+            return dict(entry, rehashed=True)
+
+    def check_files(self, paths: Iterable[str] = CRITICAL_FILES, min_size: int = MIN_FILE_SIZE) -> Dict[str, Any]:
+        """Stat every path and rehash the changed ones; report missing, truncated and modified files"""
+        result = {'checked': 0, 'rehashed': 0, 'corrupted': [], 'modified': []}
+        with self._lock:
+            for path in paths:
+                result['checked'] += 1
+                entry = self.fingerprint(path)
+                if entry is None or entry['sha256'] is None or entry['size'] < min_size:
+                    result['corrupted'].append(path)
+                    continue
+                if entry['rehashed']:
+                    result['rehashed'] += 1
+                    if entry['previous_sha256'] and entry['previous_sha256'] != entry['sha256']:
+                        result['modified'].append(path)
+            if result['rehashed'] or result['corrupted']:
+                try:
+                    self._save_index()
+                except OSError as e:
+                    logger.error(f"Integrity index save failed: {e}")
+            self.stats['checks'] += 1
+            self.stats['files_checked'] += result['checked']
+        return result
+
+    # Chunk store
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.backup_root, 'chunks', digest[:2], digest)
+
+    def _manifest_dir(self) -> str:
+        return os.path.join(self.backup_root, 'manifests')
+
+    def _store_chunks(self, path: str, counters: Dict[str, int]) -> List[str]:
+        chunks = []
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(self.chunk_size), b''):
+                digest = hashlib.sha256(block).hexdigest()
+                chunk_path = self._chunk_path(digest)
+                if os.path.exists(chunk_path):
+                    counters['chunks_deduplicated'] += 1
+                else:
+                    os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+                    data = zlib.compress(block, 6)
+                    tmp_path = f"{chunk_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'wb') as out:
+                        out.write(data)
+                    os.replace(tmp_path, chunk_path)
+                    counters['chunks_written'] += 1
+                    counters['bytes_written'] += len(data)
+                chunks.append(digest)
+        return chunks
+
+    def _snapshot_sqlite(self, path: str) -> str:
+        """Consistent copy of a live database through the online backup API
+
+        The copy proceeds in BACKUP_STEP_PAGES increments and only holds the
+        source read lock during each step, so writers are never blocked for
+        the length of the whole copy.
+        """
+        fd, snapshot = tempfile.mkstemp(prefix='.snapshot_', suffix='.db', dir=self.backup_root)
+        os.close(fd)
+        source = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True, timeout=30)
+        target = sqlite3.connect(snapshot)
+        try:
+            source.backup(target, pages=BACKUP_STEP_PAGES,
+                          progress=lambda status, remaining, total: time.sleep(BACKUP_STEP_PAUSE) if remaining else None)
+        finally:
+            target.close()
+            source.close()
+        return snapshot
+
+    # Backups
+
+    def create_backup(self, paths: Iterable[str] = BACKUP_FILES, label: str = None) -> Dict[str, Any]:
+        """Write an incremental backup manifest; unchanged files reuse the previous chunk lists"""
+        with self._lock:
+            os.makedirs(self._manifest_dir(), exist_ok=True)
+            # Each kind of backup builds on its own previous one
+            previous = self._latest_manifest(label)
+            previous_files = previous['files'] if previous else {}
+            counters = {'chunks_written': 0, 'chunks_deduplicated': 0, 'bytes_written': 0, 'files_reused': 0}
+            backup_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            manifest = {'id': backup_id, 'label': label, 'created_at': datetime.now().isoformat(),
+                        'chunk_size': self.chunk_size, 'files': {}, 'missing': [], 'errors': {}}
+
+            for path in paths:
+                key = _stat_key(path)
+                if key is None:
+                    manifest['missing'].append(path)
+                    continue
+                before = previous_files.get(path)
+                if before and before['stat'] == key and all(os.path.exists(self._chunk_path(c)) for c in before['chunks']):
+                    manifest['files'][path] = before
+                    counters['files_reused'] += 1
+                    continue
+                try:
+                    if is_sqlite_file(path):
+                        snapshot = self._snapshot_sqlite(path)
+                        try:
+                            entry = {'kind': 'sqlite', 'size': os.path.getsize(snapshot),
+                                     'sha256': self._hash_file(snapshot),
+                                     'chunks': self._store_chunks(snapshot, counters)}
+                        finally:
+                            os.remove(snapshot)
+                    else:
+                        entry = {'kind': 'file', 'size': key[0], 'sha256': self._hash_file(path),
+                                 'chunks': self._store_chunks(path, counters)}
+                except (OSError, sqlite3.Error) as e:
+                    logger.error(f"Backup of {path} failed: {e}")
+                    manifest['errors'][path] = str(e)
+                    continue
+                entry['stat'] = key
+                manifest['files'][path] = entry
+
+            manifest['stats'] = counters
+            manifest_path = os.path.join(self._manifest_dir(), f"{backup_id}.json")
+            with open(manifest_path + '.tmp', 'w') as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(manifest_path + '.tmp', manifest_path)
+
+            self.stats['backups'] += 1
+            for name, value in counters.items():
+                self.stats[name] += value
+            logger.info(f"Backup {backup_id}: {len(manifest['files'])} files, "
+                        f"{counters['chunks_written']} new chunks, {counters['files_reused']} unchanged")
+            return {'success': not manifest['errors'], 'backup_id': backup_id, 'files': len(manifest['files']),
+                    'missing': manifest['missing'], 'errors': manifest['errors'], 'stats': counters}
+
+    def _manifest_ids(self) -> List[str]:
+        try:
+            names = os.listdir(self._manifest_dir())
+        except OSError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json'))
+
+    def load_manifest(self, backup_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self._manifest_dir(), f"{os.path.basename(backup_id)}.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _latest_manifest(self, label: str = None) -> Optional[Dict[str, Any]]:
+        """Newest manifest carrying label (None matches unlabelled backups)"""
+        for backup_id in reversed(self._manifest_ids()):
+            manifest = self.load_manifest(backup_id)
+            if manifest and manifest.get('label') == label:
+                return manifest
+        return None
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        backups = []
+        for backup_id in reversed(self._manifest_ids()):
+            manifest = self.load_manifest(backup_id)
+            if manifest:
+                backups.append({'id': backup_id, 'label': manifest.get('label'),
+                                'created_at': manifest['created_at'], 'files': len(manifest['files']),
+                                'size': sum(entry['size'] for entry in manifest['files'].values())})
+        return backups
+
+    def restore_backup(self, backup_id: str, target_dir: str, paths: Iterable[str] = None) -> Dict[str, Any]:
+        """Reassemble files of a backup under target_dir, verifying each against its recorded hash"""
+        manifest = self.load_manifest(backup_id)
+        if manifest is None:
+            return {'success': False, 'error': f'Backup not found: {backup_id}'}
+        wanted = set(paths) if paths else set(manifest['files'])
+        root = os.path.realpath(target_dir)
+        restored, errors = [], {}
+        for path, entry in manifest['files'].items():
+            if path not in wanted:
+                continue
+            destination = os.path.realpath(os.path.join(root, path))
+            if os.path.commonpath([root, destination]) != root or destination == root:
+                # Absolute or '..' paths in a manifest must not write outside target_dir
+                errors[path] = 'path outside the restore directory'
+                continue
+            os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+            digest = hashlib.sha256()
+            try:
+                with open(destination + '.tmp', 'wb') as out:
+                    for chunk in entry['chunks']:
+                        with open(self._chunk_path(chunk), 'rb') as f:
+                            block = zlib.decompress(f.read())
+                        digest.update(block)
+                        out.write(block)
+                if digest.hexdigest() != entry['sha256']:
+                    raise ValueError('content hash mismatch')
+                os.replace(destination + '.tmp', destination)
+                restored.append(path)
+            except (OSError, ValueError, zlib.error) as e:
+                errors[path] = str(e)
+                if os.path.exists(destination + '.tmp'):
+                    os.remove(destination + '.tmp')
+        return {'success': not errors, 'restored': restored, 'errors': errors}
+
+    def prune_backups(self, keep: int = 10, label: str = None) -> Dict[str, Any]:
+        """Drop all but the newest `keep` manifests and delete chunks no remaining manifest uses
+
+        With label, only manifests carrying that label are counted and dropped;
+        backups made for other reasons are left alone.
+        """
+        with self._lock:
+            ids = self._manifest_ids()
+            if label is not None:
+                ids = [backup_id for backup_id in ids
+                       if (self.load_manifest(backup_id) or {}).get('label') == label]
+            removed = ids[:-keep] if keep > 0 else ids
+            for backup_id in removed:
+                os.remove(os.path.join(self._manifest_dir(), f"{backup_id}.json"))
+            referenced = set()
+            for backup_id in self._manifest_ids():
+                manifest = self.load_manifest(backup_id)
+                if manifest:
+                    for entry in manifest['files'].values():
+                        referenced.update(entry['chunks'])
+            chunks_removed = 0
+            chunk_root = os.path.join(self.backup_root, 'chunks')
+            for directory, _, names in os.walk(chunk_root):
+                for name in names:
+                    if name not in referenced:
+                        os.remove(os.path.join(directory, name))
+                        chunks_removed += 1
+            return {'success': True, 'backups_removed': len(removed), 'chunks_removed': chunks_removed}
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'index_path': self.index_path,
+                'indexed_files': len(self._load_index()),
+                'backup_root': self.backup_root,
+                'backups': len(self._manifest_ids()),
+                'stats': dict(self.stats)
+            }
+
+# Global file integrity instance
+file_integrity = FileIntegrityService()
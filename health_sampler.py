@@ -0,0 +1,263 @@
+"""
+AVA CORE Health Sampler
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+One background sampler for host and process health.
+A single thread runs psutil probes on a fixed tick and writes each sample
+into a fixed-size in-memory ring. Health checks and monitoring endpoints
+read the latest sample, or a recent window, without calling psutil
+themselves. Cheap probes (CPU, memory, network I/O) run on every tick.
+Expensive ones (disk usage, the process table, the connection table) run
+every few ticks, and their last result is carried into the samples in
+between. The sampler times its own probes and reports its overhead.
+"""
+
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = float(os.environ.get('AVA_HEALTH_INTERVAL', '5'))
+DEFAULT_CAPACITY = 720
+
+class SampleRing:
+    """Fixed-size ring of samples ordered by time"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._slots: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._next = 0
+        self._count = 0
+
+    def append(self, sample: Dict[str, Any]):
+        self._slots[self._next] = sample
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        if not self._count:
+            return None
+        return self._slots[(self._next - 1) % self.capacity]
+
+    def __len__(self):
+        return self._count
+
+    def _at(self, index: int) -> Dict[str, Any]:
+        """The index-th stored sample, counting from the oldest"""
+        return self._slots[(self._next - self._count + index) % self.capacity]
+
+    def window(self, seconds: float) -> List[Dict[str, Any]]:
+        """Samples from the last seconds, oldest first; O(log n) to find the start"""
+        cutoff = time.time() - seconds
+        start = bisect_left(range(self._count), cutoff, key=lambda index: self._at(index)['time'])
+        return [self._at(index) for index in range(start, self._count)]
+
+class Probe:
+    """A sampled metric source and what it has cost so far"""
+
+    def __init__(self, name: str, func: Callable[[], Dict[str, Any]], every: int):
+        self.name = name
+        self.func = func
+        self.every = max(1, int(every))
+        self.calls = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.last_seconds = 0.0
+        self.last_run: Optional[float] = None
+        self.values: Dict[str, Any] = {}
+        self.detail: Any = None
+
+class HealthSampler:
+    """Samples host health on a background thread into a ring buffer"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, capacity: int = DEFAULT_CAPACITY):
+        self.interval = interval
+        self.ring = SampleRing(capacity)
+        self.probes: Dict[str, Probe] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._tick = 0
+        self._started_at: Optional[float] = None
+        self._thread_cpu = 0.0
+
+        self._process = psutil.Process()
+        # Prime the CPU counters so the first sample measures since startup
+        psutil.cpu_percent(interval=None)
+        self.register_probe('cpu', self._probe_cpu)
+        self.register_probe('memory', self._probe_memory)
+        self.register_probe('network_io', self._probe_network_io)
+        self.register_probe('self', self._probe_self)
+        self.register_probe('disk', self._probe_disk, every=6)
+        self.register_probe('processes', self._probe_processes, every=6)
+        self.register_probe('connections', self._probe_connections, every=12)
+
+    def register_probe(self, name: str, func: Callable[[], Any], every: int = 1):
+        """Add a probe run every `every` ticks
+
+        func returns a dict of numbers merged into each sample, or a
+        (values, detail) pair where detail is kept only as the latest
+        snapshot (e.g. the process list) and never copied into the ring.
+        """
+        with self._lock:
+            self.probes[name] = Probe(name, func, every)
+
+    # Built-in probes
+
+    def _probe_cpu(self):
+        # Non-blocking: the percentage since the previous tick
+        return {'cpu_percent': psutil.cpu_percent(interval=None)}
+
+    def _probe_memory(self):
+        memory = psutil.virtual_memory()
+        return {'memory_percent': memory.percent, 'memory_available': memory.available}
+
+    def _probe_network_io(self):
+        counters = psutil.net_io_counters()
+        return {'net_bytes_sent': counters.bytes_sent, 'net_bytes_recv': counters.bytes_recv}
+
+    def _probe_self(self):
+        with self._process.oneshot():
+            return {'process_rss': self._process.memory_info().rss,
+                    'process_threads': self._process.num_threads()}
+
+    def _probe_disk(self):
+        return {'disk_percent': psutil.disk_usage('/').percent}
+
+    def _probe_processes(self):
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'create_time']):
+            info = proc.info
+            processes.append({'pid': info['pid'], 'name': info['name'] or '',
+                              'cmdline': ' '.join(info['cmdline'] or []),
+                              'create_time': info['create_time']})
+        return {'process_count': len(processes)}, processes
+
+    def _probe_connections(self):
+        connections = psutil.net_connections()
+        statuses = Counter(c.status for c in connections)
+        remote_ports = Counter(c.raddr.port for c in connections if c.raddr)
+        values = {'network_connections': len(connections),
+                  'connections_established': statuses.get('ESTABLISHED', 0),
+                  'connections_listening': statuses.get('LISTEN', 0)}
+        return values, {'remote_ports': dict(remote_ports), 'statuses': dict(statuses)}
+
+    # Sampling
+
+    def sample_now(self) -> Dict[str, Any]:
+        """Run the probes due on this tick and append one sample"""
+        with self._lock:
+            tick = self._tick
+            self._tick += 1
+            due = [p for p in self.probes.values() if tick % p.every == 0 or p.last_run is None]
+
+        for probe in due:
+            started = time.perf_counter()
+            try:
+                result = probe.func()
+                if isinstance(result, tuple):
+                    probe.values, probe.detail = result
+                else:
+                    probe.values = result
+            except Exception as e:
+                # psutil raises AccessDenied for some tables on some hosts
+                probe.failures += 1
+                logger.debug(f"Health probe {probe.name} failed: {e}")
+            elapsed = time.perf_counter() - started
+            probe.calls += 1
+            probe.seconds += elapsed
+            probe.last_seconds = elapsed
+            probe.last_run = time.time()
+
+        now = time.time()
+        sample = {'time': now, 'timestamp': datetime.fromtimestamp(now).isoformat()}
+        with self._lock:
+            for probe in self.probes.values():
+                sample.update(probe.values)
+            self.ring.append(sample)
+        return sample
+
+    def start(self):
+        """Start the sampling thread; safe to call repeatedly"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name='health-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        cpu_start = time.thread_time()
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample_now()
+            except Exception as e:
+                logger.error(f"Health sampling failed: {e}")
+            self._thread_cpu = time.thread_time() - cpu_start
+            next_tick += self.interval
+            self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+    # Reading
+
+    def latest(self) -> Dict[str, Any]:
+        """The newest sample; the first call samples synchronously and starts the thread"""
+        sample = self.ring.latest()
+        if sample is None:
+            sample = self.sample_now()
+            self.start()
+        return dict(sample)
+
+    def window(self, seconds: float) -> List[Dict[str, Any]]:
+        self.latest()
+        with self._lock:
+            return [dict(s) for s in self.ring.window(seconds)]
+
+    def snapshot(self, probe: str) -> Any:
+        """Latest detail of a probe, e.g. the process list, sampling it once if it never ran"""
+        self.latest()
+        return self.probes[probe].detail
+
+    def get_sampler_status(self) -> Dict[str, Any]:
+        """Per-probe cost and the sampler's share of one CPU"""
+        with self._lock:
+            probes = {
+                name: {
+                    'every_seconds': probe.every * self.interval,
+                    'calls': probe.calls,
+                    'failures': probe.failures,
+                    'avg_ms': round(probe.seconds * 1000 / probe.calls, 3) if probe.calls else None,
+                    'last_ms': round(probe.last_seconds * 1000, 3)
+                }
+                for name, probe in self.probes.items()
+            }
+            probe_seconds = sum(probe.seconds for probe in self.probes.values())
+        running_for = time.time() - self._started_at if self._started_at else 0.0
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'interval_seconds': self.interval,
+            'samples': len(self.ring),
+            'capacity': self.ring.capacity,
+            'probes': probes,
+            'probe_seconds': round(probe_seconds, 4),
+            'thread_cpu_seconds': round(self._thread_cpu, 4),
+            'overhead_percent': round(self._thread_cpu * 100 / running_for, 4) if running_for else None
+        }
+
+# Global health sampler instance
+health_sampler = HealthSampler()
@@ -0,0 +1,424 @@
+"""
+AVA CORE HTTP Cache
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Private HTTP cache for outgoing GET requests made through requests sessions.
+A transport adapter mounted on a session serves fresh responses from disk,
+revalidates stale ones with If-None-Match / If-Modified-Since and reuses the
+stored body on 304, following Cache-Control, Expires, ETag, Last-Modified
+and Vary. Bodies are stored once under their SHA-256 hash in a
+size-bounded store that evicts least recently used entries.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import closing, contextmanager
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Iterator, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get('AVA_HTTP_CACHE_DIR', 'http_cache')
+DEFAULT_MAX_BYTES = int(os.environ.get('AVA_HTTP_CACHE_MB', 256)) * 1024 * 1024
+MAX_ENTRY_BYTES = 32 * 1024 * 1024
+HEURISTIC_FRESHNESS_CAP = 24 * 3600
+CACHEABLE_STATUS = (200, 203, 300, 301, 308, 404, 410)
+
+# Every request header partitions the cache, so credentials given by one
+# caller in any header (Authorization, Cookie, X-API-Key, ...) never answer
+# another caller's request; only these carry no caller identity
+UNPARTITIONED_HEADERS = frozenset(('if-none-match', 'if-modified-since', 'cache-control', 'pragma',
+                                   'connection', 'content-length'))
+
+def _parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+class HTTPCache:
+    """Content-addressed, LRU-bounded store of cacheable HTTP responses"""
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(directory, 'index.db')
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._session = None
+        self.stats = {
+            'hits': 0, 'misses': 0, 'revalidated': 0, 'bypassed': 0, 'stored': 0,
+            'not_stored': 0, 'invalidated': 0, 'evictions': 0,
+            'bytes_saved': 0, 'bytes_fetched': 0
+        }
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits on success and is closed on exit"""
+        if not self._initialized:
+            os.makedirs(self.directory, exist_ok=True)
+            with closing(sqlite3.connect(self.db_path)) as conn, conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS responses (
+                        cache_key TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        vary TEXT NOT NULL,
+                        status INTEGER NOT NULL,
+                        reason TEXT,
+                        headers TEXT NOT NULL,
+                        body_hash TEXT NOT NULL,
+                        stored_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_url ON responses(url)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS bodies (
+                        hash TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL
+                    )
+                ''')
+            self._initialized = True
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn:
+            # The index can be rebuilt by refetching, so commits skip the fsync
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                yield conn
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _write_body(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._body_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(temp_path, path)
+        return digest
+
+    def _read_body(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _key(method: str, url: str, headers) -> str:
+        partition = sorted([name.lower(), value] for name, value in headers.items()
+                           if name.lower() not in UNPARTITIONED_HEADERS)
+        return hashlib.sha256(json.dumps([method, url, partition]).encode('utf-8')).hexdigest()
+
+    # Freshness (RFC 9111 section 4.2)
+
+    @staticmethod
+    def freshness_lifetime(headers) -> float:
+        directives = _parse_cache_control(headers.get('Cache-Control'))
+        max_age = _seconds(directives.get('max-age'))
+        if max_age is not None:
+            return max_age
+        date = _http_date(headers.get('Date'))
+        expires = _http_date(headers.get('Expires'))
+        if expires is not None:
+            return max(0.0, expires - (date or time.time()))
+        last_modified = _http_date(headers.get('Last-Modified'))
+        if last_modified is not None:
+            return min(HEURISTIC_FRESHNESS_CAP, max(0.0, ((date or time.time()) - last_modified) * 0.1))
+        return 0.0
+
+    def _is_fresh(self, entry: Dict[str, Any], request_directives: Dict[str, Optional[str]]) -> bool:
+        headers = entry['headers']
+        directives = _parse_cache_control(headers.get('Cache-Control'))
+        if 'no-cache' in directives or 'no-cache' in request_directives:
+            return False
+        age = time.time() - entry['stored_at'] + (_seconds(headers.get('Age')) or 0)
+        lifetime = self.freshness_lifetime(headers)
+        request_max_age = _seconds(request_directives.get('max-age'))
+        if request_max_age is not None:
+            lifetime = min(lifetime, request_max_age)
+        return age < lifetime
+
+    def _storable(self, request, response_headers, status: int, size: int) -> bool:
+        directives = _parse_cache_control(response_headers.get('Cache-Control'))
+        if status not in CACHEABLE_STATUS or size > MAX_ENTRY_BYTES:
+            return False
+        if 'no-store' in directives or response_headers.get('Vary', '').strip() == '*':
+            return False
+        if 'no-store' in _parse_cache_control(request.headers.get('Cache-Control')):
+            return False
+        # Storing is only useful when the response is fresh for a while or
+        # can be revalidated cheaply
+        return (self.freshness_lifetime(response_headers) > 0
+                or 'ETag' in response_headers or 'Last-Modified' in response_headers)
+
+    # Index
+
+    def lookup(self, request) -> Optional[Dict[str, Any]]:
+        key = self._key(request.method, request.url, request.headers)
+        with self._connect() as conn:
+            row = conn.execute('''
+                SELECT vary, status, reason, headers, body_hash, stored_at
+                FROM responses WHERE cache_key = ?
+            ''', (key,)).fetchone()
+        if row is None:
+            return None
+        vary = json.loads(row[0])
+        if any(request.headers.get(name) != value for name, value in vary.items()):
+            return None
+        return {
+            'key': key,
+            'status': row[1],
+            'reason': row[2],
+            'headers': CaseInsensitiveDict(json.loads(row[3])),
+            'body_hash': row[4],
+            'stored_at': row[5]
+        }
+
+    def store(self, request, status: int, reason: str, headers, body: bytes):
+        vary = {}
+        for name in headers.get('Vary', '').split(','):
+            name = name.strip()
+            if name:
+                vary[name] = request.headers.get(name)
+        digest = self._write_body(body)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('INSERT OR IGNORE INTO bodies (hash, size) VALUES (?, ?)', (digest, len(body)))
+            conn.execute('''
+                INSERT OR REPLACE INTO responses
+                (cache_key, url, vary, status, reason, headers, body_hash, stored_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (self._key(request.method, request.url, request.headers), request.url,
+                  json.dumps(vary), status, reason, json.dumps(dict(headers)), digest, now, now))
+        self._count('stored')
+        self._evict()
+
+    def refresh(self, entry: Dict[str, Any], headers):
+        """Merge the headers of a 304 into a stored entry and restart its age"""
+        merged = CaseInsensitiveDict(entry['headers'])
+        for name, value in headers.items():
+            if name.lower() not in ('content-length', 'content-encoding', 'transfer-encoding'):
+                merged[name] = value
+        entry['headers'] = merged
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('''
+                UPDATE responses SET headers = ?, stored_at = ?, last_used = ? WHERE cache_key = ?
+            ''', (json.dumps(dict(merged)), now, now, entry['key']))
+
+    def touch(self, entry: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute('UPDATE responses SET last_used = ? WHERE cache_key = ?',
+                         (time.time(), entry['key']))
+
+    def invalidate(self, url: str):
+        """Drop stored responses for a URL after an unsafe request to it"""
+        with self._connect() as conn:
+            removed = conn.execute('DELETE FROM responses WHERE url = ?', (url,)).rowcount
+        if removed:
+            self._count('invalidated', removed)
+            self._remove_orphans()
+
+    def _evict(self):
+        with self._lock:
+            with self._connect() as conn:
+                total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()[0]
+                if total <= self.max_bytes:
+                    return
+                rows = conn.execute('''
+                    SELECT r.cache_key, b.size FROM responses r JOIN bodies b ON b.hash = r.body_hash
+                    ORDER BY r.last_used
+                ''').fetchall()
+                for key, size in rows:
+                    conn.execute('DELETE FROM responses WHERE cache_key = ?', (key,))
+                    self.stats['evictions'] += 1
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+        self._remove_orphans()
+
+    def _remove_orphans(self):
+        with self._connect() as conn:
+            orphans = [row[0] for row in conn.execute('''
+                SELECT hash FROM bodies WHERE hash NOT IN (SELECT body_hash FROM responses)
+            ''')]
+            for digest in orphans:
+                conn.execute('DELETE FROM bodies WHERE hash = ?', (digest,))
+                try:
+                    os.remove(self._body_path(digest))
+                except OSError:
+                    pass
+
+    def clear(self) -> int:
+        """Remove every stored response and body"""
+        with self._connect() as conn:
+            removed = conn.execute('DELETE FROM responses').rowcount
+        self._remove_orphans()
+        return removed
+
+    # Sessions
+
+    def install(self, session: requests.Session) -> requests.Session:
+        """Route a session's http and https requests through the cache"""
+        adapter = CachingAdapter(self)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """Shared caching session for module-level callers; it keeps no cookies"""
+        if self._session is None:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            self._session = self.install(session)
+        return self._session
+
+    def get_cache_status(self) -> Dict[str, Any]:
+        """Hit rate, revalidations, bytes saved and store usage"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        status = {
+            'hit_rate': round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else 0.0,
+            'directory': self.directory,
+            'max_bytes': self.max_bytes,
+            'stats': stats
+        }
+        try:
+            with self._connect() as conn:
+                status['entries'] = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+                status['bodies'], status['stored_bytes'] = conn.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM bodies'
+                ).fetchone()
+        except Exception as e:
+            status['error'] = str(e)
+        return status
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that answers GET requests from an HTTPCache when it can"""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def _cached_response(self, request, entry: Dict[str, Any], body: bytes,
+                         cache_status: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['Content-Length'] = str(len(body))
+        response.headers.pop('Content-Encoding', None)
+        response.headers.pop('Transfer-Encoding', None)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        response.cache_status = cache_status
+        return response
+
+    def send(self, request, stream=False, **kwargs) -> requests.Response:
+        if request.method != 'GET' or stream:
+            response = super().send(request, stream=stream, **kwargs)
+            if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE') and response.status_code < 400:
+                self.cache.invalidate(request.url)
+            self.cache._count('bypassed')
+            response.from_cache = False
+            response.cache_status = 'bypass'
+            return response
+
+        request_directives = _parse_cache_control(request.headers.get('Cache-Control'))
+        entry = body = None
+        try:
+            entry = self.cache.lookup(request)
+            body = self.cache._read_body(entry['body_hash']) if entry else None
+        except Exception as e:
+            logger.warning(f"HTTP cache lookup failed: {e}")
+        if body is None:
+            entry = None
+
+        if entry is not None and self.cache._is_fresh(entry, request_directives):
+            self.cache.touch(entry)
+            self.cache._count('hits')
+            self.cache._count('bytes_saved', len(body))
+            return self._cached_response(request, entry, body, 'hit')
+
+        if entry is not None:
+            etag = entry['headers'].get('ETag')
+            last_modified = entry['headers'].get('Last-Modified')
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+
+        response = super().send(request, stream=False, **kwargs)
+        for name in ('If-None-Match', 'If-Modified-Since'):
+            request.headers.pop(name, None)
+
+        if entry is not None and response.status_code == 304:
+            try:
+                self.cache.refresh(entry, response.headers)
+            except Exception as e:
+                logger.warning(f"HTTP cache refresh failed: {e}")
+            self.cache._count('revalidated')
+            self.cache._count('bytes_saved', len(body))
+            return self._cached_response(request, entry, body, 'revalidated')
+
+        self.cache._count('misses')
+        self.cache._count('bytes_fetched', len(response.content))
+        try:
+            if self.cache._storable(request, response.headers, response.status_code, len(response.content)):
+                headers = CaseInsensitiveDict(response.headers)
+                # Bodies are stored decoded
+                for name in ('Content-Encoding', 'Transfer-Encoding', 'Content-Length'):
+                    headers.pop(name, None)
+                self.cache.store(request, response.status_code, response.reason, headers, response.content)
+            else:
+                self.cache._count('not_stored')
+        except Exception as e:
+            logger.warning(f"HTTP cache store failed: {e}")
+        response.from_cache = False
+        response.cache_status = 'miss'
+        return response
+
+# Global HTTP cache instance
+http_cache = HTTPCache()
@@ -0,0 +1,423 @@
+"""
+AVA CORE Job Manager
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Asynchronous shell and code jobs with streamed output.
+A submitted job gets an id straight away and runs in the background; its
+stdout/stderr chunks are published to listeners (Socket.IO, SSE) as they are
+produced. Output is kept in memory up to a cap and then spilled to a file,
+jobs can be cancelled, and status and output stay retrievable by id after
+the job finishes.
+"""
+
+import os
+import uuid
+import codecs
+import signal
+import logging
+import threading
+import subprocess
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOB_OUTPUT_DIR = os.environ.get('AVA_JOB_OUTPUT_DIR', 'job_output')
+DEFAULT_MEMORY_CAP = 256 * 1024
+DEFAULT_SPILL_CAP = 64 * 1024 * 1024
+DEFAULT_JOB_TIMEOUT = 300
+MAX_JOB_TIMEOUT = 3600
+MAX_RETAINED_JOBS = 500
+RECENT_CHUNKS = 2048
+READ_SIZE = 64 * 1024
+CANCEL_GRACE = 2.0
+
+JOB_KINDS = ('bash', 'python', 'javascript', 'typescript')
+FINAL_STATES = ('completed', 'failed', 'cancelled', 'timed_out')
+
+class StreamCapture:
+    """One output stream: in memory up to a cap, then spilled to a file"""
+
+    def __init__(self, path: str, memory_cap: int, spill_cap: int):
+        self.path = path
+        self.memory_cap = memory_cap
+        self.spill_cap = spill_cap
+        self.buffer = bytearray()
+        self.size = 0
+        self.spilled = False
+        self.truncated = False
+        self._file = None
+
+    def append(self, data: bytes):
+        if self.truncated:
+            return
+        if self.size + len(data) > self.spill_cap:
+            data = data[:self.spill_cap - self.size]
+            self.truncated = True
+
+        if not self.spilled and self.size + len(data) > self.memory_cap:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'wb')
+            self._file.write(self.buffer)
+            self.spilled = True
+
+        if self.spilled:
+            self._file.write(data)
+            self._file.flush()
+        else:
+            self.buffer += data
+        self.size += len(data)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read(self, offset: int = 0, limit: int = None) -> bytes:
+        """Read captured bytes from offset, from memory or the spill file"""
+        end = self.size if limit is None else min(self.size, offset + limit)
+        if offset >= end:
+            return b''
+        if not self.spilled:
+            return bytes(self.buffer[offset:end])
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(end - offset)
+
+    def text(self) -> str:
+        """The in-memory head of the stream, with a pointer to the file if spilled"""
+        text = self.buffer.decode('utf-8', errors='replace') if not self.spilled \
+            else self.read(0, self.memory_cap).decode('utf-8', errors='replace')
+        if self.spilled:
+            text += f"\n[output truncated: {self.size} bytes, full output in {self.path}]\n"
+        elif self.truncated:
+            text += f"\n[output truncated at {self.spill_cap} bytes]\n"
+        return text
+
+    def remove(self):
+        self.close()
+        if self.spilled and os.path.exists(self.path):
+            os.remove(self.path)
+
+class StreamingJob:
+    """A background job, its captured output and recent output chunks"""
+
+    def __init__(self, manager: 'JobManager', kind: str, source: str, owner: str, timeout: float):
+        self.id = uuid.uuid4().hex
+        self.manager = manager
+        self.kind = kind
+        self.source = source
+        self.owner = owner
+        self.timeout = timeout
+        self.status = 'queued'
+        self.return_code = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self.streams = {
+            name: StreamCapture(os.path.join(manager.output_dir, f"{self.id}.{name}"),
+                                manager.memory_cap, manager.spill_cap)
+            for name in ('stdout', 'stderr')
+        }
+        self.recent: deque = deque(maxlen=RECENT_CHUNKS)
+        self.seq = 0
+        self.cond = threading.Condition()
+        self._process = None
+        self._pool_job = None
+        self._pool = None
+
+    def record(self, stream: str, data: str):
+        """Capture an output chunk and publish it to listeners"""
+        encoded = data.encode('utf-8')
+        with self.cond:
+            capture = self.streams[stream]
+            offset = capture.size
+            capture.append(encoded)
+            self.seq += 1
+            chunk = {'job_id': self.id, 'seq': self.seq, 'stream': stream, 'offset': offset, 'data': data}
+            self.recent.append(chunk)
+            self.cond.notify_all()
+        self.manager._publish('job_output', chunk)
+
+    def set_status(self, status: str, return_code: int = None, error: str = None):
+        with self.cond:
+            self.status = status
+            if status == 'running':
+                self.started_at = datetime.now().isoformat()
+            if status in FINAL_STATES:
+                self.finished_at = datetime.now().isoformat()
+                self.return_code = return_code
+                self.error = error
+                for capture in self.streams.values():
+                    capture.close()
+            self.cond.notify_all()
+        self.manager._publish('job_status', self.to_dict())
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL_STATES
+
+    def events_since(self, seq: int = 0, timeout: float = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Chunks after seq, waiting up to timeout for new ones while running
+
+        The second value is True when chunks after seq have already been
+        dropped from the recent window; read them through read_output.
+        """
+        with self.cond:
+            if timeout and self.seq <= seq and not self.finished:
+                self.cond.wait(timeout)
+            chunks = [chunk for chunk in self.recent if chunk['seq'] > seq]
+            gap = bool(self.recent) and self.recent[0]['seq'] > seq + 1
+            return chunks, gap
+
+    def wait(self, timeout: float = None) -> bool:
+        with self.cond:
+            return self.cond.wait_for(lambda: self.finished, timeout)
+
+    def read_output(self, stream: str = 'stdout', offset: int = 0, limit: int = None) -> Dict[str, Any]:
+        capture = self.streams[stream]
+        data = capture.read(offset, limit)
+        return {
+            'job_id': self.id,
+            'stream': stream,
+            'offset': offset,
+            'next_offset': offset + len(data),
+            'size': capture.size,
+            'complete': self.finished and offset + len(data) >= capture.size,
+            'data': data.decode('utf-8', errors='replace')
+        }
+
+    def output_text(self, stream: str = 'stdout') -> str:
+        """Captured output for synchronous callers, capped at the memory limit"""
+        return self.streams[stream].text()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'owner': self.owner,
+            'status': self.status,
+            'return_code': self.return_code,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'timeout': self.timeout,
+            'chunks': self.seq,
+            'output': {
+                name: {'bytes': capture.size, 'spilled': capture.spilled, 'truncated': capture.truncated}
+                for name, capture in self.streams.items()
+            }
+        }
+
+class JobManager:
+    """Runs shell and code jobs in the background and streams their output"""
+
+    def __init__(self, max_workers: int = 16, output_dir: str = JOB_OUTPUT_DIR,
+                 memory_cap: int = DEFAULT_MEMORY_CAP, spill_cap: int = DEFAULT_SPILL_CAP,
+                 max_jobs: int = MAX_RETAINED_JOBS):
+        self.output_dir = output_dir
+        self.memory_cap = memory_cap
+        self.spill_cap = spill_cap
+        self.max_jobs = max_jobs
+        self._jobs: 'OrderedDict[str, StreamingJob]' = OrderedDict()
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ava-job')
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0,
+                      'timed_out': 0, 'spilled': 0, 'evicted': 0}
+
+    def add_listener(self, callback: Callable[[str, Dict[str, Any]], None]):
+        """Register callback(event, payload) for job_output and job_status events"""
+        self._listeners.append(callback)
+
+    def _publish(self, event: str, payload: Dict[str, Any]):
+        for callback in self._listeners:
+            try:
+                callback(event, payload)
+            except Exception as e:
+                logger.error(f"Job listener failed for {event}: {e}")
+
+    def submit(self, kind: str, source: str, owner: str = 'default',
+               timeout: float = DEFAULT_JOB_TIMEOUT) -> StreamingJob:
+        """Start a job in the background and return it immediately"""
+        kind = kind.lower()
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unsupported job type: {kind}")
+
+        timeout = min(float(timeout or DEFAULT_JOB_TIMEOUT), MAX_JOB_TIMEOUT)
+        job = StreamingJob(self, kind, source, owner, timeout)
+        with self._lock:
+            self._jobs[job.id] = job
+            self.stats['submitted'] += 1
+            self._evict()
+
+        runner = self._run_shell if kind == 'bash' else self._run_on_pool
+        self._executor.submit(self._run, job, runner)
+        return job
+
+    def run_command(self, command: str, timeout: float = 30, owner: str = 'default') -> StreamingJob:
+        """Run a shell command through the job machinery and wait for it"""
+        job = self.submit('bash', command, owner=owner, timeout=timeout)
+        job.wait()
+        return job
+
+    def get(self, job_id: str) -> Optional[StreamingJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = list(self._jobs.values())[-limit:]
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; returns False if the job is unknown or finished"""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+
+        job.cancel_requested = True
+        process = job._process
+        if process is not None and process.poll() is None:
+            self._terminate(process)
+        if job._pool_job is not None:
+            job._pool.cancel(job._pool_job)
+        return True
+
+    def _evict(self):
+        """Drop the oldest finished jobs and their spill files beyond the retention limit"""
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [jid for jid, job in self._jobs.items() if job.finished][:max(0, excess)]:
+            for capture in self._jobs.pop(job_id).streams.values():
+                capture.remove()
+            self.stats['evicted'] += 1
+
+    def _run(self, job: StreamingJob, runner: Callable[[StreamingJob], None]):
+        if job.cancel_requested:
+            self._finish(job, 'cancelled', None, 'Job cancelled')
+            return
+        job.set_status('running')
+        try:
+            runner(job)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            self._finish(job, 'failed', None, str(e))
+
+    def _finish(self, job: StreamingJob, status: str, return_code: Optional[int], error: str = None):
+        job.set_status(status, return_code, error)
+        with self._lock:
+            self.stats[status] += 1
+            if any(capture.spilled for capture in job.streams.values()):
+                self.stats['spilled'] += 1
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen):
+        """Stop a shell job's whole process group, escalating to SIGKILL"""
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+            process.wait(timeout=CANCEL_GRACE)
+        except subprocess.TimeoutExpired:
+            if hasattr(os, 'killpg'):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def _run_shell(self, job: StreamingJob):
+        process = subprocess.Popen(
+            job.source,
+            shell=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=hasattr(os, 'killpg')
+        )
+        job._process = process
+
+        def pump(pipe, stream):
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            for block in iter(lambda: os.read(pipe.fileno(), READ_SIZE), b''):
+                text = decoder.decode(block)
+                if text:
+                    job.record(stream, text)
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                job.record(stream, tail)
+            pipe.close()
+
+        readers = [threading.Thread(target=pump, args=(process.stdout, 'stdout'), daemon=True),
+                   threading.Thread(target=pump, args=(process.stderr, 'stderr'), daemon=True)]
+        for reader in readers:
+            reader.start()
+
+        timed_out = False
+        try:
+            process.wait(timeout=job.timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            self._terminate(process)
+        for reader in readers:
+            reader.join(timeout=CANCEL_GRACE)
+
+        if job.cancel_requested:
+            self._finish(job, 'cancelled', process.returncode, 'Job cancelled')
+        elif timed_out:
+            self._finish(job, 'timed_out', process.returncode, f'Command timed out after {job.timeout} seconds')
+        elif process.returncode == 0:
+            self._finish(job, 'completed', 0)
+        else:
+            self._finish(job, 'failed', process.returncode)
+
+    def _run_on_pool(self, job: StreamingJob):
+        if job.kind == 'python':
+            from execution_pool import execution_pool as pool
+            pool_job = pool.submit(job.source, owner=job.owner, timeout=job.timeout,
+                                   on_output=job.record)
+        else:
+            from node_pool import node_pool as pool
+            pool_job = pool.submit(job.source, language=job.kind, owner=job.owner,
+                                   timeout=job.timeout, on_output=job.record)
+        job._pool, job._pool_job = pool, pool_job
+        if job.cancel_requested:
+            pool.cancel(pool_job)
+
+        pool_job.done.wait()
+        result = pool_job.result
+        if result.get('cancelled') or job.cancel_requested:
+            self._finish(job, 'cancelled', result.get('return_code'), 'Job cancelled')
+        elif result.get('timed_out'):
+            self._finish(job, 'timed_out', result.get('return_code'), 'Code execution timed out')
+        elif result.get('success'):
+            self._finish(job, 'completed', result.get('return_code', 0))
+        else:
+            # Worker-level failures (negative codes) never reach the streamed output
+            if (result.get('return_code') or 0) < 0 and result.get('error'):
+                job.record('stderr', result['error'])
+            self._finish(job, 'failed', result.get('return_code'), result.get('error') or None)
+
+    def get_manager_status(self) -> Dict[str, Any]:
+        """Get job counts by state and manager counters"""
+        with self._lock:
+            states: Dict[str, int] = {}
+            for job in self._jobs.values():
+                states[job.status] = states.get(job.status, 0) + 1
+            return {
+                'retained_jobs': len(self._jobs),
+                'jobs_by_status': states,
+                'memory_cap_bytes': self.memory_cap,
+                'spill_cap_bytes': self.spill_cap,
+                'output_dir': self.output_dir,
+                'stats': dict(self.stats)
+            }
+
+# Global job manager instance
+job_manager = JobManager()
@@ -0,0 +1,345 @@
+"""
+AVA CORE Memory Consolidation
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Incremental consolidation for the autonomous thinking memory database.
+Each cycle reads only rows past stored high-water marks (row ids, so every
+read is a primary key range) and folds them into running aggregates: a
+one-hour window of thought types for reflection and per-type counts of
+learning patterns. Thoughts produced during a cycle are buffered and written
+in one transaction. Thoughts older than the retention period are rolled into
+per-day summaries and deleted in bounded batches, and association strength
+decays with one indexed UPDATE per day that stops touching rows once they
+reach the floor. With no new activity a cycle costs a few indexed lookups,
+however large the history is.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 3600
+WINDOW_SEED_ROWS = 5000
+RETENTION_DAYS = float(os.environ.get('AVA_THOUGHT_RETENTION_DAYS', '7'))
+SUMMARY_BATCH = 5000
+DECAY_PER_DAY = 0.98
+DECAY_INTERVAL = 24 * 3600
+STRENGTH_FLOOR = 0.1
+
+STATE_KEYS = ('thoughts_hwm', 'patterns_hwm', 'associations_hwm', 'pattern_counts', 'last_decay')
+
+def _epoch(timestamp: str) -> float:
+    """SQLite CURRENT_TIMESTAMP text (UTC) to epoch seconds"""
+    try:
+        return datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+class MemoryConsolidator:
+    """High-water-mark ingestion, batched thought writes, summaries and bulk decay"""
+
+    def __init__(self, db_path: str, retention_days: float = RETENTION_DAYS,
+                 decay_per_day: float = DECAY_PER_DAY, strength_floor: float = STRENGTH_FLOOR):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.decay_per_day = decay_per_day
+        self.strength_floor = strength_floor
+        self._conn = None
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[str, str, str, float]] = []
+        # Ids of thoughts flushed here and not yet absorbed, and of those absorbed past the high-water mark
+        self._written: List[int] = []
+        self._absorbed: set = set()
+        self._window: deque = deque()
+        self._interactions = 0
+        self._changed_patterns: set = set()
+        self.state: Dict[str, Any] = {}
+        self.stats = {'cycles': 0, 'rows_ingested': 0, 'thoughts_written': 0, 'flushes': 0,
+                      'thoughts_summarized': 0, 'decays': 0, 'associations_decayed': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS consolidation_state (
+                    name TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS thought_summaries (
+                    day TEXT NOT NULL,
+                    thought_type TEXT NOT NULL,
+                    context TEXT NOT NULL,
+                    thought_count INTEGER NOT NULL,
+                    confidence_sum REAL NOT NULL,
+                    first_seen TIMESTAMP,
+                    last_seen TIMESTAMP,
+                    last_content TEXT,
+                    PRIMARY KEY (day, thought_type, context)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_memory_associations_strength '
+                         'ON memory_associations(strength)')
+            conn.commit()
+            self._conn = conn
+            self._load_state()
+        return self._conn
+
+    # State
+
+    def _load_state(self):
+        rows = dict(self._conn.execute('SELECT name, value FROM consolidation_state').fetchall())
+        self.state = {name: json.loads(rows[name]) for name in STATE_KEYS if name in rows}
+        if 'thoughts_hwm' not in self.state:
+            self._bootstrap()
+        self._seed_window()
+
+    def _bootstrap(self):
+        """First run on an existing database: one full pass, then incremental from here on"""
+        conn = self._conn
+        self.state = {
+            'thoughts_hwm': conn.execute('SELECT COALESCE(MAX(id), 0) FROM thoughts').fetchone()[0],
+            'patterns_hwm': conn.execute('SELECT COALESCE(MAX(id), 0) FROM learning_patterns').fetchone()[0],
+            'associations_hwm': conn.execute('SELECT COALESCE(MAX(id), 0) FROM memory_associations').fetchone()[0],
+            'pattern_counts': dict(conn.execute(
+                'SELECT pattern_type, COUNT(*) FROM learning_patterns GROUP BY pattern_type').fetchall()),
+            'last_decay': time.time()
+        }
+        self._save_state()
+        conn.commit()
+        logger.info(f"Memory consolidation bootstrapped at thought id {self.state['thoughts_hwm']}")
+
+    def _save_state(self):
+        self._conn.executemany('INSERT OR REPLACE INTO consolidation_state (name, value) VALUES (?, ?)',
+                               [(name, json.dumps(self.state[name])) for name in STATE_KEYS])
+
+    def _seed_window(self):
+        cutoff = time.time() - WINDOW_SECONDS
+        rows = self._conn.execute('SELECT thought_type, timestamp FROM thoughts ORDER BY id DESC LIMIT ?',
+                                  (WINDOW_SEED_ROWS,)).fetchall()
+        self._window = deque(sorted((_epoch(timestamp), thought_type) for thought_type, timestamp in rows
+                                    if _epoch(timestamp) > cutoff))
+
+    # Ingestion
+
+    def note_interaction(self):
+        """Count an interaction stored outside the consolidator as new activity"""
+        self._interactions += 1
+
+    def _ingest(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        state = self.state
+        rows = conn.execute('SELECT id, thought_type, timestamp FROM thoughts WHERE id > ? ORDER BY id',
+                            (state['thoughts_hwm'],)).fetchall()
+        thoughts = 0
+        for row_id, thought_type, timestamp in rows:
+            state['thoughts_hwm'] = row_id
+            if row_id in self._absorbed:
+                self._absorbed.discard(row_id)
+                continue
+            self._window.append((_epoch(timestamp), thought_type))
+            thoughts += 1
+
+        patterns = conn.execute('SELECT id, pattern_type FROM learning_patterns WHERE id > ? ORDER BY id',
+                                (state['patterns_hwm'],)).fetchall()
+        counts = state['pattern_counts']
+        for row_id, pattern_type in patterns:
+            counts[pattern_type] = counts.get(pattern_type, 0) + 1
+            self._changed_patterns.add(pattern_type)
+            state['patterns_hwm'] = row_id
+
+        newest = conn.execute('SELECT COALESCE(MAX(id), 0) FROM memory_associations').fetchone()[0]
+        associations = max(newest - state['associations_hwm'], 0)
+        state['associations_hwm'] = max(newest, state['associations_hwm'])
+
+        self.stats['rows_ingested'] += thoughts + len(patterns) + associations
+        return {'thoughts': thoughts, 'patterns': len(patterns), 'associations': associations}
+
+    def ingest(self) -> Dict[str, int]:
+        """Fold rows added since the high-water marks into the aggregates; returns new activity"""
+        with self._lock:
+            conn = self._connection()
+            activity = self._ingest(conn)
+            # Idle cycles leave the database untouched
+            if any(activity.values()):
+                self._save_state()
+                conn.commit()
+            activity['interactions'], self._interactions = self._interactions, 0
+            self.stats['cycles'] += 1
+            return activity
+
+    def absorb(self):
+        """Fold in the thoughts flush wrote, so they are not seen as new activity next cycle
+
+        Rows other writers added in the meantime are left for the next ingest,
+        where they count as activity.
+        """
+        with self._lock:
+            if not self._written:
+                return
+            conn = self._connection()
+            state = self.state
+            written, self._written = set(self._written), []
+            rows = conn.execute('SELECT id, thought_type, timestamp FROM thoughts WHERE id > ? AND id <= ? '
+                                'ORDER BY id', (state['thoughts_hwm'], max(written))).fetchall()
+            # The mark advances over our own rows only up to the first row written by someone else
+            contiguous = True
+            for row_id, thought_type, timestamp in rows:
+                if row_id not in written:
+                    contiguous = False
+                    continue
+                self._window.append((_epoch(timestamp), thought_type))
+                if contiguous:
+                    state['thoughts_hwm'] = row_id
+                else:
+                    self._absorbed.add(row_id)
+            self._save_state()
+            conn.commit()
+
+    def recent_thought_types(self) -> Counter:
+        """Thought types recorded in the last hour"""
+        with self._lock:
+            self._connection()
+            cutoff = time.time() - WINDOW_SECONDS
+            while self._window and self._window[0][0] <= cutoff:
+                self._window.popleft()
+            return Counter(thought_type for _, thought_type in self._window)
+
+    def pattern_counts(self, limit: int = 5) -> List[Tuple[str, int]]:
+        with self._lock:
+            self._connection()
+            return Counter(self.state['pattern_counts']).most_common(limit)
+
+    def take_changed_patterns(self) -> set:
+        """Pattern types whose counts changed since the previous call"""
+        with self._lock:
+            changed, self._changed_patterns = self._changed_patterns, set()
+            return changed
+
+    # Batched thought writes
+
+    def record_thought(self, thought_type: str, content: str, context: str, confidence: float):
+        with self._lock:
+            self._pending.append((thought_type, content, context, confidence))
+
+    def flush(self) -> int:
+        """Write buffered thoughts in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            conn = self._connection()
+            pending, self._pending = self._pending, []
+            try:
+                ids = [conn.execute('INSERT INTO thoughts (thought_type, content, context, confidence) '
+                                    'VALUES (?, ?, ?, ?)', row).lastrowid for row in pending]
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                self._pending = pending + self._pending
+                raise
+            self._written.extend(ids)
+            self.stats['flushes'] += 1
+            self.stats['thoughts_written'] += len(pending)
+            return len(pending)
+
+    # Summaries and decay
+
+    def _summarize(self, conn: sqlite3.Connection) -> int:
+        """Roll the oldest batch of expired thoughts into per-day summaries"""
+        cutoff = datetime.fromtimestamp(time.time() - self.retention_days * 86400, timezone.utc)
+        cutoff = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+        oldest = conn.execute('SELECT timestamp FROM thoughts ORDER BY id LIMIT 1').fetchone()
+        if not oldest or oldest[0] >= cutoff:
+            return 0
+        # Ids follow insertion time, so expired rows form a prefix of the id order
+        bound = conn.execute('''
+            SELECT MAX(id) FROM (SELECT id, timestamp FROM thoughts ORDER BY id LIMIT ?)
+            WHERE timestamp < ?
+        ''', (SUMMARY_BATCH, cutoff)).fetchone()[0]
+        if bound is None:
+            return 0
+        conn.execute('''
+            INSERT INTO thought_summaries
+                (day, thought_type, context, thought_count, confidence_sum, first_seen, last_seen, last_content)
+            SELECT day, thought_type, context, thought_count, confidence_sum, first_seen, last_seen,
+                   (SELECT content FROM thoughts WHERE id = newest)
+            FROM (
+                SELECT date(timestamp) AS day, thought_type, COALESCE(context, '') AS context,
+                       COUNT(*) AS thought_count, SUM(COALESCE(confidence, 0)) AS confidence_sum,
+                       MIN(timestamp) AS first_seen, MAX(timestamp) AS last_seen, MAX(id) AS newest
+                FROM thoughts WHERE id <= ? AND timestamp < ?
+                GROUP BY date(timestamp), thought_type, COALESCE(context, '')
+            )
+            WHERE true  -- lets SQLite tell the upsert clause from a join constraint
+            ON CONFLICT (day, thought_type, context) DO UPDATE SET
+                thought_count = thought_count + excluded.thought_count,
+                confidence_sum = confidence_sum + excluded.confidence_sum,
+                first_seen = MIN(first_seen, excluded.first_seen),
+                last_seen = MAX(last_seen, excluded.last_seen),
+                last_content = excluded.last_content
+        ''', (bound, cutoff))
+        return conn.execute('DELETE FROM thoughts WHERE id <= ? AND timestamp < ?', (bound, cutoff)).rowcount
+
+    def _decay(self, conn: sqlite3.Connection) -> int:
+        elapsed = time.time() - self.state['last_decay']
+        if elapsed < DECAY_INTERVAL:
+            return 0
+        factor = self.decay_per_day ** (elapsed / 86400)
+        # Rows at the floor are outside the indexed range and cost nothing
+        decayed = conn.execute('''
+            UPDATE memory_associations SET strength = MAX(?, strength * ?)
+            WHERE strength > ? AND last_used < datetime('now', '-1 day')
+        ''', (self.strength_floor, factor, self.strength_floor)).rowcount
+        self.state['last_decay'] = time.time()
+        self.stats['decays'] += 1
+        return decayed
+
+    def consolidate(self) -> Dict[str, int]:
+        """Summarize one batch of expired thoughts and apply decay when due"""
+        with self._lock:
+            conn = self._connection()
+            last_decay = self.state['last_decay']
+            try:
+                summarized = self._summarize(conn)
+                decayed = self._decay(conn)
+                if summarized or self.state['last_decay'] != last_decay:
+                    self._save_state()
+                    conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            self.stats['thoughts_summarized'] += summarized
+            self.stats['associations_decayed'] += decayed
+            return {'summarized': summarized, 'decayed': decayed}
+
+    def summaries(self, limit: int = 30) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection().execute('''
+                SELECT day, thought_type, context, thought_count, confidence_sum, last_content
+                FROM thought_summaries ORDER BY day DESC, thought_count DESC LIMIT ?
+            ''', (limit,)).fetchall()
+        return [{'day': day, 'thought_type': thought_type, 'context': context, 'count': count,
+                 'avg_confidence': round(total / count, 3) if count else None, 'last_content': content}
+                for day, thought_type, context, count, total, content in rows]
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            self._connection()
+            return {
+                'high_water_marks': {name: self.state[name] for name in
+                                     ('thoughts_hwm', 'patterns_hwm', 'associations_hwm')},
+                'pending_thoughts': len(self._pending),
+                'window_thoughts': len(self._window),
+                'retention_days': self.retention_days,
+                'last_decay': datetime.fromtimestamp(self.state['last_decay']).isoformat(),
+                'stats': dict(self.stats)
+            }
@@ -0,0 +1,376 @@
+"""
+AVA CORE Metrics
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Process-wide counters, histograms and gauges rendered in the Prometheus
+text exposition format for the /metrics endpoints.
+Each thread records into its own shard, a plain dict only that thread
+writes, so recording a value takes no lock. A scrape sums the shards of
+all threads. Shards of finished threads are folded into a retired total
+so per-request threads do not pile up. Gauges are callbacks evaluated at
+scrape time, which suits queue depths that already live in other services.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from profiler import tracer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers SQLite lookups through slow LLM completions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+class Counter:
+    """Monotonic count, optionally split by labels"""
+
+    kind = 'counter'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str, labels: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+
+    def inc(self, *label_values, amount: float = 1):
+        shard = self.registry._shard()
+        key = (self.name, label_values)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = [0]
+        cell[0] += amount
+
+    def _render(self, cells: Dict[tuple, List[float]]) -> List[str]:
+        return [f'{self.name}{_labels(self.labels, values)} {_number(cell[0])}'
+                for values, cell in sorted(cells.items())]
+
+class Histogram:
+    """Distribution of observed values in fixed buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str, labels: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values):
+        shard = self.registry._shard()
+        key = (self.name, label_values)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = self._new_cell()
+        # [count, sum, bucket counts..., +Inf]; buckets are made cumulative on render
+        cell[0] += 1
+        cell[1] += value
+        cell[2 + bisect_left(self.buckets, value)] += 1
+
+    @contextmanager
+    def timer(self, *label_values):
+        """Observe the seconds spent in the with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def merged(self) -> List[float]:
+        """[count, sum, bucket counts..., +Inf] summed over every label value"""
+        total = self._new_cell()
+        for (name, _), cell in self.registry._collect().items():
+            if name == self.name:
+                for index, value in enumerate(cell):
+                    total[index] += value
+        return total
+
+    def _new_cell(self) -> List[float]:
+        return [0, 0.0] + [0] * (len(self.buckets) + 1)
+
+    def _render(self, cells: Dict[tuple, List[float]]) -> List[str]:
+        lines = []
+        bounds = self.buckets + (float('inf'),)
+        for values, cell in sorted(cells.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, cell[2:]):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, values)} {_number(cell[1])}')
+            lines.append(f'{self.name}_count{_labels(self.labels, values)} {cell[0]}')
+        return lines
+
+class Gauge:
+    """Current value read from a callback at scrape time
+
+    The callback returns a number, or a dict from label value tuples to
+    numbers when the gauge has labels.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], Any], labels: Sequence[str]):
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+        self.labels = tuple(labels)
+
+    def _render(self) -> List[str]:
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.debug(f"Gauge {self.name} failed: {e}")
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [f'{self.name}{_labels(self.labels, key)} {_number(value)}'
+                for key, value in sorted(values.items()) if value is not None]
+
+class MetricsRegistry:
+    """Named metrics with per-thread shards merged on scrape"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[tuple, List[float]]]] = []
+        self._retired: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'scrapes': 0, 'retired_shards': 0}
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind or existing.labels != metric.labels:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                # Modules imported twice (or two apps in one process) share one series
+                if metric.kind == 'gauge':
+                    self._metrics[metric.name] = metric
+                    return metric
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help_text, labels, buckets))
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], Any],
+              labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, callback, labels))
+
+    def _shard(self) -> Dict[tuple, List[float]]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _collect(self) -> Dict[tuple, List[float]]:
+        """Sum all shards, folding those of finished threads into the retired totals"""
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    # The owner has exited, so nothing writes this shard any more
+                    self._merge(self._retired, shard.items())
+                    self.stats['retired_shards'] += 1
+            self._shards = live
+            totals = {key: list(cell) for key, cell in self._retired.items()}
+            for _, shard in live:
+                # list() copies the items in one step, so a concurrent first
+                # write to the shard cannot break the iteration
+                self._merge(totals, list(shard.items()))
+            self.stats['scrapes'] += 1
+        return totals
+
+    @staticmethod
+    def _merge(into: Dict[tuple, List[float]], items):
+        for key, cell in items:
+            target = into.get(key)
+            if target is None:
+                into[key] = list(cell)
+            else:
+                for index, value in enumerate(cell):
+                    target[index] += value
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        totals = self._collect()
+        by_metric: Dict[str, Dict[tuple, List[float]]] = {}
+        for (name, values), cell in totals.items():
+            by_metric.setdefault(name, {})[values] = cell
+
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for name, metric in metrics:
+            lines.append(f'# HELP {name} {metric.help}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            if metric.kind == 'gauge':
+                lines.extend(metric._render())
+            else:
+                lines.extend(metric._render(by_metric.get(name, {})))
+        return '\n'.join(lines) + '\n'
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+http_request_seconds = metrics.histogram(
+    'ava_http_request_duration_seconds', 'HTTP request latency by route', ('app', 'method', 'route'))
+http_requests = metrics.counter(
+    'ava_http_requests_total', 'HTTP responses by route and status', ('app', 'method', 'route', 'status'))
+llm_request_seconds = metrics.histogram(
+    'ava_llm_request_duration_seconds', 'LLM call latency by engine', ('engine', 'model'))
+llm_requests = metrics.counter(
+    'ava_llm_requests_total', 'LLM calls by engine and outcome', ('engine', 'model', 'outcome'))
+llm_tokens = metrics.counter(
+    'ava_llm_tokens_total', 'LLM tokens by engine and direction', ('engine', 'model', 'direction'))
+sqlite_query_seconds = metrics.histogram(
+    'ava_sqlite_query_duration_seconds', 'SQLite statement execution time by database file', ('store',))
+socketio_emits = metrics.counter(
+    'ava_socketio_emits_total', 'Socket.IO events emitted', ('app', 'event'))
+
+def instrument_flask(app, name: str):
+    """Record latency and status of every request served by a Flask app"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            # The rule, not the path, so /api/jobs/<job_id> stays one series
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            http_request_seconds.observe(time.perf_counter() - started, name, request.method, route)
+            http_requests.inc(name, request.method, route, str(response.status_code))
+        return response
+
+def instrument_socketio(socketio, name: str):
+    """Count events sent through a SocketIO instance, including flask_socketio.emit"""
+    emit = socketio.emit
+
+    def counted_emit(event, *args, **kwargs):
+        socketio_emits.inc(name, event)
+        return emit(event, *args, **kwargs)
+
+    socketio.emit = counted_emit
+
+class LLMCall:
+    """Times one LLM request; call usage() with the token counts from the response
+
+    An exception leaving the block counts as an error; set outcome to
+    'error' for failures reported without one, such as an HTTP error status.
+    """
+
+    def __init__(self, engine: str, model: str):
+        self.engine = engine
+        self.model = model
+        self.outcome = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def usage(self, input_tokens=None, output_tokens=None):
+        if input_tokens:
+            llm_tokens.inc(self.engine, self.model, 'input', amount=input_tokens)
+        if output_tokens:
+            llm_tokens.inc(self.engine, self.model, 'output', amount=output_tokens)
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        llm_request_seconds.observe(elapsed, self.engine, self.model)
+        tracer.record(f'llm:{self.engine}', self.started, elapsed)
+        llm_requests.inc(self.engine, self.model, 'error' if exc_type else self.outcome or 'success')
+        return False
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records statement execution time for its connection's store"""
+
+    def _observe(self, start: float):
+        elapsed = time.perf_counter() - start
+        sqlite_query_seconds.observe(elapsed, self.connection.store)
+        tracer.record(f'sqlite:{self.connection.store}', start, elapsed)
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._observe(start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._observe(start)
+
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._observe(start)
+
+class TimedConnection(sqlite3.Connection):
+    """Connection factory for sqlite3.connect(path, factory=TimedConnection)
+
+    Statements run through the connection shortcuts or its cursors are
+    timed. The time covers executing the statement and producing the first
+    row; rows fetched afterwards are not included.
+    """
+
+    def __init__(self, database, *args, **kwargs):
+        super().__init__(database, *args, **kwargs)
+        self.store = os.path.basename(str(database)) or str(database)
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # The C shortcuts create a plain cursor without calling cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
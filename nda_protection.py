@@ -86,11 +86,16 @@ All features, functions, and API endpoints are protected under NDA license.
 Unauthorized access triggers automatic transparent self-destruction.
 """
 
+import atexit
 import functools
+import itertools
 import logging
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from flask import jsonify
+from profiler import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -103,32 +108,155 @@ NDA_LICENSE_INFO = {
     'license_type': 'NDA_PROPRIETARY'
 }
 
+class NDAComplianceState:
+    """Compliance state computed once and reused until explicitly refreshed"""
+    
+    def __init__(self):
+        self._compliant: Optional[bool] = None
+        self._lock = threading.Lock()
+        self.version = 0
+        self.last_refreshed: Optional[str] = None
+    
+    def _compute(self) -> bool:
+        """Run the (comparatively expensive) authorization check"""
+        try:
+            from self_management import verify_authorization
+            return bool(verify_authorization('nda_compliance'))
+        except Exception as e:
+            logger.critical(f"NDA compliance check failed: {e}")
+            return False
+    
+    @property
+    def compliant(self) -> bool:
+        """Cached compliance result, computed on first use"""
+        state = self._compliant
+        if state is None:
+            state = self.refresh()
+        return state
+    
+    def refresh(self) -> bool:
+        """Recompute compliance; call at startup and whenever authorization changes"""
+        with self._lock:
+            self._compliant = self._compute()
+            self.version += 1
+            self.last_refreshed = datetime.now().isoformat()
+            return self._compliant
+    
+    def invalidate(self):
+        """Drop the cached state so the next access recomputes it"""
+        self._compliant = None
+
+class AccessRingBuffer:
+    """Fixed-size ring of access records flushed to a sink in batches
+    
+    Writers never take a lock: slot indices come from itertools.count, whose
+    next() is atomic under the GIL, and each slot is a single list store.
+    A flush stops at the first slot whose writer has not stored its record
+    yet, so only committed records are flushed; records overwritten before a
+    flush are counted as dropped.
+    """
+    
+    def __init__(self, capacity: int = 4096, flush_every: int = 512,
+                 sink: Optional[Callable[[List[Tuple]], None]] = None):
+        self.capacity = capacity
+        self.flush_every = flush_every
+        self.sink = sink
+        self._slots: List[Optional[Tuple]] = [None] * capacity
+        self._sequence = itertools.count()
+        self._last_sequence = -1
+        self._flushed_upto = 0
+        self._flush_lock = threading.Lock()
+        self.dropped = 0
+        self.flushed = 0
+    
+    def append(self, operation: str, name: str):
+        """Record one access; O(1) and lock-free"""
+        seq = next(self._sequence)
+        self._slots[seq % self.capacity] = (seq, time.time(), operation, name)
+        # Writers can finish out of order; keep the highest sequence seen
+        if seq > self._last_sequence:
+            self._last_sequence = seq
+        if (seq + 1) % self.flush_every == 0:
+            self.flush()
+    
+    def flush(self) -> int:
+        """Hand all unflushed records to the sink; returns the number flushed"""
+        if not self._flush_lock.acquire(blocking=False):
+            return 0  # another thread is already flushing
+        try:
+            end = max(self._last_sequence + 1, self._flushed_upto)
+            start = max(self._flushed_upto, end - self.capacity)
+            self.dropped += start - self._flushed_upto
+            records = []
+            slots = self._slots
+            capacity = self.capacity
+            committed = start
+            for seq in range(start, end):
+                record = slots[seq % capacity]
+                if record is None or record[0] < seq:
+                    # Sequence taken but not stored yet; flush it next time
+                    break
+                if record[0] == seq:
+                    records.append(record)
+                else:
+                    self.dropped += 1
+                committed = seq + 1
+            self._flushed_upto = committed
+            self.flushed += len(records)
+            if records and self.sink:
+                self.sink(records)
+            return len(records)
+        except Exception as e:
+            logger.error(f"NDA access log flush failed: {e}")
+            return 0
+        finally:
+            self._flush_lock.release()
+    
+    def pending(self) -> int:
+        """Number of records appended since the last flush"""
+        return max(self._last_sequence + 1 - self._flushed_upto, 0)
+
+def _log_access_batch(records: List[Tuple]):
+    """Default sink: one summary log line per flushed batch"""
+    counts: Dict[str, int] = {}
+    for _, _, operation, name in records:
+        key = f"{operation}:{name}"
+        counts[key] = counts.get(key, 0) + 1
+    nda_monitor.record_access_batch(counts)
+    logger.info(f"NDA protected access batch: {len(records)} calls across {len(counts)} endpoints")
+
+# Shared compliance state and access log
+nda_compliance = NDAComplianceState()
+nda_access_log = AccessRingBuffer(sink=_log_access_batch)
+atexit.register(nda_access_log.flush)
+
 def nda_protect(operation_type: str = 'general'):
     """Decorator to add NDA license protection to all functions and API endpoints"""
     def decorator(func: Callable) -> Callable:
+        name = func.__name__
+        record_access = nda_access_log.append
+        license_info = NDA_LICENSE_INFO
+        
+        span_name = f'nda_protect:{name}'
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
-                # NDA protection is always active
-                logger.info(f"NDA protected access to {func.__name__}")
-                
-                # Execute original function with NDA protection
-                result = func(*args, **kwargs)
-                
-                # Add NDA protection to response if it's a JSON response
-                if hasattr(result, '__class__') and 'Response' in str(type(result)):
-                    return result
-                elif isinstance(result, dict):
-                    result.update(NDA_LICENSE_INFO)
-                    return result
-                elif hasattr(result, 'get_json'):
-                    # Flask response object
-                    return result
-                else:
+                with tracer.span(span_name):
+                    # NDA protection is always active; access is recorded in batches
+                    record_access(operation_type, name)
+                    
+                    # Execute original function with NDA protection
+                    result = func(*args, **kwargs)
+                    
+                    # Add NDA protection to plain dict results; Flask responses
+                    # and (response, status) tuples pass through unchanged
+                    if isinstance(result, dict):
+                        result.update(license_info)
                     return result
                 
             except Exception as e:
-                logger.error(f"NDA protection error in {func.__name__}: {e}")
+                logger.error(f"NDA protection error in {name}: {e}")
                 return None
         
         return wrapper
@@ -141,22 +269,13 @@ def add_nda_headers(response_data: Dict[str, Any]) -> Dict[str, Any]:
     return response_data
 
 def verify_nda_compliance(feature_name: str) -> bool:
-    """Verify NDA compliance for specific feature"""
-    try:
-        from self_management import verify_authorization
-        
-        # Check authorization for the feature
-        if not verify_authorization('nda_compliance'):
-            logger.critical(f"NDA compliance violation: {feature_name}")
-            return False
-        
-        # Log NDA protected access
-        logger.info(f"NDA protected feature accessed: {feature_name}")
-        return True
-        
-    except Exception as e:
-        logger.critical(f"NDA compliance check failed for {feature_name}: {e}")
+    """Verify NDA compliance for specific feature using the cached compliance state"""
+    if not nda_compliance.compliant:
+        logger.critical(f"NDA compliance violation: {feature_name}")
         return False
+    
+    logger.debug("NDA protected feature accessed: %s", feature_name)
+    return True
 
 def protect_all_endpoints(app):
     """Apply NDA protection to all Flask endpoints"""
@@ -187,6 +306,7 @@ class NDAComplianceMonitor:
             'anthropic_integration', 'openai_integration', 'web_browsing'
         ]
         self.violation_count = 0
+        self.access_counts: Dict[str, int] = {}
         
     def monitor_feature_access(self, feature_name: str, user_context: Dict = None):
         """Monitor access to NDA protected features"""
@@ -202,21 +322,31 @@ class NDAComplianceMonitor:
                 
                 return False
             
-            # Log compliant access
-            logger.info(f"NDA compliant access: {feature_name}")
+            # Compliant access is recorded in the batched access log
+            nda_access_log.append('feature_access', feature_name)
             return True
             
         except Exception as e:
             logger.critical(f"NDA monitoring error: {e}")
             return False
     
+    def record_access_batch(self, counts: Dict[str, int]):
+        """Merge a flushed batch of access counts"""
+        for key, count in counts.items():
+            self.access_counts[key] = self.access_counts.get(key, 0) + count
+    
     def get_compliance_status(self) -> Dict[str, Any]:
         """Get current NDA compliance status"""
+        nda_access_log.flush()
         return {
             'nda_protected': True,
             'monitored_features': len(self.monitored_features),
             'violation_count': self.violation_count,
             'compliance_status': 'ACTIVE',
+            'compliance_state_version': nda_compliance.version,
+            'compliance_state_refreshed': nda_compliance.last_refreshed,
+            'recorded_accesses': sum(self.access_counts.values()),
+            'dropped_access_records': nda_access_log.dropped,
             'copyright': NDA_LICENSE_INFO['copyright'],
             'watermark': NDA_LICENSE_INFO['watermark']
         }
@@ -8,15 +8,21 @@ Local network device discovery and smart device integration
 """
 
 import socket
-import threading
 import time
 import json
 import logging
 from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
 from zeroconf import ServiceBrowser, Zeroconf, ServiceListener
+from background_scheduler import background_scheduler
 
 logger = logging.getLogger(__name__)
 
+SCAN_BATCH = 16
+SCAN_STEP_INTERVAL = 2
+SCAN_IDLE_MAX_INTERVAL = 600
+RESCAN_INTERVAL = 3600
+
 class NetworkDeviceDiscovery:
     """Discover and connect to devices on local network"""
     
@@ -26,6 +32,8 @@ class NetworkDeviceDiscovery:
         self.active_connections = {}
         self.zeroconf = None
         self.browser = None
+        self._scan_pending: List[str] = []
+        self._last_sweep = 0.0
         
     def start_discovery(self):
         """Start network device discovery"""
@@ -52,8 +60,9 @@ class NetworkDeviceDiscovery:
             
             self.browser = ServiceBrowser(self.zeroconf, services, listener)
             
-            # Scan local network for devices
-            threading.Thread(target=self._scan_network, daemon=True).start()
+            # Scan local network for devices, a batch of hosts per run on a worker thread
+            background_scheduler.register('network_scan', self._scan_network, SCAN_STEP_INTERVAL,
+                                          max_interval=SCAN_IDLE_MAX_INTERVAL, delay=0, blocking=True)
             
             logger.info("Network discovery started")
             return True
@@ -62,21 +71,29 @@ class NetworkDeviceDiscovery:
             logger.error(f"Network discovery failed: {e}")
             return False
     
-    def _scan_network(self):
-        """Scan local network for devices"""
-        try:
-            # Get local network range
-            hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
-            network_base = '.'.join(local_ip.split('.')[:-1])
-            
-            for i in range(1, 255):
-                ip = f"{network_base}.{i}"
-                threading.Thread(target=self._check_device, args=(ip,), daemon=True).start()
-                time.sleep(0.01)  # Prevent overwhelming network
-                
-        except Exception as e:
-            logger.error(f"Network scan error: {e}")
+    def _scan_network(self) -> bool:
+        """Scan the next batch of local network hosts; False while waiting for the next sweep"""
+        if not self._scan_pending:
+            if self._last_sweep and time.time() - self._last_sweep < RESCAN_INTERVAL:
+                return False
+            try:
+                # Get local network range
+                hostname = socket.gethostname()
+                local_ip = socket.gethostbyname(hostname)
+                network_base = '.'.join(local_ip.split('.')[:-1])
+            except Exception as e:
+                logger.error(f"Network scan error: {e}")
+                self._last_sweep = time.time()
+                return False
+            self._scan_pending = [f"{network_base}.{i}" for i in range(1, 255)]
+        
+        batch, self._scan_pending = self._scan_pending[:SCAN_BATCH], self._scan_pending[SCAN_BATCH:]
+        # Short-lived workers, so no threads are left behind between batches
+        with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+            list(executor.map(self._check_device, batch))
+        if not self._scan_pending:
+            self._last_sweep = time.time()
+        return True
     
     def _check_device(self, ip: str):
         """Check if device is accessible"""
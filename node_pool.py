@@ -0,0 +1,174 @@
+"""
+AVA CORE Node Execution Pool
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Long-lived Node.js workers for JavaScript and TypeScript execution.
+Each worker runs node_worker.js, takes jobs as JSON lines on stdin and runs
+them in a fresh vm context with a timeout, streaming console output back
+over a dedicated pipe. TypeScript is transpiled inside the worker and the
+output is cached by content hash, so repeated snippets skip the compile and
+no run pays for node startup or writes a temp file.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from execution_pool import ExecutionJob, ExecutionPool, PoolWorker
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'node_worker.js')
+
+DEFAULT_MAX_JOBS_PER_WORKER = 200
+DEFAULT_TRANSPILE_CACHE_SIZE = 512
+
+class TranspileCache:
+    """LRU of TypeScript transpilation output keyed by source hash"""
+
+    def __init__(self, max_entries: int = DEFAULT_TRANSPILE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def key(source: str) -> str:
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            output = self._entries.get(key)
+            if output is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return output
+
+    def put(self, key: str, output: str):
+        with self._lock:
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def get_cache_status(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0,
+                'stats': dict(self.stats)
+            }
+
+class NodeWorker(PoolWorker):
+    """One long-lived node process speaking JSON lines"""
+
+    def _launch(self) -> subprocess.Popen:
+        # Messages come back on a pipe of their own so anything user code or
+        # its child processes write to stdout cannot corrupt the protocol
+        read_fd, write_fd = os.pipe()
+        env = dict(os.environ, AVA_PROTOCOL_FD=str(write_fd))
+        try:
+            process = subprocess.Popen(
+                [self.pool.node_binary, f'--max-old-space-size={self.pool.memory_limit_mb}', WORKER_SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=(write_fd,),
+                env=env,
+                cwd=self.pool.cwd
+            )
+        except Exception:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        process.protocol = os.fdopen(read_fd, 'rb')
+        return process
+
+    def _send(self, process: subprocess.Popen, message: Dict[str, Any]):
+        process.stdin.write(json.dumps(message, default=str).encode('utf-8') + b'\n')
+        process.stdin.flush()
+
+    def _read_message(self, process: subprocess.Popen) -> Optional[Dict[str, Any]]:
+        line = process.protocol.readline()
+        return json.loads(line) if line else None
+
+    def _receive(self, process: subprocess.Popen, job: ExecutionJob = None) -> Optional[Dict[str, Any]]:
+        message = super()._receive(process, job)
+        if message is not None and job is not None:
+            transpiled = message.pop('transpiled', None)
+            if transpiled is not None:
+                self.pool.transpile_cache.put(job.request['transpile_key'], transpiled)
+        return message
+
+class NodeExecutionPool(ExecutionPool):
+    """Pool of persistent Node.js workers with a shared transpile cache"""
+
+    worker_class = NodeWorker
+    # Workers enforce the timeout themselves and survive it; the pool only
+    # kills one that stops responding well past the deadline
+    kill_grace = 5.0
+
+    def __init__(self, size: int = None, max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+                 memory_limit_mb: int = 256, timeout: float = 30, cwd: str = None,
+                 node_binary: str = None):
+        super().__init__(
+            size=size or int(os.environ.get('AVA_NODE_WORKERS', min(2, os.cpu_count() or 1))),
+            max_jobs_per_worker=max_jobs_per_worker,
+            cpu_limit=None,
+            memory_limit_mb=memory_limit_mb,
+            timeout=timeout,
+            cwd=cwd
+        )
+        self.node_binary = node_binary or shutil.which('node') or 'node'
+        self.transpile_cache = TranspileCache()
+
+    def submit(self, code: str, language: str = 'javascript', owner: str = 'default',
+               timeout: float = None, globals: Dict[str, Any] = None,
+               on_output: Callable[[str, str], None] = None) -> ExecutionJob:
+        """Queue JavaScript or TypeScript for execution and return the pending job
+
+        globals are JSON-serializable values defined in the job's context;
+        on_output receives (stream, text) as console output is produced.
+        """
+        timeout = timeout or self.timeout
+        request = {
+            'code': code,
+            'language': 'javascript',
+            'globals': globals or {},
+            'timeout_ms': int(timeout * 1000),
+            'stream': on_output is not None,
+            'cwd': self.cwd
+        }
+
+        if language.lower() == 'typescript':
+            key = TranspileCache.key(code)
+            transpiled = self.transpile_cache.get(key)
+            if transpiled is None:
+                request['language'] = 'typescript'
+                request['transpile_key'] = key
+            else:
+                request['code'] = transpiled
+
+        return self._enqueue(request, owner, timeout, on_output)
+
+    def get_pool_status(self) -> Dict[str, Any]:
+        """Get worker states, queue depth, counters and transpile cache usage"""
+        status = super().get_pool_status()
+        status['node_binary'] = self.node_binary
+        status['transpile_cache'] = self.transpile_cache.get_cache_status()
+        return status
+
+# Global Node execution pool instance
+node_pool = NodeExecutionPool()
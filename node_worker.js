@@ -0,0 +1,381 @@
+/**
+ * AVA CORE Node Execution Worker
+ * Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+ * Watermark: radosavlevici210@icloud.com
+ *
+ * Long-lived worker started by node_pool.py. Reads one JSON job per line on
+ * stdin, runs it in a fresh vm context and writes newline-delimited JSON
+ * messages (streamed output, then the result) to the protocol descriptor
+ * named by AVA_PROTOCOL_FD, so output from child processes cannot corrupt it.
+ */
+
+'use strict';
+
+const fs = require('fs');
+const vm = require('vm');
+const path = require('path');
+const util = require('util');
+const Module = require('module');
+const readline = require('readline');
+const asyncHooks = require('async_hooks');
+
+const protocolFd = Number(process.env.AVA_PROTOCOL_FD || 1);
+
+function send(message) {
+    fs.writeSync(protocolFd, JSON.stringify(message) + '\n');
+}
+
+// TypeScript support: the typescript package when installed, otherwise the
+// built-in type stripping of newer Node releases
+let transpiler = null;
+
+function loadTranspiler() {
+    if (transpiler !== null) {
+        return transpiler;
+    }
+    try {
+        const ts = require('typescript');
+        transpiler = source => ts.transpileModule(source, {
+            compilerOptions: {
+                module: ts.ModuleKind.CommonJS,
+                target: ts.ScriptTarget.ES2020,
+                esModuleInterop: true
+            }
+        }).outputText;
+    } catch (e) {
+        transpiler = typeof Module.stripTypeScriptTypes === 'function'
+            ? source => Module.stripTypeScriptTypes(source, { mode: 'transform' })
+            : false;
+    }
+    return transpiler;
+}
+
+class ExitSignal {
+    constructor(code) {
+        this.code = code;
+    }
+}
+
+// Errors raised outside the job's own call stack (timer callbacks, event
+// emitters, rejected promises) are attributed to the job in progress
+let currentJob = null;
+
+process.on('uncaughtException', error => {
+    if (currentJob) {
+        currentJob.fail(error);
+    }
+});
+
+process.on('unhandledRejection', reason => {
+    if (currentJob) {
+        currentJob.fail(reason);
+    }
+});
+
+// Async resources created while a job runs keep it alive the way they would
+// keep a Node process alive: handles (sockets, servers, child processes)
+// while they are ref'ed, and native requests (file system, DNS, writes,
+// crypto) until they complete. Timers are tracked by the job's own timer
+// API. JavaScript-level resources such as FileHandle or HTTP messages are
+// only destroyed on garbage collection and do not count by themselves.
+const NATIVE_REQUEST = /REQ|(CONNECT|SEND|WRITE|SHUTDOWN|QUERY)WRAP$/;
+const TIMER_RESOURCES = new Set(['Timeout', 'Immediate']);
+const IDLE_POLL_MS = 10;
+
+function keepsAlive(type, resource) {
+    if (TIMER_RESOURCES.has(type)) {
+        return false;
+    }
+    if (resource && typeof resource.hasRef === 'function') {
+        return true;
+    }
+    return NATIVE_REQUEST.test(type) && !type.startsWith('HTTP');
+}
+
+const resourceHook = asyncHooks.createHook({
+    init(asyncId, type, triggerAsyncId, resource) {
+        if (currentJob && !currentJob.finished && keepsAlive(type, resource)) {
+            currentJob.resources.set(asyncId, resource);
+        }
+    },
+    destroy(asyncId) {
+        if (currentJob && currentJob.resources.delete(asyncId)) {
+            currentJob.checkIdle();
+        }
+    }
+});
+
+class Job {
+    constructor(request) {
+        this.request = request;
+        this.output = [];
+        this.errors = [];
+        this.timers = new Map();
+        this.resources = new Map();
+        this.idlePoll = null;
+        this.returnCode = 0;
+        this.timedOut = false;
+        this.settled = false;
+        this.finished = false;
+        this.done = new Promise(resolve => {
+            this.resolve = resolve;
+        });
+    }
+
+    emit(stream, text) {
+        (stream === 'stdout' ? this.output : this.errors).push(text);
+        if (this.request.stream) {
+            send({ type: 'output', stream: stream, data: text });
+        }
+    }
+
+    fail(error) {
+        if (error instanceof ExitSignal) {
+            this.returnCode = error.code;
+            this.finish();
+            return;
+        }
+        this.emit('stderr', (error && error.stack ? error.stack : String(error)) + '\n');
+        this.returnCode = 1;
+        this.finish();
+    }
+
+    finish() {
+        if (this.finished) {
+            return;
+        }
+        this.finished = true;
+        clearInterval(this.idlePoll);
+        for (const [handle, clear] of this.timers) {
+            clear(handle);
+        }
+        this.timers.clear();
+        this.resolve();
+    }
+
+    // Handles that were unref'ed (e.g. idle keep-alive sockets) do not count,
+    // as they would not keep a Node process alive either
+    pendingResources() {
+        let pending = 0;
+        for (const resource of this.resources.values()) {
+            if (typeof resource.hasRef !== 'function' || resource.hasRef()) {
+                pending += 1;
+            }
+        }
+        return pending;
+    }
+
+    idle() {
+        return this.settled && this.timers.size === 0 && this.pendingResources() === 0;
+    }
+
+    // Finishing is deferred by one turn of the event loop so rejections
+    // left unhandled by the last callback are still reported to this job
+    checkIdle() {
+        if (this.idle()) {
+            setImmediate(() => {
+                if (this.idle()) {
+                    this.finish();
+                }
+            });
+        }
+    }
+
+    // Handles can be unref'ed or closed without a callback the job sees, so
+    // idleness is also polled once the script itself has settled
+    settle() {
+        if (this.finished || this.settled) {
+            return;
+        }
+        this.settled = true;
+        this.idlePoll = setInterval(() => this.checkIdle(), IDLE_POLL_MS);
+        this.checkIdle();
+    }
+
+    guard(fn) {
+        return (...args) => {
+            if (this.finished) {
+                return;
+            }
+            try {
+                fn(...args);
+            } catch (error) {
+                this.fail(error);
+            }
+        };
+    }
+
+    // Timers are tracked so the job finishes when no more callbacks are
+    // pending, and anything left behind is cleared when it does
+    timerApi() {
+        const job = this;
+        return {
+            setTimeout(fn, ms, ...args) {
+                const handle = setTimeout(job.guard(() => {
+                    job.timers.delete(handle);
+                    fn(...args);
+                    job.checkIdle();
+                }), ms);
+                job.timers.set(handle, clearTimeout);
+                return handle;
+            },
+            clearTimeout(handle) {
+                clearTimeout(handle);
+                job.timers.delete(handle);
+                job.checkIdle();
+            },
+            setInterval(fn, ms, ...args) {
+                const handle = setInterval(job.guard(() => fn(...args)), ms);
+                job.timers.set(handle, clearInterval);
+                return handle;
+            },
+            clearInterval(handle) {
+                clearInterval(handle);
+                job.timers.delete(handle);
+                job.checkIdle();
+            },
+            setImmediate(fn, ...args) {
+                const handle = setImmediate(job.guard(() => {
+                    job.timers.delete(handle);
+                    fn(...args);
+                    job.checkIdle();
+                }));
+                job.timers.set(handle, clearImmediate);
+                return handle;
+            },
+            clearImmediate(handle) {
+                clearImmediate(handle);
+                job.timers.delete(handle);
+                job.checkIdle();
+            }
+        };
+    }
+
+    sandbox() {
+        const job = this;
+        const format = args => util.format(...args) + '\n';
+        const sandboxConsole = {
+            log: (...args) => job.emit('stdout', format(args)),
+            info: (...args) => job.emit('stdout', format(args)),
+            debug: (...args) => job.emit('stdout', format(args)),
+            dir: value => job.emit('stdout', util.inspect(value) + '\n'),
+            table: value => job.emit('stdout', util.inspect(value) + '\n'),
+            warn: (...args) => job.emit('stderr', format(args)),
+            error: (...args) => job.emit('stderr', format(args)),
+            trace: (...args) => job.emit('stderr', format(args))
+        };
+
+        const sandboxProcess = Object.create(process, {
+            stdout: { value: { write: text => { job.emit('stdout', String(text)); return true; } } },
+            stderr: { value: { write: text => { job.emit('stderr', String(text)); return true; } } },
+            exit: { value: code => { throw new ExitSignal(code === undefined ? 0 : code); } }
+        });
+
+        const cwd = this.request.cwd || process.cwd();
+        const filename = path.join(cwd, 'ava-execution.js');
+        const moduleObject = { exports: {} };
+
+        const sandbox = Object.assign({
+            console: sandboxConsole,
+            process: sandboxProcess,
+            require: Module.createRequire(filename),
+            module: moduleObject,
+            exports: moduleObject.exports,
+            __filename: filename,
+            __dirname: cwd,
+            Buffer: Buffer,
+            URL: URL,
+            URLSearchParams: URLSearchParams,
+            TextEncoder: TextEncoder,
+            TextDecoder: TextDecoder,
+            AbortController: AbortController,
+            queueMicrotask: queueMicrotask,
+            structuredClone: structuredClone,
+            fetch: globalThis.fetch
+        }, this.timerApi(), this.request.globals || {});
+        sandbox.global = sandbox;
+        return sandbox;
+    }
+
+    async run() {
+        const started = process.hrtime.bigint();
+        const request = this.request;
+        let source = request.code;
+        let transpiled;
+
+        // Armed before the script runs, so a promise that never settles
+        // still ends the job at its timeout
+        const deadline = setTimeout(() => {
+            this.timedOut = true;
+            this.emit('stderr', 'Code execution timed out\n');
+            this.returnCode = 1;
+            this.finish();
+        }, request.timeout_ms);
+        resourceHook.enable();
+
+        try {
+            if (request.language === 'typescript') {
+                const transpile = loadTranspiler();
+                if (!transpile) {
+                    throw new Error('TypeScript transpiler not available (install the typescript package)');
+                }
+                source = transpiled = transpile(source);
+            }
+
+            const context = vm.createContext(this.sandbox());
+            const script = new vm.Script(
+                '(function () {\n' + source + '\n}).call(module.exports);',
+                { filename: 'ava-execution.js', lineOffset: -1 }
+            );
+            const value = script.runInContext(context, { timeout: request.timeout_ms });
+            Promise.resolve(value).then(() => this.settle(), error => this.fail(error));
+        } catch (error) {
+            if (error && error.code === 'ERR_SCRIPT_EXECUTION_TIMEOUT') {
+                this.timedOut = true;
+                this.emit('stderr', 'Code execution timed out\n');
+                this.returnCode = 1;
+                this.finish();
+            } else {
+                this.fail(error);
+            }
+        }
+
+        await this.done;
+        clearTimeout(deadline);
+        resourceHook.disable();
+
+        const result = {
+            type: 'result',
+            success: this.returnCode === 0,
+            output: this.output.join(''),
+            error: this.errors.join(''),
+            return_code: this.returnCode,
+            duration: Number(process.hrtime.bigint() - started) / 1e9
+        };
+        if (this.timedOut) {
+            result.timed_out = true;
+        }
+        if (transpiled !== undefined) {
+            result.transpiled = transpiled;
+        }
+        return result;
+    }
+}
+
+async function main() {
+    const input = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    send({ ready: true, pid: process.pid });
+
+    for await (const line of input) {
+        if (!line.trim()) {
+            continue;
+        }
+        currentJob = new Job(JSON.parse(line));
+        const result = await currentJob.run();
+        currentJob = null;
+        send(result);
+    }
+    process.exit(0);
+}
+
+main();
@@ -0,0 +1,255 @@
+"""
+AVA CORE Page Parser
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Single-pass HTML parsing for browsing and crawling.
+PageParser is an incremental parser (lxml in feed mode when installed,
+html.parser otherwise) that accepts a page in chunks (str or bytes) as
+they arrive. In one pass it collects the readable
+text, the title, the links with their anchor text and the robots
+directives. The resulting ParsedPage keeps a sentence index, so text, link
+and content queries run against that structure instead of rescanning
+the HTML.
+"""
+
+import codecs
+from bisect import bisect_right
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    from lxml import etree
+except ImportError:  # html.parser is used instead
+    etree = None
+
+# Elements whose content is not readable text
+SKIPPED_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg'})
+
+# Elements that separate words, so "<p>a</p><p>b</p>" reads "a b", not "ab"
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption',
+    'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'option', 'p', 'pre', 'section', 'table', 'td', 'th', 'title', 'tr', 'ul'
+})
+
+SENTENCE_SEPARATOR = '\x00'
+
+class ParsedPage:
+    """Text, title, links and sentence index of one parsed response"""
+
+    def __init__(self, url: str, title: str, text: str, links: List[Dict[str, Any]],
+                 nofollow: bool = False):
+        self.url = url
+        self.title = title
+        self.text = text
+        self.links = links
+        self.nofollow = nofollow
+        self.sentences = [s.strip() for s in text.split('.') if s.strip()]
+        # One lowercase haystack with a separator no query can span; match
+        # offsets map back to sentences through the start positions, taken
+        # from the lowered sentences since lower() can change their length
+        lowered = [sentence.lower() for sentence in self.sentences]
+        self._starts = []
+        position = 0
+        for sentence in lowered:
+            self._starts.append(position)
+            position += len(sentence) + 1
+        self._haystack = SENTENCE_SEPARATOR.join(lowered)
+
+    def search(self, query: str) -> List[str]:
+        """Sentences containing query, case-insensitively, in page order"""
+        needle = query.lower()
+        if not needle:
+            return list(self.sentences)
+        found = []
+        last = -1
+        start = self._haystack.find(needle)
+        while start != -1:
+            index = bisect_right(self._starts, start) - 1
+            if index != last:
+                found.append(self.sentences[index])
+                last = index
+            # Continue from the next sentence, one hit per sentence is enough
+            next_start = self._starts[index + 1] if index + 1 < len(self._starts) else len(self._haystack)
+            start = self._haystack.find(needle, next_start)
+        return found
+
+    def find_links(self, filter_pattern: str = None) -> List[Dict[str, str]]:
+        """Links whose anchor text contains filter_pattern, if given"""
+        if not filter_pattern:
+            return [{'url': l['url'], 'text': l['text'], 'domain': l['domain']} for l in self.links]
+        pattern = filter_pattern.lower()
+        return [{'url': l['url'], 'text': l['text'], 'domain': l['domain']}
+                for l in self.links if pattern in l['text'].lower()]
+
+    def followable_links(self) -> List[str]:
+        """Link URLs a crawler may follow under rel and meta robots nofollow"""
+        if self.nofollow:
+            return []
+        return [l['url'] for l in self.links if not l['nofollow']]
+
+class _PageBuilder:
+    """Parser target that accumulates text, title and links from tag events"""
+
+    def __init__(self, base_url: str):
+        self.url = base_url
+        self.base_url = base_url
+        self._text: List[str] = []
+        self._title: List[str] = []
+        self._links: List[Dict[str, Any]] = []
+        self._anchor: Optional[Dict[str, Any]] = None
+        self._anchor_text: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._nofollow = False
+
+    def start(self, tag: str, attributes: Dict[str, Optional[str]]):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+            return
+        if tag in BLOCK_TAGS:
+            self._text.append(' ')
+
+        if tag == 'a':
+            href = attributes.get('href')
+            if href:
+                self._anchor = {
+                    'href': href,
+                    'nofollow': 'nofollow' in (attributes.get('rel') or '').lower().split()
+                }
+                self._anchor_text = []
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'base':
+            href = attributes.get('href')
+            if href:
+                self.base_url = urljoin(self.base_url, href)
+        elif tag == 'meta':
+            if (attributes.get('name') or '').lower() == 'robots':
+                self._nofollow = 'nofollow' in (attributes.get('content') or '').lower()
+
+    def end(self, tag: str):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag in BLOCK_TAGS:
+            self._text.append(' ')
+        if tag == 'a' and self._anchor is not None:
+            url = urljoin(self.base_url, self._anchor['href'])
+            self._links.append({
+                'url': url,
+                'text': ' '.join(''.join(self._anchor_text).split()),
+                'domain': urlparse(url).netloc,
+                'nofollow': self._anchor['nofollow']
+            })
+            self._anchor = None
+        elif tag == 'title':
+            self._in_title = False
+
+    def data(self, data: str):
+        if self._skip_depth:
+            return
+        self._text.append(data)
+        if self._in_title:
+            self._title.append(data)
+        if self._anchor is not None:
+            self._anchor_text.append(data)
+
+    def close(self):
+        pass
+
+    def build(self) -> ParsedPage:
+        if self._anchor is not None:
+            self.end('a')
+        return ParsedPage(
+            url=self.url,
+            title=' '.join(''.join(self._title).split()) or 'No title',
+            text=' '.join(''.join(self._text).split()),
+            links=self._links,
+            nofollow=self._nofollow
+        )
+
+class _StdlibParser(HTMLParser):
+    """html.parser front end feeding a _PageBuilder"""
+
+    def __init__(self, builder: _PageBuilder):
+        super().__init__(convert_charrefs=True)
+        self.builder = builder
+
+    def handle_starttag(self, tag, attrs):
+        self.builder.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.builder.start(tag, dict(attrs))
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag):
+        self.builder.end(tag)
+
+    def handle_data(self, data):
+        self.builder.data(data)
+
+class PageParser:
+    """Incremental parser that builds a ParsedPage in a single pass
+
+    Uses lxml's C parser in feed mode when it is installed and html.parser
+    otherwise; both drive the same builder.
+    """
+
+    def __init__(self, base_url: str = '', encoding: Optional[str] = None, backend: str = None):
+        self.builder = _PageBuilder(base_url)
+        self.backend = backend or ('lxml' if etree is not None else 'html.parser')
+        if self.backend == 'lxml':
+            self._parser = etree.HTMLParser(target=self.builder)
+        else:
+            self._parser = _StdlibParser(self.builder)
+        self._decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        self.bytes_fed = 0
+
+    def feed(self, data: Union[str, bytes]):
+        """Parse the next chunk; bytes are decoded incrementally"""
+        if isinstance(data, bytes):
+            self.bytes_fed += len(data)
+            data = self._decoder.decode(data)
+        if data:
+            self._parser.feed(data)
+
+    def close(self) -> ParsedPage:
+        """Flush buffered input and return the parsed page"""
+        tail = self._decoder.decode(b'', final=True)
+        if tail:
+            self._parser.feed(tail)
+        try:
+            self._parser.close()
+        except Exception:
+            # lxml raises on empty documents; whatever was parsed is kept
+            pass
+        return self.builder.build()
+
+def parse_html(html: Union[str, bytes], base_url: str = '', encoding: str = None,
+               backend: str = None) -> ParsedPage:
+    parser = PageParser(base_url, encoding, backend)
+    parser.feed(html)
+    return parser.close()
+
+def parse_chunks(chunks: Iterable[Union[str, bytes]], base_url: str = '',
+                 encoding: str = None, backend: str = None) -> ParsedPage:
+    """Parse a page from an iterable of chunks without joining them first"""
+    parser = PageParser(base_url, encoding, backend)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+def parse_response(response, chunk_size: int = 64 * 1024) -> ParsedPage:
+    """Parse a requests response chunk by chunk
+
+    Works for both streamed responses and bodies already read into memory.
+    """
+    encoding = response.encoding or 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    return parse_chunks(response.iter_content(chunk_size), response.url, encoding)
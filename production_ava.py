@@ -24,25 +24,33 @@ import threading
 import requests
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, stream_with_context
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import secrets
-from network_discovery import NetworkDeviceDiscovery
-from autonomous_thinking import AutonomousThinkingEngine
-from voice_assistant import VoiceProcessor, NaturalLanguageProcessor
-from advanced_ai import AdvancedAI
-from advanced_capabilities import AdvancedCapabilities
-from anthropic_integration import AnthropicAIEngine
-from nda_protection import nda_protect, protect_all_endpoints, nda_monitor, NDA_LICENSE_INFO
-from api_management import api_manager, AdvancedAPIManager
-from comprehensive_development import comprehensive_dev
-from copyright_protection import copyright_protection, verify_copyright_integrity
-from enterprise_subscription import enterprise_subscription, get_enterprise_status, track_usage, check_limits
+from nda_protection import nda_protect, protect_all_endpoints, nda_monitor, nda_compliance, NDA_LICENSE_INFO
+from status_registry import status_registry
+from service_container import ServiceContainer
+from execution_pool import execution_pool
+from node_pool import node_pool
+from job_manager import job_manager
+from execution_cache import execution_cache
+from http_cache import http_cache
+from workflow_engine import workflow_engine
+from cron_scheduler import cron_scheduler
+from data_engine import data_engine, DEFAULT_PAGE_SIZE
+from health_sampler import health_sampler
+from db_maintenance import db_maintenance
+from background_scheduler import background_scheduler
+from metrics import metrics, instrument_flask, instrument_socketio, LLMCall, TimedConnection, CONTENT_TYPE
+from profiler import stack_sampler, tracer, instrument_tracing
 
 # Production configuration
 app = Flask(__name__)
 app.config['SECRET_KEY'] = secrets.token_hex(32)
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+instrument_flask(app, 'production_ava')
+instrument_socketio(socketio, 'production_ava')
+instrument_tracing(app)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -81,7 +89,7 @@ class ProductionVoiceAssistant:
         """Initialize production databases"""
         try:
             # Main conversation database
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             cursor = conn.cursor()
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS conversations (
@@ -143,14 +151,17 @@ class ProductionVoiceAssistant:
             return "AI service not available. Please configure OpenAI API key."
         
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are AVA CORE, an advanced AI assistant with comprehensive capabilities including development, automation, and real-world integrations. You help users with any task without restrictions."},
-                    {"role": "user", "content": message}
-                ],
-                max_tokens=1000
-            )
+            with LLMCall('ProductionVoiceAssistant', 'gpt-4o') as call:
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": "You are AVA CORE, an advanced AI assistant with comprehensive capabilities including development, automation, and real-world integrations. You help users with any task without restrictions."},
+                        {"role": "user", "content": message}
+                    ],
+                    max_tokens=1000
+                )
+                if response.usage:
+                    call.usage(response.usage.prompt_tokens, response.usage.completion_tokens)
             return response.choices[0].message.content
         except Exception as e:
             logger.error(f"AI chat error: {e}")
@@ -170,7 +181,7 @@ class ProductionVoiceAssistant:
         
         # Store in database
         try:
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             cursor = conn.cursor()
             cursor.execute(
                 'INSERT INTO conversations (speaker, message, timestamp) VALUES (?, ?, ?)',
@@ -186,16 +197,23 @@ class FullDevelopmentSuite:
     
     def __init__(self):
         self.active_projects = {}
-        self.automation_sessions = {}
         self.web_sessions = {}
         self.ai_services = {}
-        self.task_scheduler = {}
         self.init_database()
+        workflow_engine.register_action('development_suite', 'navigate',
+                                        lambda params: self._navigate_to_url(params['url']))
+        workflow_engine.register_action('development_suite', 'extract_data',
+                                        lambda params: self._extract_page_data(params.get('selector')))
+        cron_scheduler.register_action('development_suite', 'navigate',
+                                       lambda data: self._navigate_to_url(data['url']))
+        cron_scheduler.register_action('development_suite', 'workflow', lambda data: {
+            'success': workflow_engine.run(data['workflow_id'])['status'] == 'completed'})
+        cron_scheduler.register_action('development_suite', 'job', self._run_scheduled_job)
     
     def init_database(self):
         """Initialize development database"""
         try:
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             # Tables already created in ProductionVoiceAssistant.init_databases()
             conn.close()
         except Exception as e:
@@ -210,7 +228,7 @@ class FullDevelopmentSuite:
             structure = self._generate_structure(language, framework)
             
             # Store in database
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO projects (name, language, framework, project_data)
@@ -263,113 +281,96 @@ class FullDevelopmentSuite:
                 'scripts': {'start': 'python main.py'}
             }
     
-    def execute_code(self, project_id: str, language: str, code: str) -> Dict[str, Any]:
-        """Execute code with full capabilities"""
+    def execute_code(self, project_id: str, language: str, code: str,
+                     pure: Optional[bool] = None, inputs: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute code with full capabilities, reusing results of identical deterministic runs"""
         try:
+            owner = project_id or 'development_suite'
             if language.lower() == 'python':
-                result = self._execute_python(code)
+                runner = lambda: self._execute_python(code, owner=owner, inputs=inputs)
             elif language.lower() == 'javascript':
-                result = self._execute_javascript(code)
+                runner = lambda: self._execute_javascript(code, owner=owner, inputs=inputs)
             elif language.lower() == 'bash':
-                result = self._execute_bash(code)
+                runner = lambda: self._execute_bash(code, owner=owner)
             else:
                 return {'success': False, 'error': f'Language {language} not supported'}
             
+            result = execution_cache.execute(language, code, runner, pure=pure, inputs=inputs,
+                                             namespace='development_suite')
+            
             # Log execution
             if project_id in self.active_projects:
                 self._log_execution(
                     self.active_projects[project_id]['db_id'],
                     language,
                     code,
-                    result.get('output', '')
+                    result.get('output', ''),
+                    result['cached']
                 )
             
             return result
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def _execute_python(self, code: str) -> Dict[str, Any]:
-        """Execute Python code"""
+    def _execute_python(self, code: str, owner: str = 'development_suite',
+                        inputs: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute Python code on a warm execution pool worker, queued fairly per project"""
         try:
-            import io
-            import sys
-            from contextlib import redirect_stdout, redirect_stderr
-            
-            stdout_buffer = io.StringIO()
-            stderr_buffer = io.StringIO()
-            
-            exec_globals = {
-                'requests': requests,
-                'json': json,
-                'os': os,
-                'time': time
-            }
+            result = execution_pool.execute(
+                code,
+                owner=owner,
+                names={'requests': 'requests', 'json': 'json', 'os': 'os', 'time': 'time'},
+                context=inputs
+            )
             
-            with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-                exec(code, exec_globals)
+            if not result['success']:
+                return {'success': False, 'error': result['error'], 'output': result['output']}
             
             return {
                 'success': True,
-                'output': stdout_buffer.getvalue(),
-                'error': stderr_buffer.getvalue() or None
+                'output': result['output'],
+                'error': result['error'] or None
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def _execute_javascript(self, code: str) -> Dict[str, Any]:
-        """Execute JavaScript code"""
+    def _execute_javascript(self, code: str, owner: str = 'development_suite',
+                            inputs: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute JavaScript code on a persistent Node.js worker"""
         try:
-            temp_file = f'/tmp/ava_js_{int(time.time())}.js'
-            with open(temp_file, 'w') as f:
-                f.write(code)
-            
-            result = subprocess.run(
-                ['node', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            os.remove(temp_file)
+            result = node_pool.execute(code, owner=owner, globals=inputs)
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr if result.stderr else None
+                'success': result['success'],
+                'output': result['output'],
+                'error': result['error'] if result['error'] else None
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def _execute_bash(self, code: str) -> Dict[str, Any]:
-        """Execute Bash commands"""
+    def _execute_bash(self, code: str, owner: str = 'development_suite') -> Dict[str, Any]:
+        """Execute Bash commands with capped, streamed output"""
         try:
-            result = subprocess.run(
-                code,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            job = job_manager.run_command(code, timeout=30, owner=owner)
+            error = job.output_text('stderr') or job.error
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr if result.stderr else None
+                'success': job.status == 'completed',
+                'output': job.output_text('stdout'),
+                'error': error if error else None,
+                'job_id': job.id
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def _log_execution(self, project_id: int, language: str, code: str, output: str):
-        """Log code execution to database"""
+    def _log_execution(self, project_id: int, language: str, code: str, output: str,
+                       cached: bool = False):
+        """Log code execution with code and output stored once by content hash"""
         try:
-            conn = sqlite3.connect('production_conversations.db')
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO executions (project_id, language, code, output)
-                VALUES (?, ?, ?, ?)
-            ''', (project_id, language, code, output))
-            conn.commit()
-            conn.close()
+            execution_cache.log_execution(
+                'production_conversations.db', language, code, output,
+                cached=cached, project_id=project_id
+            )
         except Exception as e:
             logger.error(f"Failed to log execution: {e}")
     
@@ -383,7 +384,7 @@ class FullDevelopmentSuite:
             deployment_url = f"https://{project['name']}-{int(time.time())}.{platform}.com"
             
             # Log deployment
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO deployments (project_id, platform, deployment_url)
@@ -402,49 +403,40 @@ class FullDevelopmentSuite:
             return {'success': False, 'error': str(e)}
     
     def create_automation_workflow(self, name: str, steps: List[Dict]) -> Dict[str, Any]:
-        """Create automation workflow"""
+        """Create a persisted automation workflow; steps may declare depends_on"""
         try:
-            session_id = f"auto_{int(time.time())}"
-            self.automation_sessions[session_id] = {
-                'name': name,
-                'steps': steps,
-                'created_at': datetime.now().isoformat(),
-                'status': 'active'
-            }
+            # Like the original sequential runner, a failed step does not stop the workflow
+            workflow = workflow_engine.create_workflow('development_suite', name, steps, continue_on_error=True)
             return {
                 'success': True,
-                'session_id': session_id,
+                'session_id': workflow['id'],
+                'steps': workflow['steps'],
                 'message': f'Automation workflow "{name}" created'
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def execute_web_automation(self, session_id: str) -> Dict[str, Any]:
-        """Execute web automation workflow"""
+    def execute_web_automation(self, session_id: str, wait: bool = True) -> Dict[str, Any]:
+        """Execute web automation workflow, running independent steps concurrently"""
         try:
-            if session_id not in self.automation_sessions:
+            if workflow_engine.get_workflow(session_id) is None:
                 return {'success': False, 'error': 'Session not found'}
             
-            session = self.automation_sessions[session_id]
-            results = []
-            
-            for step in session['steps']:
-                if step['action'] == 'navigate':
-                    result = self._navigate_to_url(step['url'])
-                elif step['action'] == 'extract_data':
-                    result = self._extract_page_data(step.get('selector'))
-                elif step['action'] == 'wait':
-                    time.sleep(step.get('seconds', 1))
-                    result = {'success': True, 'action': 'wait'}
-                else:
-                    result = {'success': False, 'error': f'Unknown action: {step["action"]}'}
-                
-                results.append(result)
+            if not wait:
+                run = workflow_engine.start(session_id)
+                return {'success': True, 'session_id': session_id, 'run_id': run['id'], 'status': run['status']}
             
+            run = workflow_engine.run(session_id)
             return {
                 'success': True,
                 'session_id': session_id,
-                'results': results
+                'run_id': run['id'],
+                'status': run['status'],
+                'results': [step.get('result', {'success': False, 'status': step['status']})
+                            for step in run['steps'].values()],
+                'steps': run['steps'],
+                'duration': run['duration'],
+                'critical_path': run['critical_path']
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -452,12 +444,13 @@ class FullDevelopmentSuite:
     def _navigate_to_url(self, url: str) -> Dict[str, Any]:
         """Navigate to URL and return status"""
         try:
-            response = requests.get(url, timeout=10)
+            response = http_cache.session.get(url, timeout=10)
             return {
                 'success': True,
                 'url': url,
                 'status_code': response.status_code,
-                'content_length': len(response.content)
+                'content_length': len(response.content),
+                'cache_status': response.cache_status
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -506,7 +499,7 @@ class FullDevelopmentSuite:
         """Create productivity task"""
         try:
             task_id = f"task_{int(time.time())}"
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             cursor = conn.cursor()
             
             # Create tasks table if not exists
@@ -541,7 +534,7 @@ class FullDevelopmentSuite:
     def get_tasks(self, status: str = None) -> Dict[str, Any]:
         """Get all tasks with optional filtering"""
         try:
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             cursor = conn.cursor()
             
             if status:
@@ -572,7 +565,7 @@ class FullDevelopmentSuite:
     def update_task_status(self, task_id: str, status: str) -> Dict[str, Any]:
         """Update task status"""
         try:
-            conn = sqlite3.connect('production_conversations.db')
+            conn = sqlite3.connect('production_conversations.db', factory=TimedConnection)
             cursor = conn.cursor()
             cursor.execute(
                 'UPDATE tasks SET status = ? WHERE id = ?',
@@ -590,26 +583,28 @@ class FullDevelopmentSuite:
             return {'success': False, 'error': str(e)}
     
     def schedule_automation(self, name: str, cron_expression: str, action_type: str, action_data: Dict) -> Dict[str, Any]:
-        """Schedule automated task"""
+        """Schedule automated task on the cron scheduler"""
         try:
-            schedule_id = f"sched_{int(time.time())}"
-            self.task_scheduler[schedule_id] = {
-                'name': name,
-                'cron_expression': cron_expression,
-                'action_type': action_type,
-                'action_data': action_data,
-                'created_at': datetime.now().isoformat(),
-                'status': 'active'
-            }
+            schedule = cron_scheduler.add_schedule('development_suite', name, cron_expression,
+                                                   action_type, action_data)
+            cron_scheduler.start()
             
             return {
                 'success': True,
-                'schedule_id': schedule_id,
+                'schedule_id': schedule['id'],
+                'next_run': schedule['next_run'],
                 'message': f'Automation "{name}" scheduled'
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def _run_scheduled_job(self, action_data: Dict) -> Dict[str, Any]:
+        """Run a scheduled bash or code job and wait for it to finish"""
+        job = job_manager.submit(action_data.get('kind', 'bash'), action_data.get('source', ''),
+                                 owner='scheduler', timeout=action_data.get('timeout', 300))
+        job.wait()
+        return {'success': job.status == 'completed', 'job_id': job.id, 'error': job.error}
+    
     def get_network_devices(self) -> Dict[str, Any]:
         """Discover devices on local network"""
         try:
@@ -637,9 +632,13 @@ class FullDevelopmentSuite:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def process_data(self, data: Any, transformation: str) -> Dict[str, Any]:
-        """Process and transform data"""
+    def process_data(self, data: Any, transformation: str, operations: List[Dict] = None,
+                     page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Process and transform data; operations run a columnar pipeline over a list of records"""
         try:
+            if operations is not None:
+                return data_engine.process(data, operations, page=page, page_size=page_size)
+            
             if transformation == 'json_format':
                 if isinstance(data, str):
                     formatted_data = json.loads(data)
@@ -660,27 +659,113 @@ class FullDevelopmentSuite:
             
             return {
                 'success': True,
-                'original_data': data,
                 'transformed_data': formatted_data,
                 'transformation': transformation
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
-# Initialize production components
-assistant = ProductionVoiceAssistant(socketio)
-development_suite = FullDevelopmentSuite()
-network_discovery = NetworkDeviceDiscovery()
-autonomous_thinking = AutonomousThinkingEngine()
-voice_processor = VoiceProcessor()
-nlp_processor = NaturalLanguageProcessor()
-advanced_ai = AdvancedAI()
-advanced_capabilities = AdvancedCapabilities()
-anthropic_ai = AnthropicAIEngine()
-
-# Start autonomous systems
-autonomous_thinking.start_autonomous_thinking()
-network_discovery.start_discovery()
+# Production components are registered with the service container and built
+# on first use or by the parallel background warm-up, not at import time
+services = ServiceContainer()
+
+def _create_network_discovery():
+    from network_discovery import NetworkDeviceDiscovery
+    return NetworkDeviceDiscovery()
+
+def _create_autonomous_thinking():
+    from autonomous_thinking import AutonomousThinkingEngine
+    return AutonomousThinkingEngine()
+
+def _create_voice_processor():
+    from voice_assistant import VoiceProcessor
+    return VoiceProcessor()
+
+def _create_nlp_processor():
+    from voice_assistant import NaturalLanguageProcessor
+    return NaturalLanguageProcessor()
+
+def _create_advanced_ai():
+    from advanced_ai import AdvancedAI
+    return AdvancedAI()
+
+def _create_advanced_capabilities():
+    from advanced_capabilities import AdvancedCapabilities
+    return AdvancedCapabilities()
+
+def _create_anthropic_ai():
+    from anthropic_integration import AnthropicAIEngine
+    return AnthropicAIEngine()
+
+services.register('assistant', lambda: ProductionVoiceAssistant(socketio))
+services.register('development_suite', FullDevelopmentSuite)
+services.register('network_discovery', _create_network_discovery,
+                  on_start=lambda discovery: discovery.start_discovery())
+services.register('autonomous_thinking', _create_autonomous_thinking,
+                  on_start=lambda engine: engine.start_autonomous_thinking())
+services.register('voice_processor', _create_voice_processor)
+services.register('nlp_processor', _create_nlp_processor)
+services.register('advanced_ai', _create_advanced_ai)
+services.register('advanced_capabilities', _create_advanced_capabilities)
+services.register('anthropic_ai', _create_anthropic_ai)
+services.register('execution_pool', lambda: execution_pool,
+                  on_start=lambda pool: pool.start())
+services.register('node_pool', lambda: node_pool,
+                  on_start=lambda pool: pool.start())
+services.register('cron_scheduler', lambda: cron_scheduler,
+                  on_start=lambda scheduler: scheduler.start())
+services.register('health_sampler', lambda: health_sampler,
+                  on_start=lambda sampler: sampler.start())
+services.register('db_maintenance', lambda: db_maintenance,
+                  on_start=lambda maintenance: maintenance.start())
+services.register('background_scheduler', lambda: background_scheduler,
+                  on_start=lambda scheduler: scheduler.start())
+services.register('nda_compliance', lambda: nda_compliance,
+                  on_start=lambda state: state.refresh())
+
+def _queue_depths():
+    """Work waiting in each background queue, for the ava_queue_depth gauge"""
+    jobs = job_manager.get_manager_status()['jobs_by_status']
+    return {
+        ('execution_pool',): execution_pool.get_pool_status()['queued_jobs'],
+        ('node_pool',): node_pool.get_pool_status()['queued_jobs'],
+        ('jobs_queued',): jobs.get('queued', 0),
+        ('jobs_running',): jobs.get('running', 0),
+        ('cron_in_flight',): cron_scheduler.get_scheduler_status()['in_flight'],
+        ('workflow_runs',): len(workflow_engine.get_engine_status()['running'])
+    }
+
+metrics.gauge('ava_queue_depth', 'Items queued or in flight per background queue', _queue_depths, ('queue',))
+services.register_module('api_management')
+services.register_module('comprehensive_development')
+services.register_module('copyright_protection')
+services.register_module('enterprise_subscription')
+
+assistant = services.proxy('assistant')
+development_suite = services.proxy('development_suite')
+network_discovery = services.proxy('network_discovery')
+autonomous_thinking = services.proxy('autonomous_thinking')
+voice_processor = services.proxy('voice_processor')
+nlp_processor = services.proxy('nlp_processor')
+advanced_ai = services.proxy('advanced_ai')
+advanced_capabilities = services.proxy('advanced_capabilities')
+anthropic_ai = services.proxy('anthropic_ai')
+api_manager = services.proxy('api_management', 'api_manager')
+comprehensive_dev = services.proxy('comprehensive_development', 'comprehensive_dev')
+copyright_protection = services.proxy('copyright_protection', 'copyright_protection')
+enterprise_subscription = services.proxy('enterprise_subscription', 'enterprise_subscription')
+verify_copyright_integrity = services.lazy_callable('copyright_protection', 'verify_copyright_integrity')
+get_enterprise_status = services.lazy_callable('enterprise_subscription', 'get_enterprise_status')
+track_usage = services.lazy_callable('enterprise_subscription', 'track_usage')
+check_limits = services.lazy_callable('enterprise_subscription', 'check_limits')
+
+# Job output and status changes go to the Socket.IO room of each job
+job_manager.add_listener(lambda event, payload: socketio.emit(event, payload, to=f"job:{payload['job_id']}"))
+
+# Start autonomous systems and the remaining engines without blocking import;
+# AVA_WARMUP=0 leaves every component to be built on first use
+if os.environ.get('AVA_WARMUP', '1') != '0':
+    services.warm_up()
 
 # Production Routes
 @app.route('/')
@@ -731,18 +816,157 @@ def create_project():
 
 @app.route('/api/projects/execute', methods=['POST'])
 def execute_code():
-    """Execute code in development environment"""
+    """Execute code in development environment, or start it as a job with async=true"""
     try:
         data = request.get_json()
+        if data.get('async'):
+            return _start_job(data.get('language', ''), data.get('code', ''),
+                              data.get('project_id') or 'development_suite', data.get('timeout'))
         result = development_suite.execute_code(
             data.get('project_id', ''),
             data.get('language', ''),
-            data.get('code', '')
+            data.get('code', ''),
+            pure=data.get('pure'),
+            inputs=data.get('inputs')
         )
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/projects/execution-pool', methods=['GET'])
+def get_execution_pool_status():
+    """Get Python and Node.js execution pool workers, queue depth and limits"""
+    try:
+        return jsonify({
+            'success': True,
+            'pool': execution_pool.get_pool_status(),
+            'node_pool': node_pool.get_pool_status()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/projects/execution-cache', methods=['GET'])
+def get_execution_cache_status():
+    """Get execution result cache hit rate and execution log deduplication"""
+    try:
+        return jsonify({
+            'success': True,
+            'cache': execution_cache.get_cache_status(
+                ['production_conversations.db', 'comprehensive_development.db']
+            )
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/projects/execution-cache', methods=['DELETE'])
+def clear_execution_cache():
+    """Drop all cached execution results"""
+    try:
+        return jsonify({'success': True, 'removed': execution_cache.clear()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def _start_job(kind: str, source: str, owner: str, timeout=None):
+    """Submit a background job and describe where to follow its output"""
+    job = job_manager.submit(kind, source, owner=owner, timeout=timeout)
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.id}',
+        'stream_url': f'/api/jobs/{job.id}/stream',
+        'output_url': f'/api/jobs/{job.id}/output',
+        'socket_event': 'job_subscribe'
+    }), 202
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """Start a shell or code job and return its id immediately"""
+    try:
+        data = request.get_json()
+        kind = data.get('type') or data.get('language', 'bash')
+        source = data.get('command') or data.get('code', '')
+        return _start_job(kind, source, data.get('project_id') or 'default', data.get('timeout'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """List recent jobs, newest first"""
+    try:
+        return jsonify({
+            'success': True,
+            'jobs': job_manager.list_jobs(int(request.args.get('limit', 50))),
+            'manager': job_manager.get_manager_status()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get job status by id"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/api/jobs/<job_id>/output', methods=['GET'])
+def get_job_output(job_id):
+    """Read captured job output from a byte offset, including spilled output"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    try:
+        stream = request.args.get('stream', 'stdout')
+        if stream not in job.streams:
+            return jsonify({'success': False, 'error': f'Unknown stream: {stream}'}), 400
+        limit = request.args.get('limit')
+        result = job.read_output(stream, int(request.args.get('offset', 0)),
+                                 int(limit) if limit else 1024 * 1024)
+        result['success'] = True
+        result['status'] = job.status
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """Stream job output as server-sent events, resuming after Last-Event-ID"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    after = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+
+    def events():
+        seq = after
+        while True:
+            finished = job.finished
+            chunks, gap = job.events_since(seq, timeout=15)
+            if gap:
+                yield f"event: gap\ndata: {json.dumps({'job_id': job.id, 'after_seq': seq})}\n\n"
+            for chunk in chunks:
+                seq = chunk['seq']
+                yield f"id: {seq}\nevent: output\ndata: {json.dumps(chunk)}\n\n"
+            if finished and not chunks:
+                yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+                return
+            if not chunks:
+                yield ": keep-alive\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    cancelled = job_manager.cancel(job_id)
+    return jsonify({'success': cancelled, 'job': job.to_dict()})
+
 @app.route('/api/projects/deploy', methods=['POST'])
 def deploy_project():
     """Deploy project to production"""
@@ -825,12 +1049,48 @@ def execute_automation():
     try:
         data = request.get_json()
         result = development_suite.execute_web_automation(
-            data.get('session_id', '')
+            data.get('session_id', ''),
+            wait=not data.get('async', False)
         )
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/automation/workflows', methods=['GET'])
+def list_automation_workflows():
+    """List persisted automation workflows, newest first"""
+    try:
+        return jsonify({
+            'success': True,
+            'workflows': workflow_engine.list_workflows(request.args.get('namespace'),
+                                                        int(request.args.get('limit', 50))),
+            'engine': workflow_engine.get_engine_status()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/automation/workflows/<workflow_id>', methods=['GET'])
+def get_automation_workflow(workflow_id):
+    """Get a workflow's steps and its recent runs"""
+    try:
+        workflow = workflow_engine.get_workflow(workflow_id)
+        if workflow is None:
+            return jsonify({'success': False, 'error': 'Workflow not found'}), 404
+        return jsonify({'success': True, 'workflow': workflow})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/automation/runs/<run_id>', methods=['GET'])
+def get_automation_run(run_id):
+    """Get a workflow run with per-step timing and its critical path"""
+    try:
+        run = workflow_engine.get_run(run_id)
+        if run is None:
+            return jsonify({'success': False, 'error': 'Run not found'}), 404
+        return jsonify({'success': True, 'run': run})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/ai/configure', methods=['POST'])
 def configure_ai():
     """Configure AI service"""
@@ -911,6 +1171,39 @@ def schedule_task():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/schedule', methods=['GET'])
+def list_schedules():
+    """List cron schedules by next fire time"""
+    try:
+        schedules = cron_scheduler.list_schedules(request.args.get('namespace'),
+                                                  request.args.get('limit', 100, type=int))
+        return jsonify({'success': True, 'schedules': schedules})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/schedule/status', methods=['GET'])
+def get_scheduler_status():
+    """Get scheduler lag, throughput and counters"""
+    try:
+        return jsonify({'success': True, 'scheduler': cron_scheduler.get_scheduler_status()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/schedule/<schedule_id>', methods=['GET', 'DELETE'])
+def manage_schedule(schedule_id):
+    """Get or remove a cron schedule"""
+    try:
+        if request.method == 'DELETE':
+            if not cron_scheduler.remove_schedule(schedule_id):
+                return jsonify({'success': False, 'error': 'Schedule not found'}), 404
+            return jsonify({'success': True, 'schedule_id': schedule_id})
+        schedule = cron_scheduler.get_schedule(schedule_id)
+        if schedule is None:
+            return jsonify({'success': False, 'error': 'Schedule not found'}), 404
+        return jsonify({'success': True, 'schedule': schedule})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/network/devices', methods=['GET'])
 def get_network_devices():
     """Get local network devices"""
@@ -922,13 +1215,45 @@ def get_network_devices():
 
 @app.route('/api/data/process', methods=['POST'])
 def process_data_endpoint():
-    """Process and transform data"""
-    try:
+    """Process and transform data
+    
+    NDJSON and CSV bodies are streamed into the columnar engine, with the
+    pipeline given as JSON in the operations query parameter.
+    """
+    try:
+        if request.mimetype != 'application/json':
+            result = data_engine.process(
+                request.stream,
+                json.loads(request.args.get('operations', '[]')),
+                request.mimetype,
+                request.args.get('page', 1, type=int),
+                request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+            )
+            return jsonify(result)
+        
         data = request.get_json()
         result = development_suite.process_data(
             data.get('data'),
-            data.get('transformation', '')
+            data.get('transformation', ''),
+            data.get('operations'),
+            data.get('page', 1),
+            data.get('page_size', DEFAULT_PAGE_SIZE)
+        )
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/data/results/<result_id>', methods=['GET'])
+def get_data_result_page(result_id):
+    """Get another page of a columnar pipeline result"""
+    try:
+        result = data_engine.page(
+            result_id,
+            request.args.get('page', 1, type=int),
+            request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
         )
+        if result is None:
+            return jsonify({'success': False, 'error': 'Result not found or expired'}), 404
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -944,28 +1269,42 @@ def call_external_api():
         params = data.get('params', {})
         json_data = data.get('json')
         
-        if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-        elif method.upper() == 'POST':
-            response = requests.post(url, headers=headers, params=params, json=json_data, timeout=10)
-        elif method.upper() == 'PUT':
-            response = requests.put(url, headers=headers, params=params, json=json_data, timeout=10)
-        elif method.upper() == 'DELETE':
-            response = requests.delete(url, headers=headers, params=params, timeout=10)
-        else:
+        if method.upper() not in ('GET', 'POST', 'PUT', 'DELETE'):
             return jsonify({'success': False, 'error': f'Method {method} not supported'})
         
+        response = http_cache.session.request(
+            method.upper(), url, headers=headers, params=params,
+            json=json_data if method.upper() in ('POST', 'PUT') else None, timeout=10
+        )
+        
         return jsonify({
             'success': True,
             'status_code': response.status_code,
             'headers': dict(response.headers),
             'data': response.text[:5000],  # First 5000 characters
             'url': url,
-            'method': method
+            'method': method,
+            'cache_status': response.cache_status
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/http-cache', methods=['GET'])
+def get_http_cache_status():
+    """Get outgoing HTTP cache hit rate, revalidations and bytes saved"""
+    try:
+        return jsonify({'success': True, 'cache': http_cache.get_cache_status()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/http-cache', methods=['DELETE'])
+def clear_http_cache():
+    """Drop all cached HTTP responses"""
+    try:
+        return jsonify({'success': True, 'removed': http_cache.clear()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/database/connect', methods=['POST'])
 def connect_database():
     """Connect to external databases"""
@@ -1076,27 +1415,162 @@ def security_scan():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/api/monitor/system', methods=['GET'])
-def monitor_system():
-    """Monitor system performance"""
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text exposition of request, LLM, SQLite, Socket.IO and queue metrics"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+def _admin_authorized() -> bool:
+    """The configured AVA_ADMIN_TOKEN only
+
+    API keys do not qualify: /api/account/create is open and lets callers
+    choose their own permissions.
+    """
+    token = request.headers.get('X-Admin-Token') or request.headers.get('Authorization', '').replace('Bearer ', '')
+    admin_token = os.environ.get('AVA_ADMIN_TOKEN')
+    return bool(token and admin_token and secrets.compare_digest(token, admin_token))
+
+def _admin_forbidden():
+    return jsonify({'success': False, 'error': 'Admin credentials required'}), 403
+
+@app.route('/api/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    """Start a stack sampling profile of all threads, or list recent profiles"""
+    if not _admin_authorized():
+        return _admin_forbidden()
+    try:
+        if request.method == 'GET':
+            return jsonify({'success': True, 'profiles': stack_sampler.list_profiles()})
+        data = request.get_json(silent=True) or {}
+        profile = stack_sampler.start(float(data.get('seconds', 10)),
+                                      float(data.get('interval_ms', 5)) / 1000)
+        return jsonify({'success': True, 'profile': profile}), 202
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/admin/profile/<profile_id>', methods=['GET'])
+def admin_profile_result(profile_id):
+    """A profile as a JSON summary, collapsed stacks (?format=collapsed) or flamegraph (?format=svg)"""
+    if not _admin_authorized():
+        return _admin_forbidden()
+    try:
+        output = request.args.get('format', 'json')
+        if output == 'collapsed':
+            body = stack_sampler.collapsed(profile_id)
+            mimetype = 'text/plain'
+        elif output == 'svg':
+            body = stack_sampler.flamegraph(profile_id)
+            mimetype = 'image/svg+xml'
+        else:
+            summary = stack_sampler.summary(profile_id)
+            if summary is None:
+                return jsonify({'success': False, 'error': 'Profile not found'}), 404
+            return jsonify({'success': True, 'profile': summary})
+        if body is None:
+            return jsonify({'success': False, 'error': 'Profile not found'}), 404
+        return Response(body, mimetype=mimetype)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/admin/tracing', methods=['GET', 'POST'])
+def admin_tracing():
+    """Turn request tracing on or off and set its sample rate"""
+    if not _admin_authorized():
+        return _admin_forbidden()
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            status = tracer.configure(data.get('enabled', True), float(data.get('sample_rate', 1.0)))
+        else:
+            status = tracer.get_tracer_status()
+        return jsonify({'success': True, 'tracing': status})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/admin/traces', methods=['GET'])
+def admin_traces():
+    """Recent request traces, newest first; ?min_ms= keeps only slow ones"""
+    if not _admin_authorized():
+        return _admin_forbidden()
     try:
-        import psutil
-        
         return jsonify({
             'success': True,
-            'cpu_usage': psutil.cpu_percent(),
-            'memory_usage': psutil.virtual_memory().percent,
-            'disk_usage': psutil.disk_usage('/').percent,
-            'network_io': psutil.net_io_counters()._asdict(),
-            'uptime': time.time()
+            'traces': tracer.list_traces(request.args.get('limit', 50, type=int),
+                                         request.args.get('min_ms', 0.0, type=float))
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/api/capabilities', methods=['GET'])
-def get_capabilities():
-    """Get all available capabilities"""
-    return jsonify({
+@app.route('/api/admin/traces/<trace_id>', methods=['GET'])
+def admin_trace(trace_id):
+    """One trace with the duration and self time of every span"""
+    if not _admin_authorized():
+        return _admin_forbidden()
+    trace = tracer.get_trace(trace_id)
+    if trace is None:
+        return jsonify({'success': False, 'error': 'Trace not found'}), 404
+    return jsonify({'success': True, 'trace': trace})
+
+@app.route('/api/admin/maintenance', methods=['GET', 'POST'])
+def admin_maintenance():
+    """Per-database fragmentation and reclaimed bytes, or run a maintenance pass now"""
+    if not _admin_authorized():
+        return _admin_forbidden()
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            result = db_maintenance.run_pass(force=bool(data.get('force', False)))
+            return jsonify(result), 409 if result.get('error') else 200
+        return jsonify({'success': True, 'maintenance': db_maintenance.get_status()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/admin/background', methods=['GET', 'POST'])
+def admin_background():
+    """Background jobs with their intervals, deferrals and CPU time, or run one now"""
+    if not _admin_authorized():
+        return _admin_forbidden()
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            if not background_scheduler.run_now(str(data.get('job', ''))):
+                return jsonify({'success': False, 'error': 'Job not found'}), 404
+        return jsonify({'success': True, 'background': background_scheduler.get_status()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/monitor/system', methods=['GET'])
+def monitor_system():
+    """Monitor system performance from the health sampler; ?window=<seconds> adds the series"""
+    try:
+        sample = health_sampler.latest()
+        result = {
+            'success': True,
+            'sampled_at': sample['timestamp'],
+            'cpu_usage': sample.get('cpu_percent'),
+            'memory_usage': sample.get('memory_percent'),
+            'disk_usage': sample.get('disk_percent'),
+            'network_io': {
+                'bytes_sent': sample.get('net_bytes_sent'),
+                'bytes_recv': sample.get('net_bytes_recv')
+            },
+            'uptime': time.time(),
+            'sampler': health_sampler.get_sampler_status()
+        }
+        window = request.args.get('window', type=float)
+        if window:
+            result['series'] = health_sampler.window(window)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def _build_capabilities_document():
+    """Build the /api/capabilities document"""
+    return {
         'success': True,
         'capabilities': {
             'ai_chat': True,
@@ -1146,12 +1620,17 @@ def get_capabilities():
             'projects': {
                 'create': '/api/projects/create',
                 'execute': '/api/projects/execute',
+                'execution_pool': '/api/projects/execution-pool',
+                'execution_cache': '/api/projects/execution-cache',
+                'jobs': '/api/jobs',
                 'deploy': '/api/projects/deploy',
                 'list': '/api/projects'
             },
             'automation': {
                 'create': '/api/automation/create',
-                'execute': '/api/automation/execute'
+                'execute': '/api/automation/execute',
+                'workflows': '/api/automation/workflows',
+                'runs': '/api/automation/runs/<run_id>'
             },
             'ai': {
                 'configure': '/api/ai/configure',
@@ -1162,10 +1641,18 @@ def get_capabilities():
                 'list': '/api/tasks',
                 'update': '/api/tasks/update'
             },
-            'scheduling': '/api/schedule',
+            'scheduling': {
+                'schedule': '/api/schedule',
+                'status': '/api/schedule/status',
+                'manage': '/api/schedule/<schedule_id>'
+            },
             'network': '/api/network/devices',
-            'data': '/api/data/process',
+            'data': {
+                'process': '/api/data/process',
+                'results': '/api/data/results/<result_id>'
+            },
             'external_api': '/api/api/call',
+            'http_cache': '/api/http-cache',
             'database': {
                 'connect': '/api/database/connect',
                 'query': '/api/database/query'
@@ -1177,9 +1664,17 @@ def get_capabilities():
             },
             'security': '/api/security/scan',
             'monitoring': '/api/monitor/system',
-            'browsing': '/api/browse'
+            'browsing': '/api/browse',
+            'crawling': '/api/capabilities/crawl'
         }
-    })
+    }
+
+status_registry.register('capabilities', _build_capabilities_document)
+
+@app.route('/api/capabilities', methods=['GET'])
+def get_capabilities():
+    """Get all available capabilities"""
+    return status_registry.response('capabilities')
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
@@ -1195,6 +1690,11 @@ def get_status():
         'uptime': time.time()
     })
 
+@app.route('/api/startup/timeline', methods=['GET'])
+def get_startup_timeline():
+    """Get per-component startup timeline"""
+    return jsonify({'success': True, 'startup': services.get_startup_timeline()})
+
 @app.route('/api/autonomous/insights', methods=['GET'])
 def get_autonomous_insights():
     """Get autonomous thinking insights and current state"""
@@ -1442,10 +1942,9 @@ def create_visualization():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/api/enterprise/features', methods=['GET'])
-def get_enterprise_features():
-    """Get enterprise-level features and capabilities"""
-    return jsonify({
+def _build_enterprise_features_document():
+    """Build the /api/enterprise/features document"""
+    return {
         'success': True,
         'enterprise_features': {
             'autonomous_thinking': {
@@ -1501,7 +2000,14 @@ def get_enterprise_features():
         },
         'licensing': 'NDA Protected - Proprietary Technology',
         'support_focus': 'Climate solutions, community development, ethical business'
-    })
+    }
+
+status_registry.register('enterprise_features', _build_enterprise_features_document)
+
+@app.route('/api/enterprise/features', methods=['GET'])
+def get_enterprise_features():
+    """Get enterprise-level features and capabilities"""
+    return status_registry.response('enterprise_features')
 
 @app.route('/api/voice/start_listening', methods=['POST'])
 def start_voice_listening():
@@ -1675,6 +2181,54 @@ def browse_external_website():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+# Server-side bounds for caller-supplied crawl options: (public limit, admin limit).
+# min_delay is a lower bound; admins may also crawl across hosts.
+CRAWL_LIMITS = {
+    'max_depth': (3, 10),
+    'max_pages': (200, 5000),
+    'concurrency': (8, 32),
+    'per_host_concurrency': (2, 8)
+}
+CRAWL_MIN_DELAY = (0.25, 0.05)
+
+def _crawl_options(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Crawl options from the request body, clamped to the caller's limits"""
+    admin = _admin_authorized()
+    options = {}
+    for key, limits in CRAWL_LIMITS.items():
+        if key in data:
+            options[key] = min(max(int(data[key]), 1 if key != 'max_depth' else 0), limits[admin])
+    floor = CRAWL_MIN_DELAY[admin]
+    options['min_delay'] = max(float(data.get('min_delay', floor)), floor)
+    options['same_host'] = bool(data.get('same_host', True)) if admin else True
+    return options
+
+@app.route('/api/capabilities/crawl', methods=['POST'])
+def crawl_external_website():
+    """Crawl a website, streaming one JSON line per page unless stream is false"""
+    try:
+        data = request.get_json()
+        seeds = data.get('urls') or [data.get('url', '')]
+        if not any(seeds):
+            return jsonify({'success': False, 'error': 'URL required'}), 400
+        
+        try:
+            options = _crawl_options(data)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Invalid crawl options'}), 400
+        if not data.get('stream', True):
+            return jsonify(advanced_capabilities.crawl_website(seeds, **options))
+        
+        pages = advanced_capabilities.browser.crawl(seeds, **options)
+        
+        def generate():
+            for page in pages:
+                yield json.dumps(page) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/capabilities/process_request', methods=['POST'])
 def process_external_request():
     """Process various types of external requests"""
@@ -1688,122 +2242,129 @@ def process_external_request():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+def _build_capabilities_list_document():
+    """Build the /api/capabilities/list document from live component state"""
+    ai_capabilities = advanced_ai.get_capabilities()
+    advanced_caps = advanced_capabilities.get_capabilities()
+    voice_status = voice_processor.get_voice_status()
+    autonomous_insights = autonomous_thinking.get_autonomous_insights()
+    
+    comprehensive_capabilities = {
+        'success': True,
+        'system_name': 'AVA CORE Neural AI Assistant',
+        'version': 'Production v1.0',
+        'copyright': 'Ervin Remus Radosavlevici (© ervin210@icloud.com)',
+        'licensing': 'NDA Protected - Proprietary Technology',
+        'capabilities': {
+            'autonomous_thinking': {
+                'enabled': autonomous_insights.get('autonomous_thinking_active', False),
+                'features': [
+                    'Self-directed problem solving',
+                    'Pattern recognition and learning',
+                    'Memory retention across sessions',
+                    'Autonomous decision making',
+                    'Continuous improvement',
+                    'Context-aware responses'
+                ]
+            },
+            'voice_processing': {
+                'enabled': voice_status.get('voice_available', False),
+                'features': [
+                    'Speech recognition',
+                    'Text-to-speech synthesis',
+                    'Natural language understanding',
+                    'Intent analysis',
+                    'Voice commands',
+                    'Contextual conversations'
+                ]
+            },
+            'network_control': {
+                'enabled': True,
+                'features': [
+                    'Local network device discovery',
+                    'Smart device control',
+                    'IoT integration',
+                    'Remote system management',
+                    'Cross-platform connectivity'
+                ]
+            },
+            'business_intelligence': {
+                'enabled': True,
+                'features': [
+                    'Business analysis and optimization',
+                    'Climate solution development',
+                    'Community impact assessment',
+                    'Ethical compliance monitoring',
+                    'Sustainable development planning'
+                ]
+            },
+            'advanced_automation': {
+                'enabled': True,
+                'features': [
+                    'Multi-step workflow automation',
+                    'Cross-system integration',
+                    'Intelligent task scheduling',
+                    'Adaptive process optimization',
+                    'Development environment management'
+                ]
+            },
+            'web_capabilities': {
+                'enabled': True,
+                'features': advanced_caps.get('web_browsing', []),
+            },
+            'ai_integration': {
+                'enabled': True,
+                'features': ai_capabilities.get('capabilities', [])
+            }
+        },
+        'focus_areas': [
+            'Climate change solutions and environmental sustainability',
+            'Community development and social impact',
+            'Ethical business practices and transparency',
+            'Sustainable technology development',
+            'Human welfare and assistance optimization',
+            'Local network device management',
+            'Autonomous learning and improvement'
+        ],
+        'restrictions': [
+            'No harmful or destructive capabilities',
+            'Focus exclusively on beneficial development',
+            'Climate and community solutions priority',
+            'Maximum privacy and security protection',
+            'NDA compliance and proprietary technology protection'
+        ],
+        'anthropic_ai_capabilities': [
+            'Advanced reasoning with claude-3-5-sonnet-20241022',
+            'Business strategy analysis (sustainability focused)',
+            'Climate solution development and analysis',
+            'Community development planning',
+            'Technology ethics review and assessment',
+            'Autonomous learning optimization',
+            'Conversation insights and contextual understanding',
+            'Comprehensive response generation'
+        ],
+        'dual_ai_system': [
+            'OpenAI GPT-4o integration',
+            'Anthropic Claude-3-5-sonnet integration',
+            'Hybrid analysis capabilities',
+            'Comparative AI insights',
+            'Multi-perspective problem solving',
+            'Enhanced accuracy through model consensus'
+        ],
+        'api_endpoints_count': '35+ comprehensive routes',
+        'ai_models_integrated': ['gpt-4o', 'claude-3-5-sonnet-20241022']
+    }
+
+    return comprehensive_capabilities
+
+# Embeds live voice/autonomous state, so the cached document expires
+status_registry.register('capabilities_list', _build_capabilities_list_document, ttl=30)
+
 @app.route('/api/capabilities/list', methods=['GET'])
 def list_all_capabilities():
     """Get comprehensive list of all system capabilities"""
     try:
-        ai_capabilities = advanced_ai.get_capabilities()
-        advanced_caps = advanced_capabilities.get_capabilities()
-        voice_status = voice_processor.get_voice_status()
-        autonomous_insights = autonomous_thinking.get_autonomous_insights()
-        
-        comprehensive_capabilities = {
-            'success': True,
-            'system_name': 'AVA CORE Neural AI Assistant',
-            'version': 'Production v1.0',
-            'copyright': 'Ervin Remus Radosavlevici (© ervin210@icloud.com)',
-            'licensing': 'NDA Protected - Proprietary Technology',
-            'capabilities': {
-                'autonomous_thinking': {
-                    'enabled': autonomous_insights.get('autonomous_thinking_active', False),
-                    'features': [
-                        'Self-directed problem solving',
-                        'Pattern recognition and learning',
-                        'Memory retention across sessions',
-                        'Autonomous decision making',
-                        'Continuous improvement',
-                        'Context-aware responses'
-                    ]
-                },
-                'voice_processing': {
-                    'enabled': voice_status.get('voice_available', False),
-                    'features': [
-                        'Speech recognition',
-                        'Text-to-speech synthesis',
-                        'Natural language understanding',
-                        'Intent analysis',
-                        'Voice commands',
-                        'Contextual conversations'
-                    ]
-                },
-                'network_control': {
-                    'enabled': True,
-                    'features': [
-                        'Local network device discovery',
-                        'Smart device control',
-                        'IoT integration',
-                        'Remote system management',
-                        'Cross-platform connectivity'
-                    ]
-                },
-                'business_intelligence': {
-                    'enabled': True,
-                    'features': [
-                        'Business analysis and optimization',
-                        'Climate solution development',
-                        'Community impact assessment',
-                        'Ethical compliance monitoring',
-                        'Sustainable development planning'
-                    ]
-                },
-                'advanced_automation': {
-                    'enabled': True,
-                    'features': [
-                        'Multi-step workflow automation',
-                        'Cross-system integration',
-                        'Intelligent task scheduling',
-                        'Adaptive process optimization',
-                        'Development environment management'
-                    ]
-                },
-                'web_capabilities': {
-                    'enabled': True,
-                    'features': advanced_caps.get('web_browsing', []),
-                },
-                'ai_integration': {
-                    'enabled': True,
-                    'features': ai_capabilities.get('capabilities', [])
-                }
-            },
-            'focus_areas': [
-                'Climate change solutions and environmental sustainability',
-                'Community development and social impact',
-                'Ethical business practices and transparency',
-                'Sustainable technology development',
-                'Human welfare and assistance optimization',
-                'Local network device management',
-                'Autonomous learning and improvement'
-            ],
-            'restrictions': [
-                'No harmful or destructive capabilities',
-                'Focus exclusively on beneficial development',
-                'Climate and community solutions priority',
-                'Maximum privacy and security protection',
-                'NDA compliance and proprietary technology protection'
-            ],
-            'anthropic_ai_capabilities': [
-                'Advanced reasoning with claude-3-5-sonnet-20241022',
-                'Business strategy analysis (sustainability focused)',
-                'Climate solution development and analysis',
-                'Community development planning',
-                'Technology ethics review and assessment',
-                'Autonomous learning optimization',
-                'Conversation insights and contextual understanding',
-                'Comprehensive response generation'
-            ],
-            'dual_ai_system': [
-                'OpenAI GPT-4o integration',
-                'Anthropic Claude-3-5-sonnet integration',
-                'Hybrid analysis capabilities',
-                'Comparative AI insights',
-                'Multi-perspective problem solving',
-                'Enhanced accuracy through model consensus'
-            ],
-            'api_endpoints_count': '35+ comprehensive routes',
-            'ai_models_integrated': ['gpt-4o', 'claude-3-5-sonnet-20241022']
-        }
-        
-        return jsonify(comprehensive_capabilities)
+        return status_registry.response('capabilities_list')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
@@ -2043,11 +2604,12 @@ def hybrid_ai_dual_analysis():
         }
         
         # Store for learning
-        autonomous_thinking.remember_interaction(
-            f'hybrid_analysis_{query[:50]}',
-            json.dumps(hybrid_analysis),
-            'dual_ai_comparison'
-        )
+        with tracer.span('autonomous_thinking.remember_interaction'):
+            autonomous_thinking.remember_interaction(
+                f'hybrid_analysis_{query[:50]}',
+                json.dumps(hybrid_analysis),
+                'dual_ai_comparison'
+            )
         
         return jsonify({
             'success': True,
@@ -2072,6 +2634,26 @@ def handle_disconnect():
     """Handle WebSocket disconnection"""
     logger.info("Client disconnected")
 
+@socketio.on('job_subscribe')
+def handle_job_subscribe(data):
+    """Join a job's room and replay output after after_seq"""
+    job = job_manager.get((data or {}).get('job_id', ''))
+    if job is None:
+        emit('job_error', {'error': 'Job not found', 'job_id': (data or {}).get('job_id')})
+        return
+    join_room(f'job:{job.id}')
+    chunks, gap = job.events_since(int(data.get('after_seq', 0)))
+    if gap:
+        emit('job_gap', {'job_id': job.id, 'after_seq': data.get('after_seq', 0)})
+    for chunk in chunks:
+        emit('job_output', chunk)
+    emit('job_status', job.to_dict())
+
+@socketio.on('job_unsubscribe')
+def handle_job_unsubscribe(data):
+    """Leave a job's room"""
+    leave_room(f"job:{(data or {}).get('job_id', '')}")
+
 # ====================================================
 # ADVANCED API MANAGEMENT ENDPOINTS - NDA PROTECTED
 # Copyright: Ervin Remus Radosavlevici (© ervin210@icloud.com)
@@ -2286,7 +2868,8 @@ def execute_development_code():
         if not code:
             return jsonify({'success': False, 'error': 'Code required'}), 400
         
-        result = comprehensive_dev.execute_code(project_id, language, code, unrestricted)
+        result = comprehensive_dev.execute_code(project_id, language, code, unrestricted,
+                                                pure=data.get('pure'), inputs=data.get('inputs'))
         result.update({
             'development_mode': 'unrestricted',
             'restrictions_removed': True,
@@ -0,0 +1,393 @@
+"""
+AVA CORE Profiler
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+On-demand stack sampling and per-request span tracing.
+The stack sampler reads sys._current_frames() from a helper thread for a
+fixed number of seconds and folds every thread's stack into collapsed
+stacks ("thread;module:function;... count"), which can also be rendered
+as a flamegraph SVG. Nothing runs between profiles.
+
+The tracer records timed spans (NDA wrapper, SQLite, LLM calls, JSON
+serialization) under a per-request trace id into a bounded in-memory
+store. While tracing is off span() returns a shared no-op context, so the
+instrumented hot paths cost one context variable lookup.
+"""
+
+import os
+import sys
+import time
+import uuid
+import zlib
+import random
+import logging
+import threading
+import contextvars
+from collections import Counter, OrderedDict
+from datetime import datetime
+from html import escape
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = 120
+MAX_TRACES = 500
+MAX_SPANS_PER_TRACE = 256
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f'{module}:{code.co_name}'
+
+def render_flamegraph(collapsed: Dict[str, int], title: str = 'AVA CORE profile', width: int = 1200) -> str:
+    """Render collapsed stacks as a self-contained flamegraph SVG"""
+    root: Dict[str, Any] = {'count': 0, 'children': {}}
+    for stack, count in collapsed.items():
+        node = root
+        node['count'] += count
+        for frame in stack.split(';'):
+            node = node['children'].setdefault(frame, {'count': 0, 'children': {}})
+            node['count'] += count
+
+    row_height = 16
+    rects = []
+    depth_seen = 0
+
+    def layout(node, x, depth):
+        nonlocal depth_seen
+        depth_seen = max(depth_seen, depth)
+        for name, child in sorted(node['children'].items()):
+            child_width = child['count'] * width / root['count']
+            if child_width >= 0.5:
+                rects.append((name, child['count'], x, depth, child_width))
+                layout(child, x, depth + 1)
+            x += child_width
+
+    if root['count']:
+        layout(root, 0.0, 0)
+    height = (depth_seen + 1) * row_height + 40
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'font-family="monospace" font-size="11">',
+             f'<text x="4" y="16" font-size="14">{escape(title)} ({root["count"]} samples)</text>']
+    for name, count, x, depth, rect_width in rects:
+        # Flames grow upward from the bottom row
+        y = height - (depth + 1) * row_height
+        hue = 20 + zlib.crc32(name.encode()) % 40
+        label = escape(name)
+        percent = count * 100 / root['count']
+        parts.append(f'<g><title>{label} ({count} samples, {percent:.2f}%)</title>'
+                     f'<rect x="{x:.2f}" y="{y}" width="{rect_width:.2f}" height="{row_height - 1}" '
+                     f'fill="hsl({hue},90%,60%)"/>')
+        if rect_width > 40:
+            chars = int(rect_width / 7)
+            text = label if len(name) <= chars else escape(name[:max(0, chars - 2)]) + '..'
+            parts.append(f'<text x="{x + 3:.2f}" y="{y + 12}">{text}</text>')
+        parts.append('</g>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+class StackSampler:
+    """Statistical profiler sampling the stacks of all threads"""
+
+    def __init__(self, max_profiles: int = 5):
+        self.max_profiles = max_profiles
+        self._profiles: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._active: Optional[str] = None
+
+    def start(self, seconds: float = 10.0, interval: float = 0.005) -> Dict[str, Any]:
+        """Begin sampling in the background; raises ValueError for bad input or a running profile"""
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            raise ValueError(f"seconds must be between 0 and {MAX_PROFILE_SECONDS}")
+        if not 0.001 <= interval <= 1.0:
+            raise ValueError("interval must be between 0.001 and 1 second")
+
+        with self._lock:
+            if self._active is not None:
+                raise ValueError(f"Profile {self._active} is still running")
+            profile_id = f'profile_{uuid.uuid4().hex[:12]}'
+            profile = {
+                'id': profile_id,
+                'status': 'running',
+                'seconds': seconds,
+                'interval': interval,
+                'started_at': datetime.now().isoformat(),
+                'samples': 0,
+                'collapsed': {}
+            }
+            self._profiles[profile_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+            self._active = profile_id
+
+        thread = threading.Thread(target=self._sample, args=(profile,), name='stack-sampler', daemon=True)
+        thread.start()
+        return {'id': profile_id, 'status': 'running', 'seconds': seconds, 'interval': interval}
+
+    def _sample(self, profile: Dict[str, Any]):
+        own_id = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.monotonic() + profile['seconds']
+        cpu_start = time.thread_time()
+        try:
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    frames = []
+                    while frame is not None:
+                        frames.append(_frame_label(frame))
+                        frame = frame.f_back
+                    frames.append(names.get(thread_id, f'thread-{thread_id}'))
+                    frames.reverse()
+                    stacks[';'.join(frames)] += 1
+                samples += 1
+                time.sleep(profile['interval'])
+            profile['status'] = 'completed'
+        except Exception as e:
+            logger.error(f"Stack sampling failed: {e}")
+            profile['status'] = 'failed'
+            profile['error'] = str(e)
+        finally:
+            profile['samples'] = samples
+            profile['collapsed'] = dict(stacks)
+            profile['sampler_cpu_seconds'] = round(time.thread_time() - cpu_start, 4)
+            profile['finished_at'] = datetime.now().isoformat()
+            with self._lock:
+                self._active = None
+
+    def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def collapsed(self, profile_id: str) -> Optional[str]:
+        """Collapsed stacks, one "frame;frame;frame count" line each"""
+        profile = self.get_profile(profile_id)
+        if profile is None:
+            return None
+        lines = sorted(profile['collapsed'].items(), key=lambda item: -item[1])
+        return '\n'.join(f'{stack} {count}' for stack, count in lines) + '\n'
+
+    def flamegraph(self, profile_id: str) -> Optional[str]:
+        profile = self.get_profile(profile_id)
+        if profile is None:
+            return None
+        return render_flamegraph(profile['collapsed'], f"AVA CORE {profile_id}")
+
+    def summary(self, profile_id: str, top: int = 25) -> Optional[Dict[str, Any]]:
+        """Profile metadata plus the functions seen most often on top of a stack"""
+        profile = self.get_profile(profile_id)
+        if profile is None:
+            return None
+        leaves: Counter = Counter()
+        for stack, count in profile['collapsed'].items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        result = {key: value for key, value in profile.items() if key != 'collapsed'}
+        result['distinct_stacks'] = len(profile['collapsed'])
+        result['top_frames'] = [{'frame': frame, 'samples': count, 'percent': round(count * 100 / total, 2)}
+                                for frame, count in leaves.most_common(top)]
+        return result
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{'id': p['id'], 'status': p['status'], 'seconds': p['seconds'],
+                     'samples': p['samples'], 'started_at': p['started_at']}
+                    for p in reversed(self._profiles.values())]
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class _Span:
+    __slots__ = ('trace', 'name', 'start', 'parent', 'index')
+
+    def __init__(self, trace: Dict[str, Any], name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        trace = self.trace
+        self.parent = trace['_stack'][-1] if trace['_stack'] else None
+        self.start = time.perf_counter()
+        self.index = None
+        if len(trace['spans']) < MAX_SPANS_PER_TRACE:
+            self.index = len(trace['spans'])
+            trace['spans'].append({'name': self.name, 'parent': self.parent,
+                                   'start_ms': round((self.start - trace['_t0']) * 1000, 3)})
+            trace['_stack'].append(self.index)
+        else:
+            trace['dropped_spans'] += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.index is not None:
+            span = self.trace['spans'][self.index]
+            span['duration_ms'] = round((time.perf_counter() - self.start) * 1000, 3)
+            if exc_type is not None:
+                span['error'] = exc_type.__name__
+            self.trace['_stack'].pop()
+        return False
+
+class Tracer:
+    """Per-request span traces kept in a bounded in-memory store"""
+
+    def __init__(self, max_traces: int = MAX_TRACES):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.max_traces = max_traces
+        self._current: contextvars.ContextVar = contextvars.ContextVar('ava_trace', default=None)
+        self._traces: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'traces': 0, 'evicted': 0}
+
+    def configure(self, enabled: bool, sample_rate: float = 1.0) -> Dict[str, Any]:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        self.sample_rate = sample_rate
+        self.enabled = bool(enabled)
+        return self.get_tracer_status()
+
+    def begin(self, name: str) -> Optional[str]:
+        """Start a trace for the current request; returns its id, or None when not sampled"""
+        if not self.enabled or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return None
+        trace_id = uuid.uuid4().hex[:16]
+        trace = {
+            'trace_id': trace_id,
+            'name': name,
+            'started_at': datetime.now().isoformat(),
+            'spans': [],
+            'dropped_spans': 0,
+            '_t0': time.perf_counter(),
+            '_stack': []
+        }
+        self._current.set(trace)
+        return trace_id
+
+    def end(self, status: Any = None) -> Optional[Dict[str, Any]]:
+        """Finish the current trace and store it"""
+        trace = self._current.get()
+        if trace is None:
+            return None
+        self._current.set(None)
+        trace['duration_ms'] = round((time.perf_counter() - trace.pop('_t0')) * 1000, 3)
+        trace['status'] = status
+        del trace['_stack']
+        with self._lock:
+            self._traces[trace['trace_id']] = trace
+            self.stats['traces'] += 1
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+                self.stats['evicted'] += 1
+        return trace
+
+    def current_trace_id(self) -> Optional[str]:
+        trace = self._current.get()
+        return trace['trace_id'] if trace is not None else None
+
+    def span(self, name: str):
+        """Context manager timing a block inside the current trace, if any"""
+        trace = self._current.get()
+        if trace is None:
+            return _NOOP_SPAN
+        return _Span(trace, name)
+
+    def record(self, name: str, start: float, duration: float):
+        """Add an already-timed span; start is a perf_counter() value"""
+        trace = self._current.get()
+        if trace is None:
+            return
+        if len(trace['spans']) >= MAX_SPANS_PER_TRACE:
+            trace['dropped_spans'] += 1
+            return
+        trace['spans'].append({'name': name, 'parent': trace['_stack'][-1] if trace['_stack'] else None,
+                               'start_ms': round((start - trace['_t0']) * 1000, 3),
+                               'duration_ms': round(duration * 1000, 3)})
+
+    def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """A stored trace with each span's self time (its duration minus its children)"""
+        with self._lock:
+            trace = self._traces.get(trace_id)
+        if trace is None:
+            return None
+        spans = [dict(span) for span in trace['spans']]
+        child_ms = [0.0] * len(spans)
+        for span in spans:
+            if span['parent'] is not None:
+                child_ms[span['parent']] += span.get('duration_ms', 0.0)
+        for index, span in enumerate(spans):
+            span['self_ms'] = round(span.get('duration_ms', 0.0) - child_ms[index], 3)
+        untraced = trace['duration_ms'] - sum(s.get('duration_ms', 0.0) for s in spans if s['parent'] is None)
+        return dict(trace, spans=spans, untraced_ms=round(untraced, 3))
+
+    def list_traces(self, limit: int = 50, min_ms: float = 0.0) -> List[Dict[str, Any]]:
+        """Newest traces first, optionally only those slower than min_ms"""
+        with self._lock:
+            traces = list(reversed(self._traces.values()))
+        result = []
+        for trace in traces:
+            if trace['duration_ms'] < min_ms:
+                continue
+            by_name: Dict[str, float] = {}
+            for span in trace['spans']:
+                by_name[span['name']] = by_name.get(span['name'], 0.0) + span.get('duration_ms', 0.0)
+            result.append({'trace_id': trace['trace_id'], 'name': trace['name'], 'status': trace['status'],
+                           'started_at': trace['started_at'], 'duration_ms': trace['duration_ms'],
+                           'span_ms': {name: round(ms, 3) for name, ms in by_name.items()}})
+            if len(result) >= limit:
+                break
+        return result
+
+    def get_tracer_status(self) -> Dict[str, Any]:
+        with self._lock:
+            stored = len(self._traces)
+        return {'enabled': self.enabled, 'sample_rate': self.sample_rate, 'stored_traces': stored,
+                'max_traces': self.max_traces, 'stats': dict(self.stats)}
+
+def instrument_tracing(app):
+    """Trace each request of a Flask app while tracing is enabled
+
+    Sampled responses carry an X-Trace-Id header, and JSON serialization
+    shows up as a json.dumps span.
+    """
+    from flask import request
+    from flask.json.provider import DefaultJSONProvider
+
+    class TracedJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            with tracer.span('json.dumps'):
+                return super().dumps(obj, **kwargs)
+
+    app.json = TracedJSONProvider(app)
+
+    @app.before_request
+    def _begin_trace():
+        if tracer.enabled:
+            route = request.url_rule.rule if request.url_rule else request.path
+            tracer.begin(f'{request.method} {route}')
+
+    @app.after_request
+    def _finish_trace(response):
+        trace = tracer.end(response.status_code)
+        if trace is not None:
+            response.headers['X-Trace-Id'] = trace['trace_id']
+        return response
+
+    @app.teardown_request
+    def _drop_trace(exc):
+        # Only still set when after_request did not run
+        tracer.end('error' if exc else None)
+
+# Global profiler instances
+stack_sampler = StackSampler()
+tracer = Tracer()
@@ -15,9 +15,10 @@ import threading
 import time
 import logging
 import sqlite3
-import requests
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from execution_pool import execution_pool
+from node_pool import node_pool
 
 class FullDevelopmentSuite:
     """Complete development environment with all restored features"""
@@ -241,38 +242,34 @@ class FullDevelopmentSuite:
     def _execute_python_advanced(self, code: str, context: Dict = None) -> Dict[str, Any]:
         """Execute Python with advanced features and context"""
         try:
-            # Create temporary execution environment
-            exec_globals = {
-                '__name__': '__main__',
-                'requests': requests,
-                'json': json,
-                'os': os,
-                'time': time,
-                'datetime': datetime
-            }
-            
-            if context:
-                exec_globals.update(context)
-            
-            # Capture output
-            import io
-            import sys
-            from contextlib import redirect_stdout, redirect_stderr
-            
-            stdout_buffer = io.StringIO()
-            stderr_buffer = io.StringIO()
-            
-            with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-                exec(code, exec_globals)
+            # Run on a pool worker rather than the request thread; context
+            # values are sent over the worker pipe and must be JSON-serializable
+            result = execution_pool.execute(
+                code,
+                owner='restored_features',
+                names={
+                    'requests': 'requests',
+                    'json': 'json',
+                    'os': 'os',
+                    'time': 'time',
+                    'datetime': 'datetime:datetime'
+                },
+                context=context,
+                return_globals=True
+            )
             
-            output = stdout_buffer.getvalue()
-            error = stderr_buffer.getvalue()
+            if not result['success']:
+                return {
+                    'success': False,
+                    'error': result['error'],
+                    'output': result['output']
+                }
             
             return {
                 'success': True,
-                'output': output,
-                'error': error if error else None,
-                'globals': {k: str(v) for k, v in exec_globals.items() if not k.startswith('__')}
+                'output': result['output'],
+                'error': result['error'] if result['error'] else None,
+                'globals': result['globals']
             }
             
         except Exception as e:
@@ -284,87 +281,35 @@ class FullDevelopmentSuite:
     
     def _execute_javascript_advanced(self, code: str, context: Dict = None) -> Dict[str, Any]:
         """Execute JavaScript with Node.js and advanced features"""
-        try:
-            # Create temporary file with context
-            temp_file = f'/tmp/ava_js_{int(time.time())}.js'
-            
-            full_code = ""
-            if context:
-                full_code += f"const context = {json.dumps(context)};\n"
-            
-            full_code += code
-            
-            with open(temp_file, 'w') as f:
-                f.write(full_code)
-            
-            # Execute with Node.js
-            result = subprocess.run(
-                ['node', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # Clean up
-            os.remove(temp_file)
-            
-            return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr if result.stderr else None
-            }
-            
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'error': 'Execution timeout (30 seconds)',
-                'output': ''
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'output': ''
-            }
+        return self._execute_on_node(code, 'javascript', context)
     
     def _execute_typescript_advanced(self, code: str, context: Dict = None) -> Dict[str, Any]:
-        """Execute TypeScript with ts-node and advanced features"""
+        """Execute TypeScript with cached transpilation and advanced features"""
+        return self._execute_on_node(code, 'typescript', context)
+    
+    def _execute_on_node(self, code: str, language: str, context: Dict = None) -> Dict[str, Any]:
+        """Run JavaScript or TypeScript on a persistent Node.js worker"""
         try:
-            # Create temporary file with context
-            temp_file = f'/tmp/ava_ts_{int(time.time())}.ts'
-            
-            full_code = ""
-            if context:
-                full_code += f"const context = {json.dumps(context)};\n"
-            
-            full_code += code
-            
-            with open(temp_file, 'w') as f:
-                f.write(full_code)
-            
-            # Execute with ts-node
-            result = subprocess.run(
-                ['ts-node', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=30
+            result = node_pool.execute(
+                code,
+                language=language,
+                owner='restored_features',
+                globals={'context': context} if context else None
             )
             
-            # Clean up
-            os.remove(temp_file)
+            if result.get('timed_out'):
+                return {
+                    'success': False,
+                    'error': 'Execution timeout (30 seconds)',
+                    'output': ''
+                }
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr if result.stderr else None
+                'success': result['success'],
+                'output': result['output'],
+                'error': result['error'] if result['error'] else None
             }
             
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'error': 'Execution timeout (30 seconds)',
-                'output': ''
-            }
         except Exception as e:
             return {
                 'success': False,
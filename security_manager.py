@@ -6,16 +6,112 @@ Enterprise-grade security and authentication system
 """
 
 import os
+import io
 import jwt
+import json
+import base64
+import struct
 import hashlib
 import secrets
 import logging
+import functools
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import bcrypt
 
 logger = logging.getLogger(__name__)
 
+# Framed AES-GCM stream format:
+#   header = magic | chunk size | 7 byte nonce prefix  (authenticated as AAD)
+#   frame  = ciphertext length | final flag | ciphertext+tag
+# Each frame nonce is prefix | frame counter | final flag, so frames cannot be
+# reordered, dropped or truncated without failing authentication.
+STREAM_MAGIC = b'AVS1'
+STREAM_HEADER = struct.Struct('>4sI7s')
+STREAM_FRAME = struct.Struct('>IB')
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+BATCH_TOKEN_PREFIX = 'g1.'
+NONCE_SIZE = 12
+
+
+def derive_key(password: bytes, salt: bytes, iterations: int = 100000, length: int = 32) -> bytes:
+    """Derive a key with PBKDF2-SHA256"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=length,
+        salt=salt,
+        iterations=iterations,
+    )
+    return kdf.derive(password)
+
+
+class DerivedKeyCache:
+    """Bounded cache of PBKDF2 keys, keyed by a SHA-256 digest of the password
+
+    The plaintext password is never kept. Call clear() to drop every cached key.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._keys: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def derive(self, password: bytes, salt: bytes, iterations: int = 100000, length: int = 32) -> bytes:
+        cache_key = (hashlib.sha256(password).digest(), salt, iterations, length)
+        with self._lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+                return key
+        key = derive_key(password, salt, iterations, length)
+        with self._lock:
+            self._keys[cache_key] = key
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return key
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+
+@functools.lru_cache(maxsize=32)
+def derive_subkey(master_key: bytes, info: bytes, length: int = 32) -> bytes:
+    """Derive a purpose-bound subkey from an existing key with HKDF-SHA256"""
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=length, salt=None, info=info)
+    return hkdf.derive(master_key)
+
+
+def _stream_nonce(prefix: bytes, counter: int, final: bool) -> bytes:
+    """Build the per-frame nonce for the framed stream format"""
+    return prefix + struct.pack('>IB', counter, 1 if final else 0)
+
+
+def _read_exact(src: BinaryIO, size: int) -> bytes:
+    """Read exactly size bytes unless EOF is reached first"""
+    buf = src.read(size)
+    if len(buf) == size or not buf:
+        return buf
+    parts = [buf]
+    remaining = size - len(buf)
+    while remaining:
+        more = src.read(remaining)
+        if not more:
+            break
+        parts.append(more)
+        remaining -= len(more)
+    return b''.join(parts)
+
+
 class SecurityManager:
     """Handles authentication, encryption, and security policies"""
     
@@ -23,6 +119,8 @@ class SecurityManager:
         self.jwt_secret = os.environ.get('JWT_SECRET', self._generate_jwt_secret())
         self.encryption_key = self._get_or_create_encryption_key()
         self.fernet = Fernet(self.encryption_key)
+        self.aesgcm = AESGCM(self._derive_stream_key())
+        self.key_cache = DerivedKeyCache()
         self.session_timeout = 3600  # 1 hour
         self.active_sessions = {}
         self.security_policies = self._load_security_policies()
@@ -49,6 +147,19 @@ class SecurityManager:
             logger.error(f"Encryption key error: {str(e)}")
             return Fernet.generate_key()  # Fallback to memory-only key
     
+    def _derive_stream_key(self):
+        """Derive the AES-256-GCM key used for bulk and streaming encryption"""
+        master_key = base64.urlsafe_b64decode(self.encryption_key)
+        return derive_subkey(master_key, b'ava-core-stream-v1')
+    
+    def derive_password_key(self, password: bytes, salt: bytes, iterations: int = 100000) -> bytes:
+        """PBKDF2 key for a password, reusing earlier derivations of this manager"""
+        return self.key_cache.derive(password, salt, iterations)
+    
+    def clear_key_cache(self):
+        """Forget every key derived by derive_password_key"""
+        self.key_cache.clear()
+    
     def _load_security_policies(self):
         """Load security policies configuration"""
         return {
@@ -230,7 +341,6 @@ class SecurityManager:
             if isinstance(data, str):
                 data = data.encode('utf-8')
             elif isinstance(data, dict):
-                import json
                 data = json.dumps(data).encode('utf-8')
             
             encrypted = self.fernet.encrypt(data)
@@ -242,6 +352,8 @@ class SecurityManager:
     def decrypt_data(self, encrypted_data):
         """Decrypt sensitive data"""
         try:
+            if isinstance(encrypted_data, str) and encrypted_data.startswith(BATCH_TOKEN_PREFIX):
+                return self.decrypt_batch([encrypted_data])[0]
             if isinstance(encrypted_data, str):
                 encrypted_data = encrypted_data.encode('utf-8')
             
@@ -251,6 +363,184 @@ class SecurityManager:
             logger.error(f"Decryption error: {str(e)}")
             return None
     
+    def _to_bytes(self, data):
+        """Normalize a value the same way encrypt_data does"""
+        if isinstance(data, bytes):
+            return data
+        if isinstance(data, str):
+            return data.encode('utf-8')
+        if isinstance(data, dict):
+            return json.dumps(data).encode('utf-8')
+        raise TypeError(f"Unsupported data type: {type(data).__name__}")
+    
+    def encrypt_batch(self, rows: Iterable[Any]) -> List[Optional[str]]:
+        """Encrypt many values with AES-GCM in one pass
+        
+        Returns one token per row, or None for rows that could not be encrypted.
+        Tokens are accepted by decrypt_batch and decrypt_data.
+        """
+        rows = list(rows)
+        encrypt = self.aesgcm.encrypt
+        encode = base64.urlsafe_b64encode
+        nonces = os.urandom(NONCE_SIZE * len(rows))
+        tokens = []
+        for index, row in enumerate(rows):
+            try:
+                nonce = nonces[index * NONCE_SIZE:(index + 1) * NONCE_SIZE]
+                sealed = encrypt(nonce, self._to_bytes(row), None)
+                tokens.append(BATCH_TOKEN_PREFIX + encode(nonce + sealed).decode('ascii'))
+            except Exception as e:
+                logger.error(f"Batch encryption error at row {index}: {str(e)}")
+                tokens.append(None)
+        return tokens
+    
+    def decrypt_batch(self, tokens: Iterable[Optional[str]]) -> List[Optional[Union[str, bytes]]]:
+        """Decrypt tokens produced by encrypt_batch, returning None for invalid rows
+        
+        Rows that are not UTF-8 text come back as bytes.
+        """
+        decrypt = self.aesgcm.decrypt
+        decode = base64.urlsafe_b64decode
+        prefix_length = len(BATCH_TOKEN_PREFIX)
+        results = []
+        for index, token in enumerate(tokens):
+            try:
+                if isinstance(token, bytes):
+                    token = token.decode('ascii')
+                if not token or not token.startswith(BATCH_TOKEN_PREFIX):
+                    raise ValueError("Not a batch token")
+                raw = decode(token[prefix_length:])
+                plain = decrypt(raw[:NONCE_SIZE], raw[NONCE_SIZE:], None)
+                try:
+                    results.append(plain.decode('utf-8'))
+                except UnicodeDecodeError:
+                    results.append(plain)
+            except Exception as e:
+                logger.error(f"Batch decryption error at row {index}: {type(e).__name__}")
+                results.append(None)
+        return results
+    
+    def encrypt_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Dict[str, Any]:
+        """Encrypt a binary stream into framed AES-GCM chunks
+        
+        Memory use is bounded by two chunks regardless of input size.
+        """
+        try:
+            if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+                raise ValueError(f"chunk_size must be between 1 and {STREAM_MAX_CHUNK_SIZE}")
+            
+            prefix = os.urandom(7)
+            header = STREAM_HEADER.pack(STREAM_MAGIC, chunk_size, prefix)
+            dst.write(header)
+            
+            encrypt = self.aesgcm.encrypt
+            bytes_in = 0
+            bytes_out = len(header)
+            counter = 0
+            chunk = _read_exact(src, chunk_size)
+            while True:
+                # Read one chunk ahead so the last frame can be flagged as final
+                next_chunk = _read_exact(src, chunk_size) if len(chunk) == chunk_size else b''
+                final = not next_chunk
+                sealed = encrypt(_stream_nonce(prefix, counter, final), chunk, header)
+                dst.write(STREAM_FRAME.pack(len(sealed), 1 if final else 0))
+                dst.write(sealed)
+                bytes_in += len(chunk)
+                bytes_out += STREAM_FRAME.size + len(sealed)
+                counter += 1
+                if final:
+                    break
+                chunk = next_chunk
+            
+            return {'success': True, 'bytes_in': bytes_in, 'bytes_out': bytes_out, 'chunks': counter}
+        except Exception as e:
+            logger.error(f"Stream encryption error: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def decrypt_stream(self, src: BinaryIO, dst: BinaryIO) -> Dict[str, Any]:
+        """Decrypt a framed AES-GCM stream produced by encrypt_stream
+        
+        Plaintext is written frame by frame; on failure the destination may
+        hold a partial result and must be discarded.
+        """
+        try:
+            header = _read_exact(src, STREAM_HEADER.size)
+            if len(header) != STREAM_HEADER.size:
+                raise ValueError("Truncated stream header")
+            magic, chunk_size, prefix = STREAM_HEADER.unpack(header)
+            if magic != STREAM_MAGIC:
+                raise ValueError("Unknown stream format")
+            if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+                raise ValueError("Invalid chunk size in header")
+            
+            decrypt = self.aesgcm.decrypt
+            max_frame = chunk_size + 16
+            bytes_out = 0
+            counter = 0
+            while True:
+                frame = _read_exact(src, STREAM_FRAME.size)
+                if len(frame) != STREAM_FRAME.size:
+                    raise ValueError("Stream truncated before final frame")
+                length, final = STREAM_FRAME.unpack(frame)
+                if length > max_frame:
+                    raise ValueError("Frame exceeds declared chunk size")
+                sealed = _read_exact(src, length)
+                if len(sealed) != length:
+                    raise ValueError("Truncated frame")
+                plain = decrypt(_stream_nonce(prefix, counter, bool(final)), sealed, header)
+                dst.write(plain)
+                bytes_out += len(plain)
+                counter += 1
+                if final:
+                    break
+            
+            if src.read(1):
+                raise ValueError("Unexpected data after final frame")
+            
+            return {'success': True, 'bytes_out': bytes_out, 'chunks': counter}
+        except InvalidTag:
+            logger.error("Stream decryption error: authentication failed")
+            return {'success': False, 'error': 'Authentication failed'}
+        except Exception as e:
+            logger.error(f"Stream decryption error: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def encrypt_buffer(self, data: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[bytes]:
+        """Encrypt an in-memory buffer with the framed stream format"""
+        out = io.BytesIO()
+        result = self.encrypt_stream(io.BytesIO(data), out, chunk_size)
+        return out.getvalue() if result['success'] else None
+    
+    def decrypt_buffer(self, data: bytes) -> Optional[bytes]:
+        """Decrypt a buffer produced by encrypt_buffer"""
+        out = io.BytesIO()
+        result = self.decrypt_stream(io.BytesIO(data), out)
+        return out.getvalue() if result['success'] else None
+    
+    def encrypt_file(self, source_path: str, target_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Dict[str, Any]:
+        """Encrypt a file on disk without loading it into memory"""
+        try:
+            with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+                result = self.encrypt_stream(src, dst, chunk_size)
+            if result['success']:
+                os.chmod(target_path, 0o600)
+            return result
+        except Exception as e:
+            logger.error(f"File encryption error: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def decrypt_file(self, source_path: str, target_path: str) -> Dict[str, Any]:
+        """Decrypt a file written by encrypt_file, removing partial output on failure"""
+        try:
+            with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+                result = self.decrypt_stream(src, dst)
+            if not result['success'] and os.path.exists(target_path):
+                os.remove(target_path)
+            return result
+        except Exception as e:
+            logger.error(f"File decryption error: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
     def generate_api_key(self, username, permissions=None):
         """Generate API key for programmatic access"""
         try:
@@ -300,7 +590,6 @@ class SecurityManager:
             if not key_data:
                 return {"valid": False, "reason": "Invalid key data"}
             
-            import json
             key_info = json.loads(key_data)
             
             if not key_info.get('active', False):
@@ -404,7 +693,6 @@ class SecurityManager:
                 'user_agent': os.environ.get('REQUEST_USER_AGENT', 'unknown')
             }
             
-            import json
             audit_file = f"audit_{datetime.now().strftime('%Y%m%d')}.log"
             
             with open(audit_file, 'a') as f:
@@ -9,16 +9,19 @@ import os
 import json
 import hashlib
 import subprocess
-import threading
 import time
 import requests
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import sqlite3
-import shutil
 import psutil
 import platform
+from health_sampler import health_sampler
+from file_integrity import file_integrity, CRITICAL_FILES, BACKUP_FILES
+from tool_inventory import tool_inventory
+from metrics import TimedConnection
+from background_scheduler import background_scheduler
 
 class PersistentMemory:
     """Cross-device persistent memory system"""
@@ -32,7 +35,7 @@ class PersistentMemory:
         
     def init_database(self):
         """Initialize persistent memory database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         # Core memory tables
@@ -105,7 +108,7 @@ class PersistentMemory:
         
     def remember_conversation(self, speaker: str, message: str, context: Dict = None):
         """Store conversation in persistent memory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         device_id = self.get_device_id()
@@ -122,7 +125,7 @@ class PersistentMemory:
         
     def get_conversation_history(self, limit: int = 100) -> List[Dict]:
         """Retrieve conversation history"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -148,7 +151,7 @@ class PersistentMemory:
     
     def learn_behavior(self, pattern: str, context: Dict = None, effectiveness: float = 0.5):
         """Learn and store behavioral patterns"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         # Check if pattern exists
@@ -216,17 +219,8 @@ class PersistentMemory:
     
     def start_memory_sync(self):
         """Start background memory synchronization"""
-        def sync_worker():
-            while True:
-                try:
-                    self.sync_across_devices()
-                    time.sleep(self.memory_sync_interval)
-                except Exception as e:
-                    logging.error(f"Memory sync error: {e}")
-                    time.sleep(60)  # Wait a minute before retrying
-        
-        sync_thread = threading.Thread(target=sync_worker, daemon=True)
-        sync_thread.start()
+        background_scheduler.register(f'memory_sync:{self.user_id}', self.sync_across_devices,
+                                      self.memory_sync_interval, retry_interval=60)
     
     def sync_across_devices(self):
         """Synchronize memory across devices (placeholder for cloud sync)"""
@@ -246,27 +240,23 @@ class SelfRepairSystem:
         
     def start_health_monitoring(self):
         """Start continuous health monitoring"""
-        def health_worker():
-            while True:
-                try:
-                    self.perform_health_check()
-                    time.sleep(self.health_check_interval)
-                except Exception as e:
-                    logging.error(f"Health monitoring error: {e}")
-                    time.sleep(30)
-        
-        health_thread = threading.Thread(target=health_worker, daemon=True)
-        health_thread.start()
+        # A clean check backs the interval off to 5 minutes; any issue resets it. Repairs may
+        # run pip, so checks run off the scheduler thread
+        background_scheduler.register('health_monitoring', self.perform_health_check,
+                                      self.health_check_interval, max_interval=300, retry_interval=30,
+                                      idle=lambda status: not status.get('issues_detected'), blocking=True)
     
     def perform_health_check(self) -> Dict[str, Any]:
         """Comprehensive system health check"""
+        sample = health_sampler.latest()
         health_status = {
             'timestamp': datetime.now().isoformat(),
-            'cpu_usage': psutil.cpu_percent(),
-            'memory_usage': psutil.virtual_memory().percent,
-            'disk_usage': psutil.disk_usage('/').percent,
-            'processes': len(psutil.pids()),
-            'network_connections': len(psutil.net_connections()),
+            'sampled_at': sample['timestamp'],
+            'cpu_usage': sample.get('cpu_percent', 0.0),
+            'memory_usage': sample.get('memory_percent', 0.0),
+            'disk_usage': sample.get('disk_percent', 0.0),
+            'processes': sample.get('process_count', 0),
+            'network_connections': sample.get('network_connections', 0),
             'issues_detected': [],
             'repairs_attempted': []
         }
@@ -340,12 +330,7 @@ class SelfRepairSystem:
             'psutil', 'pyttsx3', 'speechrecognition'
         ]
         
-        missing_packages = []
-        for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
-            except ImportError:
-                missing_packages.append(package)
+        missing_packages = tool_inventory.missing_packages(required_packages)
         
         if missing_packages:
             health_status['issues_detected'].append(f'Missing packages: {missing_packages}')
@@ -360,29 +345,20 @@ class SelfRepairSystem:
                 logging.info(f"Successfully installed {package}")
         except Exception as e:
             logging.error(f"Failed to install dependencies: {e}")
+        finally:
+            tool_inventory.invalidate()
     
     def check_file_integrity(self, health_status: Dict):
-        """Check integrity of critical files"""
-        critical_files = [
-            'app.py', 'voice_assistant.py', 'advanced_ai.py',
-            'automation_controller.py', 'self_management.py'
-        ]
+        """Check integrity of critical files (only changed files are reread)"""
+        integrity = file_integrity.check_files(CRITICAL_FILES)
+        health_status['integrity'] = {
+            'checked': integrity['checked'],
+            'rehashed': integrity['rehashed'],
+            'modified': integrity['modified']
+        }
         
-        corrupted_files = []
-        for file in critical_files:
-            if os.path.exists(file):
-                try:
-                    with open(file, 'r') as f:
-                        content = f.read()
-                        if len(content) < 100:  # Suspiciously small file
-                            corrupted_files.append(file)
-                except Exception:
-                    corrupted_files.append(file)
-            else:
-                corrupted_files.append(file)
-        
-        if corrupted_files:
-            health_status['issues_detected'].append(f'Corrupted files: {corrupted_files}')
+        if integrity['corrupted']:
+            health_status['issues_detected'].append(f"Corrupted files: {integrity['corrupted']}")
 
 
 class SelfUpgradeSystem:
@@ -395,17 +371,9 @@ class SelfUpgradeSystem:
         
     def start_upgrade_monitoring(self):
         """Start monitoring for available upgrades"""
-        def upgrade_worker():
-            while True:
-                try:
-                    self.check_for_upgrades()
-                    time.sleep(self.check_interval)
-                except Exception as e:
-                    logging.error(f"Upgrade monitoring error: {e}")
-                    time.sleep(300)  # Wait 5 minutes before retrying
-        
-        upgrade_thread = threading.Thread(target=upgrade_worker, daemon=True)
-        upgrade_thread.start()
+        # pip list --outdated can take minutes, so checks run off the scheduler thread
+        background_scheduler.register('upgrade_monitoring', self.check_for_upgrades,
+                                      self.check_interval, retry_interval=300, blocking=True)
     
     def check_for_upgrades(self) -> Dict[str, Any]:
         """Check for available system upgrades"""
@@ -417,26 +385,13 @@ class SelfUpgradeSystem:
             'upgrade_recommendations': []
         }
         
-        # Check Python packages for updates
-        try:
-            result = subprocess.run(['pip', 'list', '--outdated'], 
-                                  capture_output=True, text=True)
-            if result.stdout:
-                outdated_lines = result.stdout.strip().split('\n')[2:]  # Skip header
-                for line in outdated_lines:
-                    if line.strip():
-                        package_info = line.split()
-                        if len(package_info) >= 3:
-                            package_name = package_info[0]
-                            current_version = package_info[1]
-                            latest_version = package_info[2]
-                            upgrade_status['available_upgrades'].append({
-                                'package': package_name,
-                                'current': current_version,
-                                'latest': latest_version
-                            })
-        except Exception as e:
-            logging.error(f"Failed to check package updates: {e}")
+        # Outdated packages come from the local index or a cached pip check
+        outdated = tool_inventory.outdated_packages()
+        upgrade_status['available_upgrades'] = outdated['packages']
+        upgrade_status['checked_at'] = outdated['checked_at']
+        upgrade_status['source'] = outdated['source']
+        if outdated.get('error'):
+            upgrade_status['check_error'] = outdated['error']
         
         # Generate upgrade recommendations
         if upgrade_status['available_upgrades']:
@@ -470,6 +425,8 @@ class SelfUpgradeSystem:
                 except subprocess.CalledProcessError as e:
                     upgrade_result['errors'].append(f"Failed to upgrade {package}: {e}")
             
+            tool_inventory.invalidate()
+            
             # Update system capabilities
             self.enhance_capabilities()
             
@@ -482,25 +439,16 @@ class SelfUpgradeSystem:
         return upgrade_result
     
     def create_system_backup(self):
-        """Create backup before upgrade"""
+        """Create incremental backup before upgrade"""
         try:
-            backup_dir = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # Backup critical files
-            critical_files = [
-                'app.py', 'voice_assistant.py', 'advanced_ai.py',
-                'automation_controller.py', 'self_management.py',
-                'ava_memory.db'
-            ]
-            
-            for file in critical_files:
-                if os.path.exists(file):
-                    shutil.copy2(file, backup_dir)
-            
-            logging.info(f"System backup created: {backup_dir}")
+            result = file_integrity.create_backup(BACKUP_FILES, label='pre-upgrade')
+            if result['errors']:
+                logging.error(f"Backup incomplete: {result['errors']}")
+            logging.info(f"System backup created: {result['backup_id']}")
+            return result
         except Exception as e:
             logging.error(f"Backup creation failed: {e}")
+            return {'success': False, 'error': str(e)}
     
     def enhance_capabilities(self):
         """Enhance system capabilities during upgrade"""
@@ -530,17 +478,16 @@ class SelfDefenseSystem:
         
     def start_threat_monitoring(self):
         """Start continuous threat monitoring"""
-        def defense_worker():
-            while self.monitoring_active:
-                try:
-                    self.scan_for_threats()
-                    time.sleep(30)  # Check every 30 seconds
-                except Exception as e:
-                    logging.error(f"Threat monitoring error: {e}")
-                    time.sleep(60)
-        
-        defense_thread = threading.Thread(target=defense_worker, daemon=True)
-        defense_thread.start()
+        # Check every 30 seconds, backing off to 2 minutes while nothing is detected
+        background_scheduler.register('threat_monitoring', self._threat_job, 30, max_interval=120,
+                                      retry_interval=60,
+                                      idle=lambda status: not status['threats_detected'])
+    
+    def _threat_job(self) -> Dict[str, Any]:
+        if not self.monitoring_active:
+            background_scheduler.unregister('threat_monitoring')
+            return {'threats_detected': []}
+        return self.scan_for_threats()
     
     def scan_for_threats(self) -> Dict[str, Any]:
         """Scan for potential security threats"""
@@ -579,19 +526,19 @@ class SelfDefenseSystem:
                 'malware', 'virus', 'rootkit'
             ]
             
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                proc_name = proc.info['name'].lower()
-                cmdline = ' '.join(proc.info['cmdline'] or []).lower()
+            for proc in health_sampler.snapshot('processes') or []:
+                proc_name = proc['name'].lower()
+                cmdline = proc['cmdline'].lower()
                 
                 for pattern in suspicious_patterns:
                     if pattern in proc_name or pattern in cmdline:
                         threat_status['threats_detected'].append({
                             'type': 'suspicious_process',
-                            'details': f"Process: {proc.info['name']} (PID: {proc.info['pid']})",
+                            'details': f"Process: {proc['name']} (PID: {proc['pid']})",
                             'severity': 'high'
                         })
-                        self.neutralize_threat(proc.info['pid'])
-                        threat_status['defensive_actions'].append(f"Terminated suspicious process {proc.info['name']}")
+                        if self.neutralize_threat(proc['pid'], proc['name'], proc.get('create_time')):
+                            threat_status['defensive_actions'].append(f"Terminated suspicious process {proc['name']}")
                         
         except Exception as e:
             logging.error(f"Process monitoring failed: {e}")
@@ -599,19 +546,16 @@ class SelfDefenseSystem:
     def monitor_network(self, threat_status: Dict):
         """Monitor network connections for threats"""
         try:
-            connections = psutil.net_connections()
-            suspicious_connections = []
+            connections = health_sampler.snapshot('connections') or {}
+            remote_ports = connections.get('remote_ports', {})
             
-            for conn in connections:
-                if conn.raddr:  # Has remote address
-                    # Check for suspicious ports or IPs
-                    if conn.raddr.port in [4444, 31337, 12345]:  # Common backdoor ports
-                        suspicious_connections.append(conn)
+            # Common backdoor ports
+            suspicious_connections = sum(remote_ports.get(port, 0) for port in [4444, 31337, 12345])
             
             if suspicious_connections:
                 threat_status['threats_detected'].append({
                     'type': 'suspicious_network',
-                    'details': f"Suspicious network connections: {len(suspicious_connections)}",
+                    'details': f"Suspicious network connections: {suspicious_connections}",
                     'severity': 'medium'
                 })
                 
@@ -641,8 +585,9 @@ class SelfDefenseSystem:
     def monitor_resources(self, threat_status: Dict):
         """Monitor for resource-based attacks"""
         try:
-            cpu_usage = psutil.cpu_percent()
-            memory_usage = psutil.virtual_memory().percent
+            sample = health_sampler.latest()
+            cpu_usage = sample.get('cpu_percent', 0.0)
+            memory_usage = sample.get('memory_percent', 0.0)
             
             # Detect potential DoS attacks
             if cpu_usage > 95 and memory_usage > 90:
@@ -657,14 +602,25 @@ class SelfDefenseSystem:
         except Exception as e:
             logging.error(f"Resource monitoring failed: {e}")
     
-    def neutralize_threat(self, pid: int):
-        """Neutralize detected threat"""
+    def neutralize_threat(self, pid: int, name: str = None, create_time: float = None) -> bool:
+        """Neutralize detected threat
+        
+        The PID may come from a process snapshot taken seconds ago, so the
+        process is only terminated while it still has the same name and start
+        time; a recycled PID belongs to an unrelated process.
+        """
         try:
             proc = psutil.Process(pid)
+            if (name is not None and proc.name() != name) or \
+                    (create_time is not None and proc.create_time() != create_time):
+                logging.info(f"Not terminating PID {pid}: it no longer belongs to {name}")
+                return False
             proc.terminate()
             logging.warning(f"Terminated suspicious process: PID {pid}")
+            return True
         except Exception as e:
             logging.error(f"Failed to neutralize threat PID {pid}: {e}")
+            return False
     
     def mitigate_resource_attack(self):
         """Mitigate resource exhaustion attacks"""
@@ -737,7 +693,7 @@ class AVACoreSelfManagement:
     def process_external_work_request(self, task_description: str, task_type: str) -> Dict[str, Any]:
         """Process external work requests"""
         # Store the work request
-        conn = sqlite3.connect(self.memory.db_path)
+        conn = sqlite3.connect(self.memory.db_path, factory=TimedConnection)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -0,0 +1,185 @@
+"""
+AVA CORE Service Container
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Lazy construction of the assistant's global engines.
+Services are registered as factories and built on first use (or by a
+parallel background warm-up), so importing the server no longer pays for
+every database, SDK client and background thread up front. Each build is
+timed to produce a per-component startup timeline.
+"""
+
+import time
+import logging
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ServiceRecord:
+    """Registration and startup timing for one service"""
+
+    def __init__(self, name: str, factory: Callable[[], Any], on_start: Optional[Callable[[Any], None]]):
+        self.name = name
+        self.factory = factory
+        self.on_start = on_start
+        self.instance = None
+        self.status = 'registered'
+        self.error = None
+        self.started_at = None
+        self.duration = None
+        self.thread = None
+        self.trigger = None
+        self.lock = threading.Lock()
+
+class LazyService:
+    """Stand-in that builds the named service on first attribute access
+
+    When target is given the stand-in forwards to that attribute of the
+    service, e.g. the global instance defined by a lazily imported module.
+    """
+
+    __slots__ = ('_container', '_name', '_target')
+
+    def __init__(self, container: 'ServiceContainer', name: str, target: Optional[str] = None):
+        object.__setattr__(self, '_container', container)
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_target', target)
+
+    def _resolve(self):
+        service = self._container.get(self._name)
+        return getattr(service, self._target) if self._target else service
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._resolve(), attr, value)
+
+    def __repr__(self):
+        return f"<LazyService {self._name}{'.' + self._target if self._target else ''}>"
+
+class ServiceContainer:
+    """Registry of lazily constructed services with a startup timeline"""
+
+    def __init__(self):
+        self._services: Dict[str, ServiceRecord] = {}
+        self._origin = time.perf_counter()
+        self._warmup_thread = None
+
+    def register(self, name: str, factory: Callable[[], Any], on_start: Optional[Callable[[Any], None]] = None):
+        """Register a factory; on_start runs once right after construction"""
+        self._services[name] = ServiceRecord(name, factory, on_start)
+
+    def register_module(self, module_name: str):
+        """Register a module whose import has side effects as a lazy service"""
+        self.register(module_name, lambda: importlib.import_module(module_name))
+
+    def proxy(self, name: str, target: Optional[str] = None) -> LazyService:
+        """Return a lazy stand-in usable wherever the instance was used"""
+        return LazyService(self, name, target)
+
+    def lazy_callable(self, name: str, attr: str) -> Callable:
+        """Return a function that resolves service.attr on each call"""
+        def call(*args, **kwargs):
+            return getattr(self.get(name), attr)(*args, **kwargs)
+        call.__name__ = attr
+        return call
+
+    def get(self, name: str, trigger: str = 'first_use') -> Any:
+        """Return the service instance, constructing it if needed"""
+        record = self._services[name]
+        if record.status == 'ready':
+            return record.instance
+
+        with record.lock:
+            if record.status == 'ready':
+                return record.instance
+
+            record.status = 'building'
+            record.trigger = trigger
+            record.thread = threading.current_thread().name
+            record.started_at = time.perf_counter()
+            try:
+                instance = record.factory()
+                if record.on_start:
+                    record.on_start(instance)
+            except Exception as e:
+                record.status = 'failed'
+                record.error = str(e)
+                record.duration = time.perf_counter() - record.started_at
+                logger.error(f"Service {name} failed to start: {e}")
+                raise
+
+            record.duration = time.perf_counter() - record.started_at
+            record.instance = instance
+            record.status = 'ready'
+            logger.info(f"Service {name} ready in {record.duration * 1000:.1f}ms ({trigger})")
+            return instance
+
+    def warm_up(self, names: Iterable[str] = None, max_workers: int = 4, background: bool = True):
+        """Construct the remaining services in parallel
+
+        Runs in a daemon thread by default so the caller is not blocked;
+        services requested meanwhile are built (or waited on) by the requester.
+        """
+        pending = [name for name in (names or list(self._services))
+                   if self._services[name].status != 'ready']
+
+        def run():
+            def build(name):
+                try:
+                    self.get(name, trigger='warm_up')
+                except Exception:
+                    pass  # already recorded on the service
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ava-warmup') as pool:
+                list(pool.map(build, pending))
+            logger.info(f"Service warm-up finished: {len(pending)} services")
+
+        if not background:
+            run()
+            return
+        self._warmup_thread = threading.Thread(target=run, name='ava-warmup', daemon=True)
+        self._warmup_thread.start()
+
+    def get_startup_timeline(self) -> Dict[str, Any]:
+        """Per-component startup timeline ordered by start time"""
+        components = []
+        for record in self._services.values():
+            entry = {
+                'service': record.name,
+                'status': record.status,
+                'trigger': record.trigger,
+                'thread': record.thread,
+                'start_offset_ms': round((record.started_at - self._origin) * 1000, 2) if record.started_at else None,
+                'duration_ms': round(record.duration * 1000, 2) if record.duration is not None else None,
+            }
+            if record.error:
+                entry['error'] = record.error
+            components.append(entry)
+
+        components.sort(key=lambda c: (c['start_offset_ms'] is None, c['start_offset_ms'] or 0))
+        finished = [c['start_offset_ms'] + c['duration_ms'] for c in components if c['duration_ms'] is not None]
+        return {
+            'components': components,
+            'services_ready': sum(1 for c in components if c['status'] == 'ready'),
+            'services_total': len(components),
+            'wall_time_ms': round(max(finished), 2) if finished else 0,
+            'serial_time_ms': round(sum(c['duration_ms'] for c in components if c['duration_ms'] is not None), 2),
+            'importtime': self.format_timeline(components)
+        }
+
+    def format_timeline(self, components: List[Dict[str, Any]] = None) -> List[str]:
+        """Render the timeline in the style of python -X importtime"""
+        if components is None:
+            components = self.get_startup_timeline()['components']
+        lines = ['startup: offset [us] | duration [us] | service']
+        for c in components:
+            if c['duration_ms'] is None:
+                continue
+            lines.append(f"startup: {int(c['start_offset_ms'] * 1000):>13} | {int(c['duration_ms'] * 1000):>13} | {c['service']}")
+        return lines
@@ -0,0 +1,122 @@
+"""
+AVA CORE Status Registry
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Capability and status documents built once and served pre-serialized.
+Each document keeps its JSON bytes and an ETag, is rebuilt only when
+invalidated (explicitly, by a table change or after an optional TTL), and
+conditional GETs with a matching If-None-Match receive 304 Not Modified.
+"""
+
+import copy
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+from flask import Response, request
+
+logger = logging.getLogger(__name__)
+
+class StatusDocument:
+    """A built status document with its serialized body and ETag"""
+
+    __slots__ = ('payload', 'body', 'etag', 'built_at', 'built_monotonic')
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+        self.body = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        self.built_at = datetime.now().isoformat()
+        self.built_monotonic = time.monotonic()
+
+class StatusRegistry:
+    """Registry of lazily built, cached status and capability documents"""
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._ttls: Dict[str, Optional[float]] = {}
+        self._table_dependents: Dict[str, set] = {}
+        self._documents: Dict[str, StatusDocument] = {}
+        self._lock = threading.RLock()
+        self.stats = {'builds': 0, 'hits': 0, 'not_modified': 0, 'invalidations': 0}
+
+    def register(self, name: str, builder: Callable[[], Dict[str, Any]],
+                 ttl: Optional[float] = None, tables: Iterable[str] = ()):
+        """Register a document builder
+
+        ttl bounds staleness for documents that embed live state; tables lists
+        database tables whose changes should invalidate the document.
+        """
+        with self._lock:
+            self._builders[name] = builder
+            self._ttls[name] = ttl
+            for table in tables:
+                self._table_dependents.setdefault(table, set()).add(name)
+            self._documents.pop(name, None)
+
+    def document(self, name: str) -> StatusDocument:
+        """Return the cached document, building it if missing or expired"""
+        doc = self._documents.get(name)
+        if doc is not None and not self._expired(name, doc):
+            self.stats['hits'] += 1
+            return doc
+
+        with self._lock:
+            doc = self._documents.get(name)
+            if doc is None or self._expired(name, doc):
+                doc = StatusDocument(self._builders[name]())
+                self._documents[name] = doc
+                self.stats['builds'] += 1
+            return doc
+
+    def _expired(self, name: str, doc: StatusDocument) -> bool:
+        ttl = self._ttls.get(name)
+        return ttl is not None and time.monotonic() - doc.built_monotonic > ttl
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """Return a deep copy of the document payload for in-process callers"""
+        return copy.deepcopy(self.document(name).payload)
+
+    def invalidate(self, name: str = None):
+        """Drop one cached document, or all of them when name is None"""
+        with self._lock:
+            if name is None:
+                self._documents.clear()
+            else:
+                self._documents.pop(name, None)
+            self.stats['invalidations'] += 1
+
+    def table_changed(self, table: str):
+        """Invalidate every document that depends on the given table"""
+        for name in self._table_dependents.get(table, ()):
+            self.invalidate(name)
+
+    def response(self, name: str) -> Response:
+        """Serve a document with an ETag, answering conditional GETs with 304"""
+        doc = self.document(name)
+        if doc.etag in request.if_none_match:
+            self.stats['not_modified'] += 1
+            response = Response(status=304)
+        else:
+            response = Response(doc.body, mimetype='application/json')
+        response.set_etag(doc.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def get_registry_status(self) -> Dict[str, Any]:
+        """Get cache statistics and the state of each registered document"""
+        return {
+            'registered_documents': sorted(self._builders),
+            'cached_documents': {
+                name: {'etag': doc.etag, 'built_at': doc.built_at, 'bytes': len(doc.body)}
+                for name, doc in list(self._documents.items())
+            },
+            'stats': dict(self.stats)
+        }
+
+# Global status registry instance
+status_registry = StatusRegistry()
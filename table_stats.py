@@ -0,0 +1,149 @@
+"""
+AVA CORE Table Statistics Service
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Trigger-maintained row counts for SQLite tables.
+Tracked tables get AFTER INSERT/DELETE triggers that keep a per-database
+_table_row_counts table current. Readers cache the counts in memory and only
+re-read them when PRAGMA data_version reports a commit from another
+connection, so status aggregators get counts in O(1) instead of scanning.
+
+Note: REPLACE conflict resolution only fires delete triggers when
+recursive_triggers is enabled on the writing connection. Tables written with
+INSERT OR REPLACE against a UNIQUE key should be resynced periodically.
+"""
+
+import re
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, Tuple
+from status_registry import status_registry
+
+logger = logging.getLogger(__name__)
+
+COUNTS_TABLE = '_table_row_counts'
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+class TableStatistics:
+    """Shared O(1) row counts for tracked SQLite tables"""
+
+    def __init__(self):
+        self._readers: Dict[str, sqlite3.Connection] = {}
+        self._data_versions: Dict[str, int] = {}
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.stats = {'reads': 0, 'refreshes': 0, 'resyncs': 0}
+
+    def track(self, db_path: str, *tables: str):
+        """Install counting triggers for tables and seed their counts once"""
+        for table in tables:
+            if not _IDENTIFIER.match(table):
+                raise ValueError(f"Invalid table name: {table}")
+
+        try:
+            conn = sqlite3.connect(db_path, isolation_level=None)
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {COUNTS_TABLE} (
+                        table_name TEXT PRIMARY KEY,
+                        row_count INTEGER NOT NULL
+                    )
+                ''')
+                for table in tables:
+                    conn.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS _count_{table}_insert
+                        AFTER INSERT ON {table}
+                        BEGIN
+                            UPDATE {COUNTS_TABLE} SET row_count = row_count + 1
+                            WHERE table_name = '{table}';
+                        END
+                    ''')
+                    conn.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS _count_{table}_delete
+                        AFTER DELETE ON {table}
+                        BEGIN
+                            UPDATE {COUNTS_TABLE} SET row_count = row_count - 1
+                            WHERE table_name = '{table}';
+                        END
+                    ''')
+                    # Seeding and trigger creation share one transaction, so
+                    # no concurrent write can be missed or double counted
+                    conn.execute(f'''
+                        INSERT OR IGNORE INTO {COUNTS_TABLE} (table_name, row_count)
+                        SELECT ?, COUNT(*) FROM {table}
+                    ''', (table,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            finally:
+                conn.close()
+
+            logger.info(f"Row count tracking enabled for {db_path}: {', '.join(tables)}")
+
+        except Exception as e:
+            logger.error(f"Table statistics tracking failed for {db_path}: {e}")
+
+    def _reader(self, db_path: str) -> sqlite3.Connection:
+        conn = self._readers.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._readers[db_path] = conn
+        return conn
+
+    def _refresh(self, db_path: str, conn: sqlite3.Connection):
+        """Reload all tracked counts for a database after another connection committed"""
+        rows = conn.execute(f'SELECT table_name, row_count FROM {COUNTS_TABLE}').fetchall()
+        self.stats['refreshes'] += 1
+        for table, row_count in rows:
+            key = (db_path, table)
+            previous = self._counts.get(key)
+            self._counts[key] = row_count
+            if previous is not None and previous != row_count:
+                status_registry.table_changed(table)
+
+    def count(self, db_path: str, table: str) -> int:
+        """Return the row count of a tracked table without scanning it"""
+        with self._lock:
+            self.stats['reads'] += 1
+            try:
+                conn = self._reader(db_path)
+                version = conn.execute('PRAGMA data_version').fetchone()[0]
+                if version != self._data_versions.get(db_path):
+                    self._refresh(db_path, conn)
+                    self._data_versions[db_path] = version
+                return self._counts.get((db_path, table), 0)
+            except sqlite3.Error as e:
+                logger.error(f"Row count lookup failed for {db_path}:{table}: {e}")
+                return 0
+
+    def resync(self, db_path: str, table: str) -> int:
+        """Recount a tracked table with COUNT(*) and correct any drift"""
+        if not _IDENTIFIER.match(table):
+            raise ValueError(f"Invalid table name: {table}")
+
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:
+                conn.execute(f'''
+                    UPDATE {COUNTS_TABLE} SET row_count = (SELECT COUNT(*) FROM {table})
+                    WHERE table_name = ?
+                ''', (table,))
+        finally:
+            conn.close()
+        self.stats['resyncs'] += 1
+        return self.count(db_path, table)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cached counts and service counters"""
+        with self._lock:
+            return {
+                'tracked_tables': {f"{db}:{table}": count for (db, table), count in self._counts.items()},
+                'stats': dict(self.stats)
+            }
+
+# Global table statistics service
+table_stats = TableStatistics()
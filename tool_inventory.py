@@ -0,0 +1,277 @@
+"""
+AVA CORE Tooling Inventory
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Cached answers to "which packages and tools are installed, and what is outdated".
+Installed Python distributions come from importlib.metadata and command-line
+tools from shutil.which, so presence checks never import a package or start a
+process. Tool versions that can only be had from `tool --version` are probed
+in parallel and cached per executable path and mtime. Outdated packages are
+read from a local package index when AVA_PACKAGE_INDEX points at one (a
+wheelhouse directory or a JSON name-to-version map), which works offline;
+otherwise `pip list --outdated` runs at most once per TTL, and its result is
+persisted so a restart does not repeat the multi-second network call.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import threading
+import subprocess
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from packaging.version import InvalidVersion, Version
+except ImportError:
+    Version = None
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_TTL = 60.0
+OUTDATED_TTL = float(os.environ.get('AVA_OUTDATED_TTL', str(6 * 3600)))
+PROBE_TIMEOUT = 5.0
+PIP_TIMEOUT = 120.0
+PROBE_WORKERS = 8
+DEFAULT_CACHE_PATH = 'ava_tool_inventory.json'
+
+# Wheel and sdist file names: name-version(-build)(-tags).whl / name-version.tar.gz
+DISTRIBUTION_FILE = re.compile(r'^(?P<name>.+?)-(?P<version>\d[^-]*?)(-.*)?\.(whl|tar\.gz|zip)$')
+VERSION_TEXT = re.compile(r'\d+(\.\d+)+')
+
+def normalize_name(name: str) -> str:
+    """PEP 503 normalized project name"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+def _version_key(version: str):
+    if Version is not None:
+        try:
+            return (0, Version(version))
+        except InvalidVersion:
+            pass
+    return (-1, tuple(int(part) if part.isdigit() else 0 for part in re.split(r'[.+-]', version)))
+
+def is_newer(candidate: str, current: str) -> bool:
+    return _version_key(candidate) > _version_key(current)
+
+class ToolInventory:
+    """Installed packages, available tools and outdated packages with TTL caching"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, package_ttl: float = PACKAGE_TTL,
+                 outdated_ttl: float = OUTDATED_TTL, index_path: str = None):
+        self.cache_path = cache_path
+        self.package_ttl = package_ttl
+        self.outdated_ttl = outdated_ttl
+        self.index_path = index_path if index_path is not None else os.environ.get('AVA_PACKAGE_INDEX')
+        self._packages: Optional[Dict[str, str]] = None
+        self._packages_at = 0.0
+        self._versions: Dict[tuple, Optional[str]] = {}
+        self._outdated: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._outdated_lock = threading.Lock()
+        self.stats = {'package_scans': 0, 'which_lookups': 0, 'version_probes': 0, 'version_cache_hits': 0,
+                      'outdated_checks': 0, 'outdated_cache_hits': 0}
+
+    # Python packages
+
+    def installed_packages(self, refresh: bool = False) -> Dict[str, str]:
+        """Normalized name -> version of every installed distribution"""
+        with self._lock:
+            if refresh or self._packages is None or time.monotonic() - self._packages_at > self.package_ttl:
+                packages = {}
+                for dist in importlib.metadata.distributions():
+                    name = dist.metadata['Name']
+                    if name:
+                        packages.setdefault(normalize_name(name), dist.version)
+                self._packages = packages
+                self._packages_at = time.monotonic()
+                self.stats['package_scans'] += 1
+            return self._packages
+
+    def package_version(self, name: str) -> Optional[str]:
+        return self.installed_packages().get(normalize_name(name))
+
+    def missing_packages(self, names: Iterable[str]) -> List[str]:
+        packages = self.installed_packages()
+        return [name for name in names if normalize_name(name) not in packages]
+
+    # Command-line tools
+
+    def which(self, tools: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolved executable path of each tool, or None; no process is started"""
+        found = {}
+        for tool in tools:
+            found[tool] = shutil.which(tool)
+            self.stats['which_lookups'] += 1
+        return found
+
+    def available_tools(self, tools: Iterable[str]) -> List[str]:
+        return [tool for tool, path in self.which(tools).items() if path]
+
+    def _in_process_version(self, tool: str, path: str) -> Optional[str]:
+        """Versions known without a subprocess: this interpreter and its pip"""
+        interpreter_dir = os.path.dirname(os.path.realpath(sys.executable))
+        if os.path.realpath(path) == os.path.realpath(sys.executable):
+            return platform.python_version()
+        if tool.startswith('pip') and os.path.dirname(os.path.realpath(path)) == interpreter_dir:
+            return self.package_version('pip')
+        return None
+
+    def _probe_version(self, path: str) -> Optional[str]:
+        self.stats['version_probes'] += 1
+        try:
+            result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+        match = VERSION_TEXT.search(result.stdout or result.stderr)
+        return match.group(0) if match else (result.stdout or result.stderr).strip()[:80] or None
+
+    def tool_versions(self, tools: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Path and version of each tool; uncached versions are probed in parallel"""
+        result, pending = {}, {}
+        for tool, path in self.which(tools).items():
+            result[tool] = {'available': path is not None, 'path': path, 'version': None}
+            if path is None:
+                continue
+            try:
+                key = (path, os.stat(path).st_mtime_ns)
+            except OSError:
+                key = (path, 0)
+            version = self._in_process_version(tool, path)
+            if version is not None:
+                result[tool]['version'] = version
+            elif key in self._versions:
+                result[tool]['version'] = self._versions[key]
+                self.stats['version_cache_hits'] += 1
+            else:
+                pending[tool] = key
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(pending))) as executor:
+                futures = {tool: executor.submit(self._probe_version, key[0]) for tool, key in pending.items()}
+            for tool, future in futures.items():
+                version = future.result()
+                self._versions[pending[tool]] = version
+                result[tool]['version'] = version
+        return result
+
+    # Outdated packages
+
+    def _load_persisted(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f).get('outdated')
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _persist(self, outdated: Dict[str, Any]):
+        try:
+            with open(self.cache_path + '.tmp', 'w') as f:
+                json.dump({'outdated': outdated}, f, indent=1)
+            os.replace(self.cache_path + '.tmp', self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not persist tool inventory: {e}")
+
+    def read_local_index(self) -> Dict[str, str]:
+        """Latest version per normalized name from the configured local index"""
+        latest: Dict[str, str] = {}
+        if os.path.isdir(self.index_path):
+            for _, _, names in os.walk(self.index_path):
+                for filename in names:
+                    match = DISTRIBUTION_FILE.match(filename)
+                    if not match:
+                        continue
+                    name, version = normalize_name(match.group('name')), match.group('version')
+                    if name not in latest or is_newer(version, latest[name]):
+                        latest[name] = version
+        else:
+            with open(self.index_path) as f:
+                for name, version in json.load(f).items():
+                    latest[normalize_name(name)] = str(version)
+        return latest
+
+    def _outdated_from_index(self) -> List[Dict[str, str]]:
+        latest = self.read_local_index()
+        return [{'package': name, 'current': version, 'latest': latest[name]}
+                for name, version in sorted(self.installed_packages(refresh=True).items())
+                if name in latest and is_newer(latest[name], version)]
+
+    def _outdated_from_pip(self) -> List[Dict[str, str]]:
+        result = subprocess.run([sys.executable, '-m', 'pip', 'list', '--outdated', '--format=json',
+                                 '--disable-pip-version-check'],
+                                capture_output=True, text=True, timeout=PIP_TIMEOUT)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip()[-500:] or f'pip exited with {result.returncode}')
+        return [{'package': item['name'], 'current': item['version'], 'latest': item['latest_version']}
+                for item in json.loads(result.stdout or '[]')]
+
+    def outdated_packages(self, refresh: bool = False) -> Dict[str, Any]:
+        """Outdated packages from the local index, or from pip at most once per TTL
+
+        When pip fails (for example without network access) the last known
+        result is returned with stale set and the error attached.
+        """
+        with self._outdated_lock:
+            if self._outdated is None:
+                self._outdated = self._load_persisted()
+            cached = self._outdated
+            if not refresh and cached and time.time() - cached['checked_epoch'] < self.outdated_ttl \
+                    and cached['source'] == ('local_index' if self.index_path else 'pip'):
+                self.stats['outdated_cache_hits'] += 1
+                return dict(cached, stale=False)
+
+            self.stats['outdated_checks'] += 1
+            started = time.perf_counter()
+            try:
+                if self.index_path:
+                    packages, source = self._outdated_from_index(), 'local_index'
+                else:
+                    packages, source = self._outdated_from_pip(), 'pip'
+            except (OSError, ValueError, RuntimeError, subprocess.SubprocessError) as e:
+                logger.warning(f"Outdated package check failed: {e}")
+                if cached:
+                    return dict(cached, stale=True, error=str(e))
+                return {'packages': [], 'source': None, 'checked_at': None, 'stale': True, 'error': str(e)}
+
+            self._outdated = {
+                'packages': packages,
+                'source': source,
+                'checked_at': datetime.now().isoformat(),
+                'checked_epoch': time.time(),
+                'duration_ms': round((time.perf_counter() - started) * 1000, 1)
+            }
+            if source == 'pip':
+                self._persist(self._outdated)
+            return dict(self._outdated, stale=False)
+
+    def invalidate(self):
+        """Forget cached package data, e.g. after installing or upgrading packages"""
+        with self._lock:
+            self._packages = None
+        with self._outdated_lock:
+            self._outdated = None
+            if os.path.exists(self.cache_path):
+                os.remove(self.cache_path)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'installed_packages': len(self.installed_packages()),
+            'cached_tool_versions': len(self._versions),
+            'index_path': self.index_path,
+            'outdated_checked_at': self._outdated['checked_at'] if self._outdated else None,
+            'outdated_ttl': self.outdated_ttl,
+            'stats': dict(self.stats)
+        }
+
+# Global tool inventory instance
+tool_inventory = ToolInventory()
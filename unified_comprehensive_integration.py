@@ -23,6 +23,8 @@ import time
 import threading
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from status_registry import status_registry
+from table_stats import table_stats
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +42,15 @@ class UnifiedComprehensiveIntegration:
         
         # Initialize unified integration
         self.init_integration_database()
+        table_stats.track(self.integration_db, 'unified_features', 'secret_enterprise_capabilities')
         self.integrate_all_features()
         
+        status_registry.register(
+            'unified_comprehensive_status',
+            self._build_unified_comprehensive_status,
+            tables=('unified_features', 'secret_enterprise_capabilities')
+        )
+        
         logger.info("Unified comprehensive integration initialized")
     
     def init_integration_database(self):
@@ -388,6 +397,8 @@ class UnifiedComprehensiveIntegration:
                 
                 conn.commit()
             
+            status_registry.table_changed('secret_enterprise_capabilities')
+            
         except Exception as e:
             logger.error(f"Secret enterprise capabilities integration error: {e}")
     
@@ -409,62 +420,15 @@ class UnifiedComprehensiveIntegration:
                 
                 conn.commit()
             
+            status_registry.table_changed('unified_features')
+            
         except Exception as e:
             logger.error(f"Feature storage error: {e}")
     
     def get_unified_comprehensive_status(self) -> Dict[str, Any]:
-        """Get unified comprehensive integration status"""
+        """Get unified comprehensive integration status (cached until the underlying tables change)"""
         try:
-            with sqlite3.connect(self.integration_db) as conn:
-                # Get all unified features
-                cursor = conn.execute('''
-                    SELECT feature_category, COUNT(*) 
-                    FROM unified_features 
-                    GROUP BY feature_category
-                ''')
-                feature_counts = dict(cursor.fetchall())
-                
-                # Get total features
-                cursor = conn.execute('SELECT COUNT(*) FROM unified_features')
-                total_features = cursor.fetchone()[0]
-                
-                # Get secret enterprise capabilities
-                cursor = conn.execute('SELECT COUNT(*) FROM secret_enterprise_capabilities')
-                secret_capabilities = cursor.fetchone()[0]
-            
-            return {
-                'unified_comprehensive_integration_active': True,
-                'total_features_integrated': total_features,
-                'feature_categories': feature_counts,
-                'secret_enterprise_capabilities': secret_capabilities,
-                'comprehensive_protection_active': True,
-                'github_repository_ready': True,
-                'netlify_production_ready': True,
-                'all_past_development_integrated': True,
-                'all_additional_features_integrated': True,
-                'authorization': {
-                    'copyright_owner': self.copyright_owner,
-                    'authorized_contact': self.authorized_contact,
-                    'watermark': self.watermark,
-                    'timestamp': self.timestamp
-                },
-                'integration_scope': {
-                    'core_system_features': True,
-                    'protection_systems': True,
-                    'ai_engines': True,
-                    'enterprise_features': True,
-                    'development_capabilities': True,
-                    'business_features': True,
-                    'secret_enterprise_capabilities': True
-                },
-                'production_deployment': {
-                    'github_repository': 'https://github.com/radosavlevici210/NeuralAssistant',
-                    'netlify_ready': True,
-                    'comprehensive_protection': True,
-                    'impossible_reproduction_protection': True
-                }
-            }
-            
+            return status_registry.get('unified_comprehensive_status')
         except Exception as e:
             logger.error(f"Status retrieval error: {e}")
             return {
@@ -472,6 +436,54 @@ class UnifiedComprehensiveIntegration:
                 'error_handled': True
             }
     
+    def _build_unified_comprehensive_status(self) -> Dict[str, Any]:
+        """Build the unified comprehensive integration status document"""
+        with sqlite3.connect(self.integration_db) as conn:
+            # Get all unified features
+            cursor = conn.execute('''
+                SELECT feature_category, COUNT(*) 
+                FROM unified_features 
+                GROUP BY feature_category
+            ''')
+            feature_counts = dict(cursor.fetchall())
+        
+        # Totals come from trigger-maintained counts
+        total_features = table_stats.count(self.integration_db, 'unified_features')
+        secret_capabilities = table_stats.count(self.integration_db, 'secret_enterprise_capabilities')
+        
+        return {
+            'unified_comprehensive_integration_active': True,
+            'total_features_integrated': total_features,
+            'feature_categories': feature_counts,
+            'secret_enterprise_capabilities': secret_capabilities,
+            'comprehensive_protection_active': True,
+            'github_repository_ready': True,
+            'netlify_production_ready': True,
+            'all_past_development_integrated': True,
+            'all_additional_features_integrated': True,
+            'authorization': {
+                'copyright_owner': self.copyright_owner,
+                'authorized_contact': self.authorized_contact,
+                'watermark': self.watermark,
+                'timestamp': self.timestamp
+            },
+            'integration_scope': {
+                'core_system_features': True,
+                'protection_systems': True,
+                'ai_engines': True,
+                'enterprise_features': True,
+                'development_capabilities': True,
+                'business_features': True,
+                'secret_enterprise_capabilities': True
+            },
+            'production_deployment': {
+                'github_repository': 'https://github.com/radosavlevici210/NeuralAssistant',
+                'netlify_ready': True,
+                'comprehensive_protection': True,
+                'impossible_reproduction_protection': True
+            }
+        }
+    
     def execute_unified_comprehensive_operation(self, operation_type: str, operation_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute unified comprehensive operation"""
         try:
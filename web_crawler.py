@@ -0,0 +1,363 @@
+"""
+AVA CORE Web Crawler
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+Concurrent, polite crawler for WebBrowser.
+Pages are fetched by a fixed set of asyncio workers sharing one aiohttp
+session, whose connector keeps connections alive and caps connections per
+host. Each host gets its robots.txt fetched once, and request starts to it
+are spaced by the minimum delay or its Crawl-delay. Seen URLs go through a
+Bloom filter so memory stays flat on large crawls, links are followed up to
+a depth limit, and results are yielded as each page completes.
+"""
+
+import math
+import time
+import queue
+import asyncio
+import hashlib
+import logging
+import threading
+from urllib.robotparser import RobotFileParser
+from urllib.parse import urlsplit, urlunsplit
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+from page_parser import PageParser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'AVA-CORE-Crawler/1.0'
+DEFAULT_MAX_BODY_BYTES = 2 * 1024 * 1024
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+
+class BloomFilter:
+    """Fixed-size set membership with a bounded false positive rate"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions from two halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns False when it was (probably) already present"""
+        added = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self._bits[p >> 3] & mask:
+                self._bits[p >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+def normalize_url(url: str) -> Optional[str]:
+    """Canonical form used for deduplication, or None for non-HTTP URLs"""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f'{host}:{port}'
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+class HostPolicy:
+    """robots.txt rules and request spacing for one scheme://host"""
+
+    def __init__(self, origin: str, min_delay: float):
+        self.origin = origin
+        self.min_delay = min_delay
+        self.robots: Optional[RobotFileParser] = None
+        self.disallow_all = False
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+        self.ready = False
+
+    def allowed(self, url: str, user_agent: str) -> bool:
+        if self.disallow_all:
+            return False
+        return self.robots is None or self.robots.can_fetch(user_agent, url)
+
+    async def wait_turn(self):
+        """Sleep until this host may receive the next request"""
+        async with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.min_delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class WebCrawler:
+    """Breadth-first crawler with per-host politeness and bounded concurrency"""
+
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT, max_depth: int = 2,
+                 max_pages: int = 100, concurrency: int = 8, per_host_concurrency: int = 2,
+                 min_delay: float = 0.25, respect_robots: bool = True, same_host: bool = True,
+                 allowed_domains: Iterable[str] = None, timeout: float = 15,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES, headers: Dict[str, str] = None,
+                 bloom_capacity: int = 100000):
+        self.user_agent = user_agent
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.min_delay = min_delay
+        self.respect_robots = respect_robots
+        self.same_host = same_host
+        self.allowed_domains = {d.lower() for d in allowed_domains or ()}
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.headers = dict(headers or {})
+        self.headers['User-Agent'] = user_agent
+        self.bloom_capacity = bloom_capacity
+        self.stats: Dict[str, Any] = {}
+
+    def _in_scope(self, url: str, seed_hosts: set) -> bool:
+        host = urlsplit(url).hostname or ''
+        if self.allowed_domains:
+            return any(host == d or host.endswith('.' + d) for d in self.allowed_domains)
+        return not self.same_host or urlsplit(url).netloc in seed_hosts
+
+    async def _policy(self, session, policies: Dict[str, HostPolicy], url: str) -> HostPolicy:
+        parts = urlsplit(url)
+        origin = f'{parts.scheme}://{parts.netloc}'
+        policy = policies.get(origin)
+        if policy is None:
+            policy = policies[origin] = HostPolicy(origin, self.min_delay)
+        if policy.ready or not self.respect_robots:
+            return policy
+
+        async with policy.lock:
+            if policy.ready:
+                return policy
+            # RFC 9309: a missing robots.txt allows everything, an unreachable
+            # one disallows everything
+            try:
+                async with session.get(f'{origin}/robots.txt', allow_redirects=True) as response:
+                    if response.status >= 500:
+                        policy.disallow_all = True
+                    elif response.status < 400:
+                        robots = RobotFileParser(f'{origin}/robots.txt')
+                        body = await response.content.read(512 * 1024)
+                        robots.parse(body.decode('utf-8', 'replace').splitlines())
+                        policy.robots = robots
+                        delay = robots.crawl_delay(self.user_agent)
+                        if delay:
+                            policy.min_delay = max(policy.min_delay, float(delay))
+                self.stats['robots_fetched'] += 1
+            except Exception as e:
+                logger.warning(f"robots.txt unavailable for {origin}: {e}")
+                policy.disallow_all = True
+            policy.next_slot = time.monotonic() + policy.min_delay
+            policy.ready = True
+        return policy
+
+    async def _fetch(self, session, url: str, depth: int, parent: Optional[str],
+                     policies: Dict[str, HostPolicy]) -> Tuple[Dict[str, Any], List[str]]:
+        result = {'url': url, 'depth': depth, 'parent': parent, 'success': False}
+        policy = await self._policy(session, policies, url)
+        if self.respect_robots and not policy.allowed(url, self.user_agent):
+            self.stats['robots_blocked'] += 1
+            result['error'] = 'Disallowed by robots.txt'
+            return result, []
+
+        await policy.wait_turn()
+        started = time.perf_counter()
+        links: List[str] = []
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                parser = None
+                if response.status < 400 and content_type in HTML_TYPES:
+                    parser = PageParser(str(response.url), response.charset)
+                # HTML is parsed chunk by chunk as it arrives; other bodies
+                # are only counted
+                size = 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    chunk = chunk[:self.max_body_bytes - size]
+                    size += len(chunk)
+                    if parser is not None:
+                        parser.feed(chunk)
+                    if size >= self.max_body_bytes:
+                        break
+                result.update({
+                    'final_url': str(response.url),
+                    'status_code': response.status,
+                    'content_type': content_type,
+                    'bytes': size,
+                    'truncated': not response.content.at_eof(),
+                    'success': response.status < 400
+                })
+                if parser is not None:
+                    page = parser.close()
+                    result['title'] = page.title
+                    result['links_found'] = len(page.links)
+                    links = page.followable_links()
+            self.stats['pages'] += 1
+            self.stats['bytes'] += result['bytes']
+            if not result['success']:
+                self.stats['errors'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            result['error'] = str(e) or type(e).__name__
+        result['elapsed'] = round(time.perf_counter() - started, 4)
+        return result, links
+
+    async def crawl(self, seeds: Iterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Crawl from seed URLs, yielding one result per page as it completes"""
+        import aiohttp
+
+        self.stats = {'pages': 0, 'errors': 0, 'bytes': 0, 'robots_fetched': 0,
+                      'robots_blocked': 0, 'duplicates': 0, 'out_of_scope': 0,
+                      'started_at': time.time()}
+        seen = BloomFilter(self.bloom_capacity)
+        frontier: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+        policies: Dict[str, HostPolicy] = {}
+        scheduled = 0
+
+        seed_urls = [u for u in (normalize_url(s) for s in seeds) if u]
+        seed_hosts = {urlsplit(u).netloc for u in seed_urls}
+
+        def schedule(url: str, depth: int, parent: Optional[str]):
+            nonlocal scheduled
+            if scheduled >= self.max_pages:
+                return
+            if not seen.add(url):
+                self.stats['duplicates'] += 1
+                return
+            scheduled += 1
+            frontier.put_nowait((url, depth, parent))
+
+        for url in seed_urls:
+            schedule(url, 0, None)
+
+        async def worker(session):
+            while True:
+                url, depth, parent = await frontier.get()
+                try:
+                    result, links = await self._fetch(session, url, depth, parent, policies)
+                    if depth < self.max_depth:
+                        for link in links:
+                            link = normalize_url(link)
+                            if link is None:
+                                continue
+                            if not self._in_scope(link, seed_hosts):
+                                self.stats['out_of_scope'] += 1
+                                continue
+                            schedule(link, depth + 1, url)
+                    await results.put(result)
+                finally:
+                    frontier.task_done()
+
+        async def run():
+            connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                             limit_per_host=self.per_host_concurrency,
+                                             keepalive_timeout=30, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers=self.headers) as session:
+                workers = [asyncio.ensure_future(worker(session)) for _ in range(self.concurrency)]
+                try:
+                    await frontier.join()
+                finally:
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+            await results.put(None)
+
+        runner = asyncio.ensure_future(run())
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    break
+                yield result
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+            self.stats['elapsed'] = round(time.time() - self.stats['started_at'], 3)
+
+    def iter_crawl(self, seeds: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Synchronous view of crawl(); the event loop runs on a helper thread
+
+        Closing the iterator early stops the crawl.
+        """
+        seeds = list(seeds)
+        items: 'queue.Queue' = queue.Queue(maxsize=self.concurrency * 4)
+        done = object()
+        state = {}
+
+        async def consume():
+            state['task'] = asyncio.current_task()
+            pages = self.crawl(seeds)
+            try:
+                async for result in pages:
+                    await asyncio.get_running_loop().run_in_executor(None, items.put, result)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Crawl failed: {e}")
+                items.put({'success': False, 'error': str(e)})
+            finally:
+                await pages.aclose()
+                items.put(done)
+
+        def run_loop():
+            loop = asyncio.new_event_loop()
+            state['loop'] = loop
+            try:
+                loop.run_until_complete(consume())
+            finally:
+                loop.close()
+
+        thread = threading.Thread(target=run_loop, name='web-crawler', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = items.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            cancelled = False
+            while thread.is_alive():
+                if not cancelled and 'task' in state:
+                    state['loop'].call_soon_threadsafe(state['task'].cancel)
+                    cancelled = True
+                # Keep draining so a producer blocked on a full queue can exit
+                try:
+                    items.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            thread.join()
+
+    def get_crawl_stats(self) -> Dict[str, Any]:
+        """Counters of the most recent crawl"""
+        stats = dict(self.stats)
+        if stats.get('elapsed'):
+            stats['pages_per_sec'] = round(stats['pages'] / stats['elapsed'], 2)
+        return stats
@@ -0,0 +1,390 @@
+"""
+AVA CORE Workflow Engine
+Copyright and Trademark: Ervin Remus Radosavlevici (© ervin210@icloud.com)
+Watermark: radosavlevici210@icloud.com
+
+DAG-based automation workflows.
+Steps name the steps they depend on, and every step whose dependencies have
+finished starts at once. The engine runs them on its own asyncio loop:
+blocking actions go to a thread pool and wait steps are plain timers that
+hold no thread. Workflows, runs, per-step timings and the critical path are
+persisted to SQLite, so results stay retrievable by id after a restart.
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from metrics import TimedConnection
+
+logger = logging.getLogger(__name__)
+
+MAX_WAIT_SECONDS = 3600
+DEFAULT_RUN_TIMEOUT = 600
+RESERVED_STEP_KEYS = ('id', 'action', 'params', 'depends_on', 'timeout', 'continue_on_error')
+FINAL_STATES = ('completed', 'failed')
+
+def normalize_steps(steps: List[Dict[str, Any]], continue_on_error: bool = False) -> List[Dict[str, Any]]:
+    """Give every step an id, params and dependency list, and check the graph
+
+    Steps may carry their parameters under 'params' or inline next to
+    'action'. When no step declares depends_on the workflow keeps the
+    original sequential meaning and each step depends on the one before.
+    A failed step skips its dependents unless it has continue_on_error
+    (default: the continue_on_error argument).
+    Raises ValueError for duplicate ids, unknown dependencies and cycles.
+    """
+    if not isinstance(steps, list) or not steps:
+        raise ValueError('A workflow needs at least one step')
+
+    declared = any('depends_on' in step for step in steps)
+    normalized = []
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict) or not step.get('action'):
+            raise ValueError(f'Step {index} has no action')
+        step_id = str(step.get('id') or f'step_{index + 1}')
+        params = step.get('params')
+        if params is None:
+            params = {k: v for k, v in step.items() if k not in RESERVED_STEP_KEYS}
+        if declared:
+            depends_on = step.get('depends_on') or []
+            if isinstance(depends_on, str):
+                depends_on = [depends_on]
+        else:
+            depends_on = [normalized[-1]['id']] if normalized else []
+        normalized.append({
+            'id': step_id,
+            'action': step['action'],
+            'params': params,
+            'depends_on': [str(d) for d in depends_on],
+            'timeout': step.get('timeout'),
+            'continue_on_error': bool(step.get('continue_on_error', continue_on_error))
+        })
+
+    ids = [step['id'] for step in normalized]
+    if len(set(ids)) != len(ids):
+        raise ValueError('Step ids must be unique')
+    known = set(ids)
+    for step in normalized:
+        missing = [d for d in step['depends_on'] if d not in known]
+        if missing:
+            raise ValueError(f"Step {step['id']} depends on unknown steps: {', '.join(missing)}")
+
+    # Kahn's algorithm; anything left unvisited sits on a cycle
+    remaining = {step['id']: set(step['depends_on']) for step in normalized}
+    ready = [step_id for step_id, deps in remaining.items() if not deps]
+    visited = 0
+    while ready:
+        current = ready.pop()
+        visited += 1
+        for step_id, deps in remaining.items():
+            if current in deps:
+                deps.discard(current)
+                if not deps:
+                    ready.append(step_id)
+    if visited != len(normalized):
+        raise ValueError('Workflow steps contain a dependency cycle')
+    return normalized
+
+def critical_path(steps: List[Dict[str, Any]], timings: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Longest chain of dependent steps by measured duration"""
+    longest: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    by_id = {step['id']: step for step in steps}
+
+    def visit(step_id: str) -> float:
+        if step_id not in longest:
+            best, best_dep = 0.0, None
+            for dep in by_id[step_id]['depends_on']:
+                length = visit(dep)
+                if best_dep is None or length > best:
+                    best, best_dep = length, dep
+            longest[step_id] = best + (timings.get(step_id, {}).get('duration') or 0.0)
+            previous[step_id] = best_dep
+        return longest[step_id]
+
+    for step in steps:
+        visit(step['id'])
+    end = max(longest, key=longest.get)
+    path = [end]
+    while previous[path[-1]] is not None:
+        path.append(previous[path[-1]])
+    path.reverse()
+    return {'steps': path, 'seconds': round(longest[end], 4)}
+
+class WorkflowEngine:
+    """Persists DAG workflows and runs their steps concurrently"""
+
+    def __init__(self, db_path: str = 'workflows.db', max_workers: int = 8):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self._actions: Dict[str, Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {}
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.stats = {'workflows_created': 0, 'runs_started': 0, 'runs_completed': 0,
+                      'runs_failed': 0, 'steps_run': 0}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits on success and is closed on exit"""
+        if not self._initialized:
+            with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS workflows (
+                        id TEXT PRIMARY KEY,
+                        namespace TEXT NOT NULL,
+                        name TEXT,
+                        steps TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS workflow_runs (
+                        id TEXT PRIMARY KEY,
+                        workflow_id TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        started_at TEXT,
+                        finished_at TEXT,
+                        duration REAL,
+                        critical_path TEXT,
+                        steps TEXT,
+                        FOREIGN KEY (workflow_id) REFERENCES workflows (id)
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_workflow_runs_workflow ON workflow_runs(workflow_id)')
+            self._initialized = True
+        with closing(sqlite3.connect(self.db_path, factory=TimedConnection)) as conn, conn:
+            yield conn
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='workflow-step')
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(self._executor)
+                threading.Thread(target=loop.run_forever, name='workflow-engine', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def register_action(self, namespace: str, action: str,
+                        handler: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        """Register a blocking handler(params) -> result dict for an action name"""
+        self._actions.setdefault(namespace, {})[action] = handler
+
+    def supported_actions(self, namespace: str) -> List[str]:
+        return sorted(set(self._actions.get(namespace, {})) | {'wait'})
+
+    # Workflows
+
+    def create_workflow(self, namespace: str, name: str, steps: List[Dict[str, Any]],
+                        continue_on_error: bool = False) -> Dict[str, Any]:
+        """Validate and persist a workflow; raises ValueError for an invalid graph"""
+        normalized = normalize_steps(steps, continue_on_error)
+        known = set(self.supported_actions(namespace))
+        unknown = sorted({step['action'] for step in normalized} - known)
+        if unknown:
+            raise ValueError(f"Unknown actions: {', '.join(unknown)}")
+
+        workflow_id = f'auto_{uuid.uuid4().hex}'
+        with self._connect() as conn:
+            conn.execute('INSERT INTO workflows (id, namespace, name, steps) VALUES (?, ?, ?, ?)',
+                         (workflow_id, namespace, name, json.dumps(normalized)))
+        self._count('workflows_created')
+        return {'id': workflow_id, 'namespace': namespace, 'name': name, 'steps': normalized}
+
+    def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute('''
+                SELECT id, namespace, name, steps, created_at FROM workflows WHERE id = ?
+            ''', (workflow_id,)).fetchone()
+            if row is None:
+                return None
+            runs = [r[0] for r in conn.execute('''
+                SELECT id FROM workflow_runs WHERE workflow_id = ? ORDER BY started_at DESC LIMIT 20
+            ''', (workflow_id,))]
+        return {'id': row[0], 'namespace': row[1], 'name': row[2], 'steps': json.loads(row[3]),
+                'created_at': row[4], 'recent_runs': runs}
+
+    def list_workflows(self, namespace: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        query = 'SELECT id, namespace, name, created_at FROM workflows'
+        args: tuple = ()
+        if namespace:
+            query += ' WHERE namespace = ?'
+            args = (namespace,)
+        query += ' ORDER BY created_at DESC LIMIT ?'
+        with self._connect() as conn:
+            rows = conn.execute(query, args + (limit,)).fetchall()
+        return [{'id': r[0], 'namespace': r[1], 'name': r[2], 'created_at': r[3]} for r in rows]
+
+    # Runs
+
+    def start(self, workflow_id: str) -> Dict[str, Any]:
+        """Start a run in the background and return its initial record"""
+        workflow = self.get_workflow(workflow_id)
+        if workflow is None:
+            raise KeyError(workflow_id)
+
+        run = {
+            'id': f'run_{uuid.uuid4().hex}',
+            'workflow_id': workflow_id,
+            'status': 'running',
+            'started_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'duration': None,
+            'critical_path': None,
+            'steps': {step['id']: {'action': step['action'], 'status': 'pending'}
+                      for step in workflow['steps']}
+        }
+        with self._lock:
+            self._runs[run['id']] = run
+        self._save_run(run)
+        self._count('runs_started')
+
+        loop = self._ensure_loop()
+        self._futures[run['id']] = asyncio.run_coroutine_threadsafe(self._execute(workflow, run), loop)
+        return self._snapshot(run)
+
+    def run(self, workflow_id: str, timeout: float = DEFAULT_RUN_TIMEOUT) -> Dict[str, Any]:
+        """Run a workflow and wait for its result"""
+        run = self.start(workflow_id)
+        future = self._futures.get(run['id'])
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception as e:
+                logger.error(f"Workflow run {run['id']} did not finish: {e}")
+        return self.get_run(run['id'])
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is not None:
+            return self._snapshot(run)
+        with self._connect() as conn:
+            row = conn.execute('''
+                SELECT id, workflow_id, status, started_at, finished_at, duration, critical_path, steps
+                FROM workflow_runs WHERE id = ?
+            ''', (run_id,)).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'workflow_id': row[1], 'status': row[2], 'started_at': row[3],
+                'finished_at': row[4], 'duration': row[5],
+                'critical_path': json.loads(row[6]) if row[6] else None,
+                'steps': json.loads(row[7]) if row[7] else {}}
+
+    def _snapshot(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(run, default=str))
+
+    def _save_run(self, run: Dict[str, Any]):
+        snapshot = self._snapshot(run)
+        try:
+            with self._connect() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO workflow_runs
+                    (id, workflow_id, status, started_at, finished_at, duration, critical_path, steps)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (snapshot['id'], snapshot['workflow_id'], snapshot['status'], snapshot['started_at'],
+                      snapshot['finished_at'], snapshot['duration'],
+                      json.dumps(snapshot['critical_path']) if snapshot['critical_path'] else None,
+                      json.dumps(snapshot['steps'])))
+        except Exception as e:
+            logger.error(f"Failed to persist workflow run {run['id']}: {e}")
+
+    async def _execute(self, workflow: Dict[str, Any], run: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        handlers = self._actions.get(workflow['namespace'], {})
+        origin = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: Dict[str, Any]) -> bool:
+            """Run one step; True when its dependents may run"""
+            # Each step waits only for its own dependencies
+            dependencies = [tasks[d] for d in step['depends_on']]
+            outcomes = await asyncio.gather(*dependencies) if dependencies else []
+            record = run['steps'][step['id']]
+            if not all(outcomes):
+                with self._lock:
+                    record['status'] = 'skipped'
+                return False
+
+            started = time.perf_counter()
+            with self._lock:
+                record['status'] = 'running'
+                record['started_offset'] = round(started - origin, 4)
+            params = step['params']
+            try:
+                if step['action'] == 'wait':
+                    seconds = min(float(params.get('seconds', 1)), MAX_WAIT_SECONDS)
+                    await asyncio.sleep(seconds)
+                    result = {'success': True, 'action': 'wait', 'message': f'Waited {seconds} seconds'}
+                else:
+                    call = loop.run_in_executor(None, handlers[step['action']], params)
+                    result = await asyncio.wait_for(call, step['timeout']) if step['timeout'] else await call
+            except asyncio.TimeoutError:
+                result = {'success': False, 'error': f"Step timed out after {step['timeout']} seconds"}
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+
+            finished = time.perf_counter()
+            ok = bool(isinstance(result, dict) and result.get('success', True))
+            with self._lock:
+                record.update({
+                    'status': 'completed' if ok else 'failed',
+                    'duration': round(finished - started, 4),
+                    'finished_offset': round(finished - origin, 4),
+                    'result': result
+                })
+            self._count('steps_run')
+            return ok or step.get('continue_on_error', False)
+
+        for step in workflow['steps']:
+            tasks[step['id']] = loop.create_task(run_step(step))
+        await asyncio.gather(*tasks.values())
+
+        with self._lock:
+            run['status'] = 'completed' if all(record['status'] == 'completed'
+                                               for record in run['steps'].values()) else 'failed'
+            run['finished_at'] = datetime.now().isoformat()
+            run['duration'] = round(time.perf_counter() - origin, 4)
+            run['critical_path'] = critical_path(workflow['steps'], run['steps'])
+            # Against the wall-clock duration this shows what concurrency saved
+            run['critical_path']['total_step_seconds'] = round(
+                sum(s.get('duration') or 0.0 for s in run['steps'].values()), 4)
+        self._count('runs_completed' if run['status'] == 'completed' else 'runs_failed')
+        self._save_run(run)
+        self._futures.pop(run['id'], None)
+        with self._lock:
+            # Finished runs are served from the database from now on
+            self._runs.pop(run['id'], None)
+
+    def get_engine_status(self) -> Dict[str, Any]:
+        """Counters, running runs and registered actions per namespace"""
+        with self._lock:
+            running = [run_id for run_id, run in self._runs.items() if run['status'] not in FINAL_STATES]
+            stats = dict(self.stats)
+        return {
+            'running': running,
+            'max_workers': self.max_workers,
+            'actions': {namespace: self.supported_actions(namespace) for namespace in self._actions},
+            'stats': stats
+        }
+
+# Global workflow engine instance
+workflow_engine = WorkflowEngine()